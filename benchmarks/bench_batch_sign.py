@@ -0,0 +1,70 @@
+"""
+작은 프로그램 여러 개의 sign analysis: 프로그램마다 FixedPointSolver vs BatchSignSolver 한 번
+
+    python -m benchmarks.bench_batch_sign --programs 1000 --statements 10
+
+example/ 정도 크기의 프로그램을 생성해서 모든 함수의 CFG 를
+- per-program: 함수마다 FixedPointSolver
+- batched: BatchSignSolver (pack: NumPy buffer 만들기, solve: 배열 연산 반복)
+결과를 읽는 비용 (states: dict, fixed_point: MapLattice) 은 따로 잰다.
+로 풀고 시간과 결과가 같은지를 출력한다.
+"""
+import argparse
+import sys
+import time
+
+from common.generator import GeneratorConfig, generate
+from ir import tip_ast as ast
+from ir.tip_ast import get_ast
+from ir.tip_cfg import GraphBuilder
+from lattice.tip_lattice import FixedPointSolver
+from lattice.tip_vectorized import BatchSignSolver
+from main import load_parser
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--programs', type=int, default=1000)
+    parser.add_argument('--functions', type=int, default=3)
+    parser.add_argument('--statements', type=int, default=10)
+    parser.add_argument('--seed', type=int, default=0)
+    args = parser.parse_args(argv)
+
+    sys.setrecursionlimit(max(sys.getrecursionlimit(), 10000))
+    # 프로그램을 하나씩 parse 하면 오래 걸리므로 함수를 많이 가진 프로그램 하나로 만들고 함수를 프로그램으로 본다.
+    config = GeneratorConfig(functions=args.programs * args.functions, statements=args.statements,
+                             call_graph='dag', seed=args.seed)
+    program = get_ast(load_parser().parse(generate(config)))
+    cfgs = [GraphBuilder(program, str(f.name.name)).graph for f in program.functions]
+    parameters = [ast.as_list(f.parameters, []) for f in program.functions]
+    print(f"[batched sign benchmark] CFGs={len(cfgs)} statements={args.statements}")
+
+    start = time.perf_counter()
+    expected = [FixedPointSolver(entry, ps).fixed_point for entry, ps in zip(cfgs, parameters)]
+    per_program = time.perf_counter() - start
+
+    start = time.perf_counter()
+    solver = BatchSignSolver(cfgs, parameters)
+    batched = time.perf_counter() - start
+
+    start = time.perf_counter()
+    for i in range(len(cfgs)):
+        solver.states(i)
+    read = time.perf_counter() - start
+
+    start = time.perf_counter()
+    states = [solver.fixed_point(i) for i in range(len(cfgs))]
+    convert = time.perf_counter() - start
+    same = states == expected
+
+    print(f"  nodes                         {solver.nodes:10d} (buffer {solver.state.shape[0]} x {solver.state.shape[1]})")
+    print(f"  per-program FixedPointSolver  {per_program * 1000:10.1f} ms")
+    print(f"  BatchSignSolver               {batched * 1000:10.1f} ms "
+          f"(pack {solver.pack_seconds * 1000:.1f} ms, solve {solver.solve_seconds * 1000:.1f} ms, {solver.sweeps} sweeps)")
+    print(f"  read states (dict)            {read * 1000:10.1f} ms")
+    print(f"  read fixed_point (MapLattice) {convert * 1000:10.1f} ms")
+    print(f"  same fixed points             {same!s:>10}")
+    return 0 if same else 1
+
+
+if __name__ == '__main__':
+    sys.exit(main())
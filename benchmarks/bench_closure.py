@@ -0,0 +1,106 @@
+"""
+closure analysis (call graph): cubic algorithm vs worklist + cycle elimination
+
+    python -m benchmarks.bench_closure --sizes 500 1000 2000
+
+bench_points_to 의 프로그램 (함수 pointer 변수 g 를 거친 간접 호출) 에서
+- cubic: 모든 constraint 를 바뀌는 것이 없을 때까지 다시 보는 naive 풀이 (spa 9.2)
+- closure: ClosureAnalysis (AndersenSolver 의 difference propagation + lazy cycle detection)
+의 시간과 call graph 가 같은지를 출력한다.
+"""
+import argparse
+import sys
+import time
+
+from benchmarks.bench_points_to import make_pointer_program
+from pointer.tip_closure import ClosureAnalysis
+from pointer.tip_pointer_constraint import AddressOf, Call, Copy, Load, PointerConstraintCollector, Store
+
+def cubic_call_graph(program) -> tuple[dict[str, set[str]], int]:
+    """
+    (call graph, 모든 constraint 를 다시 본 횟수)
+    """
+    collector = PointerConstraintCollector(program)
+    functions = collector.functions
+    points_to = {}
+
+    def pt(cell):
+        return points_to.setdefault(cell, set())
+
+    def include(target, items) -> bool:
+        s = pt(target)
+        size = len(s)
+        s |= items
+        return len(s) != size
+
+    rounds = 0
+    changed = True
+    while changed:
+        changed = False
+        rounds += 1
+        for c in collector.constraints:
+            if isinstance(c, AddressOf):
+                changed |= include(c.target, {c.cell})
+            elif isinstance(c, Copy):
+                changed |= include(c.target, pt(c.source))
+            elif isinstance(c, Load):
+                for cell in list(pt(c.source)):
+                    changed |= include(c.target, pt(cell))
+            elif isinstance(c, Store):
+                for cell in list(pt(c.target)):
+                    changed |= include(cell, pt(c.source))
+            elif isinstance(c, Call):
+                for cell in list(pt(c.callee)):
+                    if cell.kind != 'function':
+                        continue
+                    signature = functions[cell.name]
+                    for argument, parameter in zip(c.arguments, signature.parameters):
+                        if argument is not None:
+                            changed |= include(parameter, pt(argument))
+                    changed |= include(c.target, pt(signature.result))
+
+    graph = {name: set() for name in functions}
+    for site in collector.call_sites:
+        if site.callee is None:
+            continue
+        arity = len(site.node.expressions)
+        graph[site.function] |= {cell.name for cell in pt(site.callee)
+                                 if cell.kind == 'function' and len(functions[cell.name].parameters) == arity}
+    return graph, rounds
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--sizes', type=int, nargs='+', default=[500, 1000, 2000])
+    parser.add_argument('--functions', type=int, default=20)
+    parser.add_argument('--variables', type=int, default=30)
+    parser.add_argument('--seed', type=int, default=0)
+    args = parser.parse_args(argv)
+
+    sys.setrecursionlimit(max(sys.getrecursionlimit(), 10000))
+    print(f"[closure analysis benchmark] functions={args.functions} variables={args.variables}")
+    print(f"  {'statements':>10} {'call sites':>10} {'edges':>6} {'cubic':>12} {'rounds':>6} "
+          f"{'closure':>12} {'collapsed':>9} {'same':>5}")
+
+    same = True
+    for size in args.sizes:
+        program = make_pointer_program(size, args.functions, args.variables, args.seed)
+
+        start = time.perf_counter()
+        expected, rounds = cubic_call_graph(program)
+        cubic_time = time.perf_counter() - start
+
+        start = time.perf_counter()
+        closure = ClosureAnalysis(program)
+        closure_time = time.perf_counter() - start
+
+        equal = closure.call_graph == expected
+        same &= equal
+        edges = sum(map(len, closure.call_graph.values()))
+        print(f"  {size:>10} {len(closure.call_sites):>10} {edges:>6} {cubic_time * 1000:>9.1f} ms {rounds:>6} "
+              f"{closure_time * 1000:>9.1f} ms {closure.solver.collapsed:>9} {equal!s:>5}")
+    return 0 if same else 1
+
+
+if __name__ == '__main__':
+    sys.exit(main())
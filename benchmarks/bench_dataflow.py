@@ -0,0 +1,162 @@
+"""
+bit vector liveness / reaching definitions vs set[str] 기반 naive 구현
+
+    python -m benchmarks.bench_dataflow --statements 50000
+
+두 구현은 같은 worklist 순서를 사용하므로 lattice 표현 (int bit set vs set[str]) 차이만 측정된다.
+"""
+import argparse
+import random
+import sys
+import time
+from collections import deque
+
+from ir import tip_ast as ast
+from ir import tip_cfg as cfg
+from ir.tip_cfg import GraphBuilder
+from lattice.tip_dataflow import LivenessAnalysis, ReachingDefinitionsAnalysis, node_uses, node_defines, iter_bits
+
+
+def make_program(statements: int, variables: int, seed: int) -> ast.Program:
+    """
+    statements 개의 문장을 가진 main 함수 AST 를 직접 만든다. (parser 를 거치지 않음)
+    """
+    rng = random.Random(seed)
+    names = [ast.Id(f"v{i}") for i in range(variables)]
+
+    def expression():
+        left = rng.choice(names)
+        if rng.random() < 0.3:
+            return ast.Int(str(rng.randint(-9, 9)))
+        op = rng.choice(list(ast.ArithmeticOperator))
+        return ast.Arithmetic(left, op, rng.choice(names))
+
+    def condition():
+        op = rng.choice(list(ast.ComparisonOperator))
+        return ast.Comparison(rng.choice(names), op, ast.Int(str(rng.randint(0, 9))))
+
+    def block(budget: int, depth: int) -> list:
+        stmts = []
+        while budget > 0:
+            r = rng.random()
+            if depth < 3 and budget > 4 and r < 0.1:
+                inner = rng.randint(1, min(budget - 1, 20))
+                stmts.append(ast.If(condition(), block(inner, depth + 1), None))
+                budget -= inner + 1
+            elif depth < 3 and budget > 4 and r < 0.15:
+                inner = rng.randint(1, min(budget - 1, 20))
+                stmts.append(ast.While(condition(), block(inner, depth + 1)))
+                budget -= inner + 1
+            elif r < 0.2:
+                stmts.append(ast.Output(rng.choice(names)))
+                budget -= 1
+            else:
+                stmts.append(ast.Assignment(rng.choice(names), expression()))
+                budget -= 1
+        return stmts
+
+    body = [ast.Declaration(list(names))] + block(statements, 0)
+    main = ast.Function(ast.Id("main"), [], body, ast.Return(rng.choice(names)))
+    return ast.Program([main])
+
+
+def naive_liveness(graph: cfg.IndexedGraph):
+    uses = [node_uses(n) for n in graph.nodes]
+    defs = [node_defines(n) for n in graph.nodes]
+    before = [set() for _ in graph.nodes]
+    order = list(reversed(graph.reverse_postorder()))
+    worklist = deque(order)
+    queued = set(order)
+
+    while worklist:
+        v = worklist.popleft()
+        queued.discard(v)
+        after = set()
+        for s in graph.successors[v]:
+            after |= before[s]
+        y = (after - defs[v]) | uses[v]
+        if y != before[v]:
+            before[v] = y
+            for p in graph.predecessors[v]:
+                if p not in queued:
+                    queued.add(p)
+                    worklist.append(p)
+
+    return before
+
+
+def naive_reaching_definitions(graph: cfg.IndexedGraph):
+    gen = [set() for _ in graph.nodes]
+    defined = [None] * len(graph)
+    for i, node in enumerate(graph.nodes):
+        if isinstance(node, cfg.NormalNode) and isinstance(node.statement, ast.Assignment):
+            defined[i] = str(node.statement.id.name)
+            gen[i] = {f"{defined[i]}@{i}"}
+        elif isinstance(node, cfg.NormalNode) and isinstance(node.statement, ast.Declaration):
+            defined[i] = {str(id.name) for id in node.statement.ids}
+
+    after = [set() for _ in graph.nodes]
+    order = graph.reverse_postorder()
+    worklist = deque(order)
+    queued = set(order)
+
+    while worklist:
+        v = worklist.popleft()
+        queued.discard(v)
+        before = set()
+        for p in graph.predecessors[v]:
+            before |= after[p]
+        if isinstance(defined[v], str):
+            prefix = f"{defined[v]}@"
+            before = {d for d in before if not d.startswith(prefix)}
+        elif defined[v]:
+            before = {d for d in before if d.split('@', 1)[0] not in defined[v]}
+        y = before | gen[v]
+        if y != after[v]:
+            after[v] = y
+            for s in graph.successors[v]:
+                if s not in queued:
+                    queued.add(s)
+                    worklist.append(s)
+
+    return after
+
+
+def measure(label, fn):
+    start = time.perf_counter()
+    result = fn()
+    elapsed = time.perf_counter() - start
+    print(f"  {label:<36} {elapsed * 1000:10.1f} ms")
+    return result, elapsed
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--statements', type=int, default=50000)
+    parser.add_argument('--variables', type=int, default=64)
+    parser.add_argument('--seed', type=int, default=0)
+    args = parser.parse_args(argv)
+
+    sys.setrecursionlimit(max(sys.getrecursionlimit(), 10000))
+    program = make_program(args.statements, args.variables, args.seed)
+    entry = GraphBuilder(program).graph
+    graph = cfg.IndexedGraph(entry)
+    print(f"[dataflow benchmark] statements={args.statements} variables={args.variables} nodes={len(graph)}")
+
+    live, bit_live = measure("liveness (bit vector)", lambda: LivenessAnalysis(entry))
+    # bit vector 쪽과 동일하게 IndexedGraph 생성 시간을 포함한다.
+    naive_live, set_live = measure("liveness (set[str])", lambda: naive_liveness(cfg.IndexedGraph(entry)))
+    reaching, bit_reaching = measure("reaching definitions (bit vector)", lambda: ReachingDefinitionsAnalysis(entry))
+    naive_reaching, set_reaching = measure("reaching definitions (set[str])", lambda: naive_reaching_definitions(cfg.IndexedGraph(entry)))
+
+    # 두 구현의 결과가 같은지 확인
+    for i in range(len(graph)):
+        assert live.variables.decode(live.solver.before[i]) == naive_live[i]
+        definitions = (reaching.definitions[b] for b in iter_bits(reaching.solver.after[i]))
+        assert {f"{graph.nodes[d].statement.id.name}@{d}" for d in definitions} == naive_reaching[i]
+
+    print(f"  speedup: liveness x{set_live / bit_live:.1f}, reaching definitions x{set_reaching / bit_reaching:.1f}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,79 @@
+"""
+sign analysis: 모든 node 를 푸는 FixedPointSolver vs (node, 변수) 질의만 푸는 DemandSignSolver
+
+    python -m benchmarks.bench_demand --statements 5000 --queries 20
+
+생성한 큰 main 함수에서 output 문 직전의 변수 sign 을 임의로 골라 묻는다.
+- full: FixedPointSolver 한 번 (질의는 결과를 읽기만 함)
+- demand: 질의마다 DemandSignSolver.query_before (앞선 질의의 memo 를 재사용)
+첫 질의의 latency 와 질의 전체 시간, 답이 같은지를 출력한다.
+"""
+import argparse
+import random
+import sys
+import time
+
+from common.generator import GeneratorConfig, generate
+from ir import tip_ast as ast
+from ir import tip_cfg as cfg
+from ir.tip_ast import get_ast
+from ir.tip_cfg import GraphBuilder
+from lattice.tip_demand import DemandSignSolver, join_value
+from lattice.tip_lattice import FixedPointSolver, MapLattice
+from main import load_parser
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--statements', type=int, default=5000)
+    parser.add_argument('--queries', type=int, default=20)
+    parser.add_argument('--seed', type=int, default=0)
+    args = parser.parse_args(argv)
+
+    sys.setrecursionlimit(max(sys.getrecursionlimit(), 10000))
+    config = GeneratorConfig(functions=1, statements=args.statements, call_graph='none', seed=args.seed)
+    program = get_ast(load_parser().parse(generate(config)))
+    function = program.functions[-1]
+    parameters = ast.as_list(function.parameters, [])
+    entry = GraphBuilder(program, str(function.name.name)).graph
+    graph = cfg.IndexedGraph(entry)
+
+    rng = random.Random(args.seed)
+    outputs = [v for v, node in enumerate(graph.nodes)
+               if isinstance(node, cfg.NormalNode) and isinstance(node.statement, ast.Output)]
+    names = sorted({str(id.name) for node in graph.nodes
+                    if isinstance(node, cfg.NormalNode) and isinstance(node.statement, ast.Declaration)
+                    for id in node.statement.ids})
+    queries = [(rng.choice(outputs), rng.choice(names)) for _ in range(args.queries)]
+    print(f"[demand-driven sign benchmark] statements={args.statements} nodes={len(graph)} queries={len(queries)}")
+
+    start = time.perf_counter()
+    fixed_point = FixedPointSolver(entry, parameters).fixed_point
+    full_time = time.perf_counter() - start
+
+    def expected(v, name):
+        value = None
+        for u in graph.predecessors[v]:
+            state = fixed_point[u]
+            if isinstance(state, MapLattice):
+                value = join_value(value, state.lattice.get(name))
+        return value
+
+    solver = DemandSignSolver(entry, parameters, graph=graph)
+    same = True
+    latencies = []
+    for v, name in queries:
+        start = time.perf_counter()
+        answer = solver.query_before(v, name)
+        latencies.append(time.perf_counter() - start)
+        same &= answer == expected(v, name)
+
+    print(f"  full fixed point              {full_time * 1000:10.1f} ms")
+    print(f"  demand: first query           {latencies[0] * 1000:10.1f} ms")
+    print(f"  demand: all queries           {sum(latencies) * 1000:10.1f} ms")
+    print(f"  explored (node, variable)     {solver.explored:10d} of {len(graph) * len(names)}")
+    print(f"  same answers                  {same!s:>10}")
+    return 0 if same else 1
+
+
+if __name__ == '__main__':
+    sys.exit(main())
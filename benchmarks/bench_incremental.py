@@ -0,0 +1,63 @@
+"""
+전체 parse vs incremental parse
+
+    python -m benchmarks.bench_incremental --functions 40 --edits 20
+
+생성한 프로그램의 임의 함수 안 정수 상수를 바꾸는 편집 (키 입력 하나) 을 반복하고
+- full: 편집된 text 전체를 parse_program + build_ast
+- incremental: IncrementalDocument.apply
+의 시간을 비교한다. 매 편집마다 두 AST 가 같은지 확인한다.
+"""
+import argparse
+import random
+import re
+import statistics
+import sys
+import time
+
+from common.generator import GeneratorConfig, generate
+from ir.tip_ast import get_ast
+from ir.tip_incremental import IncrementalDocument, TextEdit
+from main import load_parser
+
+def random_edit(text: str, rng: random.Random) -> TextEdit:
+    literal = rng.choice(list(re.finditer(r'\b\d+\b', text)))
+    return TextEdit(literal.start(), literal.end(), str(rng.randrange(100)))
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--functions', type=int, default=40)
+    parser.add_argument('--statements', type=int, default=10)
+    parser.add_argument('--edits', type=int, default=20)
+    parser.add_argument('--seed', type=int, default=0)
+    args = parser.parse_args(argv)
+
+    lark = load_parser()
+    text = generate(GeneratorConfig(functions=args.functions, statements=args.statements, call_graph='dag', seed=args.seed))
+    document = IncrementalDocument(lark, text)
+    rng = random.Random(args.seed)
+
+    full, incremental, reparsed = [], [], 0
+    for _ in range(args.edits):
+        edit = random_edit(document.text, rng)
+
+        start = time.perf_counter()
+        result = document.apply(edit)
+        incremental.append(time.perf_counter() - start)
+        reparsed += result.reparsed
+
+        start = time.perf_counter()
+        program = get_ast(lark.parse(document.text))
+        full.append(time.perf_counter() - start)
+
+        assert program == document.program, "incremental AST 가 전체 parse 와 다르다."
+
+    print(f"[incremental benchmark] {len(document.spans)} functions, {len(document.text)} chars, {args.edits} edits")
+    print(f"  full          {statistics.median(full) * 1000:9.2f} ms / edit")
+    print(f"  incremental   {statistics.median(incremental) * 1000:9.2f} ms / edit  (reparsed {reparsed} functions)")
+    print(f"  speedup       {statistics.median(full) / statistics.median(incremental):9.1f}x")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,190 @@
+"""
+TIP 실행: AST 를 직접 도는 interpreter vs bytecode interpreter
+
+    python -m benchmarks.bench_interpreter --n 22
+
+같은 프로그램 (재귀 호출, while, pointer, record 를 모두 쓰는 WORKLOAD) 을
+- ast: 문장 / 식마다 isinstance 로 분기하고 변수를 dict 로 찾는 구현
+- bytecode: compile_program + Interpreter (compile 시간 포함)
+로 실행하고 output 이 같은지 확인한다.
+"""
+import argparse
+import sys
+import time
+
+from ir import tip_ast as ast
+from ir.tip_ast import get_ast
+from ir.tip_bytecode import compile_program
+from ir.tip_interpreter import Cell, Interpreter
+from main import load_parser
+
+WORKLOAD = """
+fib(n) {
+  var r;
+  r = n;
+  if (n > 1) { r = fib(n - 1) + fib(n - 2); }
+  return r;
+}
+
+sum(p, n) {
+  var i;
+  i = 0;
+  while (n > i) { *p = *p + i * i / 3; i = i + 1; }
+  return *p;
+}
+
+main(n) {
+  var acc, k, s, point;
+  acc = 0;
+  k = 0;
+  point = {x: 0, y: 0};
+  while (n > k) {
+    s = sum(&acc, 200);
+    point.x = point.x + s / 1000;
+    point.y = point.y - 1;
+    k = k + 1;
+  }
+  output acc;
+  output point.x;
+  output point.y;
+  output fib(n);
+  return 0;
+}
+"""
+
+class AstInterpreter:
+    """
+    비교 기준: 변수 환경은 dict, 호출은 Python 재귀
+    """
+    def __init__(self, program: ast.Program, inputs):
+        self.functions = {str(f.name.name): f for f in program.functions}
+        self.inputs = iter(inputs)
+        self.outputs = []
+
+    def call(self, function: ast.Function, arguments: list):
+        env = {str(p.name): a for p, a in zip(ast.as_list(function.parameters, []), arguments)}
+        cells = {}
+        self.block(function.statements, env, cells)
+        return self.expression(function.return_statement.expression, env, cells)
+
+    def lookup(self, name, env, cells):
+        if name in cells:
+            return cells[name].value
+        if name in env:
+            return env[name]
+        return self.functions[name]
+
+    def store(self, name, value, env, cells):
+        if name in cells:
+            cells[name].value = value
+        else:
+            env[name] = value
+
+    def block(self, statements, env, cells):
+        for statement in ast.as_list(statements, []):
+            self.statement(statement, env, cells)
+
+    def statement(self, s, env, cells):
+        if isinstance(s, ast.Assignment):
+            self.store(str(s.id.name), self.expression(s.expression, env, cells), env, cells)
+        elif isinstance(s, ast.While):
+            while self.expression(s.condition, env, cells):
+                self.block(s.statements, env, cells)
+        elif isinstance(s, ast.If):
+            if self.expression(s.condition, env, cells):
+                self.block(s.true_statements, env, cells)
+            else:
+                self.block(s.false_statements, env, cells)
+        elif isinstance(s, ast.DereferenceAssignment):
+            self.expression(s.target.expression, env, cells).value = self.expression(s.expression, env, cells)
+        elif isinstance(s, ast.FieldAssignment):
+            name = str(s.id.name)
+            record = dict(self.lookup(name, env, cells))
+            record[str(s.key.name)] = self.expression(s.expression, env, cells)
+            self.store(name, record, env, cells)
+        elif isinstance(s, ast.Output):
+            self.outputs.append(self.expression(s.expression, env, cells))
+        elif isinstance(s, ast.Declaration):
+            for id in ast.as_list(s.ids, []):
+                env[str(id.name)] = None
+        else:
+            raise NotImplementedError(s.__class__.__name__)
+
+    def expression(self, e, env, cells):
+        if isinstance(e, ast.Id):
+            return self.lookup(str(e.name), env, cells)
+        if isinstance(e, ast.Int):
+            return int(e.value)
+        if isinstance(e, ast.Arithmetic):
+            left = self.expression(e.left_expression, env, cells)
+            right = self.expression(e.right_expression, env, cells)
+            if e.operator is ast.ArithmeticOperator.ADD:
+                return left + right
+            if e.operator is ast.ArithmeticOperator.SUB:
+                return left - right
+            if e.operator is ast.ArithmeticOperator.MUL:
+                return left * right
+            q = abs(left) // abs(right)
+            return q if (left < 0) == (right < 0) else -q
+        if isinstance(e, ast.Comparison):
+            left = self.expression(e.left_expression, env, cells)
+            right = self.expression(e.right_expression, env, cells)
+            if e.operator is ast.ComparisonOperator.GT:
+                return 1 if left > right else 0
+            return 1 if left == right else 0
+        if isinstance(e, ast.Parenthesize):
+            return self.expression(e.expression, env, cells)
+        if isinstance(e, ast.FunctionCall):
+            callee = self.expression(e.callee, env, cells)
+            return self.call(callee, [self.expression(a, env, cells) for a in ast.as_list(e.expressions, [])])
+        if isinstance(e, ast.Dereference):
+            return self.expression(e.expression, env, cells).value
+        if isinstance(e, ast.Reference):
+            name = str(e.id.name)
+            if name not in cells:
+                cells[name] = Cell(env.pop(name, None))
+            return cells[name]
+        if isinstance(e, ast.Record):
+            return {str(f.key.name): self.expression(f.Value, env, cells) for f in ast.as_list(e.fields, [])}
+        if isinstance(e, ast.FieldAccess):
+            return self.expression(e.expression, env, cells)[str(e.id.name)]
+        if isinstance(e, ast.Input):
+            return int(next(self.inputs))
+        raise NotImplementedError(e.__class__.__name__)
+
+
+def measure(label, fn):
+    start = time.perf_counter()
+    result = fn()
+    elapsed = time.perf_counter() - start
+    print(f"  {label:<36} {elapsed * 1000:10.1f} ms")
+    return result, elapsed
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--n', type=int, default=22, help='main 의 인자 (반복 횟수 / fib 인자)')
+    args = parser.parse_args(argv)
+
+    sys.setrecursionlimit(max(sys.getrecursionlimit(), 10000))
+    program = get_ast(load_parser().parse(WORKLOAD))
+    print(f"[interpreter benchmark] n={args.n}")
+
+    baseline = AstInterpreter(program, [args.n])
+    _, ast_time = measure("ast", lambda: baseline.call(baseline.functions['main'], [args.n]))
+
+    def run():
+        interpreter = Interpreter(compile_program(program), [args.n])
+        interpreter.run()
+        return interpreter
+    interpreter, bytecode_time = measure("bytecode (incl. compile)", run)
+
+    same = interpreter.outputs == baseline.outputs
+    print(f"  steps                                {interpreter.steps:10d} ({interpreter.steps / bytecode_time / 1e6:.2f} M steps/s)")
+    print(f"  speedup                              x{ast_time / bytecode_time:.1f}")
+    print(f"  same outputs                         {same!s:>10}")
+    return 0 if same else 1
+
+
+if __name__ == '__main__':
+    sys.exit(main())
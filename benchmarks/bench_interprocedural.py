@@ -0,0 +1,69 @@
+"""
+interprocedural sign analysis: 호출 위치 수 vs 문맥 수
+
+    python -m benchmarks.bench_interprocedural --functions 60 --call-density 0.4
+
+생성한 프로그램의 모든 함수를 root 로
+- intraprocedural: 함수마다 FixedPointSolver (호출은 ㅜ)
+- interprocedural: InterproceduralSignSolver (요약 표)
+를 실행하고 호출 위치 수, 문맥 수, 문맥을 푼 횟수를 출력한다.
+호출 결과가 ㅜ 가 아니게 된 변수 (정밀도 향상) 도 센다.
+"""
+import argparse
+import sys
+import time
+
+from common.generator import CALL_GRAPHS, GeneratorConfig, generate
+from ir import tip_ast as ast
+from ir.tip_ast import get_ast
+from ir.tip_cfg import GraphBuilder
+from lattice.tip_interprocedural import InterproceduralSignSolver, calls_in
+from lattice.tip_lattice import FixedPointSolver, MapLattice, SignLattice
+from main import load_parser
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--functions', type=int, default=60)
+    parser.add_argument('--statements', type=int, default=20)
+    parser.add_argument('--call-density', type=float, default=0.4)
+    parser.add_argument('--call-graph', choices=CALL_GRAPHS, default='recursive')
+    parser.add_argument('--seed', type=int, default=0)
+    args = parser.parse_args(argv)
+
+    sys.setrecursionlimit(max(sys.getrecursionlimit(), 10000))
+    config = GeneratorConfig(functions=args.functions, statements=args.statements, call_density=args.call_density,
+                             call_graph=args.call_graph, pointer_density=0.0, record_density=0.0, seed=args.seed)
+    program = get_ast(load_parser().parse(generate(config)))
+    names = [str(f.name.name) for f in program.functions]
+    call_sites = sum(1 for _ in calls_in(program))
+    print(f"[interprocedural sign benchmark] functions={len(names)} call sites={call_sites}")
+
+    start = time.perf_counter()
+    intraprocedural = {f.name.name: FixedPointSolver(GraphBuilder(program, str(f.name.name)).graph,
+                                                     ast.as_list(f.parameters, [])).fixed_point
+                       for f in program.functions}
+    intra_time = time.perf_counter() - start
+
+    start = time.perf_counter()
+    solver = InterproceduralSignSolver(program, names)
+    inter_time = time.perf_counter() - start
+
+    def precise(state):
+        if not isinstance(state, MapLattice):
+            return 0
+        return sum(1 for sign in state.lattice.values() if sign is not SignLattice.TOP)
+
+    before = sum(precise(states[-1]) for states in intraprocedural.values())
+    after = sum(precise(solver.fixed_point(name)[-1]) for name in names)
+
+    print(f"  components (SCC)              {len(solver.components):10d} (largest {max(map(len, solver.components))})")
+    print(f"  contexts                      {len(solver.summaries):10d}")
+    print(f"  context analyses              {solver.analyses:10d}")
+    print(f"  intraprocedural               {intra_time * 1000:10.1f} ms")
+    print(f"  interprocedural               {inter_time * 1000:10.1f} ms")
+    print(f"  non-ㅜ variables at exit      {before:10d} -> {after}")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
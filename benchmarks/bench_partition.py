@@ -0,0 +1,72 @@
+"""
+unification: UnificationSolver 하나 vs component 로 나누어 process pool 에서 풀기
+
+    python -m benchmarks.bench_partition --functions 400 --workers 4
+
+생성한 프로그램의 constraint 로
+- serial: UnificationSolver
+- partitioned: PartitionedUnificationSolver (pool 은 미리 띄워 두고 시간에서 뺀다.)
+를 비교하고 두 결과의 동치류가 같은지 확인한다.
+"""
+import argparse
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+from common.generator import GeneratorConfig, generate
+from ir.tip_ast import get_ast
+from main import load_parser
+from type.tip_constraint import ConstraintCollector
+from type.tip_partition import PartitionedUnificationSolver, TermTable, components
+from type.tip_unification import UnificationSolver, UnionFind
+
+def classes(relation: dict) -> set[frozenset]:
+    union_find = UnionFind(dict(relation))
+    groups = {}
+    for t in relation:
+        groups.setdefault(union_find.find(t), set()).add(t)
+    return {frozenset(g) for g in groups.values()}
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--functions', type=int, default=400)
+    parser.add_argument('--statements', type=int, default=12)
+    parser.add_argument('--workers', type=int, default=os.cpu_count() or 1)
+    parser.add_argument('--seed', type=int, default=0)
+    args = parser.parse_args(argv)
+
+    sys.setrecursionlimit(max(sys.getrecursionlimit(), 10000))
+    text = generate(GeneratorConfig(functions=args.functions, statements=args.statements, seed=args.seed))
+    collector = ConstraintCollector(get_ast(load_parser().parse(text)))
+    constraints = collector.constraints
+
+    start = time.perf_counter()
+    groups = components(TermTable(list(dict.fromkeys(constraints))))
+    pre_pass = time.perf_counter() - start
+
+    start = time.perf_counter()
+    serial = UnificationSolver(constraints, collector.record_fields)
+    serial_time = time.perf_counter() - start
+
+    with ProcessPoolExecutor(max_workers=args.workers) as pool:
+        for future in [pool.submit(os.getpid) for _ in range(args.workers)]:
+            future.result()
+        start = time.perf_counter()
+        partitioned = PartitionedUnificationSolver(constraints, collector.record_fields, args.workers, 0, pool)
+        partitioned_time = time.perf_counter() - start
+
+    same = classes(serial.type_parent_relation) == classes(partitioned.type_parent_relation)
+    print(f"[partitioned unification benchmark] functions={args.functions} constraints={len(constraints)} "
+          f"terms={len(serial.type_parent_relation)} workers={args.workers}")
+    print(f"  components                    {len(groups):10d} (largest {max(map(len, groups), default=0)} constraints)")
+    print(f"  bins                          {len(partitioned.bins):10d}")
+    print(f"  pre-pass                      {pre_pass * 1000:10.1f} ms")
+    print(f"  serial                        {serial_time * 1000:10.1f} ms")
+    print(f"  partitioned (incl. pre-pass)  {partitioned_time * 1000:10.1f} ms")
+    print(f"  same classes                  {same!s:>10}")
+    return 0 if same else 1
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,49 @@
+"""
+sign analysis state 메모리: PersistentMap (구조 공유) vs node 마다 dict 복사
+
+    python -m benchmarks.bench_persistent --statements 5000 --variables 200
+
+dict 쪽은 solver 결과의 각 state 를 dict 로 펼쳐 이전 구현 (node x vars) 의 저장 비용을 재현한다.
+"""
+import argparse
+import sys
+import time
+import tracemalloc
+
+from ir.tip_cfg import GraphBuilder
+from lattice.tip_lattice import FixedPointSolver, MapLattice
+from benchmarks.bench_dataflow import make_program
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--statements', type=int, default=5000)
+    parser.add_argument('--variables', type=int, default=200)
+    parser.add_argument('--seed', type=int, default=0)
+    args = parser.parse_args(argv)
+
+    sys.setrecursionlimit(max(sys.getrecursionlimit(), 10000))
+    program = make_program(args.statements, args.variables, args.seed)
+    entry = GraphBuilder(program).graph
+
+    tracemalloc.start()
+    start = time.perf_counter()
+    solver = FixedPointSolver(entry)
+    elapsed = time.perf_counter() - start
+    persistent, _ = tracemalloc.get_traced_memory()
+
+    copies = [dict(state.lattice.items()) if isinstance(state, MapLattice) else None
+              for state in solver.fixed_point]
+    with_copies, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    print(f"[persistent map benchmark] statements={args.statements} variables={args.variables} "
+          f"nodes={len(solver.fixed_point)}")
+    print(f"  sign analysis time            {elapsed * 1000:10.1f} ms ({solver.solver.iterations} iterations)")
+    print(f"  states (PersistentMap)        {persistent / 2**20:10.2f} MiB")
+    print(f"  states (dict per node)        {(with_copies - persistent) / 2**20:10.2f} MiB")
+    del copies
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,194 @@
+"""
+전체 pipeline 단계별 시간 측정
+
+    python -m benchmarks.bench_pipeline -o results.json
+    python -m benchmarks.bench_pipeline --compare baseline.json --threshold 0.2
+
+단계 (PHASES)
+- grammar: tip.lark 로 Lark parser 생성 (한 번만 측정)
+- parse: source -> parse tree
+- ast: get_ast
+- constraints: ConstraintCollector
+- unification: UnificationSolver
+- cfg: GraphBuilder
+- fixed_point: FixedPointSolver (sign analysis)
+
+example/ 의 모든 예제와 common.generator 로 만든 크기별 프로그램에 대해 측정한다.
+각 단계는 --repeat 번 실행한 값 중 최솟값을 기록한다.
+--compare 가 주어지면 저장된 결과와 비교해 threshold 보다 느려진 단계를 출력하고 종료 코드 1 을 반환한다.
+"""
+import argparse
+import json
+import platform
+import sys
+import time
+from pathlib import Path
+
+from lark import Lark
+
+from common.exceptions import TypeAnalysisException
+from common.generator import GeneratorConfig, generate
+from ir.tip_ast import get_ast
+from ir.tip_cfg import GraphBuilder
+from type.tip_constraint import ConstraintCollector
+from type.tip_unification import UnificationSolver
+from lattice.tip_lattice import FixedPointSolver
+
+BASE_DIR = Path(__file__).resolve().parent.parent
+SYNTAX = BASE_DIR / "syntax" / "tip.lark"
+EXAMPLES = BASE_DIR / "example"
+
+PHASES = ('grammar', 'parse', 'ast', 'constraints', 'unification', 'cfg', 'fixed_point')
+
+# 이보다 작은 차이는 측정 오차로 보고 무시한다. (초)
+NOISE_FLOOR = 0.002
+
+
+def load_grammar() -> Lark:
+    return Lark(SYNTAX.read_text(encoding="utf-8"), start='prog')
+
+def timed(fn):
+    start = time.perf_counter()
+    result = fn()
+    return result, time.perf_counter() - start
+
+def run_pipeline(parser: Lark, source: str) -> dict:
+    """
+    한 프로그램의 단계별 시간 (초), 실패한 단계는 error 에 기록하고 이후 단계는 건너뛴다.
+    type analysis 가 실패해도 cfg / fixed_point 는 측정한다.
+    """
+    timings = {}
+
+    cst, timings['parse'] = timed(lambda: parser.parse(source))
+    program, timings['ast'] = timed(lambda: get_ast(cst))
+
+    try:
+        collector, timings['constraints'] = timed(lambda: ConstraintCollector(program))
+        _, timings['unification'] = timed(lambda: UnificationSolver(collector.constraints, collector.record_fields))
+    except (TypeAnalysisException, AttributeError) as e:
+        timings['error'] = f"{type(e).__name__}: {e}"
+
+    graph, timings['cfg'] = timed(lambda: GraphBuilder(program).graph)
+    if graph is not None:
+        _, timings['fixed_point'] = timed(lambda: FixedPointSolver(graph))
+
+    return timings
+
+def best_of(repeat: int, fn) -> dict:
+    best = None
+    for _ in range(repeat):
+        timings = fn()
+        if best is None:
+            best = timings
+        else:
+            for phase, value in timings.items():
+                if phase != 'error':
+                    best[phase] = min(best.get(phase, value), value)
+    return best
+
+def corpus(sizes: list[int], statements: int, seed: int):
+    """
+    (이름, source) 목록: example 예제 + 생성된 프로그램
+    """
+    for path in sorted(EXAMPLES.glob("*/*.txt")):
+        yield f"example/{path.parent.name}/{path.name}", path.read_text(encoding="utf-8").split('"""', 1)[0]
+
+    for size in sizes:
+        config = GeneratorConfig(functions=size, statements=statements, seed=seed)
+        yield f"generated/f{size}xs{statements}", generate(config)
+
+def run(args) -> dict:
+    parser, grammar = timed(load_grammar)
+    for _ in range(args.repeat - 1):
+        parser, t = timed(load_grammar)
+        grammar = min(grammar, t)
+
+    results = {
+        'meta': {
+            'python': platform.python_version(),
+            'platform': platform.platform(),
+            'repeat': args.repeat,
+            'timestamp': time.strftime('%Y-%m-%dT%H:%M:%S'),
+        },
+        'grammar': grammar,
+        'programs': {},
+    }
+
+    for name, source in corpus(args.sizes, args.statements, args.seed):
+        try:
+            timings = best_of(args.repeat, lambda: run_pipeline(parser, source))
+        except Exception as e:
+            # 문법에 맞지 않는 예제 등
+            timings = {'error': f"{type(e).__name__}: {str(e).splitlines()[0]}"}
+        timings['size'] = len(source)
+        results['programs'][name] = timings
+        print_row(name, timings)
+
+    return results
+
+def print_row(name: str, timings: dict):
+    cells = []
+    for phase in PHASES[1:]:
+        value = timings.get(phase)
+        cells.append(f"{'-':>12}" if value is None else f"{value * 1000:12.2f}")
+    error = '  ! ' + timings['error'][:60] if 'error' in timings else ''
+    print(f"  {name:<32} {''.join(cells)}{error}")
+
+def compare(current: dict, baseline: dict, threshold: float) -> list[str]:
+    """
+    baseline 보다 (1 + threshold) 배 이상 느려진 (프로그램, 단계) 목록
+    """
+    regressions = []
+
+    def check(label, new, old):
+        if new is None or old is None or new - old < NOISE_FLOOR:
+            return
+        if new > old * (1 + threshold):
+            regressions.append(f"{label}: {old * 1000:.2f} ms -> {new * 1000:.2f} ms (x{new / old:.2f})")
+
+    check('grammar', current.get('grammar'), baseline.get('grammar'))
+    for name, timings in current['programs'].items():
+        old = baseline.get('programs', {}).get(name)
+        if old is None:
+            continue
+        for phase in PHASES[1:]:
+            check(f"{name} {phase}", timings.get(phase), old.get(phase))
+
+    return regressions
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--sizes', type=int, nargs='*', default=[1, 4, 16, 64], help='생성할 프로그램의 함수 수')
+    parser.add_argument('--statements', type=int, default=40, help='생성할 프로그램의 함수당 문장 수')
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--repeat', type=int, default=3)
+    parser.add_argument('-o', '--output', help='결과 JSON 파일')
+    parser.add_argument('--compare', help='비교할 baseline JSON 파일')
+    parser.add_argument('--threshold', type=float, default=0.25, help='허용하는 느려짐 비율 (0.25 = 25%%)')
+    args = parser.parse_args(argv)
+
+    sys.setrecursionlimit(max(sys.getrecursionlimit(), 100000))
+
+    print(f"[pipeline benchmark] repeat={args.repeat} (ms)")
+    print(f"  {'program':<32} {''.join(f'{phase:>12}' for phase in PHASES[1:])}")
+    results = run(args)
+    print(f"  grammar load: {results['grammar'] * 1000:.2f} ms")
+
+    if args.output:
+        Path(args.output).write_text(json.dumps(results, indent=2, ensure_ascii=False), encoding="utf-8")
+
+    if args.compare:
+        baseline = json.loads(Path(args.compare).read_text(encoding="utf-8"))
+        regressions = compare(results, baseline, args.threshold)
+        if regressions:
+            print(f"\n[regressions] threshold={args.threshold:.0%}")
+            for line in regressions:
+                print(f"  {line}")
+            return 1
+        print(f"\nno regressions (threshold={args.threshold:.0%})")
+
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,101 @@
+"""
+binary 형식 (common.serializer) vs pickle
+
+    python -m benchmarks.bench_serialize --sizes 5,20,80
+
+생성한 프로그램마다 AST, CFG, sign 분석 결과를 기록하고
+- 크기, dump / load 시간 (load: 전체 / 함수 하나만)
+- round-trip: 복원한 AST, CFG (IndexedGraph 의 succ / pred), fixed_point 가 원래 객체와 같은지, 다시 기록하면 같은 bytes 인지
+를 확인한다. 다르면 종료 코드 1
+"""
+import argparse
+import pickle
+import sys
+import time
+
+from common.generator import GeneratorConfig, generate
+from common.serializer import dumps, loads
+from ir.tip_cfg import IndexedGraph
+from main import TipAnalysis
+
+def analyse(functions: int, statements: int, seed: int) -> TipAnalysis:
+    analyzer = TipAnalysis()
+    analyzer.program = generate(GeneratorConfig(functions=functions, statements=statements, call_graph='chain', seed=seed))
+    analyzer.set_parser()
+    analyzer.parse_program()
+    analyzer.build_ast()
+    analyzer.build_cfg()
+    analyzer.solve_sign()
+    return analyzer
+
+def same_graph(a, b) -> bool:
+    x, y = IndexedGraph(a), IndexedGraph(b)
+    if x.successors != y.successors:
+        return False
+    for m, n in zip(x.nodes, y.nodes):
+        if type(m) is not type(n) or getattr(m, 'statement', None) != getattr(n, 'statement', None):
+            return False
+        if [x.index[p] for p in getattr(m, 'predecessors', ())] != [y.index[p] for p in getattr(n, 'predecessors', ())]:
+            return False
+    return True
+
+def round_trip(analyzer: TipAnalysis, data: bytes) -> list[str]:
+    snapshot = loads(data)
+    errors = []
+    if snapshot.program != analyzer.ast:
+        errors.append('program')
+    if not same_graph(analyzer.cfg, snapshot.cfg):
+        errors.append('cfg')
+    if snapshot.fixed_point != analyzer.fixed_point:
+        errors.append('fixed_point')
+
+    # 객체 공유 (CFG statement 와 program statement 등) 까지 같으면 다시 기록한 결과도 같다.
+    if dumps(program=snapshot.program, cfg=snapshot.cfg, fixed_point=snapshot.fixed_point) != data:
+        errors.append('sharing')
+    return errors
+
+def timed(f, repeat: int) -> float:
+    best = float('inf')
+    for _ in range(repeat):
+        start = time.perf_counter()
+        f()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--sizes', default='5,20,80', help='함수 수 목록')
+    parser.add_argument('--statements', type=int, default=10)
+    parser.add_argument('--repeat', type=int, default=5)
+    args = parser.parse_args(argv)
+
+    print(f"[serialize benchmark] best of {args.repeat}")
+    print(f"  {'functions':>9} {'binary':>9} {'pickle':>9} {'dump':>8} {'pickle':>8} {'load':>8} {'1 func':>8} {'unpickle':>8}")
+
+    failed = False
+    for functions in (int(s) for s in args.sizes.split(',')):
+        analyzer = analyse(functions, args.statements, seed=functions)
+        parts = dict(program=analyzer.ast, cfg=analyzer.cfg, fixed_point=analyzer.fixed_point)
+
+        data = dumps(**parts)
+        pickled = pickle.dumps(parts)
+        dump_time = timed(lambda: dumps(**parts), args.repeat)
+        pickle_time = timed(lambda: pickle.dumps(parts), args.repeat)
+        load_time = timed(lambda: loads(data).program, args.repeat)
+        function_time = timed(lambda: loads(data).function('main'), args.repeat)
+        unpickle_time = timed(lambda: pickle.loads(pickled), args.repeat)
+
+        print(f"  {functions:>9} {len(data):>8}B {len(pickled):>8}B "
+              f"{dump_time * 1000:6.2f}ms {pickle_time * 1000:6.2f}ms "
+              f"{load_time * 1000:6.2f}ms {function_time * 1000:6.2f}ms {unpickle_time * 1000:6.2f}ms")
+
+        errors = round_trip(analyzer, data)
+        if errors:
+            failed = True
+            print(f"    round-trip mismatch: {', '.join(errors)}")
+
+    return 1 if failed else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
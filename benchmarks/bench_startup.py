@@ -0,0 +1,101 @@
+"""
+시작 시간 (import) budget
+
+    python -m benchmarks.bench_startup --budget 60
+
+새 python process 에서 `python -X importtime` 으로 각 시나리오의 import 시간을 잰다.
+- import main: entry point 만 import (문법 / parser / 분석 module 은 아직 읽지 않아야 한다)
+- TipAnalysis(): instance 생성까지
+- sign analysis: parser 를 만들고 예제 하나를 분석 (lark 와 분석 module 이 모두 load 된다)
+
+--runs 번 실행한 값의 중앙값을 쓰고, `import main` 이 budget (ms) 을 넘으면 종료 코드 1 을 반환한다.
+"""
+import argparse
+import statistics
+import subprocess
+import sys
+import time
+from pathlib import Path
+
+BASE_DIR = Path(__file__).resolve().parent.parent
+
+SCENARIOS = {
+    'import main': "import main",
+    'TipAnalysis()': "import main; main.TipAnalysis()",
+    'sign analysis': (
+        "import main; a = main.TipAnalysis(); "
+        "a.program = open('example/ir/example3.txt').read(); "
+        "a.set_parser(); a.parse_program(); a.build_ast(); a.build_cfg(); a.solve_sign()"
+    ),
+}
+
+
+def parse_importtime(stderr: str) -> list[tuple[int, int, str]]:
+    """
+    'import time: self [us] | cumulative | imported package' 줄을 (self, cumulative, 이름) 으로
+    이름 앞의 공백 수가 중첩 깊이 (0 = 최상위)
+    """
+    rows = []
+    for line in stderr.splitlines():
+        if not line.startswith('import time:') or 'self [us]' in line:
+            continue
+        self_us, cumulative, name = line[len('import time:'):].split('|', 2)
+        rows.append((int(self_us), int(cumulative), name.rstrip()))
+    return rows
+
+def measure(statement: str) -> tuple[float, float, list]:
+    """
+    (import 시간 ms, process 전체 시간 ms, importtime 행)
+    python 자체 시작 (site 등) 에 쓰인 import 는 제외한다.
+    """
+    baseline = set(name for _, _, name in parse_importtime(run("pass")[1]))
+
+    start = time.perf_counter()
+    _, stderr = run(statement)
+    wall = (time.perf_counter() - start) * 1000
+
+    rows = parse_importtime(stderr)
+    rows = [row for row in rows if row[2] not in baseline]
+    total = sum(c for _, c, name in rows if not name.startswith('  ')) / 1000
+    return total, wall, rows
+
+def run(statement: str):
+    result = subprocess.run(
+        [sys.executable, '-X', 'importtime', '-c', statement],
+        cwd=BASE_DIR, capture_output=True, text=True, check=True,
+    )
+    return result.stdout, result.stderr
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--budget', type=float, default=60.0, help='import main 의 허용 시간 (ms)')
+    parser.add_argument('--runs', type=int, default=5)
+    parser.add_argument('--top', type=int, default=8, help='가장 오래 걸린 module 출력 개수')
+    args = parser.parse_args(argv)
+
+    print(f"[startup benchmark] runs={args.runs} budget={args.budget:.0f} ms (import main)")
+    print(f"  {'scenario':<16} {'imports':>10} {'process':>10}")
+
+    medians = {}
+    for label, statement in SCENARIOS.items():
+        samples = [measure(statement) for _ in range(args.runs)]
+        imports = statistics.median(s[0] for s in samples)
+        wall = statistics.median(s[1] for s in samples)
+        medians[label] = imports
+        print(f"  {label:<16} {imports:7.1f} ms {wall:7.1f} ms")
+
+    # import main 에서 가장 무거운 module
+    _, _, rows = measure(SCENARIOS['import main'])
+    print(f"\n  heaviest imports under `import main` (self time)")
+    for self_us, _, name in sorted(rows, key=lambda r: -r[0])[:args.top]:
+        print(f"    {self_us / 1000:7.2f} ms  {name.strip()}")
+
+    if medians['import main'] > args.budget:
+        print(f"\nover budget: import main {medians['import main']:.1f} ms > {args.budget:.0f} ms")
+        return 1
+    print(f"\nwithin budget: import main {medians['import main']:.1f} ms <= {args.budget:.0f} ms")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -1,3 +1,5 @@
-from . import exceptions, printer
+from .lazy import lazy_module
 
-__all__ = ["exceptions", "printer"]
\ No newline at end of file
+__all__ = ["exceptions", "printer", "generator", "profiler", "serializer", "report", "server", "batch"]
+
+__getattr__ = lazy_module(__name__, __all__)
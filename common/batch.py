@@ -0,0 +1,309 @@
+"""
+여러 TIP 파일 일괄 분석 (같은 함수는 한 번만)
+
+    python -m common.batch example/type/*.txt
+    python -m common.batch a.txt b.txt --store summaries.json
+    python -m common.batch a.txt b.txt --json -o report.json
+
+copy-paste 된 helper 함수는 파일마다 ConstraintCollector / FixedPointSolver 로 처음부터 다시 분석된다.
+함수마다 요약 (FunctionSummary) 을 만들어 fingerprint (ir.tip_fingerprint) 를 key 로 SummaryStore 에 둔다.
+- type: 함수 하나만 두고 (다른 함수 이름은 type 변수) 푼 함수의 type
+- sign: 함수 CFG 의 FixedPointSolver 결과 (IndexedGraph 순서, 변수는 정규 이름 #0, #1, ...)
+fingerprint 가 같은 함수는 이름만 다르므로 store 에 있는 요약의 이름을 되돌려 쓰고 분석하지 않는다.
+--store 를 주면 store 를 JSON 으로 읽고 써서 실행 사이에도 공유한다.
+--vectorized 이면 새로 분석하는 함수의 sign analysis 를 모아 두었다가 BatchSignSolver (NumPy) 로 한 번에 푼다.
+
+report 끝에 중복 제거로 건너뛴 일 (분석한 함수 수, CFG node 수, 제약식 수, 처음 분석할 때 걸린 시간) 을 쓴다.
+"""
+import argparse
+import json
+import os
+import sys
+import time
+from dataclasses import asdict, dataclass, field
+
+from ir import tip_ast as ast
+from ir.tip_fingerprint import VERSION, FunctionFingerprint
+
+@dataclass
+class FunctionSummary:
+    """
+    이름이 정규 이름인 분석 결과 (JSON 으로 그대로 저장)
+    - states: node 마다 {변수: sign}, ㅗ 이면 None
+    - nodes / constraints / seconds: 분석한 양 (다시 쓰면 건너뛴 양)
+    """
+    type: str = None
+    states: list = field(default_factory=list)
+    nodes: int = 0
+    constraints: int = 0
+    seconds: float = 0.0
+    errors: list[str] = field(default_factory=list)
+
+    def renamed_states(self, original: dict[str, str]) -> list:
+        """
+        정규 이름 -> 원래 이름 (FunctionFingerprint.original())
+        """
+        return [None if state is None else dict(sorted((original.get(name, name), sign) for name, sign in state.items()))
+                for state in self.states]
+
+def sign_states(states: list, names: dict[str, str]) -> list:
+    """
+    node 마다 {변수: SignLattice} (ㅗ 이면 None) -> JSON 으로 저장할 {정규 이름: sign}
+    """
+    return [
+        None if state is None else {names.get(key, key): str(value.value) for key, value in sorted(state.items())}
+        for state in states
+    ]
+
+def summarize(function: ast.Function, names: dict[str, str], sign: bool = True) -> FunctionSummary:
+    """
+    함수 하나만 분석한다. names 는 원래 이름 -> 정규 이름 (FunctionFingerprint.names)
+    sign 이 False 이면 type 만 (sign analysis 는 호출한 쪽이 모아서 푼다.)
+    """
+    from ir.tip_cfg import GraphBuilder
+    from lattice.tip_lattice import FixedPointSolver, MapLattice
+    from type.tip_constraint import ConstraintCollector
+    from type.tip_solution import SolvedTypes
+    from type.tip_unification import UnificationSolver
+
+    start = time.perf_counter()
+    summary = FunctionSummary()
+    program = ast.Program([function])
+    name = str(function.name.name)
+
+    try:
+        collector = ConstraintCollector(program)
+        summary.constraints = len(collector.constraints)
+        solver = UnificationSolver(collector.constraints, collector.record_fields)
+        summary.type = str(SolvedTypes(solver.type_parent_relation, collector.types).variables()[name])
+    except Exception as e:
+        summary.errors.append(f"types: {type(e).__name__}: {e}")
+
+    if sign:
+        try:
+            entry = GraphBuilder(program, name).graph
+            fixed_point = FixedPointSolver(entry, ast.as_list(function.parameters, [])).fixed_point
+            summary.nodes = len(fixed_point)
+            summary.states = sign_states([s.lattice if isinstance(s, MapLattice) else None for s in fixed_point], names)
+        except Exception as e:
+            summary.errors.append(f"sign: {type(e).__name__}: {e}")
+
+    summary.seconds = time.perf_counter() - start
+    return summary
+
+@dataclass
+class SummaryStore:
+    """
+    fingerprint digest -> FunctionSummary
+    - hits / misses: 요약을 다시 쓴 / 새로 만든 함수 수
+    - saved_*: hit 마다 건너뛴 분석의 양
+    """
+    summaries: dict[str, FunctionSummary] = field(default_factory=dict)
+
+    hits: int = field(init=False, default=0)
+    misses: int = field(init=False, default=0)
+    saved_nodes: int = field(init=False, default=0)
+    saved_constraints: int = field(init=False, default=0)
+    saved_seconds: float = field(init=False, default=0.0)
+
+    def summary(self, function: ast.Function, fingerprint: FunctionFingerprint,
+                sign: bool = True) -> tuple[FunctionSummary, bool]:
+        """
+        (요약, store 에서 찾았는지)
+        """
+        summary = self.summaries.get(fingerprint.digest)
+        if summary is not None:
+            self.hits += 1
+            return summary, True
+
+        self.misses += 1
+        summary = self.summaries[fingerprint.digest] = summarize(function, fingerprint.names, sign)
+        return summary, False
+
+    def saved(self, summary: FunctionSummary):
+        """
+        다시 쓴 요약 하나만큼 건너뛴 양을 더한다. (vectorized 이면 sign analysis 를 푼 뒤에 부른다.)
+        """
+        self.saved_nodes += summary.nodes
+        self.saved_constraints += summary.constraints
+        self.saved_seconds += summary.seconds
+
+    @classmethod
+    def load(cls, path: str) -> 'SummaryStore':
+        with open(path, encoding='utf-8') as f:
+            data = json.load(f)
+        if data.get('version') != VERSION:
+            # 정규형이 바뀌었으면 예전 요약은 쓰지 않는다.
+            return cls()
+        return cls({digest: FunctionSummary(**summary) for digest, summary in data['summaries'].items()})
+
+    def save(self, path: str):
+        data = {'version': VERSION, 'summaries': {digest: asdict(s) for digest, s in self.summaries.items()}}
+        with open(path, 'w', encoding='utf-8') as f:
+            json.dump(data, f, ensure_ascii=False)
+
+@dataclass
+class FunctionResult:
+    file: str
+    name: str
+    digest: str
+    type: str
+    exit_state: dict
+    reused: bool
+    errors: list[str]
+
+@dataclass
+class BatchAnalysis:
+    """
+    paths 의 파일을 차례로 parse 하고 함수마다 store 의 요약을 쓴다.
+    dedup 이 False 이면 store 를 거치지 않고 모든 함수를 분석한다. (비교용)
+    vectorized 이면 새로 만든 요약의 sign analysis 를 마지막에 BatchSignSolver 로 한 번에 푼다.
+    """
+    paths: list[str]
+    store: SummaryStore = field(default_factory=SummaryStore)
+    dedup: bool = True
+    vectorized: bool = False
+
+    results: list[FunctionResult] = field(init=False, default_factory=list)
+    errors: dict[str, str] = field(init=False, default_factory=dict)
+    functions: int = field(init=False, default=0)
+    seconds: float = field(init=False, default=0.0)
+
+    _pending: list = field(init=False, default_factory=list)  # (요약, 함수, 정규 이름), sign analysis 를 기다리는 것
+    _analysed: list = field(init=False, default_factory=list)  # (파일, 함수, fingerprint, 요약, 다시 썼는지)
+
+    def __post_init__(self):
+        from main import TipAnalysis
+
+        start = time.perf_counter()
+        analyzer = TipAnalysis()
+        analyzer.set_parser()
+        for path in self.paths:
+            try:
+                analyzer.load_source(path)
+                analyzer.parse_source()
+            except Exception as e:
+                self.errors[path] = f"parse: {type(e).__name__}: {str(e).splitlines()[0] if str(e) else ''}"
+                continue
+            for function in analyzer.ast.functions:
+                self.analyse(path, function)
+        self.solve_pending()
+
+        for path, function, fingerprint, summary, reused in self._analysed:
+            if reused:
+                self.store.saved(summary)
+            states = summary.renamed_states(fingerprint.original())
+            self.results.append(FunctionResult(
+                path, str(function.name.name), fingerprint.digest, summary.type,
+                states[-1] if states else None, reused, summary.errors
+            ))
+        self._analysed = []
+        self.seconds = time.perf_counter() - start
+
+    def analyse(self, path: str, function: ast.Function):
+        self.functions += 1
+        fingerprint = FunctionFingerprint(function)
+        sign = not self.vectorized
+        if self.dedup:
+            summary, reused = self.store.summary(function, fingerprint, sign)
+        else:
+            summary, reused = summarize(function, fingerprint.names, sign), False
+        if not reused and not sign:
+            self._pending.append((summary, function, fingerprint.names))
+        self._analysed.append((path, function, fingerprint, summary, reused))
+
+    def solve_pending(self):
+        """
+        모아 둔 함수의 CFG 를 BatchSignSolver 하나로 푼다. (함수마다 FixedPointSolver 대신)
+        시간은 CFG node 수에 비례해 나누어 요약의 seconds 에 더한다.
+        """
+        if not self._pending:
+            return
+        from ir.tip_cfg import GraphBuilder
+        from lattice.tip_vectorized import BatchSignSolver
+
+        start = time.perf_counter()
+        pending, self._pending = self._pending, []
+        solver = BatchSignSolver(
+            [GraphBuilder(ast.Program([function]), str(function.name.name)).graph for _, function, _ in pending],
+            [ast.as_list(function.parameters, []) for _, function, _ in pending]
+        )
+        for i, (summary, _, names) in enumerate(pending):
+            states = solver.states(i)
+            summary.nodes = len(states)
+            summary.states = sign_states(states, names)
+
+        share = (time.perf_counter() - start) / max(1, solver.nodes)
+        for summary, _, _ in pending:
+            summary.seconds += share * summary.nodes
+
+    @property
+    def unique(self) -> int:
+        return len({result.digest for result in self.results})
+
+    def report(self) -> dict:
+        store = self.store
+        return {
+            'functions': self.functions,
+            'unique': self.unique,
+            'analysed': store.misses if self.dedup else self.functions,
+            'reused': store.hits if self.dedup else 0,
+            'saved_nodes': store.saved_nodes,
+            'saved_constraints': store.saved_constraints,
+            'saved_ms': round(store.saved_seconds * 1000, 3),
+            'total_ms': round(self.seconds * 1000, 3),
+        }
+
+def text_lines(batch: BatchAnalysis):
+    current = None
+    for result in batch.results:
+        if result.file != current:
+            current = result.file
+            yield f"\n[{current}]\n"
+        state = 'ㅗ' if result.exit_state is None else \
+            '{' + ', '.join(f"{name}: {sign}" for name, sign in result.exit_state.items()) + '}'
+        reused = '  (reused)' if result.reused else ''
+        yield f"  {result.name:<16} {result.digest[:12]}  {result.type}  {state}{reused}\n"
+        for error in result.errors:
+            yield f"    [ERROR] {error}\n"
+    for path, error in batch.errors.items():
+        yield f"\n[{path}]\n  [ERROR] {error}\n"
+
+    r = batch.report()
+    share = r['reused'] / r['functions'] * 100 if r['functions'] else 0.0
+    yield "\n[dedup]\n"
+    yield f"  functions {r['functions']}, unique {r['unique']}, analysed {r['analysed']}, reused {r['reused']} ({share:.1f}%)\n"
+    yield (f"  skipped {r['saved_nodes']} CFG nodes, {r['saved_constraints']} constraints, "
+           f"{r['saved_ms']:.1f} ms of analysis (total {r['total_ms']:.1f} ms)\n")
+
+def main(argv=None):
+    from common.report import open_report
+
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('paths', nargs='+', help='분석할 TIP 파일')
+    parser.add_argument('--store', help='요약 store (JSON), 있으면 읽고 끝나면 쓴다.')
+    parser.add_argument('--no-dedup', action='store_true', help='store 를 쓰지 않고 모든 함수를 분석')
+    parser.add_argument('--vectorized', action='store_true', help='sign analysis 를 모아서 NumPy 로 한 번에 푼다.')
+    parser.add_argument('--json', action='store_true', help='report 를 JSON 으로')
+    parser.add_argument('-o', '--output', help='report 파일 (없으면 stdout)')
+    args = parser.parse_args(argv)
+
+    sys.setrecursionlimit(max(sys.getrecursionlimit(), 10000))
+    store = SummaryStore.load(args.store) if args.store and os.path.exists(args.store) else SummaryStore()
+    batch = BatchAnalysis(args.paths, store, not args.no_dedup, args.vectorized)
+
+    with open_report(args.output) as out:
+        if args.json:
+            json.dump({'functions': [asdict(r) for r in batch.results], 'errors': batch.errors,
+                       'dedup': batch.report()}, out, ensure_ascii=False, indent=2)
+            out.write('\n')
+        else:
+            out.writelines(text_lines(batch))
+
+    if args.store and not args.no_dedup:
+        store.save(args.store)
+    return 1 if batch.errors else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,280 @@
+"""
+TIP 프로그램 생성기 (규모 측정용)
+
+    python -m common.generator --functions 200 --statements 500 --seed 1 -o big.tip
+
+syntax/tip.lark 문법을 따르는 프로그램을 seed 에 따라 결정적으로 만든다.
+한 줄씩 만들어 바로 파일에 쓰므로 (generator) 수 MB 크기의 입력도 메모리에 모두 올리지 않는다.
+
+변수는 type 별로 나누어 선언하므로 생성된 프로그램은 type analysis 도 통과한다.
+- v0, v1, ...: int
+- p0, p1, ...: ↑int
+- r0, r1, ...: { a: int, b: int }
+- s0: ↑{ a: int, b: int }
+
+call graph 모양 (call_graph)
+- none: 호출 없음
+- chain: f0 -> f1 -> ... -> fn-1
+- tree: fi -> f2i+1, f2i+2
+- dag: fi -> fj (j > i) 중 임의로 선택
+- recursive: 자기 자신과 앞선 함수 호출 포함 (SCC 가 생긴다)
+"""
+import argparse
+import random
+import sys
+from dataclasses import dataclass, field
+from typing import Iterator, TextIO
+
+CALL_GRAPHS = ('none', 'chain', 'tree', 'dag', 'recursive')
+
+@dataclass
+class GeneratorConfig:
+    functions: int = 10
+    statements: int = 50
+    depth: int = 3
+    parameters: int = 2
+    variables: int = 8
+    loop_density: float = 0.05
+    branch_density: float = 0.1
+    pointer_density: float = 0.1
+    record_density: float = 0.05
+    call_density: float = 0.05
+    call_graph: str = 'dag'
+    seed: int = 0
+
+    def __post_init__(self):
+        if self.call_graph not in CALL_GRAPHS:
+            raise ValueError(f"call_graph 는 {', '.join(CALL_GRAPHS)} 중 하나: {self.call_graph}")
+
+@dataclass
+class ProgramGenerator:
+    """
+    lines() 는 프로그램을 한 줄씩 돌려준다.
+    함수 하나를 만드는 동안 필요한 상태는 현재 중첩 깊이 만큼의 stack 뿐이다.
+    """
+    config: GeneratorConfig = field(default_factory=GeneratorConfig)
+
+    rng: random.Random = field(init=False, default=None)
+    callees: list[list[int]] = field(init=False, default_factory=list)
+
+    def __post_init__(self):
+        self.rng = random.Random(self.config.seed)
+        self.callees = [self.call_targets(i) for i in range(self.config.functions)]
+
+    def call_targets(self, i: int) -> list[int]:
+        n = self.config.functions
+        shape = self.config.call_graph
+        if shape == 'chain':
+            return [i + 1] if i + 1 < n else []
+        elif shape == 'tree':
+            return [j for j in (2 * i + 1, 2 * i + 2) if j < n]
+        elif shape == 'dag':
+            later = range(i + 1, n)
+            return self.rng.sample(later, min(len(later), self.rng.randint(0, 3)))
+        elif shape == 'recursive':
+            return self.rng.sample(range(n), min(n, self.rng.randint(1, 3)))
+        return []
+
+    # names ==========
+    def ints(self):
+        return [f"v{i}" for i in range(self.config.variables)]
+
+    def pointers(self):
+        return [f"p{i}" for i in range(max(1, self.config.variables // 4))]
+
+    def records(self):
+        return [f"r{i}" for i in range(max(1, self.config.variables // 4))]
+
+    def chance(self, p: float) -> bool:
+        return self.rng.random() < p
+
+    # expressions ==========
+    def atom(self, names: list[str]) -> str:
+        c = self.config
+        r = self.rng.random()
+        if r < 0.3:
+            return str(self.rng.randint(0, 9))
+        elif r < 0.35:
+            return "input"
+        elif self.chance(c.pointer_density):
+            return f"(*{self.rng.choice(self.pointers())})"
+        elif self.chance(c.record_density):
+            return f"{self.rng.choice(self.records())}.{self.rng.choice('ab')}"
+        return self.rng.choice(names)
+
+    def expression(self, names: list[str], depth: int = 2) -> str:
+        if depth == 0 or self.chance(0.4):
+            return self.atom(names)
+
+        op = self.rng.choice('+-*/')
+        left = self.expression(names, depth - 1)
+        right = self.expression(names, depth - 1)
+        if self.chance(0.2):
+            return f"({left} {op} {right})"
+        return f"{left} {op} {right}"
+
+    def condition(self, names: list[str]) -> str:
+        op = self.rng.choice(('>', '=='))
+        return f"{self.expression(names, 1)} {op} {self.expression(names, 1)}"
+
+    def call(self, callee: int, names: list[str]) -> str:
+        arguments = ', '.join(self.expression(names, 1) for _ in range(self.config.parameters))
+        return f"f{callee}({arguments})"
+
+    # statements ==========
+    def simple_statement(self, function: int, names: list[str]) -> str:
+        c = self.config
+        rng = self.rng
+        callees = self.callees[function] if function >= 0 else [0] if c.functions else []
+
+        if callees and self.chance(c.call_density):
+            return f"{rng.choice(names)} = {self.call(rng.choice(callees), names)};"
+        if self.chance(c.pointer_density):
+            p = rng.choice(self.pointers())
+            r = rng.random()
+            if r < 0.3:
+                return f"{p} = &{rng.choice(names)};"
+            elif r < 0.5:
+                # 'alloc' 은 VAR 와도 맞으므로 alloc (E) 는 alloc 이라는 함수 호출로 parse 된다.
+                # 피연산자는 괄호가 필요 없는 정수 / 변수만 쓴다.
+                operand = str(rng.randint(0, 9)) if rng.random() < 0.5 else rng.choice(names)
+                return f"{p} = alloc {operand};"
+            elif r < 0.8:
+                return f"*{p} = {self.expression(names)};"
+            return f"{p} = {rng.choice(self.pointers())};"
+        if self.chance(c.record_density):
+            r = rng.random()
+            if r < 0.4:
+                return f"{rng.choice(self.records())}.{rng.choice('ab')} = {self.expression(names)};"
+            elif r < 0.7:
+                return f"(*s0).{rng.choice('ab')} = {self.expression(names)};"
+            return f"s0 = &{rng.choice(self.records())};"
+        if self.chance(0.1):
+            return f"output {self.expression(names)};"
+
+        return f"{rng.choice(names)} = {self.expression(names)};"
+
+    def block(self, function: int, names: list[str], budget: int, depth: int, indent: str) -> Iterator[str]:
+        """
+        budget 개의 문장 (중첩된 문장 포함) 을 만든다.
+        """
+        c = self.config
+        while budget > 0:
+            compound = depth < c.depth and budget > 2
+            if compound and self.chance(c.loop_density):
+                inner = self.rng.randint(1, min(budget - 1, 10))
+                yield f"{indent}while ({self.condition(names)}) {{\n"
+                yield from self.block(function, names, inner, depth + 1, indent + "  ")
+                yield f"{indent}}}\n"
+                budget -= inner + 1
+            elif compound and self.chance(c.branch_density):
+                inner = self.rng.randint(1, min(budget - 1, 10))
+                yield f"{indent}if ({self.condition(names)}) {{\n"
+                yield from self.block(function, names, inner, depth + 1, indent + "  ")
+                budget -= inner + 1
+                if budget > 1 and self.chance(0.5):
+                    other = self.rng.randint(1, min(budget - 1, 10))
+                    yield f"{indent}}} else {{\n"
+                    yield from self.block(function, names, other, depth + 1, indent + "  ")
+                    budget -= other
+                yield f"{indent}}}\n"
+            else:
+                yield f"{indent}{self.simple_statement(function, names)}\n"
+                budget -= 1
+
+    def function(self, index: int) -> Iterator[str]:
+        """
+        index < 0 이면 main
+        """
+        c = self.config
+        if index < 0:
+            name, parameters = "main", []
+        else:
+            name, parameters = f"f{index}", [f"a{i}" for i in range(c.parameters)]
+
+        ints = self.ints()
+        names = parameters + ints
+        yield f"{name}({', '.join(parameters)}) {{\n"
+        yield f"  var {', '.join(ints + self.pointers() + self.records() + ['s0'])};\n"
+
+        # 모든 변수를 type 에 맞게 초기화
+        for v in ints:
+            yield f"  {v} = {self.rng.randint(0, 9)};\n"
+        for p in self.pointers():
+            yield f"  {p} = &{self.rng.choice(ints)};\n"
+        for r in self.records():
+            yield f"  {r} = {{a: {self.rng.randint(0, 9)}, b: {self.rng.randint(0, 9)}}};\n"
+        yield f"  s0 = &{self.records()[0]};\n"
+
+        # call graph 의 모든 edge 가 한 번은 나타나도록
+        if index >= 0:
+            for callee in self.callees[index]:
+                yield f"  {self.rng.choice(ints)} = {self.call(callee, names)};\n"
+
+        yield from self.block(index, names, c.statements, 0, "  ")
+        yield f"  return {self.rng.choice(names)};\n"
+        yield "}\n"
+
+    def lines(self) -> Iterator[str]:
+        for i in range(self.config.functions):
+            yield from self.function(i)
+            yield "\n"
+        yield from self.function(-1)
+
+def generate(config: GeneratorConfig) -> str:
+    """
+    작은 프로그램용, 전체를 문자열로 만든다.
+    """
+    return ''.join(ProgramGenerator(config).lines())
+
+def write_program(config: GeneratorConfig, out: TextIO) -> int:
+    """
+    out 에 한 줄씩 쓰고 쓴 문자 수를 반환한다.
+    """
+    written = 0
+    for line in ProgramGenerator(config).lines():
+        written += out.write(line)
+    return written
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    defaults = GeneratorConfig()
+    parser.add_argument('--functions', type=int, default=defaults.functions)
+    parser.add_argument('--statements', type=int, default=defaults.statements, help='함수당 문장 수')
+    parser.add_argument('--depth', type=int, default=defaults.depth, help='최대 중첩 깊이')
+    parser.add_argument('--parameters', type=int, default=defaults.parameters)
+    parser.add_argument('--variables', type=int, default=defaults.variables)
+    parser.add_argument('--loop-density', type=float, default=defaults.loop_density)
+    parser.add_argument('--branch-density', type=float, default=defaults.branch_density)
+    parser.add_argument('--pointer-density', type=float, default=defaults.pointer_density)
+    parser.add_argument('--record-density', type=float, default=defaults.record_density)
+    parser.add_argument('--call-density', type=float, default=defaults.call_density)
+    parser.add_argument('--call-graph', choices=CALL_GRAPHS, default=defaults.call_graph)
+    parser.add_argument('--seed', type=int, default=defaults.seed)
+    parser.add_argument('-o', '--output', help='출력 파일 (없으면 stdout)')
+    args = parser.parse_args(argv)
+
+    config = GeneratorConfig(
+        functions=args.functions,
+        statements=args.statements,
+        depth=args.depth,
+        parameters=args.parameters,
+        variables=args.variables,
+        loop_density=args.loop_density,
+        branch_density=args.branch_density,
+        pointer_density=args.pointer_density,
+        record_density=args.record_density,
+        call_density=args.call_density,
+        call_graph=args.call_graph,
+        seed=args.seed,
+    )
+
+    if args.output is None:
+        write_program(config, sys.stdout)
+    else:
+        with open(args.output, 'w', encoding='utf-8', buffering=1 << 20) as out:
+            write_program(config, out)
+
+
+if __name__ == '__main__':
+    main()
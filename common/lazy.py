@@ -0,0 +1,20 @@
+"""
+package 의 하위 module 을 처음 사용할 때 import 한다. (시작 시간 단축)
+
+    # <package>/__init__.py
+    __all__ = ["tip_ast", ...]
+    __getattr__ = lazy_module(__name__, __all__)
+"""
+import importlib
+
+def lazy_module(package: str, names: list[str]):
+    """
+    package 의 module __getattr__ (names 에 있는 이름만 하위 module 로 import)
+    """
+    names = frozenset(names)
+
+    def __getattr__(name):
+        if name in names:
+            return importlib.import_module(f"{package}.{name}")
+        raise AttributeError(f"module {package!r} has no attribute {name!r}")
+    return __getattr__
@@ -0,0 +1,196 @@
+"""
+Phase profiler (opt-in)
+
+    profiler = Profiler(memory=True, cprofile=True)
+    with profiler.phase('unification', hooks=UNIFICATION_HOOKS):
+        UnificationSolver(...)
+    profiler.count('constraints', n)
+    profiler.report()           # 단계별 {wall, peak_memory, counters, runs}
+    profiler.dump_stats(path)   # cProfile / pstats
+
+단계마다 기록하는 것
+- wall: time.perf_counter 차이 (초)
+- peak_memory: tracemalloc 의 단계 내 최대 사용량 (byte, memory=True 일 때)
+- counters: count() 로 더한 값, hook 으로 센 hot path 호출 수
+같은 이름의 단계 (--function 마다, 파일마다) 는 report 에서 합친다. (wall, counter 는 합, 메모리와 maximum() 은 최대)
+
+hot path (find, union, transfer function) 에는 profiler 코드가 없다.
+hook 이 주어진 단계 동안에만 해당 method 를 세는 wrapper 로 바꿔 끼우고 끝나면 원래대로 되돌린다.
+profiler 를 쓰지 않으면 (TipAnalysis.profiler = None) 아무 것도 바뀌지 않으므로 추가 비용이 없다.
+"""
+import cProfile
+import io
+import pstats
+import time
+import tracemalloc
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+
+@dataclass
+class PhaseRecord:
+    name: str
+    wall: float = 0.0
+    peak_memory: int = None
+    counters: dict[str, int] = field(default_factory=dict)
+    maxima: set[str] = field(default_factory=set)  # maximum() 으로 기록한 counter
+    runs: int = 1
+
+    def merge(self, other: 'PhaseRecord'):
+        """
+        같은 이름의 단계를 한 번 더 실행한 기록을 더한다.
+        """
+        self.wall += other.wall
+        if other.peak_memory is not None:
+            self.peak_memory = max(self.peak_memory or 0, other.peak_memory)
+        for counter, value in other.counters.items():
+            if counter in other.maxima:
+                self.counters[counter] = max(self.counters.get(counter, value), value)
+            else:
+                self.counters[counter] = self.counters.get(counter, 0) + value
+        self.maxima |= other.maxima
+        self.runs += other.runs
+
+    def as_dict(self) -> dict:
+        return {
+            'wall': self.wall,
+            'peak_memory': self.peak_memory,
+            'counters': dict(self.counters),
+            'runs': self.runs,
+        }
+
+@dataclass
+class Hook:
+    """
+    owner.name 을 단계 동안 wrap(profiler, original) 이 만든 함수로 바꾼다.
+    """
+    owner: type
+    name: str
+    wrap: object
+
+def counting(counter: str):
+    """
+    호출 수를 세는 hook wrapper
+    """
+    def wrap(profiler, original):
+        def wrapper(*args, **kwargs):
+            profiler.count(counter)
+            return original(*args, **kwargs)
+        return wrapper
+    return wrap
+
+def counting_find(profiler, original):
+    """
+    UnionFind.find: 호출 수, 대표까지의 경로 길이 (합 / 최대)
+    """
+    def find(self, x):
+        # path compression 전에 길이를 센다.
+        parent = self.parent
+        y = x
+        length = 0
+        while parent[y] is not y:
+            y = parent[y]
+            length += 1
+        profiler.count('find_calls')
+        profiler.count('find_path_total', length)
+        profiler.maximum('find_path_max', length)
+        return original(self, x)
+    return find
+
+def counting_transfer(profiler, original):
+    """
+    Analysis.transfer_function: 만들어진 f_v 의 호출 수 (transfer_calls)
+    """
+    def transfer_function(self, node):
+        f = original(self, node)
+        def counted(x):
+            profiler.count('transfer_calls')
+            return f(x)
+        return counted
+    return transfer_function
+
+@dataclass
+class Profiler:
+    memory: bool = True
+    cprofile: bool = False
+
+    phases: list[PhaseRecord] = field(init=False, default_factory=list)
+    current: PhaseRecord = field(init=False, default=None)
+    stats: cProfile.Profile = field(init=False, default=None)
+
+    def __post_init__(self):
+        if self.cprofile:
+            self.stats = cProfile.Profile()
+
+    @contextmanager
+    def phase(self, name: str, hooks: list[Hook] = ()):
+        record = PhaseRecord(name)
+        previous, self.current = self.current, record
+        self.phases.append(record)
+
+        started_tracing = False
+        if self.memory:
+            if not tracemalloc.is_tracing():
+                tracemalloc.start()
+                started_tracing = True
+            tracemalloc.reset_peak()
+            base, _ = tracemalloc.get_traced_memory()
+
+        restore = []
+        for hook in hooks:
+            original = hook.owner.__dict__.get(hook.name)
+            restore.append((hook, original))
+            setattr(hook.owner, hook.name, hook.wrap(self, getattr(hook.owner, hook.name)))
+
+        if self.stats is not None:
+            self.stats.enable()
+        start = time.perf_counter()
+        try:
+            yield record
+        finally:
+            record.wall = time.perf_counter() - start
+            if self.stats is not None:
+                self.stats.disable()
+
+            for hook, original in reversed(restore):
+                if original is None:
+                    delattr(hook.owner, hook.name)
+                else:
+                    setattr(hook.owner, hook.name, original)
+
+            if self.memory:
+                _, peak = tracemalloc.get_traced_memory()
+                record.peak_memory = peak - base
+                if started_tracing:
+                    tracemalloc.stop()
+
+            self.current = previous
+
+    def count(self, counter: str, n: int = 1):
+        counters = self.current.counters
+        counters[counter] = counters.get(counter, 0) + n
+
+    def maximum(self, counter: str, value: int):
+        self.current.maxima.add(counter)
+        counters = self.current.counters
+        if value > counters.get(counter, value - 1):
+            counters[counter] = value
+
+    def report(self) -> dict:
+        merged = {}
+        for record in self.phases:
+            total = merged.get(record.name)
+            if total is None:
+                total = merged[record.name] = PhaseRecord(record.name)
+                total.runs = 0
+            total.merge(record)
+        return {name: record.as_dict() for name, record in merged.items()}
+
+    def dump_stats(self, path: str):
+        if self.stats is None:
+            raise ValueError("cprofile=True 로 만든 Profiler 만 pstats 를 저장할 수 있다.")
+        self.stats.dump_stats(path)
+
+    def format_stats(self, limit: int = 20, sort: str = 'cumulative') -> str:
+        out = io.StringIO()
+        pstats.Stats(self.stats, stream=out).sort_stats(sort).print_stats(limit)
+        return out.getvalue()
@@ -0,0 +1,307 @@
+"""
+분석 결과 report writer (text / JSON Lines / DOT)
+
+    with open_report('out.jsonl') as out:
+        writer = make_writer('jsonl', out, ReportFilter(functions={'main'}, final_only=True))
+        writer.cfg(entry, 'main')
+        writer.sign_analysis(entry, fixed_point, 'main')
+
+printer 의 print_* 는 한 줄마다 print 를 부른다. writer 는
+- 줄을 generator 로 만들어 buffer 가 큰 file 에 writelines 로 넘기고
+- filter 에 걸리는 부분 (다른 함수, 마지막이 아닌 state) 은 문자열로 만들지 않는다.
+CFG 순회는 재귀 대신 stack 을 쓴다. (깊은 CFG 에서 recursion limit 회피)
+
+format
+- text: printer 와 같은 출력, 단 state 의 변수는 이름 순서 (PersistentMap 의 순서는 삽입 순서가 아니다.)
+- jsonl: 한 줄에 record 하나 {"kind": "constraint" | "type" | "cfg_node" | "state" | "constant" | "call_graph" | "query", ...}
+- dot: CFG (함수마다 digraph 하나) 와 call graph 만, 나머지 section 은 쓰지 않는다. (sign 질의는 main.py 에서 거부)
+"""
+import json
+import sys
+from dataclasses import dataclass, field
+from typing import TextIO
+
+from ir import tip_cfg
+
+BUFFER_SIZE = 1 << 16
+FORMATS = ('text', 'jsonl', 'dot')
+
+def open_report(path: str = None) -> TextIO:
+    """
+    path 가 없거나 '-' 이면 stdout (같은 file descriptor 를 큰 buffer 로 다시 연다.)
+    """
+    if path is None or path == '-':
+        sys.stdout.flush()
+        return open(sys.stdout.fileno(), 'w', encoding='utf-8', buffering=BUFFER_SIZE, closefd=False)
+    return open(path, 'w', encoding='utf-8', buffering=BUFFER_SIZE)
+
+@dataclass
+class ReportFilter:
+    """
+    functions: 쓸 함수 이름 (None 이면 전부)
+    final_only: sign analysis 에서 exit node 의 state 만
+    """
+    functions: set[str] = None
+    final_only: bool = False
+
+    def includes(self, function: str) -> bool:
+        return self.functions is None or function in self.functions
+
+def node_label(node: tip_cfg._Node) -> str:
+    if isinstance(node, tip_cfg.BranchNode):
+        return f"{node.category.name}: {node.statement.condition}"
+    if isinstance(node, tip_cfg.NormalNode):
+        return str(node.statement)
+    return node.__class__.__name__
+
+def section(title: str, function: str) -> str:
+    # main 은 printer 와 같은 제목
+    return f"\n[{title}]\n" if function == 'main' else f"\n[{title}: {function}]\n"
+
+def state_items(state) -> list[tuple[str, str]]:
+    """
+    MapLattice -> [(변수, sign)], ㅗ 이면 None
+    """
+    if not hasattr(state, 'lattice'):
+        return None
+    return [(key, str(value.value)) for key, value in sorted(state.lattice.items())]
+
+@dataclass
+class ReportWriter:
+    out: TextIO
+    filter: ReportFilter = field(default_factory=ReportFilter)
+
+    def constraints(self, constraints):
+        self.out.writelines(self.constraint_lines(constraints))
+
+    def type_parent_relation(self, relation: dict):
+        self.out.writelines(self.type_lines(relation))
+
+    def cfg(self, entry: tip_cfg._Node, function: str = 'main'):
+        if self.filter.includes(function):
+            self.out.writelines(self.cfg_lines(entry, function))
+
+    def sign_analysis(self, entry: tip_cfg._Node, fixed_point: list, function: str = 'main'):
+        """
+        fixed_point[i] 는 IndexedGraph(entry) 의 i 번째 node 의 state
+        """
+        if not self.filter.includes(function):
+            return
+
+        if self.filter.final_only:
+            if entry is None:
+                raise ValueError("final_only 는 entry (exit node 위치) 가 필요하다.")
+            indices = tip_cfg.IndexedGraph(entry).exits()
+        else:
+            indices = range(1, len(fixed_point))
+        self.out.writelines(self.state_lines(fixed_point, indices, function))
+
+    def constant_propagation(self, solver, function: str = 'main'):
+        """
+        solver: SparseConditionalConstantSolver, constants[i] 는 IndexedGraph 의 i 번째 node 의 state (실행 불가능하면 None)
+        """
+        if self.filter.includes(function):
+            self.out.writelines(self.constant_lines(solver, function))
+
+    def call_graph(self, graph: dict[str, set[str]]):
+        self.out.writelines(self.call_graph_lines(graph))
+
+    def sign_queries(self, answers: list[tuple[str, str, object]], function: str = 'main'):
+        """
+        answers: TipAnalysis.query_sign 의 (output 문, 변수, sign 또는 None)
+        """
+        if self.filter.includes(function):
+            self.out.writelines(self.query_lines(answers, function))
+
+    def constraint_lines(self, constraints):
+        return ()
+
+    def constant_lines(self, solver, function: str):
+        return ()
+
+    def call_graph_lines(self, graph: dict[str, set[str]]):
+        return ()
+
+    def query_lines(self, answers, function: str):
+        return ()
+
+    def type_lines(self, relation: dict):
+        return ()
+
+    def cfg_lines(self, entry: tip_cfg._Node, function: str):
+        return ()
+
+    def state_lines(self, fixed_point: list, indices, function: str):
+        return ()
+
+class TextWriter(ReportWriter):
+    def constraint_lines(self, constraints):
+        yield '[constraints]\n'
+        for c in constraints:
+            yield f" - {c}\n"
+
+    def type_lines(self, relation: dict):
+        yield '\n[type parent relation]\n'
+        for k, v in relation.items():
+            yield f" - {k} → {v}\n"
+
+    def cfg_lines(self, entry: tip_cfg._Node, function: str):
+        """
+        DFS preorder (true 다음 false), 번호는 처음 언급될 때 붙인다. (printer.print_cfg 와 같은 출력)
+        """
+        yield section('Control Flow Graph', function)
+        ids = {}
+
+        def node_id(node):
+            if node is None:
+                return "None"
+            return ids.setdefault(id(node), len(ids))
+
+        visited = set()
+        stack = [entry]
+        while stack:
+            node = stack.pop()
+            if node is None or id(node) in visited:
+                continue
+            visited.add(id(node))
+
+            label = f"  [{node_id(node)}] {node_label(node)}\n"
+            if isinstance(node, tip_cfg.Entry):
+                yield label + f"       └→ successor: [{node_id(node.successor)}]\n"
+                stack.append(node.successor)
+            elif isinstance(node, tip_cfg.Exit):
+                yield label + f"       └← predecessors: {[node_id(p) for p in node.predecessors]}\n"
+            elif isinstance(node, tip_cfg.BranchNode):
+                true_id, false_id = node_id(node.true_successor), node_id(node.false_successor)
+                yield (label
+                       + f"       ├← predecessors: {[node_id(p) for p in node.predecessors]}\n"
+                       + f"       ├→ true_successor: [{true_id}]\n"
+                       + f"       └→ false_successor: [{false_id}]\n")
+                stack.append(node.false_successor)
+                stack.append(node.true_successor)
+            elif isinstance(node, tip_cfg.NormalNode):
+                successor_id = node_id(node.successor)
+                yield (label
+                       + f"       ├← predecessors: {[node_id(p) for p in node.predecessors]}\n"
+                       + f"       └→ successor: [{successor_id}]\n")
+                stack.append(node.successor)
+
+    def constant_lines(self, solver, function: str):
+        yield section('Constant Propagation', function)
+        for i, node in enumerate(solver.graph.nodes):
+            if i == 0:
+                continue
+            state = solver.constants[i]
+            if state is None:
+                yield f"  S{i} = dead    ({node_label(node)})\n"
+            else:
+                items = ', '.join(f"{key} = {value}" for key, value in state.items())
+                yield f"  S{i} = {{{items}}}    ({node_label(node)})\n"
+
+    def call_graph_lines(self, graph: dict[str, set[str]]):
+        for caller, callees in graph.items():
+            yield f"[call graph] {caller} -> {', '.join(sorted(callees))}\n"
+
+    def query_lines(self, answers, function: str):
+        for statement, name, sign in answers:
+            yield f"[{function}] {statement}  {name}: {'ㅗ' if sign is None else sign.value}\n"
+
+    def state_lines(self, fixed_point: list, indices, function: str):
+        yield section('Sign Analysis', function)
+        for i in indices:
+            items = state_items(fixed_point[i])
+            if items is None:
+                yield f"  S{i} = {fixed_point[i]}\n"
+            else:
+                yield f"  S{i} = {{{', '.join(f'{key} = {value}' for key, value in items)}}}\n"
+
+class JsonLinesWriter(ReportWriter):
+    """
+    cfg_node 와 state 의 node 번호는 IndexedGraph 의 index (0 = entry)
+    """
+    def record(self, record: dict) -> str:
+        return json.dumps(record, ensure_ascii=False) + '\n'
+
+    def constraint_lines(self, constraints):
+        for c in constraints:
+            yield self.record({'kind': 'constraint', 'text': str(c)})
+
+    def type_lines(self, relation: dict):
+        for k, v in relation.items():
+            yield self.record({'kind': 'type', 'term': str(k), 'parent': str(v)})
+
+    def cfg_lines(self, entry: tip_cfg._Node, function: str):
+        graph = tip_cfg.IndexedGraph(entry)
+        for i, node in enumerate(graph.nodes):
+            yield self.record({
+                'kind': 'cfg_node', 'function': function, 'node': i,
+                'type': node.__class__.__name__, 'label': node_label(node),
+                'successors': graph.successors[i], 'predecessors': graph.predecessors[i],
+            })
+
+    def constant_lines(self, solver, function: str):
+        for i, state in enumerate(solver.constants):
+            yield self.record({
+                'kind': 'constant', 'function': function, 'node': i,
+                'state': None if state is None else {key: str(value) for key, value in state.items()},
+            })
+
+    def call_graph_lines(self, graph: dict[str, set[str]]):
+        for caller, callees in graph.items():
+            yield self.record({'kind': 'call_graph', 'caller': caller, 'callees': sorted(callees)})
+
+    def query_lines(self, answers, function: str):
+        for statement, name, sign in answers:
+            yield self.record({
+                'kind': 'query', 'function': function, 'statement': statement, 'variable': name,
+                'sign': None if sign is None else str(sign.value),
+            })
+
+    def state_lines(self, fixed_point: list, indices, function: str):
+        for i in indices:
+            items = state_items(fixed_point[i])
+            yield self.record({
+                'kind': 'state', 'function': function, 'node': i,
+                'state': None if items is None else dict(items),
+            })
+
+def dot_string(value: str) -> str:
+    return '"' + value.replace('\\', '\\\\').replace('"', '\\"') + '"'
+
+class DotWriter(ReportWriter):
+    def cfg_lines(self, entry: tip_cfg._Node, function: str):
+        graph = tip_cfg.IndexedGraph(entry)
+        yield f"digraph {dot_string(function)} {{\n"
+        yield "  node [shape=box];\n"
+        for i, node in enumerate(graph.nodes):
+            shape = ' shape=diamond' if isinstance(node, tip_cfg.BranchNode) else ''
+            yield f"  n{i} [label={dot_string(node_label(node))}{shape}];\n"
+        for i, node in enumerate(graph.nodes):
+            if isinstance(node, tip_cfg.BranchNode):
+                true_successor, false_successor = graph.successors[i]
+                yield f"  n{i} -> n{true_successor} [label=\"true\"];\n"
+                yield f"  n{i} -> n{false_successor} [label=\"false\"];\n"
+            else:
+                for successor in graph.successors[i]:
+                    yield f"  n{i} -> n{successor};\n"
+        yield "}\n"
+
+    def call_graph_lines(self, graph: dict[str, set[str]]):
+        yield 'digraph "call graph" {\n'
+        for caller in graph:
+            yield f"  {dot_string(caller)};\n"
+        for caller, callees in graph.items():
+            for callee in sorted(callees):
+                yield f"  {dot_string(caller)} -> {dot_string(callee)};\n"
+        yield "}\n"
+
+WRITERS = {
+    'text': TextWriter,
+    'jsonl': JsonLinesWriter,
+    'dot': DotWriter,
+}
+
+def make_writer(format: str, out: TextIO, filter: ReportFilter = None) -> ReportWriter:
+    if format not in WRITERS:
+        raise ValueError(f"지원하지 않는 format: {format} ({', '.join(FORMATS)})")
+    return WRITERS[format](out, filter or ReportFilter())
@@ -0,0 +1,502 @@
+"""
+AST / CFG / 분석 결과의 binary 형식 (worker 간 전송, cache 저장용)
+
+    data = dumps(program=analyzer.ast, cfg=analyzer.cfg, fixed_point=analyzer.fixed_point)
+    snapshot = loads(data)
+    snapshot.function('main')   # 이 함수의 node 만 Python 객체로 만든다.
+    snapshot.cfg                # entry node
+
+pickle 은 node 마다 class 이름과 field 이름을 쓰고, CFG 의 predecessors 순환을 따라 재귀한다.
+여기서는 모든 node 를 번호 (index) 로 펼쳐서 정수 배열에 담는다.
+
+layout (little endian, 모든 section 은 4 byte 정렬)
+    header        magic 'TIPB', version, node / edge / string 수, root 4 개 (program, cfg, fixed_point, types)
+    node offsets  u32[nodes]      node i 의 field 가 edges 의 어디서 시작하는지
+    edges         u32[edges]      field 값: node index, string index, 길이, enum 번호
+    string offs   u32[strings+1]  string i = blob[offs[i]:offs[i+1]]
+    kinds         u8[nodes]       node i 의 종류 (KINDS 의 번호)
+    blob          utf-8
+
+- 목록은 [길이, 원소...], 없음 (None) 은 NONE
+- 같은 객체는 한 번만 기록한다. (CFG node 가 가리키는 statement 는 program 의 statement 와 같은 객체로 복원된다.)
+- loads 는 bytes 를 memoryview 로 감싸기만 한다. node 는 처음 접근할 때 만들고 재사용한다.
+"""
+import struct
+import sys
+from array import array
+from dataclasses import dataclass, field, fields
+
+from ir import tip_ast as ast
+from ir import tip_cfg as cfg
+
+MAGIC = b'TIPB'
+VERSION = 1
+NONE = 0xFFFFFFFF
+
+# magic, version, reserved, nodes, edges, strings, blob bytes, root: program, cfg, fixed_point, types
+HEADER = struct.Struct('<4sHHIIIIIIII')
+
+# AST node 의 field 종류 (dataclass field 순서)
+# - str: string table / node, node?: node index (없으면 NONE) / list, list?: [길이, node...]
+# - arith, cmp: operator enum 번호
+AST_SCHEMA = {
+    'Id': ('str',),
+    'Int': ('str',),
+    'Field': ('node', 'node'),
+    'Declaration': ('list',),
+    'Assignment': ('node', 'node'),
+    'Dereference': ('node',),
+    'DereferenceAssignment': ('node', 'node'),
+    'Return': ('node',),
+    'Function': ('node', 'list', 'list', 'node'),
+    'Program': ('list',),
+    'Arithmetic': ('node', 'arith', 'node'),
+    'Comparison': ('node', 'cmp', 'node'),
+    'If': ('node', 'list', 'list?'),
+    'While': ('node', 'list'),
+    'Output': ('node',),
+    'FunctionCall': ('node', 'list'),
+    'Parenthesize': ('node',),
+    'Input': (),
+    'Null': (),
+    'Reference': ('node',),
+    'Allocation': ('node',),
+    'Record': ('list',),
+    'FieldAccess': ('node', 'node'),
+    'FieldAssignment': ('node', 'node', 'node'),
+    'DereferenceFieldAssignment': ('node', 'node', 'node'),
+}
+
+# CFG: Entry [succ] / Exit [preds] / NormalNode [stmt, preds, succ] / BranchNode [stmt, category, preds, true, false]
+CFG_KINDS = ('Entry', 'Exit', 'NormalNode', 'BranchNode')
+
+# 분석 결과: Bottom [] / Signs [n, (변수, sign)...] / States [node...] / Types [n, (이름, type)...]
+RESULT_KINDS = ('Bottom', 'Signs', 'States', 'Types')
+
+# kind -> ((tag, field 이름), ...)
+AST_LAYOUT = {
+    kind: tuple(zip(tags, (f.name for f in fields(getattr(ast, kind)))))
+    for kind, tags in AST_SCHEMA.items()
+}
+
+KINDS = tuple(AST_SCHEMA) + CFG_KINDS + RESULT_KINDS
+KIND = {name: code for code, name in enumerate(KINDS)}
+
+ARITHMETIC = tuple(ast.ArithmeticOperator)
+COMPARISON = tuple(ast.ComparisonOperator)
+CATEGORY = tuple(cfg.BranchCategory)
+
+def sign_values():
+    from lattice.tip_lattice import SignLattice
+    return tuple(SignLattice)
+
+class SerializationError(ValueError):
+    pass
+
+@dataclass
+class Encoder:
+    """
+    객체 -> node index, encode_<Class> 가 edges 에 field 를 쓴다.
+    """
+    offsets: array = field(init=False, default_factory=lambda: array('I'))
+    edges: array = field(init=False, default_factory=lambda: array('I'))
+    kinds: bytearray = field(init=False, default_factory=bytearray)
+    strings: dict[str, int] = field(init=False, default_factory=dict)
+    memo: dict[int, int] = field(init=False, default_factory=dict)
+    keep: list = field(init=False, default_factory=list)  # id() 재사용 방지
+
+    def string(self, value) -> int:
+        value = str(value)
+        index = self.strings.get(value)
+        if index is None:
+            index = self.strings[value] = len(self.strings)
+        return index
+
+    def reserve(self, obj, kind: str) -> int:
+        index = len(self.kinds)
+        self.kinds.append(KIND[kind])
+        self.offsets.append(0)
+        self.memo[id(obj)] = index
+        self.keep.append(obj)
+        return index
+
+    def write(self, index: int, values: list[int]):
+        self.offsets[index] = len(self.edges)
+        self.edges.extend(values)
+
+    def optional(self, obj) -> int:
+        return NONE if obj is None else self.encode(obj)
+
+    def sequence(self, items) -> list[int]:
+        if items is None:
+            return [NONE]
+        indices = [self.encode(item) for item in items]
+        return [len(indices)] + indices
+
+    def encode(self, obj) -> int:
+        index = self.memo.get(id(obj))
+        if index is not None:
+            return index
+
+        kind = obj.__class__.__name__
+        if kind in AST_SCHEMA:
+            return self.encode_ast(obj, kind)
+        if isinstance(obj, cfg._Node):
+            return self.encode_graph(obj)
+        raise SerializationError(f"기록할 수 없는 객체: {kind}")
+
+    def encode_ast(self, node: ast._Ast, kind: str) -> int:
+        # 자식을 먼저 기록하면 edges 가 섞이므로 값을 모은 뒤 한 번에 쓴다.
+        index = self.reserve(node, kind)
+        values = []
+        for tag, name in AST_LAYOUT[kind]:
+            value = getattr(node, name)
+            if tag == 'str':
+                values.append(self.string(value))
+            elif tag == 'node':
+                values.append(self.optional(value))
+            elif tag in ('list', 'list?'):
+                values.extend(self.sequence(value))
+            elif tag == 'arith':
+                values.append(ARITHMETIC.index(value))
+            elif tag == 'cmp':
+                values.append(COMPARISON.index(value))
+        self.write(index, values)
+        return index
+
+    def encode_graph(self, entry: cfg._Node) -> int:
+        """
+        CFG 는 순환하므로 도달하는 node 에 먼저 번호를 붙이고 (succ, pred 모두 따라감) 그 다음 field 를 쓴다.
+        """
+        nodes = []
+        stack = [entry]
+        while stack:
+            node = stack.pop()
+            if node is None or id(node) in self.memo:
+                continue
+            self.reserve(node, node.__class__.__name__)
+            nodes.append(node)
+            stack.extend(cfg.successors(node))
+            stack.extend(getattr(node, 'predecessors', ()))
+
+        for node in nodes:
+            getattr(self, f"encode_{node.__class__.__name__}")(node)
+        return self.memo[id(entry)]
+
+    def encode_Entry(self, node: cfg.Entry):
+        self.write(self.memo[id(node)], [self.node_index(node.successor)])
+
+    def encode_Exit(self, node: cfg.Exit):
+        self.write(self.memo[id(node)], self.node_indices(node.predecessors))
+
+    def encode_NormalNode(self, node: cfg.NormalNode):
+        values = [self.encode(node.statement)] + self.node_indices(node.predecessors) + [self.node_index(node.successor)]
+        self.write(self.memo[id(node)], values)
+
+    def encode_BranchNode(self, node: cfg.BranchNode):
+        values = [self.encode(node.statement), CATEGORY.index(node.category)]
+        values += self.node_indices(node.predecessors)
+        values += [self.node_index(node.true_successor), self.node_index(node.false_successor)]
+        self.write(self.memo[id(node)], values)
+
+    def node_index(self, node) -> int:
+        return NONE if node is None else self.memo[id(node)]
+
+    def node_indices(self, nodes) -> list[int]:
+        return [len(nodes)] + [self.memo[id(n)] for n in nodes]
+
+    def encode_states(self, fixed_point: list) -> int:
+        """
+        fixed_point[i]: ㅗ 또는 MapLattice(변수 -> SignLattice), 같은 state 객체는 한 번만 기록
+        """
+        signs = sign_values()
+        values = [len(fixed_point)]
+        for state in fixed_point:
+            index = self.memo.get(id(state))
+            if index is None:
+                if hasattr(state, 'lattice'):
+                    index = self.reserve(state, 'Signs')
+                    items = sorted(state.lattice.items())
+                    row = [len(items)]
+                    for name, sign in items:
+                        row += [self.string(name), signs.index(sign)]
+                    self.write(index, row)
+                else:
+                    index = self.reserve(state, 'Bottom')
+                    self.write(index, [])
+            values.append(index)
+
+        index = self.reserve(fixed_point, 'States')
+        self.write(index, values)
+        return index
+
+    def encode_types(self, types: dict[str, str]) -> int:
+        index = self.reserve(types, 'Types')
+        values = [len(types)]
+        for name, value in types.items():
+            values += [self.string(name), self.string(value)]
+        self.write(index, values)
+        return index
+
+    def to_bytes(self, roots: list[int]) -> bytes:
+        blob = bytearray()
+        string_offsets = array('I', [0])
+        for value in self.strings:  # dict 는 삽입 순서 = index 순서
+            blob += value.encode('utf-8')
+            string_offsets.append(len(blob))
+
+        arrays = [self.offsets, self.edges, string_offsets]
+        if sys.byteorder == 'big':
+            arrays = [array('I', a) for a in arrays]
+            for a in arrays:
+                a.byteswap()
+
+        header = HEADER.pack(MAGIC, VERSION, 0, len(self.kinds), len(self.edges), len(self.strings), len(blob), *roots)
+        return b''.join([header] + [a.tobytes() for a in arrays] + [bytes(self.kinds), bytes(blob)])
+
+def dumps(program: ast.Program = None, cfg: cfg._Node = None, fixed_point: list = None,
+          types: dict[str, str] = None) -> bytes:
+    """
+    주어진 것만 기록한다. (program 과 cfg 를 함께 주면 statement 를 공유)
+    """
+    encoder = Encoder()
+    roots = [
+        NONE if program is None else encoder.encode(program),
+        NONE if cfg is None else encoder.encode(cfg),
+        NONE if fixed_point is None else encoder.encode_states(fixed_point),
+        NONE if types is None else encoder.encode_types(types),
+    ]
+    return encoder.to_bytes(roots)
+
+def u32_view(buffer: memoryview):
+    if sys.byteorder == 'big':
+        words = array('I', buffer)
+        words.byteswap()
+        return words
+    return buffer.cast('I')
+
+@dataclass
+class Snapshot:
+    """
+    dumps 결과를 읽는 쪽, node 는 node(i) 로 처음 접근할 때 만든다.
+    """
+    data: bytes
+
+    view: memoryview = field(init=False, default=None)
+    offsets: memoryview = field(init=False, default=None)
+    edges: memoryview = field(init=False, default=None)
+    string_offsets: memoryview = field(init=False, default=None)
+    kinds: memoryview = field(init=False, default=None)
+    blob: memoryview = field(init=False, default=None)
+    roots: tuple = field(init=False, default=None)
+    cache: list = field(init=False, default=None)
+    strings: dict[int, str] = field(init=False, default_factory=dict)
+
+    def __post_init__(self):
+        self.view = memoryview(self.data)
+        if len(self.view) < HEADER.size:
+            raise SerializationError("header 보다 짧다.")
+
+        magic, version, _, nodes, edges, strings, blob, *roots = HEADER.unpack_from(self.view)
+        if magic != MAGIC:
+            raise SerializationError(f"TIPB 형식이 아니다: {magic!r}")
+        if version != VERSION:
+            raise SerializationError(f"지원하지 않는 version: {version} (현재 {VERSION})")
+
+        sizes = [4 * nodes, 4 * edges, 4 * (strings + 1), nodes, blob]
+        if HEADER.size + sum(sizes) != len(self.view):
+            raise SerializationError("section 크기가 header 와 맞지 않는다.")
+
+        sections = []
+        position = HEADER.size
+        for size in sizes:
+            sections.append(self.view[position:position + size])
+            position += size
+
+        self.offsets, self.edges, self.string_offsets = (u32_view(s) for s in sections[:3])
+        self.kinds, self.blob = sections[3], sections[4]
+        self.roots = tuple(roots)
+        self.cache = [None] * nodes
+
+    def __len__(self):
+        return len(self.kinds)
+
+    def kind(self, index: int) -> str:
+        return KINDS[self.kinds[index]]
+
+    def string(self, index: int) -> str:
+        value = self.strings.get(index)
+        if value is None:
+            start, end = self.string_offsets[index], self.string_offsets[index + 1]
+            value = self.strings[index] = str(self.blob[start:end], 'utf-8')
+        return value
+
+    def sequence(self, position: int) -> tuple[list[int], int]:
+        """
+        edges[position] 부터의 [길이, index...] -> (index 목록, 다음 위치), 없음이면 None
+        """
+        length = self.edges[position]
+        if length == NONE:
+            return None, position + 1
+        return list(self.edges[position + 1:position + 1 + length]), position + 1 + length
+
+    def node(self, index: int):
+        if index == NONE:
+            return None
+
+        obj = self.cache[index]
+        if obj is None:
+            kind = self.kind(index)
+            if kind in AST_SCHEMA:
+                obj = self.cache[index] = self.load_ast(index, kind)
+            elif kind in CFG_KINDS:
+                self.load_graph(index)
+                obj = self.cache[index]
+            else:
+                raise SerializationError(f"node 가 아님: {kind}")
+        return obj
+
+    def load_ast(self, index: int, kind: str) -> ast._Ast:
+        position = self.offsets[index]
+        args = []
+        for tag in AST_SCHEMA[kind]:
+            if tag == 'str':
+                args.append(self.string(self.edges[position]))
+                position += 1
+            elif tag == 'node':
+                args.append(self.node(self.edges[position]))
+                position += 1
+            elif tag in ('list', 'list?'):
+                indices, position = self.sequence(position)
+                args.append(None if indices is None else [self.node(i) for i in indices])
+            elif tag == 'arith':
+                args.append(ARITHMETIC[self.edges[position]])
+                position += 1
+            elif tag == 'cmp':
+                args.append(COMPARISON[self.edges[position]])
+                position += 1
+        return getattr(ast, kind)(*args)
+
+    def load_graph(self, index: int):
+        """
+        index 에서 도달하는 CFG node 를 모두 빈 객체로 만든 뒤 연결한다. (순환 때문에 재귀하지 않는다.)
+        """
+        created = []
+        stack = [index]
+        while stack:
+            i = stack.pop()
+            if i == NONE or self.cache[i] is not None:
+                continue
+            kind = self.kind(i)
+            created.append((i, kind))
+            if kind == 'Entry':
+                self.cache[i] = cfg.Entry()
+            elif kind == 'Exit':
+                self.cache[i] = cfg.Exit()
+            elif kind == 'NormalNode':
+                self.cache[i] = cfg.NormalNode(None)
+            else:
+                self.cache[i] = cfg.BranchNode(None, None)
+            stack.extend(self.graph_neighbours(i, kind))
+
+        for i, kind in created:
+            getattr(self, f"load_{kind}")(self.cache[i], self.offsets[i])
+
+    def graph_neighbours(self, index: int, kind: str) -> list[int]:
+        position = self.offsets[index]
+        if kind == 'Entry':
+            return [self.edges[position]]
+        if kind == 'Exit':
+            return self.sequence(position)[0]
+        if kind == 'NormalNode':
+            predecessors, position = self.sequence(position + 1)
+            return predecessors + [self.edges[position]]
+        predecessors, position = self.sequence(position + 2)
+        return predecessors + [self.edges[position], self.edges[position + 1]]
+
+    def load_Entry(self, node: cfg.Entry, position: int):
+        node.successor = self.node(self.edges[position])
+
+    def load_Exit(self, node: cfg.Exit, position: int):
+        node.predecessors = [self.node(i) for i in self.sequence(position)[0]]
+
+    def load_NormalNode(self, node: cfg.NormalNode, position: int):
+        node.statement = self.node(self.edges[position])
+        predecessors, position = self.sequence(position + 1)
+        node.predecessors = [self.node(i) for i in predecessors]
+        node.successor = self.node(self.edges[position])
+
+    def load_BranchNode(self, node: cfg.BranchNode, position: int):
+        node.statement = self.node(self.edges[position])
+        node.category = CATEGORY[self.edges[position + 1]]
+        predecessors, position = self.sequence(position + 2)
+        node.predecessors = [self.node(i) for i in predecessors]
+        node.true_successor = self.node(self.edges[position])
+        node.false_successor = self.node(self.edges[position + 1])
+
+    @property
+    def program(self) -> ast.Program:
+        return self.node(self.roots[0])
+
+    @property
+    def cfg(self) -> cfg._Node:
+        return self.node(self.roots[1])
+
+    def function_names(self) -> list[str]:
+        """
+        Function / Id node 를 만들지 않고 이름만 읽는다.
+        """
+        indices, _ = self.sequence(self.offsets[self.roots[0]])
+        return [self.string(self.edges[self.offsets[self.edges[self.offsets[i]]]]) for i in indices]
+
+    def function(self, name: str) -> ast.Function:
+        indices, _ = self.sequence(self.offsets[self.roots[0]])
+        for i, function_name in zip(indices, self.function_names()):
+            if function_name == name:
+                return self.node(i)
+        raise KeyError(name)
+
+    @property
+    def fixed_point(self) -> list:
+        if self.roots[2] == NONE:
+            return None
+
+        from lattice.tip_lattice import Bottom, MapLattice
+        from lattice.tip_persistent import PersistentMap
+
+        signs = sign_values()
+        states = []
+        for i in self.sequence(self.offsets[self.roots[2]])[0]:
+            if self.cache[i] is None:
+                if self.kind(i) == 'Bottom':
+                    self.cache[i] = Bottom()
+                else:
+                    position = self.offsets[i]
+                    items = [
+                        (self.string(self.edges[p]), signs[self.edges[p + 1]])
+                        for p in range(position + 1, position + 1 + 2 * self.edges[position], 2)
+                    ]
+                    self.cache[i] = MapLattice(PersistentMap(items))
+            states.append(self.cache[i])
+        return states
+
+    @property
+    def types(self) -> dict[str, str]:
+        if self.roots[3] == NONE:
+            return None
+        position = self.offsets[self.roots[3]]
+        return {
+            self.string(self.edges[p]): self.string(self.edges[p + 1])
+            for p in range(position + 1, position + 1 + 2 * self.edges[position], 2)
+        }
+
+def loads(data: bytes) -> Snapshot:
+    return Snapshot(data)
+
+def dump(path: str, **parts):
+    with open(path, 'wb') as out:
+        out.write(dumps(**parts))
+
+def load(path: str) -> Snapshot:
+    with open(path, 'rb') as f:
+        return Snapshot(f.read())
@@ -0,0 +1,417 @@
+"""
+분석 daemon (editor 연동용)
+
+    python -m common.server --stdio
+    python -m common.server --socket /tmp/tip-analysis.sock
+    python -m common.server --socket /tmp/tip-analysis.sock --workers 4
+
+저장할 때마다 process 를 새로 띄우면 import 와 Lark parser 생성 비용을 매번 낸다.
+daemon 은 parser, transformer, 결과 cache 를 살려 둔 채로 요청을 처리한다.
+
+protocol: JSON-RPC 2.0, 한 줄에 message 하나 (newline delimited JSON)
+    -> {"jsonrpc": "2.0", "id": 1, "method": "analyse", "params": {"text": "...", "analyses": ["types", "sign"]}}
+    <- {"jsonrpc": "2.0", "id": 1, "result": {"functions": [...], "types": {...}, "sign": [...], "errors": [], "cached": false}}
+
+method
+- analyse(text, analyses=["types", "sign"]): 분석 결과, 실패한 단계는 errors 에 기록
+- ping: "pong"
+- stats: cache 크기 / hit / miss
+- shutdown: 요청 처리 후 종료
+
+front end
+- --stdio: stdin / stdout 으로 한 client
+- --socket: Unix socket, 요청을 하나씩 처리
+- --socket --workers N: asyncio 로 여러 client 를 동시에 받고, 분석 (CPU 작업) 은 process pool 에서 실행
+  worker process 도 각자 parser 를 한 번만 만든다.
+"""
+import asyncio
+import hashlib
+import json
+import os
+import socket
+import socketserver
+import stat
+import sys
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, field
+
+ANALYSES = ('types', 'sign')
+DEFAULT_SOCKET = '/tmp/tip-analysis.sock'
+
+# JSON-RPC error code
+PARSE_ERROR = -32700
+INVALID_REQUEST = -32600
+METHOD_NOT_FOUND = -32601
+INVALID_PARAMS = -32602
+
+class RpcError(Exception):
+    def __init__(self, code: int, message: str):
+        self.code = code
+        self.message = message
+        super().__init__(message)
+
+def analyse_text(text: str, analyses=ANALYSES) -> dict:
+    """
+    TipAnalysis 의 단계를 차례로 실행하고 JSON 으로 보낼 수 있는 결과를 만든다.
+    parser 는 main.load_parser 가 process 안에서 재사용한다.
+    """
+    from main import TipAnalysis
+
+    analyzer = TipAnalysis()
+    analyzer.program = text
+    result = {'functions': [], 'errors': []}
+
+    try:
+        analyzer.set_parser()
+        analyzer.parse_program()
+        analyzer.build_ast()
+    except Exception as e:
+        result['errors'].append(f"parse: {type(e).__name__}: {str(e).splitlines()[0] if str(e) else ''}")
+        return result
+
+    result['functions'] = [str(f.name.name) for f in analyzer.ast.functions]
+
+    if 'types' in analyses:
+        try:
+            analyzer.collect_constraints()
+            analyzer.solve_types()
+            result['types'] = {name: str(t) for name, t in analyzer.types.variables().items()}
+        except Exception as e:
+            result['errors'].append(f"types: {type(e).__name__}: {e}")
+
+    if 'sign' in analyses:
+        try:
+            analyzer.build_cfg()
+            if analyzer.cfg is not None:
+                analyzer.solve_sign()
+                result['sign'] = sign_states(analyzer.cfg, analyzer.fixed_point)
+        except Exception as e:
+            result['errors'].append(f"sign: {type(e).__name__}: {e}")
+
+    return result
+
+def sign_states(entry, fixed_point: list) -> list[dict]:
+    from ir.tip_cfg import IndexedGraph
+    from lattice.tip_lattice import MapLattice
+
+    graph = IndexedGraph(entry)
+    states = []
+    for node, state in zip(graph.nodes, fixed_point):
+        label = str(getattr(node, 'statement', node.__class__.__name__))
+        if isinstance(state, MapLattice):
+            values = {key: str(value.value) for key, value in sorted(state.lattice.items())}
+        else:
+            values = None
+        states.append({'node': label, 'state': values})
+    return states
+
+def cache_key(text: str, analyses) -> tuple:
+    return hashlib.sha1(text.encode('utf-8')).hexdigest(), tuple(sorted(analyses))
+
+def check_params(params) -> tuple[str, tuple]:
+    if not isinstance(params, dict) or not isinstance(params.get('text'), str):
+        raise RpcError(INVALID_PARAMS, "params.text (string) 가 필요하다.")
+    analyses = params.get('analyses', list(ANALYSES))
+    if not isinstance(analyses, list) or any(a not in ANALYSES for a in analyses):
+        raise RpcError(INVALID_PARAMS, f"params.analyses 는 {list(ANALYSES)} 의 부분집합이어야 한다.")
+    return params['text'], tuple(analyses)
+
+@dataclass
+class AnalysisService:
+    """
+    요청 처리와 결과 cache (LRU, 같은 text / analyses 조합)
+    - rpc_<method> 가 JSON-RPC method 를 처리한다.
+    """
+    cache_size: int = 128
+
+    cache: OrderedDict = field(init=False, default_factory=OrderedDict)
+    hits: int = field(init=False, default=0)
+    misses: int = field(init=False, default=0)
+    running: bool = field(init=False, default=True)
+
+    def warm(self):
+        from main import load_parser
+        from ir.tip_ast import get_transformer
+
+        load_parser()
+        get_transformer()
+
+    def cached(self, key):
+        result = self.cache.get(key)
+        if result is not None:
+            self.cache.move_to_end(key)
+            self.hits += 1
+        return result
+
+    def store(self, key, result):
+        self.misses += 1
+        self.cache[key] = result
+        if len(self.cache) > self.cache_size:
+            self.cache.popitem(last=False)
+
+    def handle_line(self, line: str) -> str:
+        """
+        요청 한 줄 -> 응답 한 줄 (notification 이면 None)
+        """
+        try:
+            request = json.loads(line)
+        except json.JSONDecodeError as e:
+            return encode(error_response(None, RpcError(PARSE_ERROR, str(e))))
+
+        response = self.handle(request)
+        return None if response is None else encode(response)
+
+    def handle(self, request) -> dict:
+        request_id = request.get('id') if isinstance(request, dict) else None
+        try:
+            method = self.method(request)
+            result = method(request.get('params', {}))
+        except RpcError as e:
+            return error_response(request_id, e)
+
+        if 'id' not in request:
+            return None
+        return {'jsonrpc': '2.0', 'id': request_id, 'result': result}
+
+    def method(self, request):
+        if not isinstance(request, dict) or not isinstance(request.get('method'), str):
+            raise RpcError(INVALID_REQUEST, "method 가 없는 요청")
+        method = getattr(self, f"rpc_{request['method']}", None)
+        if method is None:
+            raise RpcError(METHOD_NOT_FOUND, f"알 수 없는 method: {request['method']}")
+        return method
+
+    def rpc_analyse(self, params):
+        text, analyses = check_params(params)
+        key = cache_key(text, analyses)
+
+        result = self.cached(key)
+        if result is None:
+            result = analyse_text(text, analyses)
+            self.store(key, result)
+            return dict(result, cached=False)
+
+        return dict(result, cached=True)
+
+    def rpc_ping(self, params):
+        return "pong"
+
+    def rpc_stats(self, params):
+        return {'cached': len(self.cache), 'hits': self.hits, 'misses': self.misses, 'pid': os.getpid()}
+
+    def rpc_shutdown(self, params):
+        self.running = False
+        return None
+
+def encode(message: dict) -> str:
+    return json.dumps(message, ensure_ascii=False) + '\n'
+
+def error_response(request_id, error: RpcError) -> dict:
+    return {'jsonrpc': '2.0', 'id': request_id, 'error': {'code': error.code, 'message': error.message}}
+
+# front end: stdio / Unix socket ==========
+def serve_stdio(service: AnalysisService, reader=None, writer=None):
+    reader = reader or sys.stdin
+    writer = writer or sys.stdout
+
+    for line in reader:
+        if not line.strip():
+            continue
+        response = service.handle_line(line)
+        if response is not None:
+            writer.write(response)
+            writer.flush()
+        if not service.running:
+            break
+
+def serve_unix(service: AnalysisService, path: str = DEFAULT_SOCKET):
+    """
+    연결마다 요청을 한 줄씩 처리 (한 번에 한 연결)
+    """
+    class Handler(socketserver.StreamRequestHandler):
+        def handle(self):
+            for raw in self.rfile:
+                response = service.handle_line(raw.decode('utf-8'))
+                if response is not None:
+                    self.wfile.write(response.encode('utf-8'))
+                    self.wfile.flush()
+                if not service.running:
+                    break
+
+    remove_stale_socket(path)
+    with socketserver.UnixStreamServer(path, Handler) as server:
+        owned = socket_identity(path)
+        try:
+            while service.running:
+                server.handle_request()
+        finally:
+            remove_own_socket(path, owned)
+
+def remove_stale_socket(path: str):
+    """
+    이전 daemon 이 남긴 socket 만 지운다. socket 이 아닌 파일이면 지우지 않고 시작을 거부한다.
+    """
+    try:
+        st = os.lstat(path)
+    except FileNotFoundError:
+        return
+    if not stat.S_ISSOCK(st.st_mode):
+        raise FileExistsError(f"{path} exists and is not a socket; refusing to replace it")
+    os.unlink(path)
+
+def socket_identity(path: str) -> tuple[int, int]:
+    st = os.lstat(path)
+    return st.st_dev, st.st_ino
+
+def remove_own_socket(path: str, owned: tuple[int, int]):
+    """
+    종료 시 이 server 가 만든 inode 일 때만 지운다. (그 사이 다른 파일로 바뀌었으면 그대로 둔다.)
+    """
+    try:
+        st = os.lstat(path)
+    except FileNotFoundError:
+        return
+    if stat.S_ISSOCK(st.st_mode) and (st.st_dev, st.st_ino) == owned:
+        os.unlink(path)
+
+# front end: asyncio + process pool ==========
+def _warm_worker():
+    AnalysisService().warm()
+
+def _analyse_in_worker(text: str, analyses: tuple) -> dict:
+    return analyse_text(text, analyses)
+
+@dataclass
+class AsyncAnalysisServer:
+    """
+    asyncio 로 여러 client 를 받는다.
+    - cache / ping / stats 는 event loop 에서 바로 처리
+    - analyse 의 cache miss 는 process pool 에서 실행 (GIL 을 피해 여러 요청을 동시에 분석)
+    """
+    path: str = DEFAULT_SOCKET
+    workers: int = 2
+    service: AnalysisService = field(default_factory=AnalysisService)
+
+    pool: ProcessPoolExecutor = field(init=False, default=None)
+    server: asyncio.AbstractServer = field(init=False, default=None)
+    stopped: asyncio.Event = field(init=False, default=None)
+    pending: dict = field(init=False, default_factory=dict)
+
+    async def serve(self):
+        remove_stale_socket(self.path)
+        self.stopped = asyncio.Event()
+        self.pool = ProcessPoolExecutor(max_workers=self.workers, initializer=_warm_worker)
+        # worker 를 미리 띄워 첫 요청이 parser 생성 비용을 내지 않도록 한다.
+        loop = asyncio.get_running_loop()
+        await asyncio.gather(*(loop.run_in_executor(self.pool, os.getpid) for _ in range(self.workers)))
+        self.server = await asyncio.start_unix_server(self.client, path=self.path)
+        owned = socket_identity(self.path)
+        try:
+            await self.stopped.wait()
+        finally:
+            self.server.close()
+            await self.server.wait_closed()
+            self.pool.shutdown(cancel_futures=True)
+            remove_own_socket(self.path, owned)
+
+    async def client(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        try:
+            while not self.stopped.is_set():
+                line = await reader.readline()
+                if not line:
+                    break
+                response = await self.handle_line(line.decode('utf-8'))
+                if response is not None:
+                    writer.write(response.encode('utf-8'))
+                    await writer.drain()
+        finally:
+            writer.close()
+
+    async def handle_line(self, line: str):
+        try:
+            request = json.loads(line)
+        except json.JSONDecodeError as e:
+            return encode(error_response(None, RpcError(PARSE_ERROR, str(e))))
+
+        if isinstance(request, dict) and request.get('method') == 'analyse':
+            response = await self.analyse(request)
+        else:
+            response = self.service.handle(request)
+            if not self.service.running:
+                self.stopped.set()
+
+        return None if response is None else encode(response)
+
+    async def analyse(self, request: dict):
+        request_id = request.get('id')
+        try:
+            text, analyses = check_params(request.get('params'))
+        except RpcError as e:
+            return error_response(request_id, e)
+
+        key = cache_key(text, analyses)
+        result = self.service.cached(key)
+        cached = result is not None
+        if not cached:
+            # 같은 text 를 동시에 요청하면 하나의 분석 결과를 기다린다.
+            future = self.pending.get(key)
+            if future is None:
+                loop = asyncio.get_running_loop()
+                future = loop.run_in_executor(self.pool, _analyse_in_worker, text, analyses)
+                self.pending[key] = future
+                try:
+                    result = await future
+                    self.service.store(key, result)
+                finally:
+                    del self.pending[key]
+            else:
+                result = await future
+
+        if 'id' not in request:
+            return None
+        return {'jsonrpc': '2.0', 'id': request_id, 'result': dict(result, cached=cached)}
+
+# client ==========
+def call(method: str, params: dict = None, path: str = DEFAULT_SOCKET, request_id: int = 1):
+    """
+    Unix socket daemon 에 요청 하나를 보내고 응답을 받는다.
+    """
+    request = {'jsonrpc': '2.0', 'id': request_id, 'method': method, 'params': params or {}}
+    with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as sock:
+        sock.connect(path)
+        with sock.makefile('rwb') as stream:
+            stream.write(encode(request).encode('utf-8'))
+            stream.flush()
+            return json.loads(stream.readline())
+
+def main(argv=None):
+    import argparse
+
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    mode = parser.add_mutually_exclusive_group(required=True)
+    mode.add_argument('--stdio', action='store_true', help='stdin / stdout JSON-RPC')
+    mode.add_argument('--socket', nargs='?', const=DEFAULT_SOCKET, help='Unix socket 경로')
+    parser.add_argument('--workers', type=int, default=0, help='asyncio front end 의 process pool 크기 (0 이면 단일 process)')
+    parser.add_argument('--cache-size', type=int, default=128)
+    args = parser.parse_args(argv)
+
+    sys.setrecursionlimit(max(sys.getrecursionlimit(), 10000))
+    service = AnalysisService(args.cache_size)
+
+    if args.stdio:
+        service.warm()
+        serve_stdio(service)
+        return
+    try:
+        if args.workers > 0:
+            asyncio.run(AsyncAnalysisServer(args.socket, args.workers, service).serve())
+        else:
+            service.warm()
+            serve_unix(service, args.socket)
+    except FileExistsError as e:
+        parser.error(str(e))
+
+
+if __name__ == '__main__':
+    main()
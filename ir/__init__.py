@@ -1,3 +1,5 @@
-from . import tip_ast, tip_cfg
+from common.lazy import lazy_module
 
-__all__ = ["tip_ast", "tip_cfg"]
\ No newline at end of file
+__all__ = ["tip_ast", "tip_bytecode", "tip_cfg", "tip_fingerprint", "tip_incremental", "tip_interpreter", "tip_normalize", "tip_source"]
+
+__getattr__ = lazy_module(__name__, __all__)
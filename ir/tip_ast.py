@@ -2,9 +2,10 @@
 https://lark-parser.readthedocs.io/en/latest/examples/advanced/create_ast.html#
 """
 import sys
-from typing import List
+from typing import Iterator, List
 from dataclasses import dataclass
 from enum import Enum
+from functools import lru_cache
 from lark import ast_utils, Transformer
 
 this_module = sys.modules[__name__]
@@ -513,6 +514,37 @@ class DereferenceFieldAssignment(_Statement):
     def __hash__(self):
         return hash((self.target, self.key, self.expression))
 
+def as_list(items, default=None):
+    """
+    `?stmts`, `?ids`, `?exprs` 는 원소가 하나이면 list 대신 원소 자체로, 없으면 None 으로 inline 된다.
+    AST 에서는 항상 list 로 다루도록 맞춘다.
+    """
+    if items is None:
+        return default
+    if isinstance(items, list):
+        return items
+    return [items]
+
+def children(node) -> list:
+    """
+    node 바로 아래의 AST node 와 list (field 순서)
+    """
+    return [value for value in vars(node).values() if isinstance(value, (_Ast, list))]
+
+def walk(node) -> Iterator[_Ast]:
+    """
+    node (AST node 또는 list) 아래의 모든 AST node, preorder
+    재귀 대신 stack 으로 (깊게 중첩된 식에서도 recursion limit 에 걸리지 않는다.)
+    """
+    stack = [node]
+    while stack:
+        node = stack.pop()
+        if isinstance(node, list):
+            stack.extend(reversed(node))
+        elif isinstance(node, _Ast):
+            yield node
+            stack.extend(reversed(children(node)))
+
 class ToAst(Transformer):
     def ids(self, items):
         return items
@@ -527,7 +559,7 @@ class ToAst(Transformer):
         return Program(items)
 
     def func(self, items):
-        return Function(items[0], items[1], items[2], items[3])
+        return Function(items[0], as_list(items[1], []), as_list(items[2], []), items[3])
 
     def stmt_return(self, items):
         return Return(items[0])
@@ -557,7 +589,7 @@ class ToAst(Transformer):
         return Arithmetic(items[0], ArithmeticOperator.DIV, items[1])
 
     def stmt_if(self, items):
-        return If(items[0], items[1], items[2])
+        return If(items[0], as_list(items[1], []), as_list(items[2]))
 
     def cmp_gt(self, items):
         return Comparison(items[0], ComparisonOperator.GT, items[1])
@@ -566,13 +598,13 @@ class ToAst(Transformer):
         return Comparison(items[0], ComparisonOperator.EQ, items[1])
 
     def stmt_while(self, items):
-        return While(items[0], items[1])
+        return While(items[0], as_list(items[1], []))
 
     def stmt_output(self, items):
         return Output(items[0])
 
     def factor_call(self, items):
-        return FunctionCall(items[0], items[1])
+        return FunctionCall(items[0], as_list(items[1], []))
 
     def prim_paren(self, items):
         # spa p23 - "parenthesized expression are not present in the abstract syntax"
@@ -609,7 +641,9 @@ class ToAst(Transformer):
     def prim_null(self, items):
         return Null()
 
+@lru_cache(maxsize=None)
 def get_transformer():
+    # transformer 는 상태가 없으므로 process 안에서 하나를 재사용한다.
     return ast_utils.create_transformer(this_module, ToAst())
 
 def get_ast(cst):
@@ -0,0 +1,444 @@
+"""
+TIP -> register bytecode
+
+함수 하나 = CompiledFunction (register 수, instruction list)
+    instruction 은 (op, a, b, c) tuple 하나, a 가 결과 register
+    register 0 ... n-1 은 parameter 와 지역 변수, 그 뒤는 식을 계산하는 임시 register
+
+    f(x) {
+      var y;
+      y = x + 1;
+      while (y > 0) { y = y - 1; }
+      return y;
+    }
+
+    f: arity=1 registers=3 (x, y)
+         0  ADDK     1 0 1
+         1  JUMP     3
+         2  ADDK     1 1 -1
+         3  LOADK    2 0
+         4  JUMPGT   1 2 2
+         5  RET      1
+
+변수
+- 주소를 쓰는 변수 (&X 가 함수 안에 있는 X) 는 register 에 Cell 을 두고 LOAD / STORE 로 읽고 쓴다.
+  &X 는 그 Cell 자체이다. (alloc 으로 만든 pointer 와 같은 표현)
+- 나머지 변수는 register 를 바로 읽고 쓴다.
+
+값
+- int, null (None), pointer (Cell), record (dict, field 쓰기는 복사 후 수정 -> 값 의미), 함수 (CompiledFunction)
+
+식을 계산할 때 결과 register 를 받을 수 있으면 (X = E 의 X) 그 register 에 바로 쓴다.
+조건은 비교 연산과 분기를 합친 JUMPGT / JUMPEQ (와 부정) 로, while 은 조건을 loop 아래에 두어 반복마다 분기 하나만 실행한다.
+"""
+from dataclasses import dataclass, field
+from typing import Iterator
+
+from ir import tip_ast as ast
+
+# opcode ==========
+(MOVE, LOADK, ADD, SUB, MUL, DIV, ADDK, GT, EQ,
+ JUMP, JUMPT, JUMPF, JUMPGT, JUMPNGT, JUMPEQ, JUMPNEQ,
+ INPUT, OUTPUT, ALLOC, LOAD, STORE, RECORD, FIELD, SETFIELD,
+ CALL, CALLF, RET) = range(27)
+
+OPCODE_NAMES = [
+    'MOVE', 'LOADK', 'ADD', 'SUB', 'MUL', 'DIV', 'ADDK', 'GT', 'EQ',
+    'JUMP', 'JUMPT', 'JUMPF', 'JUMPGT', 'JUMPNGT', 'JUMPEQ', 'JUMPNEQ',
+    'INPUT', 'OUTPUT', 'ALLOC', 'LOAD', 'STORE', 'RECORD', 'FIELD', 'SETFIELD',
+    'CALL', 'CALLF', 'RET',
+]
+
+ARITHMETIC = {
+    ast.ArithmeticOperator.ADD: ADD,
+    ast.ArithmeticOperator.SUB: SUB,
+    ast.ArithmeticOperator.MUL: MUL,
+    ast.ArithmeticOperator.DIV: DIV,
+}
+COMPARISON = {
+    ast.ComparisonOperator.GT: GT,
+    ast.ComparisonOperator.EQ: EQ,
+}
+# 비교 연산 -> (참이면 분기, 거짓이면 분기)
+BRANCH = {
+    ast.ComparisonOperator.GT: (JUMPGT, JUMPNGT),
+    ast.ComparisonOperator.EQ: (JUMPEQ, JUMPNEQ),
+}
+
+class CompileError(ValueError):
+    pass
+
+@dataclass(eq=False)
+class CompiledFunction:
+    """
+    - code[i] = (op, a, b, c)
+    - statements[i]: code[i] 를 만든 statement (실행 오류 message 용)
+    - names[i]: i 번째 register 의 변수 이름 (임시 register 는 없음)
+    함수 값은 이 객체 자체이므로 == 는 identity 비교
+    """
+    name: str
+    arity: int
+    registers: int = 0
+    code: list[tuple] = field(default_factory=list)
+    statements: list[ast._Statement] = field(default_factory=list)
+    names: list[str] = field(default_factory=list)
+
+    def __repr__(self):
+        return self.name
+
+@dataclass
+class CompiledProgram:
+    functions: dict[str, CompiledFunction]
+
+    def __getitem__(self, name: str) -> CompiledFunction:
+        return self.functions[name]
+
+    def instructions(self) -> int:
+        return sum(len(f.code) for f in self.functions.values())
+
+def declared_variables(statements: list[ast._Statement]) -> Iterator[ast.Id]:
+    # 재귀 대신 stack 으로 (깊게 중첩된 문장에서 recursion limit 회피)
+    stack = list(reversed(ast.as_list(statements, [])))
+    while stack:
+        stmt = stack.pop()
+        if isinstance(stmt, ast.Declaration):
+            yield from stmt.ids
+        elif isinstance(stmt, ast.If):
+            stack.extend(reversed(ast.as_list(stmt.false_statements, [])))
+            stack.extend(reversed(ast.as_list(stmt.true_statements, [])))
+        elif isinstance(stmt, ast.While):
+            stack.extend(reversed(ast.as_list(stmt.statements, [])))
+
+def referenced_variables(node: ast._Ast) -> set[str]:
+    """
+    &X 의 X
+    """
+    return {str(n.id.name) for n in ast.walk(node) if isinstance(n, ast.Reference)}
+
+@dataclass
+class FunctionCompiler:
+    """
+    function 의 code 를 target (이미 만들어 둔 CompiledFunction) 에 채운다.
+    functions: 모든 함수 (함수 이름을 값으로 쓰거나 직접 호출할 때)
+    """
+    function: ast.Function
+    target: CompiledFunction
+    functions: dict[str, CompiledFunction]
+
+    registers: dict[str, int] = field(init=False, default_factory=dict)
+    boxed: set[str] = field(init=False, default_factory=set)
+    locals: int = field(init=False, default=0)
+    temp: int = field(init=False, default=0)
+    statement: ast._Statement = field(init=False, default=None)
+
+    def __post_init__(self):
+        parameters = ast.as_list(self.function.parameters, [])
+        for id in [*parameters, *declared_variables(self.function.statements)]:
+            self.registers.setdefault(str(id.name), len(self.registers))
+        self.locals = self.temp = self.target.registers = len(self.registers)
+        self.target.names = list(self.registers)
+        self.boxed = referenced_variables(self.function) & set(self.registers)
+
+        # 주소를 쓰는 변수는 처음부터 Cell 에 둔다. (parameter 는 받은 값, 지역 변수는 null 로 시작)
+        self.statement = self.function
+        for name in sorted(self.boxed, key=self.registers.get):
+            register = self.registers[name]
+            self.emit(ALLOC, register, register)
+
+        for stmt in ast.as_list(self.function.statements, []):
+            self.visit(stmt)
+        self.visit(self.function.return_statement)
+
+    # code ==========
+    def emit(self, op: int, a=None, b=None, c=None) -> int:
+        self.target.code.append((op, a, b, c))
+        self.target.statements.append(self.statement)
+        return len(self.target.code) - 1
+
+    def patch(self, index: int, target: int):
+        op, a, b, c = self.target.code[index]
+        if op == JUMP:
+            self.target.code[index] = (op, target, b, c)
+        elif op in (JUMPT, JUMPF):
+            self.target.code[index] = (op, a, target, c)
+        else:
+            self.target.code[index] = (op, a, b, target)
+
+    def here(self) -> int:
+        return len(self.target.code)
+
+    def allocate(self) -> int:
+        register = self.temp
+        self.temp += 1
+        if self.temp > self.target.registers:
+            self.target.registers = self.temp
+        return register
+
+    def variable(self, id: ast.Id) -> int:
+        name = str(id.name)
+        if name not in self.registers:
+            raise CompileError(f"{self.target.name}: 선언되지 않은 변수 {name}")
+        return self.registers[name]
+
+    # statement ==========
+    def visit(self, stmt: ast._Statement):
+        method = getattr(self, f'visit_{stmt.__class__.__name__}', None)
+        if method is None:
+            raise CompileError(f"{self.target.name}: 지원하지 않는 문장 {stmt}")
+
+        outer = self.statement
+        self.statement = stmt
+        method(stmt)
+        # 문장이 끝나면 임시 register 를 모두 돌려받는다.
+        self.temp = self.locals
+        self.statement = outer
+
+    def visit_block(self, statements):
+        for stmt in ast.as_list(statements, []):
+            self.visit(stmt)
+
+    def visit_Declaration(self, node: ast.Declaration):
+        pass
+
+    def visit_Assignment(self, node: ast.Assignment):
+        register = self.variable(node.id)
+        if str(node.id.name) in self.boxed:
+            self.emit(STORE, register, self.expression(node.expression))
+        else:
+            self.expression(node.expression, register)
+
+    def visit_Output(self, node: ast.Output):
+        self.emit(OUTPUT, self.expression(node.expression))
+
+    def visit_Return(self, node: ast.Return):
+        self.emit(RET, self.expression(node.expression))
+
+    def visit_If(self, node: ast.If):
+        to_else = self.branch(node.condition, False)
+        self.visit_block(node.true_statements)
+        if node.false_statements:
+            to_end = self.emit(JUMP)
+            self.patch(to_else, self.here())
+            self.visit_block(node.false_statements)
+            self.patch(to_end, self.here())
+        else:
+            self.patch(to_else, self.here())
+
+    def visit_While(self, node: ast.While):
+        """
+            JUMP cond
+        body:
+            ...
+        cond:
+            if E goto body
+        """
+        to_condition = self.emit(JUMP)
+        body = self.here()
+        self.visit_block(node.statements)
+        self.patch(to_condition, self.here())
+        self.patch(self.branch(node.condition, True), body)
+
+    def visit_DereferenceAssignment(self, node: ast.DereferenceAssignment):
+        pointer = self.expression(node.target.expression)
+        self.emit(STORE, pointer, self.expression(node.expression))
+
+    def visit_FieldAssignment(self, node: ast.FieldAssignment):
+        register = self.variable(node.id)
+        value = self.expression(node.expression)
+        if str(node.id.name) in self.boxed:
+            record = self.allocate()
+            self.emit(LOAD, record, register)
+            self.emit(SETFIELD, record, str(node.key.name), value)
+            self.emit(STORE, register, record)
+        else:
+            self.emit(SETFIELD, register, str(node.key.name), value)
+
+    def visit_DereferenceFieldAssignment(self, node: ast.DereferenceFieldAssignment):
+        pointer = self.expression(node.target.expression)
+        value = self.expression(node.expression)
+        record = self.allocate()
+        self.emit(LOAD, record, pointer)
+        self.emit(SETFIELD, record, str(node.key.name), value)
+        self.emit(STORE, pointer, record)
+
+    def branch(self, condition: ast._Expression, when: bool) -> int:
+        """
+        condition 이 when 이면 분기하는 instruction (분기 위치는 나중에 patch)
+        """
+        while isinstance(condition, ast.Parenthesize):
+            condition = condition.expression
+        if isinstance(condition, ast.Comparison):
+            left = self.expression(condition.left_expression)
+            right = self.expression(condition.right_expression)
+            jump_true, jump_false = BRANCH[condition.operator]
+            return self.emit(jump_true if when else jump_false, left, right)
+        return self.emit(JUMPT if when else JUMPF, self.expression(condition))
+
+    # expression ==========
+    def expression(self, node: ast._Expression, dest: int = None) -> int:
+        """
+        node 의 값을 담은 register, dest 가 주어지면 항상 dest
+        - 임시 register 를 쓰는 하위 식은 dest 에 쓰기 전에 모두 계산되므로 dest 가 하위 식의 변수여도 된다.
+        """
+        method = getattr(self, f'expression_{node.__class__.__name__}', None)
+        if method is None:
+            raise CompileError(f"{self.target.name}: 지원하지 않는 식 {node}")
+        return method(node, dest)
+
+    def result(self, dest: int) -> int:
+        return self.allocate() if dest is None else dest
+
+    def expression_Int(self, node: ast.Int, dest: int) -> int:
+        dest = self.result(dest)
+        self.emit(LOADK, dest, int(node.value))
+        return dest
+
+    def expression_Id(self, node: ast.Id, dest: int) -> int:
+        name = str(node.name)
+        if name not in self.registers:
+            if name not in self.functions:
+                raise CompileError(f"{self.target.name}: 선언되지 않은 변수 {name}")
+            dest = self.result(dest)
+            self.emit(LOADK, dest, self.functions[name])
+            return dest
+
+        register = self.registers[name]
+        if name in self.boxed:
+            dest = self.result(dest)
+            self.emit(LOAD, dest, register)
+            return dest
+        if dest is not None and dest != register:
+            self.emit(MOVE, dest, register)
+            return dest
+        return register
+
+    def expression_Parenthesize(self, node: ast.Parenthesize, dest: int) -> int:
+        return self.expression(node.expression, dest)
+
+    def expression_Input(self, node: ast.Input, dest: int) -> int:
+        dest = self.result(dest)
+        self.emit(INPUT, dest)
+        return dest
+
+    def expression_Null(self, node: ast.Null, dest: int) -> int:
+        dest = self.result(dest)
+        self.emit(LOADK, dest, None)
+        return dest
+
+    def expression_Arithmetic(self, node: ast.Arithmetic, dest: int) -> int:
+        left = self.expression(node.left_expression)
+        right = node.right_expression
+        while isinstance(right, ast.Parenthesize):
+            right = right.expression
+        op = node.operator
+
+        # E + k, E - k 는 상수를 instruction 에 넣는다.
+        if isinstance(right, ast.Int) and op in (ast.ArithmeticOperator.ADD, ast.ArithmeticOperator.SUB):
+            k = int(right.value)
+            dest = self.result(dest)
+            self.emit(ADDK, dest, left, k if op is ast.ArithmeticOperator.ADD else -k)
+            return dest
+
+        right = self.expression(right)
+        dest = self.result(dest)
+        self.emit(ARITHMETIC[op], dest, left, right)
+        return dest
+
+    def expression_Comparison(self, node: ast.Comparison, dest: int) -> int:
+        left = self.expression(node.left_expression)
+        right = self.expression(node.right_expression)
+        dest = self.result(dest)
+        self.emit(COMPARISON[node.operator], dest, left, right)
+        return dest
+
+    def expression_Allocation(self, node: ast.Allocation, dest: int) -> int:
+        value = self.expression(node.expression)
+        dest = self.result(dest)
+        self.emit(ALLOC, dest, value)
+        return dest
+
+    def expression_Reference(self, node: ast.Reference, dest: int) -> int:
+        # &X: X 의 Cell
+        register = self.variable(node.id)
+        if dest is not None and dest != register:
+            self.emit(MOVE, dest, register)
+            return dest
+        return register
+
+    def expression_Dereference(self, node: ast.Dereference, dest: int) -> int:
+        pointer = self.expression(node.expression)
+        dest = self.result(dest)
+        self.emit(LOAD, dest, pointer)
+        return dest
+
+    def expression_Record(self, node: ast.Record, dest: int) -> int:
+        fields = ast.as_list(node.fields, [])
+        start = self.temp
+        values = [self.allocate() for _ in fields]
+        for f, register in zip(fields, values):
+            self.expression(f.Value, register)
+        dest = self.result(dest)
+        self.emit(RECORD, dest, tuple(str(f.key.name) for f in fields), start)
+        return dest
+
+    def expression_FieldAccess(self, node: ast.FieldAccess, dest: int) -> int:
+        record = self.expression(node.expression)
+        dest = self.result(dest)
+        self.emit(FIELD, dest, record, str(node.id.name))
+        return dest
+
+    def expression_FunctionCall(self, node: ast.FunctionCall, dest: int) -> int:
+        arguments = ast.as_list(node.expressions, [])
+        callee = node.callee
+        while isinstance(callee, ast.Parenthesize):
+            callee = callee.expression
+
+        # 지역 변수가 아닌 함수 이름이면 직접 호출 (arity 는 compile 할 때 확인)
+        direct = None
+        if isinstance(callee, ast.Id) and str(callee.name) not in self.registers:
+            direct = self.functions.get(str(callee.name))
+            if direct is None:
+                raise CompileError(f"{self.target.name}: 정의되지 않은 함수 {callee.name}")
+            if direct.arity != len(arguments):
+                raise CompileError(f"{self.target.name}: {direct.name} 는 인자 {direct.arity} 개: {node}")
+        else:
+            callee = self.expression(callee)
+
+        # 인자는 연속된 임시 register 에
+        start = self.temp
+        registers = [self.allocate() for _ in arguments]
+        for argument, register in zip(arguments, registers):
+            self.expression(argument, register)
+
+        dest = self.result(dest)
+        if direct is not None:
+            self.emit(CALLF, dest, direct, (start, len(arguments)))
+        else:
+            self.emit(CALL, dest, callee, (start, len(arguments)))
+        return dest
+
+def compile_program(program: ast.Program) -> CompiledProgram:
+    """
+    함수 객체를 먼저 모두 만들어 두고 (서로 / 자기 자신 호출) 함수마다 code 를 채운다.
+    """
+    functions = {}
+    for function in program.functions:
+        name = str(function.name.name)
+        if name in functions:
+            raise CompileError(f"함수 {name} 가 두 번 정의됨")
+        functions[name] = CompiledFunction(name, len(ast.as_list(function.parameters, [])))
+
+    for function in program.functions:
+        FunctionCompiler(function, functions[str(function.name.name)], functions)
+
+    return CompiledProgram(functions)
+
+def disassemble(function: CompiledFunction) -> Iterator[str]:
+    def operand(value):
+        return repr(value) if isinstance(value, (str, tuple)) else str(value)
+
+    yield f"{function.name}: arity={function.arity} registers={function.registers} ({', '.join(function.names)})\n"
+    for i, (op, a, b, c) in enumerate(function.code):
+        # LOADK 의 상수는 null (None) 일 수 있다.
+        operands = ' '.join(operand(x) for x in (a, b, c) if x is not None or (op == LOADK and x is b))
+        yield f"  {i:4d}  {OPCODE_NAMES[op]:<8} {operands}\n"
@@ -13,13 +13,13 @@ class BranchCategory(Enum):
 class _Node:
     pass
 
-@dataclass
+@dataclass(eq=False)
 class NormalNode(_Node):
     statement: ast._Statement
     predecessors: list[_Node] = field(default_factory=list)
     successor: _Node = field(init=False, default=None)
 
-@dataclass
+@dataclass(eq=False)
 class BranchNode(_Node):
     # condition: ast._Expression
     statement: ast._Statement
@@ -28,17 +28,95 @@ class BranchNode(_Node):
     true_successor: _Node = field(init=False, default=None)
     false_successor: _Node = field(init=False, default=None)
 
-@dataclass
+@dataclass(eq=False)
 class Entry(_Node):
     successor: _Node = field(init=False, default=None)
 
-@dataclass
+@dataclass(eq=False)
 class Exit(_Node):
     predecessors: list[_Node] = field(default_factory=list)
 
+def successors(node: _Node) -> list[_Node]:
+    """
+    succ(v)
+    - BranchNode: [true_successor, false_successor]
+    - Entry, NormalNode: [successor]
+    - Exit: []
+    """
+    if isinstance(node, BranchNode):
+        return [node.true_successor, node.false_successor]
+    elif isinstance(node, (Entry, NormalNode)):
+        return [node.successor] if node.successor is not None else []
+    return []
+
+@dataclass
+class IndexedGraph:
+    """
+    CFG 의 각 node 에 0 ... n-1 번호를 붙이고 succ / pred 를 index list 로 펼친 그래프
+    - nodes[0] 은 항상 entry
+    - GraphBuilder 가 채우는 predecessors 는 분기 합류 지점에서 누락될 수 있으므로 succ 로부터 다시 계산한다.
+    """
+    entry: _Node
+
+    nodes: list[_Node] = field(init=False, default_factory=list)
+    index: dict[_Node, int] = field(init=False, default_factory=dict)
+    successors: list[list[int]] = field(init=False, default_factory=list)
+    predecessors: list[list[int]] = field(init=False, default_factory=list)
+
+    def __post_init__(self):
+        # 재귀 대신 stack 으로 순회 (깊은 CFG 에서 recursion limit 회피)
+        stack = [self.entry]
+        self.index[self.entry] = 0
+        self.nodes.append(self.entry)
+
+        while stack:
+            node = stack.pop()
+            for succ in reversed(successors(node)):
+                if succ not in self.index:
+                    self.index[succ] = len(self.nodes)
+                    self.nodes.append(succ)
+                    stack.append(succ)
+
+        self.successors = [[self.index[s] for s in successors(n)] for n in self.nodes]
+        self.predecessors = [[] for _ in self.nodes]
+        for i, succs in enumerate(self.successors):
+            for s in succs:
+                if i not in self.predecessors[s]:
+                    self.predecessors[s].append(i)
+
+    def __len__(self):
+        return len(self.nodes)
+
+    def exits(self) -> list[int]:
+        return [i for i, n in enumerate(self.nodes) if isinstance(n, Exit)]
+
+    def reverse_postorder(self) -> list[int]:
+        """
+        entry 에서 시작하는 DFS 의 reverse postorder (forward 분석의 worklist 초기 순서)
+        """
+        order = []
+        visited = [False] * len(self.nodes)
+        visited[0] = True
+        stack = [(0, iter(self.successors[0]))]
+
+        while stack:
+            node, succs = stack[-1]
+            for s in succs:
+                if not visited[s]:
+                    visited[s] = True
+                    stack.append((s, iter(self.successors[s])))
+                    break
+            else:
+                stack.pop()
+                order.append(node)
+
+        order.reverse()
+        return order
+
 @dataclass
 class GraphBuilder:
     target_ast: ast._Ast
+    function: str = 'main'  # CFG 를 만들 함수
 
     graph: _Node = field(init=False, default=None)
     head: _Node = field(init=False, default=None)
@@ -51,7 +129,7 @@ class GraphBuilder:
         Fun, ... Fun
         """
         for fun in node.functions:
-            if fun.name.name == 'main':
+            if fun.name.name == self.function:
                 self.visit_function(fun)
                 # graph 에 exit node 추가
 
@@ -65,7 +143,7 @@ class GraphBuilder:
         statement_list = self.make_statement_node(function_statements)
 
         # 함수 실행
-        if node.name.name == 'main':
+        if node.name.name == self.function:
             self.graph = Entry()
             self.head = self.graph
             self.head.successor = statement_list[0]
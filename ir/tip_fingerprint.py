@@ -0,0 +1,101 @@
+"""
+함수 fingerprint (alpha-renaming 에 무관한 정규형의 hash)
+
+copy-paste 된 함수는 변수 이름만 바꿔도 분석 결과가 (이름만 빼면) 같다.
+정규형은 함수 AST 를 preorder 로 펼친 token 열이고, 이름은 다음처럼 바꾼다.
+- parameter 와 var 로 선언된 변수: 처음 나온 순서대로 #0, #1, ... (parameter 가 먼저)
+- 함수 자신의 이름: @self (main 은 분석이 다르므로 @main)
+- 그 밖의 이름 (다른 함수, 선언하지 않은 변수), record field 이름: 그대로
+`?stmts` 처럼 원소가 하나이면 inline 되는 list 는 as_list 로 맞춘 뒤 펼친다.
+
+    FunctionFingerprint(f).digest == FunctionFingerprint(g).digest
+    => g 는 f 의 이름을 names 대로 바꾼 것 (같은 문장, 같은 식, 같은 field 이름)
+"""
+import hashlib
+import typing
+from dataclasses import dataclass, field, fields
+from enum import Enum
+
+from ir import tip_ast as ast
+from ir.tip_bytecode import declared_variables
+
+# 정규형이 바뀌면 올린다. (저장해 둔 요약과 섞이지 않도록 digest 에 넣는다.)
+VERSION = 2
+
+def _is_list(annotation) -> bool:
+    return typing.get_origin(annotation) is list
+
+@dataclass
+class FunctionFingerprint:
+    """
+    - digest: 정규형의 hash (hex)
+    - names: 원래 이름 -> 정규 이름 (parameter / 선언된 변수만)
+    - tokens: 정규형 token 수 (함수 크기)
+    """
+    function: ast.Function
+
+    digest: str = field(init=False, default=None)
+    names: dict[str, str] = field(init=False, default_factory=dict)
+    tokens: int = field(init=False, default=0)
+
+    def __post_init__(self):
+        function = self.function
+        own = str(function.name.name)
+        local = {str(p.name) for p in ast.as_list(function.parameters, [])}
+        local.update(str(id.name) for id in declared_variables(function.statements))
+        names = self.names
+
+        def rename(name: str) -> str:
+            if name in local:
+                canonical = names.get(name)
+                if canonical is None:
+                    canonical = names[name] = f"#{len(names)}"
+                return canonical
+            if name == own:
+                return '@main' if own == 'main' else '@self'
+            return name
+
+        tokens = [f"v{VERSION}"]
+        stack = [function]
+        while stack:
+            node = stack.pop()
+            if isinstance(node, str):
+                tokens.append(node)
+            elif isinstance(node, ast.Id):
+                tokens.append(rename(str(node.name)))
+            elif isinstance(node, ast.Int):
+                tokens.append(str(node.value))
+            elif isinstance(node, Enum):
+                tokens.append(node.value)
+            elif node is None:
+                tokens.append('-')
+            else:
+                tokens.append(node.__class__.__name__)
+                children = []
+                for f in fields(node):
+                    value = getattr(node, f.name)
+                    if f.name == 'key' or isinstance(node, ast.FieldAccess) and f.name == 'id':
+                        # record field 이름은 바꿀 수 없다. (Field / FieldAssignment 의 key, E.Id 의 Id)
+                        children.append(f".{value.name}")
+                    elif _is_list(f.type):
+                        items = ast.as_list(value, [])
+                        children.append(f"[{len(items)}")
+                        children.extend(items)
+                    else:
+                        children.append(value)
+                stack.extend(reversed(children))
+
+        self.tokens = len(tokens)
+        self.digest = hashlib.blake2b('\x1f'.join(tokens).encode('utf-8'), digest_size=16).hexdigest()
+
+    def canonical(self, name: str) -> str:
+        return self.names.get(name, name)
+
+    def original(self) -> dict[str, str]:
+        """
+        정규 이름 -> 원래 이름
+        """
+        return {canonical: name for name, canonical in self.names.items()}
+
+def fingerprint(function: ast.Function) -> str:
+    return FunctionFingerprint(function).digest
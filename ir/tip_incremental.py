@@ -0,0 +1,196 @@
+"""
+Incremental reparsing (editor 용)
+
+편집 하나 (TextEdit) 가 들어오면 영향을 받은 최상위 함수만 다시 parse 해서 Program.functions 에 끼워 넣는다.
+
+TIP 에는 주석과 문자열이 없으므로 최상위 함수의 범위는 중괄호의 짝만으로 정해진다.
+    Id ( ... ) { ... { ... } ... }
+    ^start                        ^end
+
+1. 편집 전 함수 범위 (spans) 중 편집 위치에 닿는 첫 함수부터 다시 scan 한다.
+2. scan 중 함수 시작 위치가 편집 뒤쪽의 기존 함수 시작 (+ 길이 변화량) 과 같아지면 멈춘다.
+   최상위 함수 시작에서 scanner 의 상태는 항상 depth 0 이므로 그 뒤는 모두 편집 전과 같다.
+3. 다시 scan 한 함수만 parse 하고, 글자가 그대로인 함수는 이전 AST 를 재사용한다.
+"""
+import re
+from dataclasses import dataclass, field
+
+from lark import Lark
+
+from ir import tip_ast as ast
+from ir.tip_ast import get_ast
+
+# str 와 bytes (mmap) 모두 scan 할 수 있도록 두 벌, '{' 는 group 1
+_NON_SPACE = re.compile(r'\S')
+_BRACE = re.compile(r'(\{)|\}')
+_NON_SPACE_BYTES = re.compile(rb'\S')
+_BRACE_BYTES = re.compile(rb'(\{)|\}')
+
+@dataclass(frozen=True)
+class TextEdit:
+    """
+    text[start:end] 를 replacement 로 바꾼다.
+    """
+    start: int
+    end: int
+    replacement: str
+
+    def apply(self, text: str) -> str:
+        return text[:self.start] + self.replacement + text[self.end:]
+
+    @property
+    def delta(self) -> int:
+        return len(self.replacement) - (self.end - self.start)
+
+@dataclass
+class EditResult:
+    """
+    changed: 내용이 바뀐 함수, added / removed: 새로 생기거나 없어진 함수 (이름)
+    reparsed: 실제로 parse 한 함수 수
+    """
+    changed: list[str] = field(default_factory=list)
+    added: list[str] = field(default_factory=list)
+    removed: list[str] = field(default_factory=list)
+    reparsed: int = 0
+
+    @property
+    def invalidated(self) -> set[str]:
+        return set(self.changed) | set(self.added) | set(self.removed)
+
+def next_function(text, pos: int, end: int = None):
+    """
+    text[pos:end] 에서 첫 최상위 함수의 (start, end), 없으면 None
+    닫히지 않은 함수는 end 까지 (parse 단계에서 오류가 난다)
+    text 는 str, bytes, mmap (bytes 이면 위치도 byte 단위)
+    """
+    if end is None:
+        end = len(text)
+    non_space, braces = (_NON_SPACE, _BRACE) if isinstance(text, str) else (_NON_SPACE_BYTES, _BRACE_BYTES)
+
+    m = non_space.search(text, pos, end)
+    if m is None:
+        return None
+
+    start = m.start()
+    depth = 0
+    for brace in braces.finditer(text, start, end):
+        if brace.lastindex == 1:
+            depth += 1
+        else:
+            depth -= 1
+            if depth <= 0:
+                return start, brace.end()
+
+    return start, end
+
+def iter_function_spans(text, pos: int = 0, end: int = None):
+    span = next_function(text, pos, end)
+    while span is not None:
+        yield span
+        span = next_function(text, span[1], end)
+
+def function_spans(text, pos: int = 0, end: int = None) -> list[tuple[int, int]]:
+    return list(iter_function_spans(text, pos, end))
+
+def parse_function(parser: Lark, source: str) -> ast.Function:
+    program = get_ast(parser.parse(source))
+    if len(program.functions) != 1:
+        raise ValueError(f"함수 하나가 아님: {source[:40]!r}")
+    return program.functions[0]
+
+def function_name(function: ast.Function) -> str:
+    return str(function.name.name)
+
+def reparse(parser: Lark, text: str, program: ast.Program, edit: TextEdit) -> tuple[str, EditResult]:
+    """
+    이전 text 와 AST 에 edit 를 적용한다. program.functions 는 제자리에서 바뀐다.
+    """
+    document = IncrementalDocument(parser, text, program)
+    result = document.apply(edit)
+    return document.text, result
+
+@dataclass
+class IncrementalDocument:
+    """
+    text 와 그 AST, 최상위 함수 범위를 함께 유지한다.
+    apply(edit) 후에도 program 은 처음부터 parse 한 결과와 같다.
+    program 을 주면 (이미 text 를 parse 한 AST) 다시 parse 하지 않는다.
+    """
+    parser: Lark
+    text: str
+    program: ast.Program = None
+
+    spans: list[tuple[int, int]] = field(init=False, default_factory=list)
+
+    def __post_init__(self):
+        self.spans = function_spans(self.text)
+        if self.program is None:
+            self.program = ast.Program([self.parse_function(self.text[s:e]) for s, e in self.spans])
+        elif len(self.program.functions) != len(self.spans):
+            raise ValueError("program 과 text 의 함수 수가 다르다.")
+
+    def parse_function(self, source: str) -> ast.Function:
+        return parse_function(self.parser, source)
+
+    def apply(self, edit: TextEdit) -> EditResult:
+        """
+        실패 (문법 오류) 하면 예외를 던지고 document 는 편집 전 상태로 남는다.
+        """
+        old_text, old_spans = self.text, self.spans
+        old_functions = self.program.functions
+        text = edit.apply(old_text)
+        delta = edit.delta
+
+        # 편집 위치에 닿는 첫 함수 (끝이 편집 시작 이후)
+        first = 0
+        while first < len(old_spans) and old_spans[first][1] < edit.start:
+            first += 1
+        region_start = min(edit.start, old_spans[first][0]) if first < len(old_spans) else edit.start
+
+        # 편집 끝보다 (공백을 사이에 두고) 뒤에서 시작하는 함수는 그대로
+        resync = {}
+        for j in range(first, len(old_spans)):
+            if old_spans[j][0] > edit.end:
+                resync[old_spans[j][0] + delta] = j
+
+        new_spans = []
+        last = len(old_spans)
+        span = next_function(text, region_start)
+        while span is not None:
+            if span[0] in resync:
+                last = resync[span[0]]
+                break
+            new_spans.append(span)
+            span = next_function(text, span[1])
+
+        # 바뀐 범위의 함수만 parse, 글자가 같으면 이전 AST 재사용
+        replaced = {}
+        for (s, e), function in zip(old_spans[first:last], old_functions[first:last]):
+            replaced[old_text[s:e]] = function
+
+        result = EditResult()
+        functions = []
+        for s, e in new_spans:
+            source = text[s:e]
+            function = replaced.get(source)
+            if function is None:
+                function = self.parse_function(source)
+                result.reparsed += 1
+            functions.append(function)
+
+        old_names = [function_name(f) for f in old_functions[first:last]]
+        new_names = [function_name(f) for f in functions]
+        old_by_name = {function_name(f): f for f in old_functions[first:last]}
+        for name, function in zip(new_names, functions):
+            if name not in old_by_name:
+                result.added.append(name)
+            elif old_by_name[name] is not function:
+                result.changed.append(name)
+        result.removed = [name for name in old_names if name not in new_names]
+
+        # commit
+        self.text = text
+        self.spans = old_spans[:first] + new_spans + [(s + delta, e + delta) for s, e in old_spans[last:]]
+        self.program.functions = old_functions[:first] + functions + old_functions[last:]
+
+        return result
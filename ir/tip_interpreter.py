@@ -0,0 +1,292 @@
+"""
+TIP bytecode interpreter
+
+    python -m ir.tip_interpreter program.tip --input 3 5 --stats
+    python -m ir.tip_interpreter program.tip --dis
+
+    interpreter = Interpreter(compile_program(program), inputs=[3, 5])
+    interpreter.run()           # main 의 반환값
+    interpreter.outputs         # output 문으로 출력한 값
+
+실행은 dispatch loop 하나에서 한다.
+- 함수 호출은 frame stack 에 (함수, code, pc, registers, 결과 register) 를 쌓고 같은 loop 에서 callee 를 실행한다.
+  (Python 재귀를 쓰지 않으므로 깊은 TIP 재귀도 recursion limit 에 걸리지 않는다.)
+- instruction 은 자주 실행되는 순서로 비교한다.
+- 실행한 instruction 수 (steps) 와 함수별 호출 수 (calls) 를 센다.
+  max_steps 는 뒤로 가는 분기와 호출에서만 확인한다. (끝나지 않는 실행은 반드시 둘 중 하나를 반복한다.)
+
+main 의 parameter 는 arguments 로 주거나, 없으면 input 에서 차례로 읽는다.
+나눗셈은 0 쪽으로 버림 (-7 / 2 = -3), 0 으로 나누면 ExecutionError
+"""
+import sys
+from dataclasses import dataclass, field
+from typing import Callable, Iterable, Iterator
+
+from ir.tip_bytecode import (
+    MOVE, LOADK, ADD, SUB, MUL, DIV, ADDK, GT, EQ,
+    JUMP, JUMPT, JUMPF, JUMPGT, JUMPNGT, JUMPEQ, JUMPNEQ,
+    INPUT, OUTPUT, ALLOC, LOAD, STORE, RECORD, FIELD, SETFIELD,
+    CALL, CALLF, RET,
+    CompiledFunction, CompiledProgram,
+)
+
+class ExecutionError(RuntimeError):
+    pass
+
+class Cell:
+    """
+    alloc 으로 만든 칸, 또는 주소를 쓰는 변수의 칸 (pointer 값은 Cell 객체 자체, == 는 identity)
+    """
+    __slots__ = ('value',)
+
+    def __init__(self, value=None):
+        self.value = value
+
+    def __repr__(self):
+        return f"↑{format_value(self.value)}"
+
+def format_value(value) -> str:
+    if value is None:
+        return 'null'
+    if isinstance(value, dict):
+        return '{' + ', '.join(f"{k}: {format_value(v)}" for k, v in value.items()) + '}'
+    if isinstance(value, Cell):
+        return f"ptr@{id(value):x}"
+    return str(value)
+
+@dataclass
+class Interpreter:
+    """
+    inputs: input 이 차례로 읽는 int
+    output: output 문마다 불리는 함수 (없으면 outputs list 에 모은다.)
+    max_steps: 실행할 instruction 수 한도 (None 이면 없음)
+    max_depth: 호출 깊이 한도
+    """
+    program: CompiledProgram
+    inputs: Iterable[int] = ()
+    output: Callable = None
+    max_steps: int = None
+    max_depth: int = 100000
+
+    outputs: list = field(init=False, default_factory=list)
+    steps: int = field(init=False, default=0)
+    calls: dict[str, int] = field(init=False, default_factory=dict)
+    _inputs: Iterator[int] = field(init=False, default=None)
+
+    def __post_init__(self):
+        self._inputs = iter(self.inputs)
+        if self.output is None:
+            self.output = self.outputs.append
+        self.calls = dict.fromkeys(self.program.functions, 0)
+
+    def read_input(self) -> int:
+        try:
+            return int(next(self._inputs))
+        except StopIteration:
+            raise ExecutionError("input 이 더 없다.") from None
+
+    def run(self, function: str = 'main', arguments: list = None):
+        if function not in self.program.functions:
+            raise ExecutionError(f"함수 {function} 가 없다.")
+        f = self.program[function]
+        if arguments is None:
+            arguments = [self.read_input() for _ in range(f.arity)]
+        if len(arguments) != f.arity:
+            raise ExecutionError(f"{f.name} 는 인자 {f.arity} 개")
+        return self.execute(f, list(arguments))
+
+    def execute(self, f: CompiledFunction, arguments: list):
+        read_input = self.read_input
+        output = self.output
+        calls = self.calls
+        limit = self.max_steps if self.max_steps is not None else float('inf')
+        max_depth = self.max_depth
+
+        frames = []
+        code = f.code
+        r = arguments + [None] * (f.registers - len(arguments))
+        calls[f.name] += 1
+        pc = 0
+        steps = self.steps
+
+        try:
+            while True:
+                op, a, b, c = code[pc]
+                pc += 1
+                steps += 1
+
+                if op == MOVE:
+                    r[a] = r[b]
+                elif op == ADDK:
+                    r[a] = r[b] + c
+                elif op == LOADK:
+                    r[a] = b
+                elif op == JUMPNGT:
+                    if not r[a] > r[b]:
+                        pc = c
+                        if steps > limit:
+                            break
+                elif op == JUMPGT:
+                    if r[a] > r[b]:
+                        pc = c
+                        if steps > limit:
+                            break
+                elif op == ADD:
+                    r[a] = r[b] + r[c]
+                elif op == SUB:
+                    r[a] = r[b] - r[c]
+                elif op == MUL:
+                    r[a] = r[b] * r[c]
+                elif op == LOAD:
+                    r[a] = r[b].value
+                elif op == STORE:
+                    r[a].value = r[b]
+                elif op == JUMP:
+                    pc = a
+                    if steps > limit:
+                        break
+                elif op == JUMPNEQ:
+                    if r[a] != r[b]:
+                        pc = c
+                        if steps > limit:
+                            break
+                elif op == JUMPEQ:
+                    if r[a] == r[b]:
+                        pc = c
+                        if steps > limit:
+                            break
+                elif op == JUMPF:
+                    if not r[a]:
+                        pc = b
+                        if steps > limit:
+                            break
+                elif op == JUMPT:
+                    if r[a]:
+                        pc = b
+                        if steps > limit:
+                            break
+                elif op == GT:
+                    r[a] = 1 if r[b] > r[c] else 0
+                elif op == EQ:
+                    r[a] = 1 if r[b] == r[c] else 0
+                elif op == DIV:
+                    x, y = r[b], r[c]
+                    q = x // y
+                    # 0 쪽으로 버림
+                    if q < 0 and q * y != x:
+                        q += 1
+                    r[a] = q
+                elif op == CALLF or op == CALL:
+                    callee = b if op == CALLF else r[b]
+                    start, n = c
+                    if op == CALL:
+                        if not isinstance(callee, CompiledFunction):
+                            raise ExecutionError(f"함수가 아닌 값을 호출: {format_value(callee)}")
+                        if callee.arity != n:
+                            raise ExecutionError(f"{callee.name} 는 인자 {callee.arity} 개 (받은 인자 {n} 개)")
+                    if len(frames) >= max_depth:
+                        raise ExecutionError(f"호출 깊이 {max_depth} 초과")
+                    if steps > limit:
+                        break
+
+                    frames.append((f, code, pc, r, a))
+                    calls[callee.name] += 1
+                    f = callee
+                    code = f.code
+                    r = r[start:start + n]
+                    r.extend([None] * (f.registers - n))
+                    pc = 0
+                elif op == RET:
+                    value = r[a]
+                    if not frames:
+                        return value
+                    f, code, pc, r, dest = frames.pop()
+                    r[dest] = value
+                elif op == FIELD:
+                    r[a] = r[b][c]
+                elif op == SETFIELD:
+                    record = r[a]
+                    if b not in record:
+                        raise ExecutionError(f"record 에 field {b} 가 없다: {format_value(record)}")
+                    # 값 의미: 같은 record 를 가진 다른 변수에 보이지 않도록 복사해서 바꾼다.
+                    record = dict(record)
+                    record[b] = r[c]
+                    r[a] = record
+                elif op == RECORD:
+                    r[a] = dict(zip(b, r[c:c + len(b)]))
+                elif op == ALLOC:
+                    r[a] = Cell(r[b])
+                elif op == INPUT:
+                    r[a] = read_input()
+                elif op == OUTPUT:
+                    value = r[a]
+                    if value is None or isinstance(value, (Cell, CompiledFunction)):
+                        raise ExecutionError(f"int 나 record 가 아닌 값을 output: {format_value(value)}")
+                    output(value)
+                else:
+                    raise ExecutionError(f"알 수 없는 opcode {op}")
+
+            raise ExecutionError(f"instruction {self.max_steps} 개를 넘게 실행")
+        except ExecutionError as e:
+            raise ExecutionError(f"{f.name}: {f.statements[pc - 1]}: {e}") from None
+        except ZeroDivisionError:
+            raise ExecutionError(f"{f.name}: {f.statements[pc - 1]}: 0 으로 나눔") from None
+        except AttributeError:
+            raise ExecutionError(f"{f.name}: {f.statements[pc - 1]}: pointer 가 아닌 값을 역참조") from None
+        except (TypeError, KeyError) as e:
+            # int 가 아닌 값의 연산, 없는 field 읽기
+            raise ExecutionError(f"{f.name}: {f.statements[pc - 1]}: {e.__class__.__name__}: {e}") from None
+        finally:
+            self.steps = steps
+
+def load_program(path: str):
+    from ir.tip_source import MappedSource
+    from main import load_parser
+
+    with MappedSource(path) as source:
+        return source.program(load_parser())
+
+def main(argv=None):
+    import argparse
+    from ir.tip_bytecode import CompileError, compile_program, disassemble
+
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('program', help='TIP 프로그램')
+    parser.add_argument('--input', type=int, nargs='*', help='input 이 읽을 int (없으면 stdin 에서 읽는다.)')
+    parser.add_argument('--function', default='main', help='실행할 함수')
+    parser.add_argument('--max-steps', type=int, help='실행할 instruction 수 한도')
+    parser.add_argument('--stats', action='store_true', help='실행한 instruction 수 / 함수별 호출 수')
+    parser.add_argument('--dis', action='store_true', help='bytecode 만 출력')
+    args = parser.parse_args(argv)
+
+    try:
+        compiled = compile_program(load_program(args.program))
+    except CompileError as e:
+        print(f"compile error: {e}", file=sys.stderr)
+        return 2
+
+    if args.dis:
+        for f in compiled.functions.values():
+            sys.stdout.writelines(disassemble(f))
+        return 0
+
+    inputs = args.input if args.input is not None else (int(token) for line in sys.stdin for token in line.split())
+    interpreter = Interpreter(compiled, inputs, output=lambda value: print(format_value(value)), max_steps=args.max_steps)
+    try:
+        value = interpreter.run(args.function)
+    except ExecutionError as e:
+        print(f"runtime error: {e}", file=sys.stderr)
+        return 1
+    finally:
+        if args.stats:
+            print(f"[steps] {interpreter.steps}", file=sys.stderr)
+            for name, count in sorted(interpreter.calls.items(), key=lambda item: -item[1]):
+                if count:
+                    print(f"[calls] {name} {count}", file=sys.stderr)
+
+    print(format_value(value))
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,271 @@
+"""
+Normalization (spa 2.3)
+
+모든 식이 연산자를 하나만 갖도록, 하위 식을 새 임시 변수에 먼저 계산하는 문장으로 바꾼다.
+
+    x = f(y + 1, *p) * (z - input);
+
+    _t0 = y + 1;
+    _t1 = *p;
+    _t2 = f(_t0, _t1);
+    _t3 = input;
+    _t4 = z - _t3;
+    x = _t2 * _t4;
+
+정규형 (A 는 피연산자: Id 또는 Int)
+    X = A | X = A op A | X = input | X = null | X = &Y | X = alloc A | X = *A
+    X = A(A, ..., A) | X = { Id: A, ... } | X = A.Id
+    *A = A;  X.Id = A;  (*A).Id = A;  output A;  return A;
+    if (A) { ... } else { ... }
+    while (A) { ...; A 다시 계산 }
+
+- 하위 식은 왼쪽부터 계산한다. (input, 함수 호출의 순서가 원래 프로그램과 같다.)
+  피연산자로 남는 변수는 원래 뒤에 계산하는 하위 식보다 나중에 읽히므로, 주소가 노출된 변수 (&X) 는
+  뒤에 함수 호출 (*p = ... 로 바꿀 수 있다) 이 있으면 임시 변수에 먼저 복사해 둔다.
+- 임시 변수는 프로그램 전체에서 겹치지 않는 이름 (_t0, _t1, ...) 으로, 함수 앞의 선언 뒤에 var 로 추가한다.
+  (type analysis 는 변수를 이름으로 구분하므로 다른 함수의 임시 변수와도 이름이 달라야 한다.)
+- while 의 조건을 계산하는 문장은 loop 앞과 body 끝에 한 벌씩 둔다.
+- 식은 stack 으로 후위 순회하므로 깊게 중첩된 식에서도 recursion limit 에 걸리지 않는다.
+
+정규화한 AST 에서는 모든 식의 깊이가 2 이하이므로 constraint 수집, sign 분석의 transfer function 등이
+하위 식을 재귀적으로 내려가지 않는다.
+"""
+from dataclasses import dataclass, field
+from typing import Iterator
+
+from ir import tip_ast as ast
+from ir.tip_bytecode import referenced_variables
+
+# 임시 변수 없이 바로 피연산자가 될 수 있는 식
+ATOMS = (ast.Id, ast.Int)
+
+def unwrap(node: ast._Expression) -> ast._Expression:
+    while isinstance(node, ast.Parenthesize):
+        node = node.expression
+    return node
+
+def subexpressions(node: ast._Expression) -> list[ast._Expression]:
+    """
+    피연산자로 만들어야 하는 하위 식 (계산 순서대로)
+    """
+    if isinstance(node, (ast.Arithmetic, ast.Comparison)):
+        return [node.left_expression, node.right_expression]
+    if isinstance(node, (ast.Allocation, ast.Dereference, ast.FieldAccess)):
+        return [node.expression]
+    if isinstance(node, ast.Record):
+        return [f.Value for f in ast.as_list(node.fields, [])]
+    if isinstance(node, ast.FunctionCall):
+        return [node.callee, *ast.as_list(node.expressions, [])]
+    return []
+
+def has_call(node: ast._Expression) -> bool:
+    return any(isinstance(n, ast.FunctionCall) for n in ast.walk(node))
+
+def rebuild(node: ast._Expression, operands: list) -> ast._Expression:
+    """
+    node 의 하위 식을 operands 로 바꾼 새 식
+    """
+    if isinstance(node, ast.Arithmetic):
+        return ast.Arithmetic(operands[0], node.operator, operands[1])
+    if isinstance(node, ast.Comparison):
+        return ast.Comparison(operands[0], node.operator, operands[1])
+    if isinstance(node, ast.Allocation):
+        return ast.Allocation(operands[0])
+    if isinstance(node, ast.Dereference):
+        return ast.Dereference(operands[0])
+    if isinstance(node, ast.FieldAccess):
+        return ast.FieldAccess(operands[0], node.id)
+    if isinstance(node, ast.Record):
+        return ast.Record([ast.Field(f.key, value) for f, value in zip(ast.as_list(node.fields, []), operands)])
+    if isinstance(node, ast.FunctionCall):
+        return ast.FunctionCall(operands[0], operands[1:])
+    return node
+
+def program_names(program: ast.Program) -> set[str]:
+    """
+    프로그램에 나오는 모든 이름 (함수, 변수, field)
+    """
+    return {str(node.name) for node in ast.walk(program) if isinstance(node, ast.Id)}
+
+@dataclass
+class Temporaries:
+    """
+    프로그램 전체에서 겹치지 않는 임시 변수 이름
+    """
+    used: set[str]
+    prefix: str = '_t'
+
+    count: int = field(init=False, default=0)
+
+    def fresh(self) -> ast.Id:
+        while True:
+            name = f"{self.prefix}{self.count}"
+            self.count += 1
+            if name not in self.used:
+                return ast.Id(name)
+
+@dataclass
+class FunctionNormalizer:
+    function: ast.Function
+    temporaries: Temporaries
+
+    result: ast.Function = field(init=False, default=None)
+    declared: list[ast.Id] = field(init=False, default_factory=list)
+    block: list[ast._Statement] = field(init=False, default=None)
+    address_taken: set[str] = field(init=False, default_factory=set)
+
+    def __post_init__(self):
+        self.address_taken = referenced_variables(self.function)
+        statements = ast.as_list(self.function.statements, [])
+        # 앞쪽의 선언은 그대로 두고 그 뒤에 임시 변수 선언을 넣는다.
+        leading = 0
+        while leading < len(statements) and isinstance(statements[leading], ast.Declaration):
+            leading += 1
+
+        body = self.visit_block(statements[leading:])
+        self.block = body
+        return_statement = ast.Return(self.atom(self.function.return_statement.expression))
+
+        declarations = statements[:leading]
+        if self.declared:
+            declarations = [*declarations, ast.Declaration(self.declared)]
+        self.result = ast.Function(self.function.name, ast.as_list(self.function.parameters, []),
+                                   [*declarations, *body], return_statement)
+
+    # statement ==========
+    def visit_block(self, statements) -> list[ast._Statement]:
+        outer = self.block
+        self.block = []
+        for stmt in ast.as_list(statements, []):
+            method = getattr(self, f'visit_{stmt.__class__.__name__}')
+            method(stmt)
+        block, self.block = self.block, outer
+        return block
+
+    def visit_Declaration(self, node: ast.Declaration):
+        self.block.append(node)
+
+    def visit_Assignment(self, node: ast.Assignment):
+        self.block.append(ast.Assignment(node.id, self.flat(node.expression)))
+
+    def visit_Output(self, node: ast.Output):
+        self.block.append(ast.Output(self.atom(node.expression)))
+
+    def visit_Return(self, node: ast.Return):
+        # if 안의 return (문법상 허용)
+        self.block.append(ast.Return(self.atom(node.expression)))
+
+    def visit_DereferenceAssignment(self, node: ast.DereferenceAssignment):
+        pointer = self.stable(self.atom(node.target.expression), [node.expression])
+        self.block.append(ast.DereferenceAssignment(ast.Dereference(pointer), self.atom(node.expression)))
+
+    def visit_FieldAssignment(self, node: ast.FieldAssignment):
+        self.block.append(ast.FieldAssignment(node.id, node.key, self.atom(node.expression)))
+
+    def visit_DereferenceFieldAssignment(self, node: ast.DereferenceFieldAssignment):
+        pointer = self.stable(self.atom(node.target.expression), [node.expression])
+        value = self.atom(node.expression)
+        self.block.append(ast.DereferenceFieldAssignment(ast.Dereference(pointer), node.key, value))
+
+    def visit_If(self, node: ast.If):
+        condition = self.atom(node.condition)
+        true_statements = self.visit_block(node.true_statements)
+        false_statements = self.visit_block(node.false_statements) if node.false_statements is not None else None
+        self.block.append(ast.If(condition, true_statements, false_statements))
+
+    def visit_While(self, node: ast.While):
+        condition = self.atom(node.condition)
+        body = self.visit_block(node.statements)
+        if not isinstance(unwrap(node.condition), ATOMS):
+            # 조건을 다시 계산하는 문장 (같은 임시 변수에)
+            outer = self.block
+            self.block = body
+            self.block.append(ast.Assignment(condition, self.flat(node.condition)))
+            self.block = outer
+        self.block.append(ast.While(condition, body))
+
+    # expression ==========
+    def flat(self, root: ast._Expression) -> ast._Expression:
+        """
+        root 와 같은 값의, 연산자가 하나 이하인 식
+        하위 식을 계산하는 문장은 self.block 에 추가한다.
+        """
+        root = unwrap(root)
+        # [식, 하위 식, 지금까지 만든 피연산자]
+        stack = [(root, subexpressions(root), [])]
+        while True:
+            node, pending, operands = stack[-1]
+            if len(operands) < len(pending):
+                child = unwrap(pending[len(operands)])
+                if isinstance(child, ATOMS):
+                    operands.append(self.stable(child, pending[len(operands) + 1:]))
+                else:
+                    stack.append((child, subexpressions(child), []))
+                continue
+
+            stack.pop()
+            flat = rebuild(node, operands)
+            if not stack:
+                return flat
+            stack[-1][2].append(self.assign(flat))
+
+    def atom(self, node: ast._Expression) -> ast._Expression:
+        """
+        node 의 값을 가진 피연산자 (Id 또는 Int)
+        """
+        flat = self.flat(node)
+        if isinstance(flat, ATOMS):
+            return flat
+        return self.assign(flat)
+
+    def stable(self, operand: ast._Expression, later: list[ast._Expression]) -> ast._Expression:
+        """
+        later (operand 다음에 계산할 하위 식) 를 먼저 계산해도 값이 같은 피연산자
+        주소가 노출된 변수는 later 의 함수 호출이 바꿀 수 있으므로 임시 변수에 복사한다.
+        """
+        if isinstance(operand, ast.Id) and str(operand.name) in self.address_taken and any(map(has_call, later)):
+            return self.copy(operand)
+        return operand
+
+    def assign(self, flat: ast._Expression) -> ast._Expression:
+        if isinstance(flat, ATOMS):
+            return flat
+        return self.copy(flat)
+
+    def copy(self, flat: ast._Expression) -> ast.Id:
+        temporary = self.temporaries.fresh()
+        self.declared.append(temporary)
+        self.block.append(ast.Assignment(temporary, flat))
+        return temporary
+
+def normalize(program: ast.Program) -> ast.Program:
+    temporaries = Temporaries(program_names(program))
+    return ast.Program([FunctionNormalizer(f, temporaries).result for f in program.functions])
+
+def is_normalized(program: ast.Program) -> bool:
+    """
+    모든 식의 하위 식이 피연산자 (Id, Int) 인지
+    """
+    return all(isinstance(unwrap(e), ATOMS) for e in operands(program))
+
+def operands(program: ast.Program) -> Iterator[ast._Expression]:
+    for function in program.functions:
+        stack = [*ast.as_list(function.statements, []), function.return_statement]
+        while stack:
+            stmt = stack.pop()
+            if isinstance(stmt, ast.Assignment):
+                yield from subexpressions(unwrap(stmt.expression))
+            elif isinstance(stmt, (ast.Output, ast.Return)):
+                yield stmt.expression
+            elif isinstance(stmt, (ast.DereferenceAssignment, ast.DereferenceFieldAssignment)):
+                yield stmt.target.expression
+                yield stmt.expression
+            elif isinstance(stmt, ast.FieldAssignment):
+                yield stmt.expression
+            elif isinstance(stmt, ast.If):
+                yield stmt.condition
+                stack.extend(ast.as_list(stmt.true_statements, []))
+                stack.extend(ast.as_list(stmt.false_statements, []))
+            elif isinstance(stmt, ast.While):
+                yield stmt.condition
+                stack.extend(ast.as_list(stmt.statements, []))
@@ -0,0 +1,83 @@
+"""
+큰 TIP source 입력 (mmap)
+
+    with MappedSource('big.tip') as source:
+        for function in source.functions(parser):   # 함수 하나씩 parse
+            ...
+
+read_text(path).split('\"\"\"', 1)[0] 은 파일 전체를 str 로 읽고 split 으로 한 번 더 복사한다.
+MappedSource 는 파일을 mmap 으로 열어 두고
+1. 끝의 설명 (첫 '\"\"\"' 이후) 은 mapping 에서 위치만 찾아 제외한다.
+2. 최상위 함수 경계는 mapping 위에서 바로 scan 한다. (tip_incremental.next_function, byte 단위)
+3. Lark 에는 함수 하나의 text 만 넘긴다.
+따라서 한 번에 메모리에 올라오는 text 와 parse tree 는 함수 하나 분량이다.
+"""
+import mmap
+from dataclasses import dataclass, field
+
+from lark import Lark
+
+from ir import tip_ast as ast
+from ir.tip_incremental import iter_function_spans, parse_function
+
+NOTES = b'"""'
+
+@dataclass
+class MappedSource:
+    path: str
+
+    mapping: mmap.mmap = field(init=False, default=None)
+    end: int = field(init=False, default=0)  # 설명 시작 (없으면 파일 끝)
+
+    def __post_init__(self):
+        with open(self.path, 'rb') as f:
+            # 빈 파일은 mmap 할 수 없다.
+            if f.seek(0, 2) > 0:
+                self.mapping = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+
+        if self.mapping is not None:
+            notes = self.mapping.find(NOTES)
+            self.end = len(self.mapping) if notes < 0 else notes
+
+    def close(self):
+        if self.mapping is not None:
+            self.mapping.close()
+            self.mapping = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def spans(self):
+        """
+        최상위 함수의 (start, end) byte 위치
+        """
+        if self.mapping is None:
+            return iter(())
+        return iter_function_spans(self.mapping, 0, self.end)
+
+    def text(self, span: tuple[int, int]) -> str:
+        start, end = span
+        return self.mapping[start:end].decode('utf-8')
+
+    def read(self) -> str:
+        """
+        설명을 뺀 program 전체 (한 번에 parse 할 때)
+        """
+        return '' if self.mapping is None else self.mapping[:self.end].decode('utf-8')
+
+    def sources(self):
+        for span in self.spans():
+            yield self.text(span)
+
+    def functions(self, parser: Lark):
+        """
+        함수를 하나씩 parse 해서 돌려준다. (parser 의 start 는 'prog')
+        """
+        for source in self.sources():
+            yield parse_function(parser, source)
+
+    def program(self, parser: Lark) -> ast.Program:
+        return ast.Program(list(self.functions(parser)))
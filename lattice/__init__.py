@@ -1,3 +1,5 @@
-from . import tip_lattice
+from common.lazy import lazy_module
 
-__all__ = ["tip_lattice"]
\ No newline at end of file
+__all__ = ["tip_monotone", "tip_persistent", "tip_lattice", "tip_sccp", "tip_dataflow", "tip_demand", "tip_interprocedural", "tip_vectorized"]
+
+__getattr__ = lazy_module(__name__, __all__)
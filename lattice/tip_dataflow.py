@@ -0,0 +1,208 @@
+"""
+Bit vector dataflow analyses (liveness, reaching definitions)
+
+각 lattice 원소 (변수 집합, 정의 집합) 를 Python int 하나로 표현한다.
+- i 번째 bit = index i 의 변수 / 정의가 집합에 속함
+- join (∪) = |, gen / kill 적용 = gen | (x & ~kill)
+집합 연산이 word 단위 연산 한 번으로 끝나므로 set[str] 에 비해 훨씬 빠르다.
+
+Liveness (backward, may)
+    [[v]] = JOIN(v) \\ def(v) ∪ use(v)
+    JOIN(v) = ∪ [[w]], w ∈ succ(v)
+
+Reaching definitions (forward, may)
+    [[v]] = JOIN(v) \\ kill(v) ∪ gen(v)
+    JOIN(v) = ∪ [[w]], w ∈ pred(v)
+
+두 분석 모두 tip_monotone 의 MonotoneSolver 를 공유한다.
+"""
+from dataclasses import dataclass, field
+
+from ir import tip_cfg as cfg
+from ir import tip_ast as ast
+from lattice.tip_monotone import Analysis, Direction, Lattice, MonotoneSolver, PowersetLattice
+
+def expression_variables(expression: ast._Ast) -> set[str]:
+    """
+    expression 에서 읽는 변수 (Id) 목록
+    - &X 는 X 의 값을 읽지 않는다.
+    - FunctionCall 의 callee 가 Id 이면 함수 이름이므로 포함된다. (TIP 에서 함수도 값)
+    """
+    names = set()
+    stack = [expression]
+
+    while stack:
+        node = stack.pop()
+        if isinstance(node, ast.Id):
+            names.add(str(node.name))
+        elif isinstance(node, ast.Reference):
+            continue
+        elif isinstance(node, list):
+            stack.extend(node)
+        elif isinstance(node, ast.Field):
+            stack.append(node.Value)
+        elif isinstance(node, ast.FieldAccess):
+            # E.X 의 X 는 field 이름
+            stack.append(node.expression)
+        elif isinstance(node, ast._Ast):
+            stack.extend(ast.children(node))
+
+    return names
+
+def node_uses(node: cfg._Node) -> set[str]:
+    if isinstance(node, cfg.BranchNode):
+        return expression_variables(node.statement.condition)
+    elif not isinstance(node, cfg.NormalNode):
+        return set()
+
+    stmt = node.statement
+    if isinstance(stmt, ast.Assignment):
+        return expression_variables(stmt.expression)
+    elif isinstance(stmt, (ast.Output, ast.Return)):
+        return expression_variables(stmt.expression)
+    elif isinstance(stmt, ast.DereferenceAssignment):
+        return expression_variables(stmt.target.expression) | expression_variables(stmt.expression)
+    elif isinstance(stmt, ast.FieldAssignment):
+        # X.Y = E 는 X 의 나머지 field 를 유지하므로 X 를 읽는다.
+        return {str(stmt.id.name)} | expression_variables(stmt.expression)
+    elif isinstance(stmt, ast.DereferenceFieldAssignment):
+        return expression_variables(stmt.target.expression) | expression_variables(stmt.expression)
+
+    return set()
+
+def node_defines(node: cfg._Node) -> set[str]:
+    """
+    node 가 덮어쓰는 (kill 하는) 변수
+    - X = E: {X}
+    - var X1, ..., Xn: {X1, ..., Xn}
+    """
+    if not isinstance(node, cfg.NormalNode):
+        return set()
+
+    stmt = node.statement
+    if isinstance(stmt, ast.Assignment):
+        return {str(stmt.id.name)}
+    elif isinstance(stmt, ast.Declaration):
+        return {str(id.name) for id in stmt.ids}
+
+    return set()
+
+@dataclass
+class VariableIndex:
+    """
+    변수 이름 <-> bit 위치
+    """
+    names: list[str] = field(default_factory=list)
+    positions: dict[str, int] = field(default_factory=dict)
+
+    def add(self, name: str) -> int:
+        if name not in self.positions:
+            self.positions[name] = len(self.names)
+            self.names.append(name)
+        return self.positions[name]
+
+    def mask(self, names) -> int:
+        bits = 0
+        for name in names:
+            bits |= 1 << self.add(name)
+        return bits
+
+    def decode(self, bits: int) -> set[str]:
+        return {self.names[i] for i in iter_bits(bits)}
+
+def iter_bits(bits: int):
+    while bits:
+        low = bits & -bits
+        yield low.bit_length() - 1
+        bits ^= low
+
+@dataclass
+class BitVectorAnalysis(Analysis):
+    """
+    gen / kill 형태의 분배적 (distributive) 분석
+        f_v(x) = gen[v] | (x & ~kill[v])
+    lattice 는 PowersetLattice (int bit set), 풀이는 MonotoneSolver 가 담당한다.
+    """
+    graph: cfg.IndexedGraph
+    gen: list[int]
+    kill: list[int]
+    direction: Direction = Direction.FORWARD
+    lattice: Lattice = field(init=False, default_factory=PowersetLattice)
+
+    def transfer_function(self, node: cfg._Node):
+        i = self.graph.index[node]
+        gen, keep = self.gen[i], ~self.kill[i]
+        return lambda x: gen | (x & keep)
+
+@dataclass
+class LivenessAnalysis:
+    """
+    live(v) = node v 실행 직전에 이후 읽힐 수 있는 변수 집합
+    """
+    target_cfg: cfg._Node
+
+    graph: cfg.IndexedGraph = field(init=False, default=None)
+    variables: VariableIndex = field(init=False, default_factory=VariableIndex)
+    solver: MonotoneSolver = field(init=False, default=None)
+
+    def __post_init__(self):
+        self.graph = cfg.IndexedGraph(self.target_cfg)
+        gen = [self.variables.mask(node_uses(n)) for n in self.graph.nodes]
+        kill = [self.variables.mask(node_defines(n)) for n in self.graph.nodes]
+        analysis = BitVectorAnalysis(self.graph, gen, kill, Direction.BACKWARD)
+        self.solver = MonotoneSolver(analysis, self.target_cfg, graph=self.graph)
+
+    def live_in(self, node: cfg._Node) -> set[str]:
+        return self.variables.decode(self.solver.before[self.graph.index[node]])
+
+    def live_out(self, node: cfg._Node) -> set[str]:
+        return self.variables.decode(self.solver.after[self.graph.index[node]])
+
+@dataclass
+class ReachingDefinitionsAnalysis:
+    """
+    reaching(v) = node v 실행 직후에 도달할 수 있는 대입문 (X = E) 집합
+    - 정의 d 의 bit 위치는 definitions 의 index
+    """
+    target_cfg: cfg._Node
+
+    graph: cfg.IndexedGraph = field(init=False, default=None)
+    definitions: list[int] = field(init=False, default_factory=list)
+    solver: MonotoneSolver = field(init=False, default=None)
+
+    def __post_init__(self):
+        self.graph = cfg.IndexedGraph(self.target_cfg)
+
+        defined_by = {}
+        definition_of = {}
+        for i, node in enumerate(self.graph.nodes):
+            if isinstance(node, cfg.NormalNode) and isinstance(node.statement, ast.Assignment):
+                name = str(node.statement.id.name)
+                bit = 1 << len(self.definitions)
+                definition_of[i] = (name, bit)
+                defined_by[name] = defined_by.get(name, 0) | bit
+                self.definitions.append(i)
+
+        n = len(self.graph)
+        gen = [0] * n
+        kill = [0] * n
+        for i, (name, bit) in definition_of.items():
+            gen[i] = bit
+            kill[i] = defined_by[name]
+
+        # var X 는 이전의 모든 X 정의를 무효화한다.
+        for i, node in enumerate(self.graph.nodes):
+            if isinstance(node, cfg.NormalNode) and isinstance(node.statement, ast.Declaration):
+                for id in node.statement.ids:
+                    kill[i] |= defined_by.get(str(id.name), 0)
+
+        analysis = BitVectorAnalysis(self.graph, gen, kill, Direction.FORWARD)
+        self.solver = MonotoneSolver(analysis, self.target_cfg, graph=self.graph)
+
+    def reaching(self, node: cfg._Node) -> list[cfg._Node]:
+        bits = self.solver.after[self.graph.index[node]]
+        return [self.graph.nodes[self.definitions[i]] for i in iter_bits(bits)]
+
+    def reaching_in(self, node: cfg._Node) -> list[cfg._Node]:
+        bits = self.solver.before[self.graph.index[node]]
+        return [self.graph.nodes[self.definitions[i]] for i in iter_bits(bits)]
@@ -0,0 +1,334 @@
+"""
+Demand-driven sign analysis
+
+"output 문 v 에서 x 의 sign 은?" 처럼 (node, 변수) 하나를 물으면
+그 답이 의존하는 (node, 변수) 만 거꾸로 찾아서 푼다. (FixedPointSolver 는 모든 node 의 state 를 계산한다.)
+
+sign analysis 의 state 는 변수별 map 이고 transfer function 은 변수마다 따로 쓸 수 있으므로
+[[v]]_out 대신 변수 하나의 값 x@v 를 미지수로 둔다.
+    x@entry = ㅜ (x 가 parameter), 없음 (그 외)
+    X = E 에서 X@v = eval(E), E 가 읽는 Y 는 Y@pred(v) 의 join
+    var X 에서 X@v = ㅜ
+    *E1 = E2 에서 X@v = X@pred(v) ⊔ eval(E2), X ∈ pt(E1)
+    함수 호출이 있는 v 에서 주소가 있는 X 는 먼저 ㅜ (v 의 식도 X 를 ㅜ 로 읽는다.)
+    그 외 x@v = x@pred(v) 의 join
+
+query(v, x)
+1. x@v 에서 의존하는 미지수를 따라가며 cone (아직 답을 모르는 미지수) 을 모은다.
+   이미 푼 미지수 (memo) 에서는 멈춘다.
+2. cone 만 worklist 로 푼다. (의존하는 쪽이 먼저 오도록 DFS postorder 순서)
+3. cone 은 의존 관계에 대해 닫혀 있으므로 푼 값은 모두 최종값이고 memo 에 남긴다.
+비용은 x 의 정의를 거슬러 올라가는 slice 크기에 비례한다.
+
+값 "없음" (None) 은 FixedPointSolver 의 state 에 변수가 없는 경우이다. (join 의 항등원, 읽으면 ㅜ)
+cone 의 미지수는 "아직 도달하지 않음" (UNREACHED, state 가 ㅗ) 에서 시작한다.
+UNREACHED 는 join 의 항등원이고 식에서 읽으면 ㅗ 이므로 반복은 FixedPointSolver 처럼 ㅗ 에서 올라간다.
+(없음 에서 시작하면 loop 의 back edge 를 처음 읽을 때 ㅜ 가 되어 내려오지 않는다.)
+executable_edges (SparseConditionalConstantSolver 결과) 가 주어지면 실행 불가능한 node 는 ㅗ state 이므로
+모든 변수가 UNREACHED 이고 (질의의 답은 None), 실행 불가능한 edge 는 따라가지 않는다.
+"""
+import heapq
+from dataclasses import dataclass, field
+
+from ir import tip_ast as ast
+from ir import tip_cfg as cfg
+from lattice.tip_lattice import SignAnalysis, SignLattice, compile_expression, join_sign
+
+# transfer 종류
+PASS, DEFINE, WEAK = range(3)
+
+class _Unreached:
+    """
+    아직 도달하지 않은 미지수 (pred 의 state 가 모두 ㅗ)
+    """
+    def __repr__(self):
+        return 'UNREACHED'
+
+UNREACHED = _Unreached()
+
+def join_value(a, b):
+    """
+    UNREACHED ⊑ 없음 (None) ⊑ sign
+    """
+    if a is UNREACHED or a is None and b is not UNREACHED:
+        return b
+    if b is UNREACHED or b is None:
+        return a
+    return join_sign(a, b)
+
+def sign_uses(value, targets=None) -> set[str]:
+    """
+    compile_expression(value, targets) 가 state 에서 읽는 변수
+    """
+    uses = set()
+    stack = [value]
+    while stack:
+        value = stack.pop()
+        if isinstance(value, ast.Id):
+            uses.add(str(value.name))
+        elif isinstance(value, (ast.Arithmetic, ast.Comparison)):
+            stack.append(value.left_expression)
+            stack.append(value.right_expression)
+        elif isinstance(value, ast.Parenthesize):
+            stack.append(value.expression)
+        elif isinstance(value, ast.Dereference) and targets is not None:
+            uses |= targets(value.expression) or set()
+    return uses
+
+@dataclass
+class NodeTransfer:
+    """
+    node 하나의 변수별 transfer
+    - defined 에 없는 변수는 PASS
+    - DEFINE: x@v = sign(state), WEAK: x@v = x@pred(v) ⊔ sign(state)
+    - clobbered: 호출이 ㅜ 로 만드는 변수 (defined 에 없으면 x@v = ㅜ, 식에서 읽어도 ㅜ)
+    state 는 uses 의 pred join 값만 담은 dict
+    uses / sign 은 처음 계산할 때 compile 한다. (canonical 은 defined 만 보고 지나간다.)
+    expression 이 None 이면 ㅜ
+    """
+    kind: int = PASS
+    defined: frozenset = frozenset()
+    expression: object = None
+    targets: object = None
+    clobbered: frozenset = frozenset()
+
+    changed: frozenset = field(init=False, default=None)
+    uses: tuple = field(init=False, default=None)
+    sign: object = field(init=False, default=None)
+
+    def __post_init__(self):
+        self.changed = self.defined | self.clobbered
+
+    def compile(self) -> 'NodeTransfer':
+        if self.uses is None:
+            if self.expression is None:
+                self.uses, self.sign = (), _top
+            else:
+                self.uses = tuple(sorted(sign_uses(self.expression, self.targets)))
+                self.sign = compile_expression(self.expression, self.targets)
+        return self
+
+def _top(state):
+    return SignLattice.TOP
+
+@dataclass
+class DemandSignSolver:
+    """
+    FixedPointSolver 와 같은 입력, query(v, x) 는 FixedPointSolver(...).fixed_point[v] 의 x 와 같다.
+    (state 가 ㅗ 이거나 x 가 없으면 None)
+    - explored: 지금까지 푼 미지수 수 (memo 크기)
+    """
+    target_cfg: cfg._Node
+    parameters: list[ast.Id] = field(default_factory=list)
+    executable_edges: set[tuple[int, int]] = None
+    points_to: object = None
+    function: str = 'main'
+    graph: cfg.IndexedGraph = None
+
+    analysis: SignAnalysis = field(init=False, default=None)
+    predecessors: list[list[int]] = field(init=False, default=None)
+    reachable: set[int] = field(init=False, default=None)
+    transfers: dict[int, NodeTransfer] = field(init=False, default_factory=dict)
+    memo: dict[tuple[int, str], object] = field(init=False, default_factory=dict)
+    aliases: dict[tuple[int, str], tuple[int, str]] = field(init=False, default_factory=dict)
+
+    def __post_init__(self):
+        if self.graph is None:
+            self.graph = cfg.IndexedGraph(self.target_cfg)
+        self.analysis = SignAnalysis(self.parameters, self.points_to, self.function)
+        self.predecessors = self.graph.predecessors
+        if self.executable_edges is not None:
+            edges = self.executable_edges
+            self.reachable = {0} | {w for _, w in edges}
+            self.predecessors = [[u for u in ps if (u, v) in edges] for v, ps in enumerate(self.predecessors)]
+
+    @property
+    def explored(self) -> int:
+        return len(self.memo)
+
+    def query(self, node: int, name: str):
+        """
+        node 실행 직후 name 의 sign
+        """
+        key = self.canonical(node, name)
+        if key not in self.memo:
+            self.solve(key)
+        value = self.memo[key]
+        return None if value is UNREACHED else value
+
+    def query_before(self, node: int, name: str):
+        """
+        node 실행 직전 name 의 sign (pred 의 join, entry 는 boundary)
+        """
+        if node == 0:
+            return self.query(0, name)
+        value = None
+        for u in self.predecessors[node]:
+            value = join_value(value, self.query(u, name))
+        return value
+
+    def query_state(self, node: int, names) -> dict:
+        return {name: self.query(node, name) for name in names}
+
+    # 의존 관계 ==========
+    def transfer(self, v: int) -> NodeTransfer:
+        transfer = self.transfers.get(v)
+        if transfer is None:
+            transfer = self.transfers[v] = self.make_transfer(self.graph.nodes[v])
+        return transfer
+
+    def make_transfer(self, node: cfg._Node) -> NodeTransfer:
+        """
+        SignAnalysis.compile_<Statement> 와 같은 해석을 변수 단위로
+        """
+        analysis = self.analysis
+        clobbered = analysis.clobbered(node)
+        if not isinstance(node, cfg.NormalNode):
+            return NodeTransfer(clobbered=clobbered)
+
+        statement = node.statement
+        targets = analysis.targets if self.points_to else None
+        if isinstance(statement, ast.Declaration):
+            return NodeTransfer(DEFINE, frozenset(str(id.name) for id in statement.ids), clobbered=clobbered)
+        if isinstance(statement, ast.Assignment):
+            return NodeTransfer(DEFINE, frozenset([str(statement.id.name)]), statement.expression, targets, clobbered)
+        if isinstance(statement, ast.DereferenceAssignment) and self.points_to is not None:
+            names = analysis.targets(statement.target.expression)
+            if names is None:
+                # 어느 변수가 바뀌는지 모르면 주소가 있는 모든 변수에 ㅜ
+                return NodeTransfer(WEAK, frozenset(self.points_to.collector.address_taken(self.function)),
+                                    clobbered=clobbered)
+            return NodeTransfer(WEAK, frozenset(names), statement.expression, analysis.targets, clobbered)
+        return NodeTransfer(clobbered=clobbered)
+
+    def canonical(self, v: int, name: str) -> tuple[int, str]:
+        """
+        v 가 name 을 그대로 넘기고 pred 가 하나뿐이면 name@v = name@pred(v) 이므로 거슬러 올라간다.
+        정의, 합류 지점, entry, 실행 불가능한 node 에서 멈춘 곳이 미지수가 된다. (memo 에는 이 미지수만 둔다.)
+        """
+        aliases = self.aliases
+        key = aliases.get((v, name))
+        if key is not None:
+            return key
+
+        predecessors = self.predecessors
+        reachable = self.reachable
+        walked = []
+        while v != 0 and (reachable is None or v in reachable):
+            preds = predecessors[v]
+            if len(preds) != 1 or name in self.transfer(v).changed:
+                break
+            walked.append(v)
+            v = preds[0]
+            key = aliases.get((v, name))
+            if key is not None:
+                break
+        if key is None:
+            key = (v, name)
+        # 지나온 node 도 같은 미지수 (다음 질의에서 다시 걷지 않도록)
+        for u in walked:
+            aliases[u, name] = key
+        return key
+
+    def inputs(self, key: tuple[int, str]) -> dict[str, list[tuple[int, str]]]:
+        """
+        key 를 계산할 때 읽는 변수 y -> y@pred(v) 의 미지수들
+        """
+        v, name = key
+        if v == 0 or (self.reachable is not None and v not in self.reachable):
+            return {}
+
+        transfer = self.transfer(v)
+        if name not in transfer.changed:
+            reads = (name,)
+        elif name not in transfer.defined:
+            reads = ()
+        elif transfer.compile().kind == WEAK:
+            reads = (name, *transfer.uses)
+        else:
+            reads = transfer.uses
+        preds = self.predecessors[v]
+        return {y: [self.canonical(u, y) for u in preds] for y in reads if y not in transfer.clobbered}
+
+    def evaluate(self, key: tuple[int, str], inputs: dict, values: dict):
+        v, name = key
+        if v == 0:
+            return SignLattice.TOP if any(str(p.name) == name for p in self.parameters) else None
+        if self.reachable is not None and v not in self.reachable:
+            return UNREACHED
+
+        def before(y):
+            value = UNREACHED
+            for source in inputs[y]:
+                value = join_value(value, values[source])
+            return value
+
+        transfer = self.transfer(v)
+        if name not in transfer.changed:
+            return before(name)
+        if name not in transfer.defined:
+            return SignLattice.TOP
+
+        state = {}
+        for y in transfer.compile().uses:
+            value = SignLattice.TOP if y in transfer.clobbered else before(y)
+            if value is UNREACHED:
+                state[y] = SignLattice.BOTTOM
+            elif value is not None:
+                state[y] = value
+        sign = transfer.sign(state)
+        if transfer.kind == WEAK:
+            # 없는 변수는 ㅗ 로 join (SignAnalysis.compile_DereferenceAssignment)
+            value = SignLattice.TOP if name in transfer.clobbered else before(name)
+            return join_sign(SignLattice.BOTTOM if value is None or value is UNREACHED else value, sign)
+        return sign
+
+    # 풀기 ==========
+    def solve(self, query: tuple[int, str]):
+        memo = self.memo
+
+        # 1. cone 을 DFS postorder 로 모은다.
+        order = []
+        inputs = {}
+
+        def sources(key):
+            inputs[key] = self.inputs(key)
+            return iter([source for group in inputs[key].values() for source in group])
+
+        visited = {query}
+        stack = [(query, sources(query))]
+        while stack:
+            key, pending = stack[-1]
+            for source in pending:
+                if source not in visited and source not in memo:
+                    visited.add(source)
+                    stack.append((source, sources(source)))
+                    break
+            else:
+                stack.pop()
+                order.append(key)
+
+        # 2. cone 안에서 거꾸로 (값이 바뀌면 다시 계산할 미지수)
+        dependents = {key: [] for key in order}
+        for key in order:
+            for group in inputs[key].values():
+                for source in group:
+                    if source in dependents:
+                        dependents[source].append(key)
+
+        # memo 와 같은 dict 에서 풀면 evaluate 가 cone 밖의 값도 그대로 읽는다.
+        for key in order:
+            memo[key] = UNREACHED
+        rank = {key: i for i, key in enumerate(order)}
+        worklist = list(range(len(order)))
+        queued = set(order)
+        while worklist:
+            key = order[heapq.heappop(worklist)]
+            queued.discard(key)
+            value = self.evaluate(key, inputs[key], memo)
+            if value != memo[key]:
+                memo[key] = value
+                for dependent in dependents[key]:
+                    if dependent not in queued:
+                        queued.add(dependent)
+                        heapq.heappush(worklist, rank[dependent])
@@ -0,0 +1,319 @@
+"""
+Interprocedural sign analysis (함수 요약, functional approach)
+
+함수 f 의 요약: 인자 sign tuple (문맥) -> 반환값 sign
+    summaries[(f, (s1, ..., sn))] = ⊔ [[return E]]
+
+- 문맥 하나는 f 의 CFG 를 parameter = (s1, ..., sn) 로 두고 SignAnalysis 로 한 번 푼다.
+- X = g(E1, ..., En) 은 인자의 sign 으로 요약 표를 찾는다. 표에 없는 문맥은 ㅗ 로 넣고 나중에 푼다.
+  같은 문맥의 호출은 호출 위치가 몇 개든 표를 한 번 읽을 뿐이다.
+- 요약이 바뀌면 그 요약을 읽은 문맥만 다시 푼다.
+- call graph 와 간접 호출의 callee 는 ClosureAnalysis (spa 9 장) 로 구한다.
+- worklist 는 call graph 의 SCC 를 callee 쪽부터 (reverse topological order) 꺼내므로
+  caller 는 callee 의 요약이 안정된 뒤에 풀린다. 재귀 (같은 SCC) 는 SCC 안에서 반복해 fixed point 에 도달한다.
+비용은 (함수, 문맥) 수 x 함수 크기에 비례하고 호출 위치 수와는 무관하다.
+
+한계
+- callee 가 여럿인 호출은 callee 마다 요약을 읽어 join 한다. callee 를 찾지 못한 호출은 ㅜ
+- points-to 없이 푼다. 주소가 있는 변수 (&X 의 X) 는 호출과 *E1 = E2 에서 ㅜ 로 만든다.
+  (callee 는 받은 pointer 로 caller 의 변수를 바꿀 수 있다. swap(&y, &z))
+- 호출은 X = E 의 E 안에서만 계산한다. (sign analysis 는 다른 문장의 식을 계산하지 않는다.)
+"""
+import heapq
+from dataclasses import dataclass, field
+
+from ir import tip_ast as ast
+from ir import tip_cfg as cfg
+from ir.tip_bytecode import referenced_variables
+from lattice.tip_lattice import (
+    Bottom, MapLattice, SignAnalysis, SignLattice, compile_expression, join_sign, node_has_call
+)
+from lattice.tip_monotone import MonotoneSolver
+from lattice.tip_persistent import PersistentMap
+from pointer.tip_closure import ClosureAnalysis
+
+def calls_in(node: ast._Ast):
+    return (n for n in ast.walk(node) if isinstance(n, ast.FunctionCall))
+
+def strongly_connected_components(graph: dict[str, set[str]]) -> list[list[str]]:
+    """
+    Tarjan (재귀 대신 stack), SCC 는 reverse topological order (callee 쪽이 먼저)
+    """
+    index = {}
+    low = {}
+    on_stack = set()
+    stack = []
+    components = []
+
+    for root in graph:
+        if root in index:
+            continue
+        index[root] = low[root] = len(index)
+        stack.append(root)
+        on_stack.add(root)
+        work = [(root, iter(sorted(graph[root])))]
+        while work:
+            v, successors = work[-1]
+            for w in successors:
+                if w not in index:
+                    index[w] = low[w] = len(index)
+                    stack.append(w)
+                    on_stack.add(w)
+                    work.append((w, iter(sorted(graph.get(w, ())))))
+                    break
+                if w in on_stack:
+                    low[v] = min(low[v], index[w])
+            else:
+                work.pop()
+                if work:
+                    u = work[-1][0]
+                    low[u] = min(low[u], low[v])
+                if low[v] == index[v]:
+                    component = []
+                    while True:
+                        w = stack.pop()
+                        on_stack.discard(w)
+                        component.append(w)
+                        if w == v:
+                            break
+                    components.append(component)
+    return components
+
+def context_leq(a: tuple, b: tuple) -> bool:
+    return all(join_sign(x, y) is y for x, y in zip(a, b))
+
+@dataclass
+class ContextSignAnalysis(SignAnalysis):
+    """
+    parameter 의 sign 이 context 인 SignAnalysis
+    transfer function 은 함수마다 한 번만 compile 해서 모든 문맥이 같이 쓴다.
+    (호출 closure 는 요약 표를 실행 시에 읽는다.)
+    address_taken: 함수 안에서 &X 로 주소가 만들어지는 변수, 호출과 *E1 = E2 가 ㅜ 로 만든다.
+    """
+    context: tuple = ()
+    address_taken: frozenset = frozenset()
+
+    _transfers: dict = field(init=False, default_factory=dict)
+
+    def clobbered(self, node: cfg._Node) -> frozenset[str]:
+        if self.points_to is not None:
+            return super().clobbered(node)
+        return self.address_taken if node_has_call(node) else frozenset()
+
+    def compile_DereferenceAssignment(self, node: cfg.NormalNode):
+        if self.points_to is not None or not self.address_taken:
+            return super().compile_DereferenceAssignment(node)
+
+        items = [(name, SignLattice.TOP) for name in sorted(self.address_taken)]
+
+        def transfer(x):
+            if isinstance(x, Bottom):
+                return x
+
+            new_map = x.lattice.update(items)
+
+            return x if new_map is x.lattice else MapLattice(new_map)
+        return transfer
+
+    def boundary(self):
+        return MapLattice(PersistentMap((str(p.name), sign) for p, sign in zip(self.parameters, self.context)))
+
+    def transfer_function(self, node: cfg._Node):
+        transfer = self._transfers.get(node)
+        if transfer is None:
+            transfer = self._transfers[node] = super().transfer_function(node)
+        return transfer
+
+@dataclass
+class FunctionSummary:
+    """
+    함수 하나의 CFG, analysis, return 문 (node index, 반환식 closure)
+    """
+    function: ast.Function
+    graph: cfg.IndexedGraph
+    analysis: ContextSignAnalysis
+    returns: list[tuple[int, object]]
+
+@dataclass
+class InterproceduralSignSolver:
+    """
+    roots: 모든 parameter 를 ㅜ 로 두고 시작하는 함수 (기본 main, 없으면 모든 함수)
+    - summaries[(f, context)]: 요약
+    - closure: callee 를 찾은 ClosureAnalysis (call_graph 는 closure.call_graph)
+    - components: call graph 의 SCC (callee 쪽이 먼저)
+    - analyses: 문맥 하나를 푼 횟수
+    - states[(f, context)]: 마지막으로 푼 fixed point (IndexedGraph 순서)
+    """
+    target_ast: ast.Program
+    roots: list[str] = None
+
+    functions: dict[str, ast.Function] = field(init=False, default_factory=dict)
+    closure: ClosureAnalysis = field(init=False, default=None)
+    call_graph: dict[str, set[str]] = field(init=False, default_factory=dict)
+    components: list[list[str]] = field(init=False, default_factory=list)
+    rank: dict[str, int] = field(init=False, default_factory=dict)
+    summaries: dict[tuple[str, tuple], SignLattice] = field(init=False, default_factory=dict)
+    dependents: dict[tuple, set[tuple]] = field(init=False, default_factory=dict)
+    below: dict[tuple, list[tuple]] = field(init=False, default_factory=dict)
+    contexts_of: dict[str, list[tuple]] = field(init=False, default_factory=dict)
+    states: dict[tuple, list] = field(init=False, default_factory=dict)
+    analyses: int = field(init=False, default=0)
+
+    _prepared: dict[str, FunctionSummary] = field(init=False, default_factory=dict)
+    _worklist: list = field(init=False, default_factory=list)
+    _queued: set = field(init=False, default_factory=set)
+    _current: tuple = field(init=False, default=None)
+    _pushed: int = field(init=False, default=0)
+
+    def __post_init__(self):
+        self.functions = {str(f.name.name): f for f in self.target_ast.functions}
+        self.closure = ClosureAnalysis(self.target_ast)
+        self.call_graph = self.closure.call_graph
+        self.components = strongly_connected_components(self.call_graph)
+        for i, component in enumerate(self.components):
+            for name in component:
+                self.rank[name] = i
+
+        if self.roots is None:
+            self.roots = ['main'] if 'main' in self.functions else list(self.functions)
+        for name in self.roots:
+            self.lookup(name, self.top_context(name))
+        self.solve()
+
+    def top_context(self, name: str) -> tuple:
+        return (SignLattice.TOP,) * len(ast.as_list(self.functions[name].parameters, []))
+
+    # 요약 표 ==========
+    def lookup(self, name: str, context: tuple) -> SignLattice:
+        """
+        context 와 그보다 작은 (⊑) 모든 문맥의 요약의 join
+        - 새 문맥은 ㅗ 로 넣고 worklist 에 넣는다.
+        - 작은 문맥까지 join 해야 호출 결과가 인자에 대해 단조이다.
+          (인자가 + 에서 ㅜ 로 커졌는데 아직 풀지 않은 f(ㅜ) = ㅗ 를 돌려주면 함수 안의 fixed point 계산이 끝나지 않을 수 있다.)
+        지금 푸는 문맥은 읽은 요약이 바뀌면 다시 풀린다.
+        """
+        key = (name, context)
+        if key not in self.summaries:
+            self.add_context(key)
+
+        value = SignLattice.BOTTOM
+        for smaller in self.below[key]:
+            if self._current is not None:
+                self.dependents.setdefault(smaller, set()).add(self._current)
+            value = join_sign(value, self.summaries[smaller])
+        return value
+
+    def add_context(self, key: tuple):
+        name, context = key
+        self.summaries[key] = SignLattice.BOTTOM
+        self.below[key] = [key]
+        for other in self.contexts_of.setdefault(name, []):
+            if context_leq(other[1], context):
+                self.below[key].append(other)
+            if context_leq(context, other[1]):
+                self.below[other].append(key)
+        self.contexts_of[name].append(key)
+        self.push(key)
+
+    def push(self, key: tuple):
+        if key not in self._queued:
+            self._queued.add(key)
+            self._pushed += 1
+            heapq.heappush(self._worklist, (self.rank[key[0]], self._pushed, key))
+
+    def solve(self):
+        while self._worklist:
+            _, _, key = heapq.heappop(self._worklist)
+            self._queued.discard(key)
+
+            self._current = key
+            result = self.analyze(*key)
+            self._current = None
+
+            old = self.summaries[key]
+            new = join_sign(old, result)
+            if new is not old:
+                self.summaries[key] = new
+                for dependent in self.dependents.get(key, ()):
+                    self.push(dependent)
+
+    # 문맥 하나 ==========
+    def prepare(self, name: str) -> FunctionSummary:
+        prepared = self._prepared.get(name)
+        if prepared is not None:
+            return prepared
+
+        function = self.functions[name]
+        graph = cfg.IndexedGraph(cfg.GraphBuilder(self.target_ast, name).graph)
+
+        def calls(node: ast.FunctionCall):
+            return self.compile_call(node, calls)
+
+        analysis = ContextSignAnalysis(ast.as_list(function.parameters, []), None, name, calls,
+                                       address_taken=frozenset(referenced_variables(function.statements)))
+        returns = []
+        for v, node in enumerate(graph.nodes):
+            if isinstance(node, cfg.NormalNode) and isinstance(node.statement, ast.Return):
+                returns.append((v, compile_expression(node.statement.expression, None, calls)))
+
+        prepared = self._prepared[name] = FunctionSummary(function, graph, analysis, returns)
+        return prepared
+
+    def compile_call(self, node: ast.FunctionCall, calls):
+        # closure analysis 가 인자 수가 맞는 callee 만 남긴다.
+        callees = sorted(self.closure.callees(node))
+        arguments = [compile_expression(e, None, calls) for e in ast.as_list(node.expressions, [])]
+        if not callees:
+            return SignLattice.TOP
+
+        lookup = self.lookup
+        bottom = SignLattice.BOTTOM
+
+        def call(state):
+            context = tuple(argument(state) for argument in arguments)
+            # 값이 없는 인자 (아직 ㅗ 인 요약의 결과) 로는 호출이 일어나지 않는다.
+            if bottom in context:
+                return bottom
+            value = bottom
+            for callee in callees:
+                value = join_sign(value, lookup(callee, context))
+            return value
+        return call
+
+    def analyze(self, name: str, context: tuple) -> SignLattice:
+        prepared = self.prepare(name)
+        prepared.analysis.context = context
+        solver = MonotoneSolver(prepared.analysis, prepared.graph.entry, graph=prepared.graph)
+        self.analyses += 1
+        self.states[name, context] = solver.after
+
+        result = SignLattice.BOTTOM
+        for v, sign in prepared.returns:
+            state = solver.after[v]
+            if isinstance(state, MapLattice):
+                result = join_sign(result, sign(state.lattice))
+        return result
+
+    # 결과 ==========
+    def summary(self, name: str, context: tuple = None) -> SignLattice:
+        """
+        context 가 없으면 모든 parameter 가 ㅜ 인 문맥 (필요하면 새로 푼다.)
+        """
+        if context is None:
+            context = self.top_context(name)
+        if (name, context) not in self.summaries:
+            self.add_context((name, context))
+            self.solve()
+        return self.lookup(name, context)
+
+    def fixed_point(self, name: str, context: tuple = None) -> list:
+        """
+        FixedPointSolver.fixed_point 과 같은 형태 (IndexedGraph(GraphBuilder(program, name).graph) 순서)
+        """
+        if context is None:
+            context = self.top_context(name)
+        self.summary(name, context)
+        return self.states[name, context]
+
+    def contexts(self, name: str) -> dict[tuple, SignLattice]:
+        return {context: self.summaries[name, context] for _, context in self.contexts_of.get(name, [])}
@@ -1,21 +1,35 @@
 """
 """
 from dataclasses import dataclass, field
-from enum import Enum, auto
+from enum import Enum
 
 from ir import tip_cfg as cfg
 from ir import tip_ast as ast
 from ir.tip_ast import ArithmeticOperator, ComparisonOperator
+from lattice.tip_monotone import Lattice, Analysis, MonotoneSolver
+from lattice.tip_persistent import PersistentMap
 
 
 class Top:
     def __repr__(self):
         return 'ㅜ'
 
+    def __eq__(self, other):
+        return isinstance(other, Top)
+
+    def __hash__(self):
+        return hash('top')
+
 class Bottom:
     def __repr__(self):
         return 'ㅗ'
 
+    def __eq__(self, other):
+        return isinstance(other, Bottom)
+
+    def __hash__(self):
+        return hash('bottom')
+
 class _Lattice:
     pass
 
@@ -26,15 +40,10 @@ class MapLattice(_Lattice):
     def __eq__(self, other):
         if not isinstance(other, MapLattice):
             return False
+        if self is other or self.lattice is other.lattice:
+            return True
 
-        for key, value in self.lattice.items():
-            if key not in other.lattice:
-                return False
-            else:
-                if value != other.lattice[key]:
-                    return False
-
-        return True
+        return self.lattice == other.lattice
 
 @dataclass
 class ProductLattice(_Lattice):
@@ -50,116 +59,39 @@ class SignLattice(Enum):
 class State:
     pass
 
-def check_expression(base_status, value):
+def sign_of_int(value: int):
+    if value > 0:
+        return SignLattice.PLUS
+    elif value < 0:
+        return SignLattice.MINUS
+    return SignLattice.ZERO
+
+def check_expression(base_status, value, targets=None):
     """
     - Exp = Int (-, 0, +)
+    - Exp = Id: base_status(Id)
     - Exp = Input (ㅜ)
-    - Exp = Exp + Exp
-    - Exp = Exp - Exp
-    ...
-    """
-    if isinstance(value, ast.Int):
-        int_value = int(value.value)
-        if int_value > 0:
-            return SignLattice.PLUS
-        elif int_value < 0:
-            return SignLattice.MINUS
-        else:
-            return SignLattice.ZERO
-    elif isinstance(value, ast.Id):
-        return base_status.lattice[str(value.name)]
-    elif isinstance(value, ast.Input):
-        return SignLattice.TOP
-    elif isinstance(value, ast.Arithmetic):
-        if value.operator is ast.ArithmeticOperator.ADD:
-            if (check_expression(base_status, value.left_expression) == SignLattice.PLUS) and (check_expression(base_status, value.right_expression) == SignLattice.PLUS):
-                return SignLattice.PLUS
-            elif (check_expression(base_status, value.left_expression) == SignLattice.MINUS) and (check_expression(base_status, value.right_expression) == SignLattice.MINUS):
-                return SignLattice.MINUS
-            else:
-                return SignLattice.TOP
-        elif value.operator is ast.ArithmeticOperator.SUB:
-            if (check_expression(base_status, value.left_expression) == SignLattice.MINUS) and (check_expression(base_status, value.right_expression) == SignLattice.PLUS):
-                return SignLattice.MINUS
-            elif (check_expression(base_status, value.left_expression) == SignLattice.PLUS) and (check_expression(base_status, value.right_expression) == SignLattice.MINUS):
-                return SignLattice.PLUS
-            else:
-                return SignLattice.TOP
-        # ...
-
-def validate_sign(base_lattice, state):
-    new_dict = {}
-
-    if state.base_index == -1:
-        for key, value in state.state_sign.lattice.items():
-            sign: SignLattice = state.state_sign.lattice[key]
-            new_dict[key] = sign
-
-        return MapLattice(new_dict)
-    else:
-        if not isinstance(base_lattice, Bottom):
-            for key, value in state.state_sign.lattice.items():
-                sign: SignLattice = check_expression(base_lattice, value)
-                new_dict[key] = sign
-
-            for key, value in base_lattice.lattice.items():
-                if key not in new_dict:
-                    new_dict[key] = value
-
-            return MapLattice(new_dict)
-        else:
-            return Bottom()
-
-@dataclass
-class ConstraintFunction:
+    - Exp = Exp op Exp: validate_arithmetic_sign / validate_comparison_sign
+    - Exp = *Exp: targets 가 주어지면 ⊔ base_status(X), X ∈ pt(Exp)
+    - 그 외 (call, pointer, record): ㅜ
+    같은 식을 여러 번 계산할 때는 compile_expression 으로 한 번 해석해 둔다.
     """
-    f1, ..., fn : L^n -> L
-     - Sn = fn(S1, ..., Sn)
-    """
-    #input_lattices: list[_Lattice] = field(init=False, default_factory=list)
-    output_lattice: State
+    return compile_expression(value, targets)(base_status.lattice)
 
-@dataclass
-class CommonConstraintFunction:
+def sign_table(rows: list[list[SignLattice]]) -> dict[tuple[SignLattice, SignLattice], SignLattice]:
     """
-    f : L^n -> L^n
-     - f(S1, ..., Sn) = (f1(S1, ..., Sn), ..., fn(S1, ..., Sn))
+    행 / 열 순서 [ㅗ, 0, -, +, ㅜ] 의 표 -> {(l, r): 결과}
     """
-    #input_lattices: list[_Lattice] = field(init=False, default_factory=list)
-    output_lattices: list[ConstraintFunction]
-
-    def execute(self, x):
-        """
-        f1, ..., fn : L^n -> L
-        - Sn = fn(S1, ..., Sn)
-        """
-        new_x = []
-
-        # each iteration it applies all the constraint functions
-        for func in self.output_lattices:
-            base_index = func.output_lattice.base_index
-            print(base_index)
-            new_x.append(validate_sign(x[base_index], func.output_lattice))
+    order = [SignLattice.BOTTOM, SignLattice.ZERO, SignLattice.MINUS, SignLattice.PLUS, SignLattice.TOP]
+    return {(l, r): rows[i][j] for i, l in enumerate(order) for j, r in enumerate(order)}
 
-        return new_x
-
-@dataclass
-class SignState(State):
-    """
-    xi 은 i 번째 줄 직후의 변수와 요약값 매핑 상태를 표현
-    """
-    base_index: int
-    state_sign: MapLattice
-
-def validate_arithmetic_sign(l: SignLattice, arith: ArithmeticOperator, r: SignLattice):
+def _arithmetic_tables():
     plus = SignLattice.PLUS
     minus = SignLattice.MINUS
     zero = SignLattice.ZERO
     top = SignLattice.TOP
     bottom = SignLattice.BOTTOM
 
-    order = [bottom, zero, minus, plus, top]
-
     add_list = [
         [bottom, bottom, bottom, bottom, bottom],
         [bottom, zero, minus, plus, top],
@@ -189,24 +121,20 @@ def validate_arithmetic_sign(l: SignLattice, arith: ArithmeticOperator, r: SignL
         [bottom, bottom, top, top, top]
     ]
 
-    table = {
-        ArithmeticOperator.ADD: add_list,
-        ArithmeticOperator.SUB: sub_list,
-        ArithmeticOperator.MUL: mul_list,
-        ArithmeticOperator.DIV: div_list,
+    return {
+        ArithmeticOperator.ADD: sign_table(add_list),
+        ArithmeticOperator.SUB: sign_table(sub_list),
+        ArithmeticOperator.MUL: sign_table(mul_list),
+        ArithmeticOperator.DIV: sign_table(div_list),
     }
 
-    return table[arith][order.index(l)][order.index(r)]
-
-def validate_comparison_sign(l: SignLattice, com: ComparisonOperator, r: SignLattice):
+def _comparison_tables():
     plus = SignLattice.PLUS
     minus = SignLattice.MINUS
     zero = SignLattice.ZERO
     top = SignLattice.TOP
     bottom = SignLattice.BOTTOM
 
-    order = [bottom, zero, minus, plus, top]
-
     gt_list = [
         [bottom, bottom, bottom, bottom, bottom],
         [bottom, zero, plus, zero, top],
@@ -223,93 +151,257 @@ def validate_comparison_sign(l: SignLattice, com: ComparisonOperator, r: SignLat
         [bottom, top, top, top, top]
     ]
 
-    table = {
-        ComparisonOperator.GT: gt_list,
-        ArithmeticOperator.EQ: eq_list
+    return {
+        ComparisonOperator.GT: sign_table(gt_list),
+        ComparisonOperator.EQ: sign_table(eq_list)
     }
 
-    return table[com][order.index(l)][order.index(r)]
+# 연산자별 표는 import 할 때 한 번만 만든다.
+ARITHMETIC_SIGN = _arithmetic_tables()
+COMPARISON_SIGN = _comparison_tables()
+
+def validate_arithmetic_sign(l: SignLattice, arith: ArithmeticOperator, r: SignLattice):
+    return ARITHMETIC_SIGN[arith][l, r]
+
+def validate_comparison_sign(l: SignLattice, com: ComparisonOperator, r: SignLattice):
+    return COMPARISON_SIGN[com][l, r]
+
+def join_sign(a: SignLattice, b: SignLattice):
+    if a is b or b is SignLattice.BOTTOM:
+        return a
+    if a is SignLattice.BOTTOM:
+        return b
+    return SignLattice.TOP
+
+def compile_expression(value, targets=None, calls=None):
+    """
+    check_expression 을 미리 해석한 closure f(state) (state 는 MapLattice 의 lattice)
+    - Id 는 변수 이름, 연산은 연산자의 표, *E 는 pt(E) 를 compile 할 때 정해 둔다.
+    - 하위 식이 모두 상수 (Int, input, ...) 이면 compile 할 때 계산해 둔다.
+    - calls 가 주어지면 함수 호출은 calls(FunctionCall) 이 돌려주는 sign 또는 closure (interprocedural 분석)
+    실행 시에는 AST 를 보지 않는다.
+    """
+    sign = _compile_sign(value, targets, calls)
+    if isinstance(sign, SignLattice):
+        return lambda state: sign
+    return sign
+
+def _compile_sign(value, targets, calls=None):
+    """
+    상수이면 SignLattice, 아니면 closure
+    """
+    top = SignLattice.TOP
+    if isinstance(value, ast.Int):
+        return sign_of_int(int(value.value))
+    elif isinstance(value, ast.Id):
+        name = str(value.name)
+        return lambda state: state.get(name, top)
+    elif isinstance(value, (ast.Arithmetic, ast.Comparison)):
+        if isinstance(value, ast.Arithmetic):
+            table = ARITHMETIC_SIGN[value.operator]
+        else:
+            table = COMPARISON_SIGN[value.operator]
+        left = _compile_sign(value.left_expression, targets, calls)
+        right = _compile_sign(value.right_expression, targets, calls)
+
+        if isinstance(left, SignLattice) and isinstance(right, SignLattice):
+            return table[left, right]
+        if isinstance(left, SignLattice):
+            return lambda state: table[left, right(state)]
+        if isinstance(right, SignLattice):
+            return lambda state: table[left(state), right]
+        return lambda state: table[left(state), right(state)]
+    elif isinstance(value, ast.Parenthesize):
+        return _compile_sign(value.expression, targets, calls)
+    elif isinstance(value, ast.FunctionCall) and calls is not None:
+        return calls(value)
+    elif isinstance(value, ast.Dereference) and targets is not None:
+        names = targets(value.expression)
+        if not names:
+            return top
+
+        names = sorted(names)
+
+        def dereference(state):
+            sign = SignLattice.BOTTOM
+            for name in names:
+                sign = join_sign(sign, state.get(name, top))
+            return sign
+        return dereference
+
+    return top
+
+def node_has_call(node: cfg._Node) -> bool:
+    """
+    NormalNode 의 문장 또는 BranchNode 의 조건에 함수 호출이 있는가
+    """
+    if isinstance(node, cfg.BranchNode):
+        expression = node.statement.condition
+    elif isinstance(node, cfg.NormalNode):
+        expression = node.statement
+    else:
+        return False
+    return any(isinstance(n, ast.FunctionCall) for n in ast.walk(expression))
+
+class SignStateLattice(Lattice):
+    """
+    lift(Vars -> Sign)
+    - ㅗ (Bottom): 도달할 수 없는 지점
+    - MapLattice(PersistentMap): 변수별 sign, 없는 변수는 ㅗ
+    state 는 이전 state 와 구조를 공유하므로 node 마다 변수 전체를 복사하지 않는다.
+    """
+    def bottom(self):
+        return Bottom()
+
+    def join(self, a, b):
+        if isinstance(a, Bottom):
+            return b
+        if isinstance(b, Bottom):
+            return a
+
+        joined = a.lattice.merge(b.lattice, join_sign)
+        if joined is a.lattice:
+            return a
+        if joined is b.lattice:
+            return b
+
+        return MapLattice(joined)
 
 @dataclass
-class FixedPointSolver:
-    target_cfg: cfg._Node
+class SignAnalysis(Analysis):
+    """
+    - entry: [X1 -> ㅜ, ..., Xn -> ㅜ] (parameters)
+    - var X1, ..., Xn: JOIN(v)[X1 -> ㅜ, ..., Xn -> ㅜ]
+    - X = E: JOIN(v)[X -> eval(JOIN(v), E)]
+    - *E1 = E2: JOIN(v)[X -> JOIN(v)(X) ⊔ eval(JOIN(v), E2)], X ∈ pt(E1) (weak update)
+    - 그 외: JOIN(v)
+    - 함수 호출이 있는 문장 / 조건: 위의 f_v 전에 주소가 있는 모든 변수 -> ㅜ
+      (호출된 함수가 받은 주소로 *p = E 를 할 수 있다.)
+
+    각 statement 는 solve 전에 closure 로 compile 한다. (compile_<Statement>, compile_expression)
+    points_to (SteensgaardSolver / AndersenSolver) 가 없으면 *E 는 ㅜ, *E1 = E2 와 호출의 쓰기는 무시한다.
+    calls 가 없으면 함수 호출은 ㅜ (compile_expression 참고)
+    """
+    parameters: list[ast.Id] = field(default_factory=list)
+    points_to: object = None
+    function: str = 'main'
+    calls: object = None
+    lattice: Lattice = field(init=False, default_factory=SignStateLattice)
 
-    checked_node: dict = field(init=False, default_factory=dict)
-    constraint_functions: list[ConstraintFunction] = field(init=False, default_factory=list)
-    fixed_point = None
+    def targets(self, expression) -> set[str]:
+        """
+        pt(E) 중 현재 함수의 변수 이름, alloc cell 이 섞여 있거나 알 수 없으면 None
+        """
+        while isinstance(expression, ast.Parenthesize):
+            expression = expression.expression
+        if self.points_to is None or not isinstance(expression, ast.Id):
+            return None
 
-    def __post_init__(self):
-        self.visit_cfg(self.target_cfg, -1)
-        common_constraint_function = CommonConstraintFunction(self.constraint_functions)
-
-        self.fixed_point = self.naive_fixed_point_algorithm(common_constraint_function)
-
-    def make_map_lattice(self, stmt: ast._Statement):
-        map_lattice = {}
-
-        if isinstance(stmt, ast.Declaration):
-            for id in stmt.ids:
-                if id not in map_lattice:
-                    map_lattice[str(id.name)] = SignLattice.TOP
-        elif isinstance(stmt, ast.Assignment):
-            map_lattice[str(stmt.id)] = stmt.expression
-
-        return map_lattice
-
-    def visit_cfg(self, current_node, index: int):
-        if isinstance(current_node, cfg.Entry):
-            self.visit_cfg(current_node.successor, index)
-        elif isinstance(current_node, cfg.NormalNode):
-            if current_node not in self.checked_node:
-                self.checked_node[current_node] = auto()
-                self.constraint_functions.append(
-                    ConstraintFunction(
-                        SignState(
-                            index,
-                            MapLattice(self.make_map_lattice(current_node.statement))
-                        )
-                    )
-                )
-            self.visit_cfg(current_node.successor, index + 1)
-        elif isinstance(current_node, cfg.BranchNode):
-            if current_node not in self.checked_node:
-                self.checked_node[current_node] = auto()
-                self.constraint_functions.append(
-                    ConstraintFunction(
-                        SignState(
-                            index,
-                            MapLattice(self.make_map_lattice(current_node.statement))
-                        )
-                    )
-                )
-            # self.visit_cfg(current_node.true_successor) while 문에서 무한루프 가능 (처리 필요)
-            self.visit_cfg(current_node.false_successor, index + 1)
-        elif isinstance(current_node, cfg.Exit):
-            return
-
-    def check_fixed_point(self, x1, x2):
-        for a, b in zip(x1, x2):
-            if a != b:
-                return False
-
-        return True
-
-    def init_lattices(self):
-        return [Bottom() for _ in range(len(self.constraint_functions))]
-
-    def naive_fixed_point_algorithm(self, f):
+        cells = self.points_to.points_to_variable(str(expression.name), self.function)
+        if any(c.kind != 'variable' or c.function != self.function for c in cells):
+            return None
+
+        return {c.name for c in cells}
+
+    def clobbered(self, node: cfg._Node) -> frozenset[str]:
         """
-        function NaiveFixedPointAlgorithm(f):
-            x := ㅗ
-            while x ≠ f(x) do
-                x := f(x)
-            end
-            return x
-        end
+        node 의 함수 호출이 덮어쓸 수 있는 변수 (주소가 있는 모든 변수), 호출이 없으면 빈 집합
         """
-        x = self.init_lattices()
+        if self.points_to is None or not node_has_call(node):
+            return frozenset()
+        return frozenset(self.points_to.collector.address_taken(self.function))
+
+    def transfer_function(self, node: cfg._Node):
+        transfer = super().transfer_function(node)
+        clobbered = self.clobbered(node)
+        if not clobbered:
+            return transfer
+
+        items = [(name, SignLattice.TOP) for name in sorted(clobbered)]
+
+        def call(x):
+            if isinstance(x, Bottom):
+                return x
+
+            new_map = x.lattice.update(items)
 
-        while not self.check_fixed_point(x, f.execute(x)):
-            x = f.execute(x)
+            return transfer(x if new_map is x.lattice else MapLattice(new_map))
+        return call
 
-        return x
\ No newline at end of file
+    def boundary(self):
+        return MapLattice(PersistentMap((str(p.name), SignLattice.TOP) for p in self.parameters))
+
+    def compile_Declaration(self, node: cfg.NormalNode):
+        items = [(str(id.name), SignLattice.TOP) for id in node.statement.ids]
+
+        def transfer(x):
+            if isinstance(x, Bottom):
+                return x
+
+            new_map = x.lattice.update(items)
+
+            return x if new_map is x.lattice else MapLattice(new_map)
+        return transfer
+
+    def compile_Assignment(self, node: cfg.NormalNode):
+        name = str(node.statement.id.name)
+        sign = compile_expression(node.statement.expression, self.targets if self.points_to else None, self.calls)
+
+        def transfer(x):
+            if isinstance(x, Bottom):
+                return x
+
+            state = x.lattice
+            new_map = state.set(name, sign(state))
+
+            return x if new_map is state else MapLattice(new_map)
+        return transfer
+
+    def compile_DereferenceAssignment(self, node: cfg.NormalNode):
+        if self.points_to is None:
+            return lambda x: x
+
+        names = self.targets(node.statement.target.expression)
+        if names is None:
+            # 어느 변수가 바뀌는지 모르면 주소가 있는 모든 변수를 ㅜ 로 만든다.
+            names = self.points_to.collector.address_taken(self.function)
+            sign = lambda state: SignLattice.TOP
+        else:
+            sign = compile_expression(node.statement.expression, self.targets, self.calls)
+        names = sorted(names)
+        bottom = SignLattice.BOTTOM
+
+        def transfer(x):
+            if isinstance(x, Bottom):
+                return x
+
+            state = x.lattice
+            value = sign(state)
+            new_map = state.update((name, join_sign(state.get(name, bottom), value)) for name in names)
+
+            return x if new_map is state else MapLattice(new_map)
+        return transfer
+
+@dataclass
+class FixedPointSolver:
+    """
+    sign analysis 를 MonotoneSolver 로 푼다.
+    fixed_point[i] 는 IndexedGraph 의 i 번째 node 실행 직후의 상태 (0 번은 entry)
+    points_to 가 주어지면 *E 읽기와 *E1 = E2 쓰기를 points-to 결과로 해석한다. (function 은 target_cfg 의 함수 이름)
+    """
+    target_cfg: cfg._Node
+    parameters: list[ast.Id] = field(default_factory=list)
+    executable_edges: set[tuple[int, int]] = None
+    points_to: object = None
+    function: str = 'main'
+
+    solver: MonotoneSolver = field(init=False, default=None)
+    fixed_point: list = field(init=False, default=None)
+
+    def __post_init__(self):
+        self.solver = MonotoneSolver(
+            SignAnalysis(self.parameters, self.points_to, self.function),
+            self.target_cfg,
+            self.executable_edges
+        )
+        self.fixed_point = self.solver.after
@@ -0,0 +1,203 @@
+"""
+Monotone framework
+
+분석 = (lattice, 방향, node 종류별 transfer function)
+    - Lattice: bottom, join (⊔), leq (⊑)
+    - Analysis: direction (forward / backward), boundary, transfer_<Node>, transfer_<Statement> (또는 compile_<...>)
+    - MonotoneSolver: 모든 분석이 공유하는 worklist solver
+
+forward
+    [[v]]_in  = ⊔ [[w]]_out, w ∈ pred(v)
+    [[v]]_out = f_v([[v]]_in)
+backward
+    [[v]]_out = ⊔ [[w]]_in, w ∈ succ(v)
+    [[v]]_in  = f_v([[v]]_out)
+
+새 분석은 Lattice 와 Analysis 만 정의하면 되고, solver 최적화는 모든 분석에 동시에 적용된다.
+"""
+import heapq
+from dataclasses import dataclass, field
+from enum import Enum, auto
+
+from ir import tip_cfg as cfg
+
+
+class Direction(Enum):
+    FORWARD = auto()
+    BACKWARD = auto()
+
+class Lattice:
+    """
+    (L, ⊑) complete lattice
+    """
+    def bottom(self):
+        raise NotImplementedError
+
+    def join(self, a, b):
+        raise NotImplementedError
+
+    def leq(self, a, b):
+        """
+        a ⊑ b <=> a ⊔ b = b
+        """
+        return self.join(a, b) == b
+
+class PowersetLattice(Lattice):
+    """
+    (2^D, ⊆), 원소는 int bit set
+    """
+    def bottom(self):
+        return 0
+
+    def join(self, a, b):
+        return a | b
+
+    def leq(self, a, b):
+        return a & ~b == 0
+
+class Analysis:
+    """
+    transfer function 은 node 종류 (Entry, Exit, BranchNode) 또는
+    NormalNode 의 statement 종류 (Assignment, Declaration, ...) 이름으로 찾는다.
+    - transfer_Entry(node, x), transfer_Assignment(node, x), ...
+    - compile_<종류>(node) 가 있으면 그것이 f_v 를 만든다. (statement 를 미리 해석해 둔 closure)
+    - 정의되지 않은 종류는 identity
+    """
+    lattice: Lattice
+    direction: Direction = Direction.FORWARD
+
+    def boundary(self):
+        """
+        forward 분석의 entry 입력 / backward 분석의 exit 입력
+        """
+        return self.lattice.bottom()
+
+    def transfer_function(self, node: cfg._Node):
+        """
+        solve 전에 node 마다 한 번만 호출되어 f_v 를 만든다.
+        solver 의 반복문에서는 getattr / isinstance 없이 f_v 만 호출된다.
+        """
+        if isinstance(node, cfg.NormalNode):
+            name = node.statement.__class__.__name__
+        else:
+            name = node.__class__.__name__
+
+        compile = getattr(self, f'compile_{name}', None)
+        if compile is not None:
+            return compile(node)
+
+        method = getattr(self, f'transfer_{name}', None)
+        if method is None:
+            return _identity
+
+        return lambda x: method(node, x)
+
+def _identity(x):
+    return x
+
+@dataclass
+class MonotoneSolver:
+    """
+    procedure WorkListAlgorithm(f1, ..., fn):
+        (x1, ..., xn) := (ㅗ, ..., ㅗ)
+        W := {v1, ..., vn}
+        while W ≠ ∅ do
+            vi := W.removeNext()
+            y := fi(x1, ..., xn)
+            if y ≠ xi then
+                xi := y
+                for each vj ∈ dep(vi) do
+                    W.add(vj)
+                end for
+            end if
+        end while
+        return (x1, ..., xn)
+    end procedure
+
+    - W 는 reverse postorder 순위를 key 로 하는 priority queue (loop 안쪽을 먼저 안정화)
+    - executable_edges 가 주어지면 (SparseConditionalConstantSolver 결과) 실행 불가능한 edge 와 node 는 무시한다.
+    """
+    analysis: Analysis
+    target_cfg: cfg._Node
+    executable_edges: set[tuple[int, int]] = None
+    graph: cfg.IndexedGraph = None
+
+    before: list = field(init=False, default_factory=list)
+    after: list = field(init=False, default_factory=list)
+    iterations: int = field(init=False, default=0)
+
+    def __post_init__(self):
+        if self.graph is None:
+            self.graph = cfg.IndexedGraph(self.target_cfg)
+        self.solve()
+
+    def dependencies(self):
+        """
+        (sources, targets): v 의 입력을 만드는 node 목록, v 가 바뀌면 다시 계산할 node 목록
+        """
+        preds, succs = self.graph.predecessors, self.graph.successors
+        if self.executable_edges is not None:
+            preds = [[u for u in ps if (u, v) in self.executable_edges] for v, ps in enumerate(preds)]
+            succs = [[w for w in ss if (v, w) in self.executable_edges] for v, ss in enumerate(succs)]
+
+        if self.analysis.direction is Direction.FORWARD:
+            return preds, succs
+        return succs, preds
+
+    def solve(self):
+        lattice = self.analysis.lattice
+        join = lattice.join
+        bottom = lattice.bottom()
+        n = len(self.graph)
+
+        self.before = [bottom] * n
+        self.after = [bottom] * n
+        transfers = [self.analysis.transfer_function(node) for node in self.graph.nodes]
+        sources, targets = self.dependencies()
+
+        order = self.graph.reverse_postorder()
+        if self.executable_edges is not None:
+            reachable = {0} | {w for _, w in self.executable_edges}
+            order = [v for v in order if v in reachable]
+
+        if self.analysis.direction is Direction.FORWARD:
+            joined, transferred = self.before, self.after
+            boundary = {0}
+        else:
+            joined, transferred = self.after, self.before
+            order.reverse()
+            boundary = {v for v in order if not sources[v]}
+
+        rank = [0] * n
+        for i, v in enumerate(order):
+            rank[v] = i
+
+        worklist = list(range(len(order)))
+        queued = [False] * n
+        for v in order:
+            queued[v] = True
+
+        boundary_value = self.analysis.boundary()
+        iterations = 0
+        while worklist:
+            v = order[heapq.heappop(worklist)]
+            queued[v] = False
+            iterations += 1
+
+            if v in boundary:
+                x = boundary_value
+            else:
+                x = bottom
+                for s in sources[v]:
+                    x = join(x, transferred[s])
+            joined[v] = x
+
+            y = transfers[v](x)
+            if y != transferred[v]:
+                transferred[v] = y
+                for t in targets[v]:
+                    if not queued[t]:
+                        queued[t] = True
+                        heapq.heappush(worklist, rank[t])
+
+        self.iterations = iterations
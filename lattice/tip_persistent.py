@@ -0,0 +1,337 @@
+"""
+Persistent map (HAMT, hash array mapped trie)
+
+state[x -> v] 를 만들 때 dict 전체를 복사하지 않고 바뀐 경로의 node 만 새로 만든다.
+- set / remove: O(log32 n) 개의 node 만 새로 만들고 나머지 subtree 는 이전 map 과 공유
+- merge (join): 두 map 이 공유하는 subtree 는 그대로 재사용
+- ==: 같은 subtree (is) 를 만나면 내려가지 않고 바로 True
+
+            root (bitmap, children)
+           /        |          \\
+       entry      node        entry
+                 /    \\
+             entry   entry
+
+hash 를 5 bit 씩 잘라 각 level 의 child 위치를 정하고, 64 bit 를 모두 사용하면 collision node 에 모은다.
+entry 는 hash prefix 가 겹치지 않는 가장 얕은 level 에 둔다. (remove 도 이 모양을 지키므로 같은 내용이면 같은 구조)
+"""
+
+_BITS = 5
+_MASK = (1 << _BITS) - 1
+_HASH_BITS = 64
+
+
+class _Entry:
+    __slots__ = ('hash', 'key', 'value')
+
+    def __init__(self, hash, key, value):
+        self.hash = hash
+        self.key = key
+        self.value = value
+
+class _Node:
+    __slots__ = ('bitmap', 'children', 'size')
+
+    def __init__(self, bitmap, children, size):
+        self.bitmap = bitmap
+        self.children = children
+        self.size = size
+
+class _Collision:
+    __slots__ = ('hash', 'entries', 'size')
+
+    def __init__(self, hash, entries):
+        self.hash = hash
+        self.entries = entries
+        self.size = len(entries)
+
+_EMPTY = _Node(0, (), 0)
+
+def _hash(key):
+    return hash(key) & ((1 << _HASH_BITS) - 1)
+
+def _size(node):
+    return 1 if isinstance(node, _Entry) else node.size
+
+def _same_value(a, b):
+    return a is b or a == b
+
+def _make_pair(shift, e1: _Entry, e2: _Entry):
+    """
+    같은 위치에서 충돌한 두 entry 를 담는 subtree
+    """
+    if shift >= _HASH_BITS:
+        return _Collision(e1.hash, (e1, e2))
+
+    i1 = (e1.hash >> shift) & _MASK
+    i2 = (e2.hash >> shift) & _MASK
+    if i1 == i2:
+        return _Node(1 << i1, (_make_pair(shift + _BITS, e1, e2),), 2)
+    elif i1 < i2:
+        return _Node((1 << i1) | (1 << i2), (e1, e2), 2)
+    else:
+        return _Node((1 << i1) | (1 << i2), (e2, e1), 2)
+
+def _insert(node, shift, entry: _Entry, combine=None):
+    """
+    node 에 entry 를 넣은 새 node (바뀐 것이 없으면 node 자신)
+    - combine 이 주어지면 이미 있는 key 의 값은 combine(기존 값, 새 값)
+    """
+    if isinstance(node, _Entry):
+        if node.hash == entry.hash and node.key == entry.key:
+            value = entry.value if combine is None else combine(node.value, entry.value)
+            if _same_value(node.value, value):
+                return node
+            if value is entry.value:
+                return entry
+            return _Entry(node.hash, node.key, value)
+        return _make_pair(shift, node, entry)
+
+    if isinstance(node, _Collision):
+        for i, e in enumerate(node.entries):
+            if e.key == entry.key:
+                new_entry = _insert(e, shift, entry, combine)
+                if new_entry is e:
+                    return node
+                return _Collision(node.hash, node.entries[:i] + (new_entry,) + node.entries[i + 1:])
+        return _Collision(node.hash, node.entries + (entry,))
+
+    bit = 1 << ((entry.hash >> shift) & _MASK)
+    idx = (node.bitmap & (bit - 1)).bit_count()
+
+    if not node.bitmap & bit:
+        children = node.children[:idx] + (entry,) + node.children[idx:]
+        return _Node(node.bitmap | bit, children, node.size + 1)
+
+    child = node.children[idx]
+    new_child = _insert(child, shift + _BITS, entry, combine)
+    if new_child is child:
+        return node
+
+    children = node.children[:idx] + (new_child,) + node.children[idx + 1:]
+    return _Node(node.bitmap, children, node.size - _size(child) + _size(new_child))
+
+def _remove(node, shift, h, key):
+    """
+    node 에서 key 를 뺀 새 node (없으면 node 자신, 비면 None)
+    entry 하나만 남은 하위 node 는 그 entry 로 바꾼다. (insert 가 만드는 모양과 같게)
+    """
+    if isinstance(node, _Entry):
+        return None if node.hash == h and node.key == key else node
+
+    if isinstance(node, _Collision):
+        for i, e in enumerate(node.entries):
+            if e.key == key:
+                entries = node.entries[:i] + node.entries[i + 1:]
+                return entries[0] if len(entries) == 1 else _Collision(node.hash, entries)
+        return node
+
+    bit = 1 << ((h >> shift) & _MASK)
+    if not node.bitmap & bit:
+        return node
+
+    idx = (node.bitmap & (bit - 1)).bit_count()
+    child = node.children[idx]
+    new_child = _remove(child, shift + _BITS, h, key)
+    if new_child is child:
+        return node
+
+    if new_child is None:
+        bitmap = node.bitmap ^ bit
+        children = node.children[:idx] + node.children[idx + 1:]
+    else:
+        bitmap = node.bitmap
+        children = node.children[:idx] + (new_child,) + node.children[idx + 1:]
+
+    if shift:
+        if not children:
+            return None
+        if len(children) == 1 and isinstance(children[0], _Entry):
+            return children[0]
+    return _Node(bitmap, children, node.size - 1)
+
+def _merge(a, b, shift, combine):
+    """
+    a ⊔ b, 공유하는 subtree 는 방문하지 않는다.
+    combine 은 교환법칙이 성립해야 한다. (lattice join)
+    """
+    if a is b:
+        return a
+    if isinstance(b, _Entry):
+        return _insert(a, shift, b, combine)
+    if isinstance(a, _Entry):
+        return _insert(b, shift, a, combine)
+    if isinstance(a, _Collision) or isinstance(b, _Collision):
+        result = a
+        for e in (b.entries if isinstance(b, _Collision) else _iter_entries(b)):
+            result = _insert(result, shift, e, combine)
+        return result
+
+    bitmap = a.bitmap | b.bitmap
+    children = []
+    size = 0
+    same_as_a = bitmap == a.bitmap
+    same_as_b = bitmap == b.bitmap
+    ia = ib = 0
+    bits = bitmap
+
+    while bits:
+        bit = bits & -bits
+        bits ^= bit
+
+        ca = cb = None
+        if a.bitmap & bit:
+            ca = a.children[ia]
+            ia += 1
+        if b.bitmap & bit:
+            cb = b.children[ib]
+            ib += 1
+
+        if ca is None:
+            child = cb
+        elif cb is None:
+            child = ca
+        else:
+            child = _merge(ca, cb, shift + _BITS, combine)
+
+        same_as_a = same_as_a and child is ca
+        same_as_b = same_as_b and child is cb
+        children.append(child)
+        size += _size(child)
+
+    if same_as_a:
+        return a
+    if same_as_b:
+        return b
+    return _Node(bitmap, tuple(children), size)
+
+def _find(node, shift, h, key):
+    while True:
+        if isinstance(node, _Entry):
+            return node if node.hash == h and node.key == key else None
+        if isinstance(node, _Collision):
+            for e in node.entries:
+                if e.key == key:
+                    return e
+            return None
+
+        bit = 1 << ((h >> shift) & _MASK)
+        if not node.bitmap & bit:
+            return None
+        node = node.children[(node.bitmap & (bit - 1)).bit_count()]
+        shift += _BITS
+
+def _iter_entries(node):
+    stack = [node]
+    while stack:
+        node = stack.pop()
+        if isinstance(node, _Entry):
+            yield node
+        elif isinstance(node, _Collision):
+            yield from node.entries
+        else:
+            stack.extend(reversed(node.children))
+
+def _equal(a, b):
+    if a is b:
+        return True
+
+    kind = type(a)
+    if kind is not type(b):
+        return False
+    if kind is _Entry:
+        return a.key == b.key and _same_value(a.value, b.value)
+    if kind is _Collision:
+        return {e.key: e.value for e in a.entries} == {e.key: e.value for e in b.entries}
+    if a.bitmap != b.bitmap or a.size != b.size:
+        return False
+
+    for x, y in zip(a.children, b.children):
+        if x is not y and not _equal(x, y):
+            return False
+
+    return True
+
+class PersistentMap:
+    """
+    불변 map, 갱신 연산은 새 PersistentMap 을 반환한다. (바뀐 것이 없으면 self)
+    """
+    __slots__ = ('_root',)
+
+    def __init__(self, items=None, _root=_EMPTY):
+        self._root = _root
+        if items:
+            for key, value in (items.items() if hasattr(items, 'items') else items):
+                self._root = _insert(self._root, 0, _Entry(_hash(key), key, value))
+
+    def set(self, key, value) -> 'PersistentMap':
+        """
+        self[key -> value]
+        """
+        root = _insert(self._root, 0, _Entry(_hash(key), key, value))
+        return self if root is self._root else PersistentMap(_root=root)
+
+    def update(self, items) -> 'PersistentMap':
+        root = self._root
+        for key, value in (items.items() if hasattr(items, 'items') else items):
+            root = _insert(root, 0, _Entry(_hash(key), key, value))
+        return self if root is self._root else PersistentMap(_root=root)
+
+    def remove(self, key) -> 'PersistentMap':
+        """
+        key 를 뺀 map (key 가 없으면 self)
+        """
+        root = _remove(self._root, 0, _hash(key), key)
+        return self if root is self._root else PersistentMap(_root=root)
+
+    def merge(self, other: 'PersistentMap', combine) -> 'PersistentMap':
+        """
+        양쪽에 있는 key 는 combine(v1, v2), 한쪽에만 있는 key 는 그대로
+        """
+        root = _merge(self._root, other._root, 0, combine)
+        if root is self._root:
+            return self
+        if root is other._root:
+            return other
+        return PersistentMap(_root=root)
+
+    def get(self, key, default=None):
+        entry = _find(self._root, 0, _hash(key), key)
+        return default if entry is None else entry.value
+
+    def __getitem__(self, key):
+        entry = _find(self._root, 0, _hash(key), key)
+        if entry is None:
+            raise KeyError(key)
+        return entry.value
+
+    def __contains__(self, key):
+        return _find(self._root, 0, _hash(key), key) is not None
+
+    def __len__(self):
+        return self._root.size
+
+    def __iter__(self):
+        return (e.key for e in _iter_entries(self._root))
+
+    def keys(self):
+        return iter(self)
+
+    def values(self):
+        return (e.value for e in _iter_entries(self._root))
+
+    def items(self):
+        return ((e.key, e.value) for e in _iter_entries(self._root))
+
+    def __eq__(self, other):
+        if isinstance(other, PersistentMap):
+            return _equal(self._root, other._root)
+        if isinstance(other, dict):
+            return len(other) == len(self) and all(
+                key in other and _same_value(other[key], value) for key, value in self.items()
+            )
+        return False
+
+    def __repr__(self):
+        items = ', '.join(f"{key!r}: {value!r}" for key, value in self.items())
+        return f"PersistentMap({{{items}}})"
@@ -0,0 +1,252 @@
+"""
+Sparse conditional constant propagation (Wegman-Zadeck, CFG 버전)
+
+flat constant lattice
+            ㅜ
+    ... -2 -1 0 1 2 ...
+            ㅗ
+
+- ㅗ: 아직 값이 도달하지 않음 (실행 불가능한 경로)
+- n: 상수
+- ㅜ: 상수가 아님
+
+procedure SCCP(cfg):
+    executable := {(•, entry)}
+    worklist := [entry]
+    while worklist ≠ ∅ do
+        v := worklist.pop()
+        in := ⊔ { out(u) | (u, v) ∈ executable }
+        out(v) := f_v(in)
+        if v is a branch then
+            mark (v, true_succ) executable   if [[cond]] ∈ {ㅜ} ∪ (Z \\ {0})
+            mark (v, false_succ) executable  if [[cond]] ∈ {ㅜ, 0}
+        else
+            mark (v, succ) executable
+        end if
+        push every executable successor whose input changed
+    end while
+end procedure
+
+FixedPointSolver 와 달리 실행 가능한 edge 만 따라가므로,
+조건식이 상수로 접히는 If / While 의 죽은 분기는 방문조차 하지 않는다.
+"""
+from collections import deque
+from dataclasses import dataclass, field
+
+from ir import tip_cfg as cfg
+from ir import tip_ast as ast
+from ir.tip_ast import ArithmeticOperator, ComparisonOperator
+from ir.tip_bytecode import referenced_variables
+from lattice.tip_lattice import Top, Bottom
+
+TOP = Top()
+BOTTOM = Bottom()
+
+def join_constant(a, b):
+    """
+    a ⊔ b (flat lattice)
+    """
+    if a is BOTTOM:
+        return b
+    if b is BOTTOM:
+        return a
+    if a is TOP or b is TOP or a != b:
+        return TOP
+    return a
+
+def _divide(l: int, r: int):
+    # TIP 의 정수 나눗셈은 0 방향으로 버림
+    q = abs(l) // abs(r)
+    return q if (l >= 0) == (r >= 0) else -q
+
+def evaluate_constant(state: dict, value: ast._Expression):
+    """
+    - Exp = Int: n
+    - Exp = Id: state(Id), 정의되지 않았으면 ㅗ
+    - Exp = Input: ㅜ
+    - Exp = Exp op Exp: 두 피연산자가 상수이면 계산, 하나라도 ㅗ 이면 ㅗ, 그 외 ㅜ
+    - 그 외 (call, pointer, record): ㅜ
+    """
+    if isinstance(value, ast.Int):
+        return int(value.value)
+    elif isinstance(value, ast.Id):
+        return state.get(str(value.name), BOTTOM)
+    elif isinstance(value, ast.Arithmetic):
+        l = evaluate_constant(state, value.left_expression)
+        r = evaluate_constant(state, value.right_expression)
+        if l is BOTTOM or r is BOTTOM:
+            return BOTTOM
+        if value.operator is ArithmeticOperator.MUL and (l == 0 or r == 0):
+            # 0 * ㅜ = 0
+            return 0
+        if l is TOP or r is TOP:
+            return TOP
+        if value.operator is ArithmeticOperator.ADD:
+            return l + r
+        elif value.operator is ArithmeticOperator.SUB:
+            return l - r
+        elif value.operator is ArithmeticOperator.MUL:
+            return l * r
+        elif value.operator is ArithmeticOperator.DIV:
+            return TOP if r == 0 else _divide(l, r)
+    elif isinstance(value, ast.Comparison):
+        l = evaluate_constant(state, value.left_expression)
+        r = evaluate_constant(state, value.right_expression)
+        if l is BOTTOM or r is BOTTOM:
+            return BOTTOM
+        if l is TOP or r is TOP:
+            return TOP
+        if value.operator is ComparisonOperator.GT:
+            return int(l > r)
+        elif value.operator is ComparisonOperator.EQ:
+            return int(l == r)
+
+    return TOP
+
+@dataclass
+class SparseConditionalConstantSolver:
+    target_cfg: cfg._Node
+    parameters: list[ast.Id] = field(default_factory=list)
+
+    graph: cfg.IndexedGraph = field(init=False, default=None)
+    executable_edges: set[tuple[int, int]] = field(init=False, default_factory=set)
+    reachable: set[int] = field(init=False, default_factory=set)
+    constants: list[dict] = field(init=False, default_factory=list)
+
+    _address_taken: set[str] = field(init=False, default_factory=set)
+    _calls: set[cfg._Node] = field(init=False, default_factory=set)
+
+    def __post_init__(self):
+        self.graph = cfg.IndexedGraph(self.target_cfg)
+        self.constants = [None] * len(self.graph)
+        # &X 로 주소가 노출된 변수, *E = E 는 이 변수들을 덮어쓸 수 있으므로 ㅜ 로 처리해야 한다.
+        self._address_taken = referenced_variables(
+            [n.statement for n in self.graph.nodes if isinstance(n, (cfg.NormalNode, cfg.BranchNode))]
+        )
+        # 호출된 함수도 받은 주소로 (*p = E) 이 변수들을 덮어쓸 수 있다.
+        for node in self.graph.nodes:
+            if isinstance(node, cfg.BranchNode):
+                expression = node.statement.condition
+            elif isinstance(node, cfg.NormalNode):
+                expression = node.statement
+            else:
+                continue
+            if any(isinstance(n, ast.FunctionCall) for n in ast.walk(expression)):
+                self._calls.add(node)
+        self.solve()
+
+    def transfer(self, node: cfg._Node, state: dict):
+        """
+        f_v : (Var -> L) -> (Var -> L)
+        - entry: [X1 -> ㅜ, ..., Xn -> ㅜ] (parameters)
+        - var X1, ..., Xn: [Xi -> ㅜ]
+        - X = E: [X -> [[E]]]
+        - *E1 = E2: 주소가 노출된 모든 변수 -> ㅜ
+        - X.Y = E: [X -> ㅜ]
+        - 함수 호출이 있는 문장 / 조건: 먼저 주소가 노출된 모든 변수 -> ㅜ
+        """
+        if isinstance(node, cfg.Entry):
+            return {str(p.name): TOP for p in self.parameters}
+        if node in self._calls and self._address_taken:
+            state = dict(state)
+            for name in self._address_taken:
+                state[name] = TOP
+        if not isinstance(node, cfg.NormalNode):
+            return state
+
+        stmt = node.statement
+        if isinstance(stmt, ast.Declaration):
+            new_state = dict(state)
+            for id in stmt.ids:
+                new_state[str(id.name)] = TOP
+            return new_state
+        elif isinstance(stmt, ast.Assignment):
+            new_state = dict(state)
+            new_state[str(stmt.id.name)] = evaluate_constant(state, stmt.expression)
+            return new_state
+        elif isinstance(stmt, (ast.DereferenceAssignment, ast.DereferenceFieldAssignment)):
+            new_state = dict(state)
+            for name in self._address_taken:
+                new_state[name] = TOP
+            return new_state
+        elif isinstance(stmt, ast.FieldAssignment):
+            new_state = dict(state)
+            new_state[str(stmt.id.name)] = TOP
+            return new_state
+
+        return state
+
+    def executable_successors(self, v: int, state: dict):
+        """
+        BranchNode 의 경우 조건식이 상수로 접히면 한쪽 edge 만 실행 가능
+        """
+        node = self.graph.nodes[v]
+        succs = self.graph.successors[v]
+
+        if isinstance(node, cfg.BranchNode):
+            condition = evaluate_constant(state, node.statement.condition)
+            if condition is BOTTOM:
+                return []
+            elif condition is TOP:
+                return succs
+            elif condition != 0:
+                return [succs[0]]
+            else:
+                return [succs[1]]
+
+        return succs
+
+    def join_predecessors(self, v: int):
+        new_state = {}
+        for u in self.graph.predecessors[v]:
+            if (u, v) not in self.executable_edges:
+                continue
+            for key, value in self.constants[u].items():
+                new_state[key] = join_constant(new_state.get(key, BOTTOM), value)
+
+        return new_state
+
+    def solve(self):
+        worklist = deque([0])
+        queued = {0}
+        self.reachable.add(0)
+
+        while worklist:
+            v = worklist.popleft()
+            queued.discard(v)
+
+            out = self.transfer(self.graph.nodes[v], self.join_predecessors(v))
+            changed = out != self.constants[v]
+            self.constants[v] = out
+
+            for s in self.executable_successors(v, out):
+                # 새로 실행 가능해진 edge 이거나 입력이 바뀐 경우에만 다시 방문
+                if (v, s) not in self.executable_edges:
+                    self.executable_edges.add((v, s))
+                    self.reachable.add(s)
+                elif not changed:
+                    continue
+                if s not in queued:
+                    queued.add(s)
+                    worklist.append(s)
+
+    def is_reachable(self, node: cfg._Node):
+        return self.graph.index[node] in self.reachable
+
+    def is_executable(self, source: cfg._Node, target: cfg._Node):
+        return (self.graph.index[source], self.graph.index[target]) in self.executable_edges
+
+    def dead_nodes(self) -> list[cfg._Node]:
+        """
+        실행 불가능한 node 목록 (이후 분석에서 건너뛸 수 있는 부분 그래프)
+        """
+        return [n for i, n in enumerate(self.graph.nodes) if i not in self.reachable]
+
+    def constant_at(self, node: cfg._Node, name: str):
+        """
+        node 실행 직후 name 의 값 (ㅗ / 상수 / ㅜ)
+        """
+        state = self.constants[self.graph.index[node]]
+        if state is None:
+            return BOTTOM
+        return state.get(name, BOTTOM)
@@ -0,0 +1,336 @@
+"""
+여러 CFG 의 sign analysis 를 NumPy 배열 위에서 한 번에 푼다.
+
+example/ 같은 작은 프로그램은 FixedPointSolver 의 분석 자체보다 프로그램마다 드는 Python 비용
+(closure 호출, PersistentMap, worklist) 이 크다. 모든 CFG 를 struct-of-arrays 로 묶고
+transfer / join 을 모든 프로그램에 대해 배열 연산으로 계산한다.
+
+buffer
+- state[node, column]: node 실행 직후 변수의 sign code (int8), column 은 프로그램마다 변수 번호 (가장 많은 프로그램에 맞춘다.)
+- reachable[node]: ㅗ state (도달할 수 없는 node) 가 아닌지
+- node 는 프로그램을 이어 붙인 번호, 마지막 행은 sentinel (항상 ㅗ, pred 가 모자란 칸을 채운다.)
+- step 마다: node, pred index, var 선언 (행, column), 식 (상수 / 변수 읽기 / 연산자 code 와 피연산자 index), 대입 (행, column, 식)
+
+sign code 는 sign_table 순서 [ㅗ, 0, -, +, ㅜ] 에 ABSENT (state 에 없는 변수) 를 더한 6 개
+- join: ABSENT 는 항등원 (PersistentMap.merge 처럼 한쪽에만 있는 변수는 그대로), 그 외는 join_sign
+- 읽기: ABSENT 는 ㅜ
+- 연산: ARITHMETIC_SIGN / COMPARISON_SIGN 을 쌓은 표 TABLES[연산자, 왼쪽, 오른쪽]
+
+풀이는 MonotoneSolver 처럼 reverse postorder 순서 (chaotic iteration) 이다.
+k 번째 step 은 모든 프로그램의 reverse postorder k 번째 node 를 한꺼번에 계산하고,
+한 바퀴 (sweep) 동안 아무 state 도 바뀌지 않으면 모든 프로그램이 fixed point 에 도달한 것이다.
+ㅗ 에서 시작하는 단조 반복이므로 결과는 FixedPointSolver (points_to / executable_edges 없이) 와 같다.
+"""
+import time
+from dataclasses import dataclass, field
+
+import numpy as np
+
+from ir import tip_ast as ast
+from ir import tip_cfg as cfg
+from lattice.tip_lattice import (
+    ARITHMETIC_SIGN, COMPARISON_SIGN, Bottom, MapLattice, SignLattice, join_sign, sign_of_int
+)
+from lattice.tip_persistent import PersistentMap
+
+SIGNS = [SignLattice.BOTTOM, SignLattice.ZERO, SignLattice.MINUS, SignLattice.PLUS, SignLattice.TOP]
+CODE = {sign: i for i, sign in enumerate(SIGNS)}
+BOTTOM, ZERO, MINUS, PLUS, TOP = range(5)
+ABSENT = 5
+
+OPERATORS = [*ARITHMETIC_SIGN, *COMPARISON_SIGN]
+OPERATOR_CODE = {operator: i for i, operator in enumerate(OPERATORS)}
+
+def _tables() -> np.ndarray:
+    tables = np.zeros((len(OPERATORS), 5, 5), dtype=np.int8)
+    for i, operator in enumerate(OPERATORS):
+        table = ARITHMETIC_SIGN.get(operator) or COMPARISON_SIGN[operator]
+        for (l, r), sign in table.items():
+            tables[i, CODE[l], CODE[r]] = CODE[sign]
+    return tables
+
+def _join_table() -> np.ndarray:
+    join = np.zeros((6, 6), dtype=np.int8)
+    for a in range(6):
+        for b in range(6):
+            if a == ABSENT or b == ABSENT:
+                join[a, b] = b if a == ABSENT else a
+            else:
+                join[a, b] = CODE[join_sign(SIGNS[a], SIGNS[b])]
+    return join
+
+TABLES = _tables()
+JOIN = _join_table()
+READ = np.array([BOTTOM, ZERO, MINUS, PLUS, TOP, TOP], dtype=np.int8)
+
+def _array(values) -> np.ndarray:
+    return np.array(values, dtype=np.int64)
+
+def column(columns: dict[str, int], id: ast.Id) -> int:
+    return columns.setdefault(str(id.name), len(columns))
+
+@dataclass
+class _Step:
+    """
+    reverse postorder 의 같은 위치에 있는 node 들 (행은 nodes 안의 위치)
+    """
+    nodes: np.ndarray
+    preds: np.ndarray
+    boundary: np.ndarray = None
+    declarations: tuple = None
+    constants: tuple = None
+    reads: tuple = None
+    operations: list = field(default_factory=list)
+    assignments: tuple = None
+    expressions: int = 0
+
+@dataclass
+class _StepBuilder:
+    """
+    _Step 의 배열을 Python list 로 모은다.
+    식은 preorder 대신 높이별로 (피연산자가 먼저 계산되도록) 나눈다.
+    """
+    entry: bool = False
+    nodes: list = field(default_factory=list)
+    preds: list = field(default_factory=list)
+    boundary: list = field(default_factory=list)
+    declarations: list = field(default_factory=list)
+    constants: list = field(default_factory=list)
+    reads: list = field(default_factory=list)
+    levels: list = field(default_factory=list)
+    assignments: list = field(default_factory=list)
+    expressions: int = 0
+
+    def expression(self, value, row: int, columns: dict[str, int]) -> tuple[int, int]:
+        """
+        (식 index, 높이), 하위 식이 모두 상수이면 (None, sign code)
+        _compile_sign 과 같은 해석 (Id 는 읽기, 연산은 표, 그 외는 ㅜ)
+        """
+        while isinstance(value, ast.Parenthesize):
+            value = value.expression
+
+        if isinstance(value, ast.Int):
+            return None, CODE[sign_of_int(int(value.value))]
+        if isinstance(value, ast.Id):
+            index = self.new_expression()
+            self.reads.append((index, row, column(columns, value)))
+            return index, 0
+        if isinstance(value, (ast.Arithmetic, ast.Comparison)):
+            operator = OPERATOR_CODE[value.operator]
+            left, left_height = self.expression(value.left_expression, row, columns)
+            right, right_height = self.expression(value.right_expression, row, columns)
+            if left is None and right is None:
+                return None, int(TABLES[operator, left_height, right_height])
+            height = 1 + max(0 if left is None else left_height, 0 if right is None else right_height)
+            left = self.operand(left, left_height)
+            right = self.operand(right, right_height)
+            index = self.new_expression()
+            while len(self.levels) < height:
+                self.levels.append([])
+            self.levels[height - 1].append((index, operator, left, right))
+            return index, height
+        return None, TOP
+
+    def operand(self, index, value) -> int:
+        if index is not None:
+            return index
+        index = self.new_expression()
+        self.constants.append((index, value))
+        return index
+
+    def new_expression(self) -> int:
+        self.expressions += 1
+        return self.expressions - 1
+
+    def build(self, width: int) -> _Step:
+        degree = max(1, max(len(p) for p in self.preds))
+        step = _Step(_array(self.nodes), _array([p + [-1] * (degree - len(p)) for p in self.preds]))
+        if self.entry:
+            step.boundary = np.full((len(self.nodes), width), ABSENT, dtype=np.int8)
+            for row, column in self.boundary:
+                step.boundary[row, column] = TOP
+        if self.declarations:
+            step.declarations = tuple(_array(a) for a in zip(*self.declarations))
+        if self.constants:
+            index, value = zip(*self.constants)
+            step.constants = (_array(index), np.array(value, dtype=np.int8))
+        if self.reads:
+            step.reads = tuple(_array(a) for a in zip(*self.reads))
+        step.operations = [tuple(_array(a) for a in zip(*level)) for level in self.levels]
+        if self.assignments:
+            step.assignments = tuple(_array(a) for a in zip(*self.assignments))
+        step.expressions = self.expressions
+        return step
+
+@dataclass
+class BatchSignSolver:
+    """
+    FixedPointSolver(target_cfgs[i], parameters[i]) 를 모든 i 에 대해 한 번에 푼다.
+    - fixed_point(i): FixedPointSolver.fixed_point 과 같은 list (IndexedGraph 순서)
+    - sweeps: reverse postorder 를 돈 횟수
+    - pack_seconds / solve_seconds: buffer 를 만드는 데 / 반복에 걸린 시간
+    points_to / executable_edges 는 받지 않는다. (*E 는 ㅜ, *E1 = E2 는 무시)
+    """
+    target_cfgs: list[cfg._Node]
+    parameters: list[list[ast.Id]] = None
+
+    graphs: list[cfg.IndexedGraph] = field(init=False, default_factory=list)
+    names: list[list[str]] = field(init=False, default_factory=list)
+    offsets: list[int] = field(init=False, default_factory=list)
+    state: np.ndarray = field(init=False, default=None)
+    reachable: np.ndarray = field(init=False, default=None)
+    sweeps: int = field(init=False, default=0)
+    pack_seconds: float = field(init=False, default=0.0)
+    solve_seconds: float = field(init=False, default=0.0)
+
+    _steps: list[_Step] = field(init=False, default_factory=list)
+
+    def __post_init__(self):
+        if self.parameters is None:
+            self.parameters = [[] for _ in self.target_cfgs]
+        start = time.perf_counter()
+        self.pack()
+        self.pack_seconds = time.perf_counter() - start
+        self.solve()
+        self.solve_seconds = time.perf_counter() - start - self.pack_seconds
+
+    def __len__(self):
+        return len(self.graphs)
+
+    @property
+    def nodes(self) -> int:
+        return self.offsets[-1] if self.offsets else 0
+
+    def pack(self):
+        builders = []
+        offset = 0
+        normal, declaration, assignment = cfg.NormalNode, ast.Declaration, ast.Assignment
+        for entry, parameters in zip(self.target_cfgs, self.parameters):
+            graph = cfg.IndexedGraph(entry)
+            # 변수 번호는 처음 나온 순서대로 (읽기만 하는 이름도 번호를 받지만 그 column 은 항상 ABSENT)
+            columns = {str(p.name): i for i, p in enumerate(parameters)}
+            self.graphs.append(graph)
+            self.offsets.append(offset)
+            nodes, predecessors = graph.nodes, graph.predecessors
+
+            order = graph.reverse_postorder()
+            while len(builders) < len(order):
+                # 첫 step 은 모든 프로그램의 entry
+                builders.append(_StepBuilder(entry=not builders))
+            for builder, v in zip(builders, order):
+                row = len(builder.nodes)
+                builder.nodes.append(offset + v)
+                builder.preds.append([offset + u for u in predecessors[v]])
+                node = nodes[v]
+                if v == 0:
+                    builder.boundary.extend((row, columns[str(p.name)]) for p in parameters)
+                elif type(node) is normal:
+                    statement = node.statement
+                    if type(statement) is declaration:
+                        builder.declarations.extend((row, column(columns, id)) for id in statement.ids)
+                    elif type(statement) is assignment:
+                        index, value = builder.expression(statement.expression, row, columns)
+                        index = builder.operand(index, value)
+                        builder.assignments.append((row, column(columns, statement.id), index))
+            self.names.append(list(columns))
+            offset += len(graph)
+        self.offsets.append(offset)
+
+        width = max(1, max((len(names) for names in self.names), default=0))
+        sentinel = offset
+        self._steps = [builder.build(width) for builder in builders]
+        for step in self._steps:
+            step.preds[step.preds < 0] = sentinel
+        self.state = np.full((offset + 1, width), ABSENT, dtype=np.int8)
+        self.reachable = np.zeros(offset + 1, dtype=bool)
+
+    def transfer(self, step: _Step) -> tuple[np.ndarray, np.ndarray]:
+        """
+        step 의 node 들의 [[v]]_out 과 도달 가능 여부
+        """
+        out, reachable = self.state, self.reachable
+        if step.boundary is not None:
+            state = step.boundary.copy()
+            live = np.ones(len(step.nodes), dtype=bool)
+        else:
+            preds = step.preds
+            state = out[preds[:, 0]]
+            live = reachable[preds[:, 0]]
+            for j in range(1, preds.shape[1]):
+                # ㅗ state 인 pred 의 행은 모두 ABSENT 이므로 그대로 join 해도 된다.
+                state = JOIN[state, out[preds[:, j]]]
+                live = live | reachable[preds[:, j]]
+
+        if step.declarations is not None:
+            rows, columns = step.declarations
+            state[rows, columns] = TOP
+        if step.assignments is not None:
+            values = np.empty(step.expressions, dtype=np.int8)
+            if step.constants is not None:
+                index, value = step.constants
+                values[index] = value
+            if step.reads is not None:
+                index, rows, columns = step.reads
+                values[index] = READ[state[rows, columns]]
+            for index, operator, left, right in step.operations:
+                values[index] = TABLES[operator, values[left], values[right]]
+            rows, columns, roots = step.assignments
+            state[rows, columns] = values[roots]
+
+        state[~live] = ABSENT
+        return state, live
+
+    def solve(self):
+        out, reachable = self.state, self.reachable
+        changed = True
+        while changed:
+            changed = False
+            self.sweeps += 1
+            for step in self._steps:
+                state, live = self.transfer(step)
+                nodes = step.nodes
+                if not changed and not (np.array_equal(out[nodes], state) and np.array_equal(reachable[nodes], live)):
+                    changed = True
+                out[nodes] = state
+                reachable[nodes] = live
+
+    def states(self, i: int) -> list:
+        """
+        node 마다 {변수: sign} (ㅗ 이면 None), MapLattice 가 필요 없으면 fixed_point 보다 싸다.
+        """
+        graph, names, offset = self.graphs[i], self.names[i], self.offsets[i]
+        rows = self.state[offset:offset + len(graph)].tolist()
+        reachable = self.reachable[offset:offset + len(graph)].tolist()
+        return [{name: SIGNS[code] for name, code in zip(names, row) if code != ABSENT} if live else None
+                for row, live in zip(rows, reachable)]
+
+    def fixed_point(self, i: int) -> list:
+        """
+        MapLattice 는 reverse postorder 로 만들며 이미 만든 pred 의 map 에서 바뀐 변수만 고친다.
+        (FixedPointSolver 처럼 이웃한 state 가 구조를 공유한다.)
+        """
+        graph, names, offset = self.graphs[i], self.names[i], self.offsets[i]
+        rows = self.state[offset:offset + len(graph)].tolist()
+        reachable = self.reachable[offset:offset + len(graph)].tolist()
+        states = [Bottom()] * len(graph)
+        done = [False] * len(graph)
+
+        for v in graph.reverse_postorder():
+            done[v] = True
+            if not reachable[v]:
+                continue
+            row = rows[v]
+            base = next((u for u in graph.predecessors[v] if done[u] and reachable[u]), None)
+            if base is not None:
+                previous = rows[base]
+                changed = [j for j, (a, b) in enumerate(zip(previous, row)) if a != b]
+                if not changed:
+                    states[v] = states[base]
+                    continue
+                if all(row[j] != ABSENT for j in changed):
+                    states[v] = MapLattice(states[base].lattice.update((names[j], SIGNS[row[j]]) for j in changed))
+                    continue
+            states[v] = MapLattice(PersistentMap(
+                (name, SIGNS[code]) for name, code in zip(names, row) if code != ABSENT
+            ))
+        return states
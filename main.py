@@ -1,67 +1,427 @@
+"""
+TIP 분석 entry point
+
+import main 은 가볍게 유지한다.
+- 문법 (tip.lark), 기본 예제, Lark parser 는 처음 필요할 때 읽고 process 안에서 재사용한다.
+- lark 와 분석 module (type, ir, lattice) 은 해당 단계를 실행할 때 import 한다.
+"""
+from __future__ import annotations
+
 from dataclasses import dataclass, field
+from functools import lru_cache
+import os
+from contextlib import nullcontext
+from typing import TYPE_CHECKING
 
-from lark import Lark, Tree
-from pathlib import Path
-from common.printer import print_constraints, print_type_parent_relation, print_cfg, print_fixed_point_sign_analysis
-from type import tip_constraint as constraint
-from ir import tip_ast, tip_cfg
-from ir.tip_ast import get_ast
-from type.tip_constraint import ConstraintCollector
-from type.tip_unification import UnificationSolver
-from lattice.tip_lattice import FixedPointSolver
-from ir.tip_cfg import GraphBuilder
+if TYPE_CHECKING:
+    from lark import Lark, Tree
+    from common.profiler import Profiler
+    from type import tip_constraint as constraint
+    from type.tip_solution import SolvedTypes
+    from ir import tip_ast, tip_cfg
+    from ir.tip_incremental import IncrementalDocument, TextEdit, EditResult
+    from ir.tip_source import MappedSource
 
 # /spa 디렉터리 경로
-BASE_DIR = Path(__file__).resolve().parent
+BASE_DIR = os.path.dirname(os.path.realpath(__file__))
+START = 'prog'
+
+def read_text(path: str) -> str:
+    # pathlib 은 import 비용이 커서 쓰지 않는다.
+    with open(path, encoding="utf-8") as f:
+        return f.read()
+
+@lru_cache(maxsize=None)
+def load_syntax() -> str:
+    return read_text(os.path.join(BASE_DIR, "syntax", "tip.lark"))
+
+@lru_cache(maxsize=None)
+def load_default_program() -> str:
+    return read_text(os.path.join(BASE_DIR, "example", "lattice", "example1.txt")).split('"""', 1)[0]
+
+@lru_cache(maxsize=None)
+def load_parser(syntax: str = None, start: str = START) -> Lark:
+    """
+    같은 문법의 parser 는 process 안에서 한 번만 만든다.
+    """
+    from lark import Lark
+
+    return Lark(load_syntax() if syntax is None else syntax, start=start)
+
+def unification_hooks():
+    """
+    profiler 가 켜져 있을 때만 바꿔 끼우는 hot path
+    """
+    from common.profiler import Hook, counting, counting_find
+    from type.tip_unification import UnionFind
+
+    return [
+        Hook(UnionFind, 'find', counting_find),
+        Hook(UnionFind, 'union', counting('union_calls')),
+    ]
+
+def fixed_point_hooks():
+    from common.profiler import Hook, counting_transfer
+    from lattice.tip_monotone import Analysis
+
+    return [
+        Hook(Analysis, 'transfer_function', counting_transfer),
+    ]
 
 @dataclass
 class TipAnalysis:
-    START = 'prog'
+    START = START
 
-    syntax = (BASE_DIR / "syntax" / "tip.lark").read_text(encoding="utf-8")
-    program = (BASE_DIR / "example" / "lattice" / "example1.txt").read_text(encoding="utf-8").split('"""', 1)[0]
+    profiler: Profiler = None
+    syntax: str = None  # None 이면 syntax/tip.lark
+    workers: int = 1  # 2 이상이면 unification 을 component 로 나누어 process pool 에서 푼다.
+    _program: str = field(init=False, default=None)
     parser: Lark = field(init=False, default=None)
     cst: Tree = field(init=False, default=None)
     ast: tip_ast.Program = field(init=False, default=None)
     cfg: tip_cfg._Node = field(init=False, default=None)
     constraints: list[constraint.TypeEqualityConstraint] = field(init=False, default=None)
     record_fields: set[str] = field(init=False, default=None)
+    type_terms: constraint.TypeFactory = field(init=False, default=None)
     type_parent_relation: dict = field(init=False, default=None)
+    types: SolvedTypes = field(init=False, default=None)
+    fixed_point: list = field(init=False, default=None)
+    points_to: object = field(init=False, default=None)  # SteensgaardSolver / AndersenSolver
+    constants: object = field(init=False, default=None)  # SparseConditionalConstantSolver
+    interprocedural: object = field(init=False, default=None)  # InterproceduralSignSolver (요약 표를 함수 사이에서 재사용)
+    document: IncrementalDocument = field(init=False, default=None)
+    source: MappedSource = field(init=False, default=None)
+
+    @property
+    def program(self) -> str:
+        # 지정하지 않으면 source 파일 전체 또는 기본 예제
+        if self._program is None:
+            self._program = self.source.read() if self.source is not None else load_default_program()
+        return self._program
+
+    @program.setter
+    def program(self, value: str):
+        self._program = value
+
+    def phase(self, name: str, hooks=None):
+        """
+        profiler 가 없으면 아무 것도 하지 않는 context, hooks 는 profiler 가 있을 때만 만든다.
+        """
+        if self.profiler is None:
+            return nullcontext()
+        return self.profiler.phase(name, hooks() if hooks is not None else ())
+
+    def count(self, counter: str, n: int):
+        if self.profiler is not None:
+            self.profiler.count(counter, n)
 
     def set_parser(self):
-        self.parser = Lark(
-            self.syntax,
-            start = self.START
-        )
+        with self.phase('grammar'):
+            self.parser = load_parser(self.syntax, self.START)
 
     def parse_program(self):
-        self.cst = self.parser.parse(self.program)
+        with self.phase('parse'):
+            self.cst = self.parser.parse(self.program)
+            self.count('characters', len(self.program))
+
+    def build_ast(self):
+        from ir.tip_ast import get_ast
+
+        with self.phase('ast'):
+            self.ast = get_ast(self.cst)
+            self.count('functions', len(self.ast.functions))
+
+    def normalize(self):
+        from ir.tip_normalize import normalize
+
+        with self.phase('normalize'):
+            self.ast = normalize(self.ast)
+            self.cst = None
+
+    def collect_constraints(self):
+        from type.tip_constraint import ConstraintCollector
+
+        with self.phase('constraints'):
+            constraint_collector = ConstraintCollector(self.ast)
+            self.constraints = constraint_collector.constraints
+            self.record_fields = constraint_collector.record_fields
+            self.type_terms = constraint_collector.types
+            self.count('constraints', len(self.constraints))
+            self.count('record_fields', len(self.record_fields))
+
+    def solve_types(self):
+        from type.tip_partition import PartitionedUnificationSolver
+        from type.tip_solution import SolvedTypes
+        from type.tip_unification import UnificationSolver
+
+        with self.phase('unification', unification_hooks):
+            if self.workers > 1:
+                unification_solver = PartitionedUnificationSolver(self.constraints, self.record_fields, self.workers)
+                # 작은 입력은 나누지 않고 푼다. (components 가 비어 있음)
+                self.count('components', len(unification_solver.components))
+                self.count('bins', len(unification_solver.bins))
+            else:
+                unification_solver = UnificationSolver(self.constraints, self.record_fields)
+            self.type_parent_relation = unification_solver.type_parent_relation
+            self.count('unique_constraints', len(unification_solver.unique_constraints))
+            self.count('terms', len(self.type_parent_relation))
+
+        # 동치류마다 한 번 펼쳐 두고 이후 질의는 analyzer.types.type_of(node)
+        with self.phase('solved_types'):
+            self.types = SolvedTypes(self.type_parent_relation, self.type_terms)
+            self.count('classes', len(self.types.canonical))
+
+    def load_source(self, path: str):
+        """
+        path 를 mmap 으로 연다. (text 는 parse_source / program 에서 필요한 만큼만 읽는다.)
+        """
+        from ir.tip_source import MappedSource
+
+        if self.source is not None:
+            self.source.close()
+        self.source = MappedSource(path)
+        self._program = None
+
+    def stream_functions(self):
+        """
+        source 의 함수를 하나씩 parse 해서 돌려준다. 받은 쪽이 함수를 버리면 메모리는 함수 하나 분량
+        """
+        return self.source.functions(self.parser)
+
+    def parse_source(self):
+        """
+        parse_program + build_ast 를 함수 단위로 (cst 는 만들지 않는다.)
+        """
+        from ir import tip_ast as ast
+
+        with self.phase('parse'):
+            self.ast = ast.Program(list(self.stream_functions()))
+            self.cst = None
+            self.count('bytes', self.source.end)
+            self.count('functions', len(self.ast.functions))
+
+    def edit_program(self, edit: TextEdit) -> EditResult:
+        """
+        편집된 최상위 함수만 다시 parse 해서 self.ast 를 갱신한다. (parse_program + build_ast 대신)
+        cst 는 갱신하지 않으므로 None 이 된다.
+        """
+        from ir.tip_incremental import IncrementalDocument
+
+        with self.phase('incremental'):
+            if self.document is None or self.document.text != self.program:
+                # build_ast 가 만든 AST 가 있으면 재사용
+                self.document = IncrementalDocument(self.parser, self.program, self.ast)
+            result = self.document.apply(edit)
+            self.program = self.document.text
+            self.ast = self.document.program
+            self.cst = None
+            self.count('reparsed', result.reparsed)
+        return result
+
+    def build_cfg(self, function: str = 'main'):
+        from ir.tip_cfg import GraphBuilder
+
+        with self.phase('cfg'):
+            self.cfg = GraphBuilder(self.ast, function).graph
+
+    def analyse_pointers(self, kind: str = 'andersen'):
+        """
+        whole-program points-to, 이후 solve_sign / query_sign 이 *E, *E1 = E2, 호출의 쓰기를 해석할 때 쓴다.
+        - steensgaard: unification (거의 선형, 덜 정밀)
+        - andersen: inclusion (대입의 방향을 구분)
+        """
+        if kind == 'steensgaard':
+            from pointer.tip_steensgaard import SteensgaardSolver as PointsToSolver
+        else:
+            from pointer.tip_andersen import AndersenSolver as PointsToSolver
+
+        with self.phase('points_to'):
+            self.points_to = PointsToSolver(self.ast)
+            self.count('constraints', len(self.points_to.collector.constraints))
+
+    def executable_edges(self) -> set[tuple[int, int]]:
+        """
+        propagate_constants 를 지금 CFG 에서 실행했으면 실행 가능한 edge, 아니면 None (모든 edge)
+        """
+        if self.constants is None or self.constants.target_cfg is not self.cfg:
+            return None
+        return self.constants.executable_edges
+
+    def solve_sign(self, function: str = 'main'):
+        """
+        propagate_constants 결과가 있으면 SCCP 가 실행 불가능하다고 한 branch 는 join 하지 않는다.
+        """
+        from lattice.tip_lattice import FixedPointSolver
+
+        with self.phase('fixed_point', fixed_point_hooks):
+            fixed_point_solver = FixedPointSolver(self.cfg, executable_edges=self.executable_edges(),
+                                                  points_to=self.points_to, function=function)
+            self.fixed_point = fixed_point_solver.fixed_point
+            self.count('nodes', len(self.fixed_point))
+            self.count('iterations', fixed_point_solver.solver.iterations)
+
+    def propagate_constants(self, function: str = 'main'):
+        """
+        build_cfg(function) 의 CFG 에서 sparse conditional constant propagation (상수, 실행 불가능한 node)
+        """
+        from ir.tip_ast import as_list
+        from lattice.tip_sccp import SparseConditionalConstantSolver
+
+        with self.phase('sccp'):
+            parameters = next((as_list(f.parameters, []) for f in self.ast.functions if str(f.name.name) == function), [])
+            self.constants = SparseConditionalConstantSolver(self.cfg, parameters)
+            self.count('nodes', len(self.constants.graph))
+            self.count('dead', len(self.constants.dead_nodes()))
+
+    def solve_sign_interprocedural(self, function: str = 'main'):
+        """
+        solve_sign 대신 함수 요약을 쓰는 sign analysis (호출 결과를 ㅜ 대신 callee 의 요약으로)
+        """
+        from lattice.tip_interprocedural import InterproceduralSignSolver
+
+        with self.phase('interprocedural'):
+            if self.interprocedural is None or self.interprocedural.target_ast is not self.ast:
+                self.interprocedural = InterproceduralSignSolver(self.ast)
+            self.fixed_point = self.interprocedural.fixed_point(function)
+            self.count('contexts', len(self.interprocedural.summaries))
+            self.count('analyses', self.interprocedural.analyses)
+
+    def build_call_graph(self) -> dict[str, set[str]]:
+        """
+        간접 호출까지 푼 call graph (ClosureAnalysis, interprocedural 분석의 scheduling 입력)
+        """
+        from pointer.tip_closure import ClosureAnalysis
+
+        with self.phase('call_graph'):
+            closure = ClosureAnalysis(self.ast)
+            self.count('call_sites', len(closure.call_sites))
+            self.count('unresolved', closure.unresolved)
+        return closure.call_graph
+
+    def query_sign(self, names: list[str], function: str = 'main') -> list[tuple[str, str, object]]:
+        """
+        output 문마다 그 직전 names 의 sign (DemandSignSolver, 전체 fixed point 는 풀지 않는다.)
+        """
+        from ir.tip_ast import Output
+        from ir.tip_cfg import IndexedGraph, NormalNode
+        from lattice.tip_demand import DemandSignSolver
+
+        answers = []
+        with self.phase('demand'):
+            graph = IndexedGraph(self.cfg)
+            solver = DemandSignSolver(self.cfg, executable_edges=self.executable_edges(), points_to=self.points_to,
+                                      function=function, graph=graph)
+            for v, node in enumerate(graph.nodes):
+                if isinstance(node, NormalNode) and isinstance(node.statement, Output):
+                    answers.extend((str(node.statement), name, solver.query_before(v, name)) for name in names)
+            self.count('queries', len(answers))
+            self.count('explored', solver.explored)
+        return answers
+
+
+def print_profile(report: dict):
+    print('\n[Profile]')
+    for name, record in report.items():
+        memory = '' if record['peak_memory'] is None else f"{record['peak_memory'] / 1024:10.1f} KiB"
+        counters = ', '.join(f"{k}={v}" for k, v in record['counters'].items())
+        if record['runs'] > 1:
+            counters = f"runs={record['runs']}, {counters}" if counters else f"runs={record['runs']}"
+        print(f"  {name:<12} {record['wall'] * 1000:10.2f} ms {memory}  {counters}")
 
 
 if __name__ == '__main__':
-    analyzer = TipAnalysis()
+    import argparse
+    import json
+    from common.profiler import Profiler
+    from common.report import FORMATS, ReportFilter, make_writer, open_report
 
+    arg_parser = argparse.ArgumentParser()
+    arg_parser.add_argument('program', nargs='?', help='분석할 TIP 프로그램 (없으면 example/lattice/example1.txt)')
+    arg_parser.add_argument('--types', action='store_true', help='type analysis 도 실행')
+    arg_parser.add_argument('--normalize', action='store_true', help='분석 전에 3-address 형태로 정규화 (spa 2.3)')
+    arg_parser.add_argument('--workers', type=int, default=1, help='unification 을 나누어 풀 process 수')
+    arg_parser.add_argument('--profile', action='store_true', help='단계별 시간 / 메모리 / counter 출력')
+    arg_parser.add_argument('--profile-json', help='profile 결과를 JSON 으로 저장')
+    arg_parser.add_argument('--pstats', help='cProfile 결과 (pstats) 저장')
+    arg_parser.add_argument('--format', choices=FORMATS, default='text', help='report 형식 (dot 은 CFG 만)')
+    arg_parser.add_argument('-o', '--output', help='report 파일 (없으면 stdout)')
+    arg_parser.add_argument('--function', action='append', help='CFG / sign analysis 를 할 함수 (여러 번, 기본 main)')
+    arg_parser.add_argument('--interprocedural', action='store_true', help='sign analysis 에서 호출 결과를 함수 요약으로 계산')
+    arg_parser.add_argument('--call-graph', action='store_true', help='closure analysis 로 찾은 call graph 출력')
+    arg_parser.add_argument('--query', action='append', help='output 문 직전 변수의 sign 만 demand-driven 으로 계산 (여러 번)')
+    arg_parser.add_argument('--constants', action='store_true',
+                            help='sparse conditional constant propagation 결과 출력, sign analysis 는 실행 불가능한 branch 를 뺀다.')
+    arg_parser.add_argument('--points-to', choices=('steensgaard', 'andersen'),
+                            help='sign analysis 에서 포인터 (*E, *E1 = E2, 호출의 쓰기) 를 이 points-to 결과로 해석')
+    arg_parser.add_argument('--final', action='store_true', help='sign analysis 는 exit state 만 출력')
+    args = arg_parser.parse_args()
+    if args.query and args.format == 'dot':
+        arg_parser.error('--query 는 text / jsonl 로만 출력할 수 있다.')
+    if args.points_to and args.interprocedural:
+        arg_parser.error('--points-to 는 --interprocedural 과 함께 쓸 수 없다.')
+
+    profiler = None
+    if args.profile or args.profile_json or args.pstats:
+        profiler = Profiler(memory=True, cprofile=args.pstats is not None)
+
+    analyzer = TipAnalysis(profiler, workers=args.workers)
     analyzer.set_parser()
-    analyzer.parse_program()
-    analyzer.ast = get_ast(analyzer.cst)
+    if args.program:
+        # 파일은 mmap 으로 열고 함수 단위로 parse
+        analyzer.load_source(args.program)
+        analyzer.parse_source()
+    else:
+        analyzer.parse_program()
+        analyzer.build_ast()
+    if args.normalize:
+        analyzer.normalize()
 
-    # type analysis ==========
-    """
-    constraint_collector = ConstraintCollector(analyzer.ast)
-    analyzer.constraints = constraint_collector.constraints
-    analyzer.record_fields = constraint_collector.record_fields
-    print_constraints(analyzer.constraints) # 콘솔 출력
-
-    unification_solver = UnificationSolver(analyzer.constraints, analyzer.record_fields)
-    analyzer.type_parent_relation = unification_solver.type_parent_relation
-    print_type_parent_relation(analyzer.type_parent_relation) # 콘솔 출력
-    """
+    functions = args.function or ['main']
+    report_filter = ReportFilter(set(functions), args.final)
+
+    with open_report(args.output) as out:
+        writer = make_writer(args.format, out, report_filter)
+
+        # type analysis ==========
+        if args.types:
+            analyzer.collect_constraints()
+            writer.constraints(analyzer.constraints)
+
+            analyzer.solve_types()
+            writer.type_parent_relation(analyzer.type_parent_relation)
+
+        # pointer analysis ==========
+        if args.points_to:
+            analyzer.analyse_pointers(args.points_to)
+
+        # control flow analysis ==========
+        if args.call_graph:
+            writer.call_graph(analyzer.build_call_graph())
+
+        for function in functions:
+            # lattice theory ==========
+            analyzer.build_cfg(function)
+            writer.cfg(analyzer.cfg, function)
+
+            # constant propagation ==========
+            if args.constants:
+                analyzer.propagate_constants(function)
+                writer.constant_propagation(analyzer.constants, function)
 
-    # lattice theory ==========
-    graph_builder = GraphBuilder(analyzer.ast)
-    analyzer.cfg = graph_builder.graph
-    print_cfg(analyzer.cfg)
+            # Sign analysis ==========
+            if args.query:
+                writer.sign_queries(analyzer.query_sign(args.query, function), function)
+                continue
+            if args.interprocedural:
+                analyzer.solve_sign_interprocedural(function)
+            else:
+                analyzer.solve_sign(function)
+            writer.sign_analysis(analyzer.cfg, analyzer.fixed_point, function)
 
-    # Sign analysis ==========
-    fixed_point_solver = FixedPointSolver(analyzer.cfg)
-    print_fixed_point_sign_analysis(fixed_point_solver.fixed_point)
\ No newline at end of file
+    if profiler is not None:
+        print_profile(profiler.report())
+        if args.profile_json:
+            with open(args.profile_json, 'w', encoding="utf-8") as out:
+                json.dump(profiler.report(), out, indent=2)
+        if args.pstats:
+            profiler.dump_stats(args.pstats)
@@ -0,0 +1,5 @@
+from common.lazy import lazy_module
+
+__all__ = ["tip_pointer_constraint", "tip_steensgaard", "tip_andersen", "tip_closure"]
+
+__getattr__ = lazy_module(__name__, __all__)
@@ -0,0 +1,225 @@
+"""
+Andersen-style (inclusion based) points-to analysis (spa 11.2)
+
+X = alloc P:  alloc-i ∈ [[X]]
+X1 = &X2:     X2 ∈ [[X1]]
+X1 = X2:      [[X2]] ⊆ [[X1]]
+X1 = *X2:     c ∈ [[X2]] => [[c]] ⊆ [[X1]]
+*X1 = X2:     c ∈ [[X1]] => [[X2]] ⊆ [[c]]
+
+cubic algorithm 대신 constraint graph 위에서 worklist 로 푼다.
+- difference propagation: node 마다 아직 전파하지 않은 원소 (delta) 만 successor 로 보낸다.
+- cycle elimination (lazy cycle detection): edge n -> z 로 전파할 것이 없고 pt(n) = pt(z) 이면
+  z 에서 시작하는 SCC 를 찾아 하나의 node 로 합친다. (합친 node 는 UnionFind 로 관리)
+Steensgaard 보다 느리지만 대입의 방향을 구분하므로 더 정밀하다.
+"""
+from dataclasses import dataclass, field
+
+from ir import tip_ast as ast
+from type.tip_unification import UnionFind
+from pointer.tip_pointer_constraint import (
+    PointerConstraintCollector, Cell, AddressOf, Copy, Load, Store, Call
+)
+
+class _Vertex:
+    __slots__ = ('cell', 'points_to', 'delta', 'successors', 'loads', 'stores', 'calls')
+
+    def __init__(self, cell: Cell):
+        self.cell = cell
+        self.points_to = set()
+        self.delta = set()
+        self.successors = set()
+        self.loads = []
+        self.stores = []
+        self.calls = []
+
+@dataclass
+class AndersenSolver:
+    target_ast: ast.Program
+
+    collector: PointerConstraintCollector = field(init=False, default=None)
+    union_find: UnionFind = field(init=False, default_factory=UnionFind)
+    collapsed: int = field(init=False, default=0)
+    propagations: int = field(init=False, default=0)
+
+    _vertices: dict[Cell, _Vertex] = field(init=False, default_factory=dict)
+    _worklist: list[_Vertex] = field(init=False, default_factory=list)
+    _checked: set = field(init=False, default_factory=set)
+
+    def __post_init__(self):
+        self.collector = PointerConstraintCollector(self.target_ast)
+        self.build_graph()
+        self.solve()
+
+    def vertex(self, cell: Cell) -> _Vertex:
+        v = self._vertices.get(cell)
+        if v is None:
+            v = _Vertex(cell)
+            self._vertices[cell] = v
+            self.union_find.makeSet(v)
+        return v
+
+    def build_graph(self):
+        for c in self.collector.constraints:
+            if isinstance(c, AddressOf):
+                self.add_points_to(self.vertex(c.target), {self.vertex(c.cell)})
+            elif isinstance(c, Copy):
+                self.vertex(c.source).successors.add(self.vertex(c.target))
+            elif isinstance(c, Load):
+                self.vertex(c.source).loads.append(self.vertex(c.target))
+            elif isinstance(c, Store):
+                self.vertex(c.target).stores.append(self.vertex(c.source))
+            elif isinstance(c, Call):
+                arguments = [None if a is None else self.vertex(a) for a in c.arguments]
+                self.vertex(c.callee).calls.append((self.vertex(c.target), arguments))
+
+    def add_points_to(self, v: _Vertex, items):
+        new = items - v.points_to
+        if new:
+            v.points_to |= new
+            v.delta |= new
+            self._worklist.append(v)
+        return new
+
+    def add_edge(self, source: _Vertex, target: _Vertex):
+        """
+        새 edge 는 source 의 전체 집합을 전파해야 한다.
+        """
+        find = self.union_find.find
+        source, target = find(source), find(target)
+        if source is target or target in source.successors:
+            return
+        source.successors.add(target)
+        self.propagate(source, target, source.points_to)
+
+    def propagate(self, source: _Vertex, target: _Vertex, items):
+        self.propagations += 1
+        if self.add_points_to(target, items):
+            return
+
+        # lazy cycle detection
+        edge = (source, target)
+        if items and edge not in self._checked and source.points_to == target.points_to:
+            self._checked.add(edge)
+            self.collapse_cycles(target)
+
+    def collapse_cycles(self, start: _Vertex):
+        """
+        Tarjan SCC (반복문 버전), start 에서 도달 가능한 부분만 탐색
+        """
+        find = self.union_find.find
+        index = {}
+        low = {}
+        on_stack = set()
+        stack = []
+        counter = 0
+        call_stack = [(start, None)]
+
+        while call_stack:
+            v, successors = call_stack[-1]
+            if successors is None:
+                index[v] = low[v] = counter
+                counter += 1
+                stack.append(v)
+                on_stack.add(v)
+                successors = iter([find(w) for w in v.successors])
+                call_stack[-1] = (v, successors)
+
+            for w in successors:
+                if w not in index:
+                    call_stack.append((w, None))
+                    break
+                elif w in on_stack:
+                    low[v] = min(low[v], index[w])
+            else:
+                call_stack.pop()
+                if call_stack:
+                    parent = call_stack[-1][0]
+                    low[parent] = min(low[parent], low[v])
+                if low[v] == index[v]:
+                    component = []
+                    while True:
+                        w = stack.pop()
+                        on_stack.discard(w)
+                        component.append(w)
+                        if w is v:
+                            break
+                    if len(component) > 1:
+                        self.merge(component)
+
+    def merge(self, component: list[_Vertex]):
+        rep = component[0]
+        for v in component[1:]:
+            self.union_find.union(v, rep)
+            self.collapsed += 1
+
+            # 어느 한쪽에만 있던 원소는 합친 node 의 모든 edge 로 다시 전파해야 한다.
+            rep.delta |= v.delta | (v.points_to ^ rep.points_to)
+            rep.points_to |= v.points_to
+            rep.successors |= v.successors
+            rep.loads.extend(v.loads)
+            rep.stores.extend(v.stores)
+            rep.calls.extend(v.calls)
+            v.points_to = v.delta = None
+            v.successors = set()
+            v.loads = v.stores = v.calls = ()
+
+        find = self.union_find.find
+        rep.successors = {find(w) for w in rep.successors} - {rep}
+        if rep.delta:
+            self._worklist.append(rep)
+
+    def solve(self):
+        find = self.union_find.find
+        functions = self.collector.functions
+
+        while self._worklist:
+            n = find(self._worklist.pop())
+            delta = n.delta
+            if not delta:
+                continue
+            n.delta = set()
+            # merge 로 생긴 중복 / 합쳐진 node 를 대표 node 로 정리
+            n.loads = loads = list({find(t) for t in n.loads})
+            n.stores = stores = list({find(s) for s in n.stores})
+            calls, successors = n.calls, list(n.successors)
+
+            for c in delta:
+                c = find(c)
+                for t in loads:
+                    if t not in c.successors:
+                        self.add_edge(c, t)
+                for s in stores:
+                    if c not in s.successors:
+                        self.add_edge(s, c)
+                if c.cell.kind == 'function':
+                    signature = functions[c.cell.name]
+                    for result, arguments in calls:
+                        for argument, parameter in zip(arguments, signature.parameters):
+                            if argument is not None:
+                                self.add_edge(argument, self.vertex(parameter))
+                        self.add_edge(self.vertex(signature.result), result)
+
+            rep = find(n)
+            if rep is not n:
+                # 처리 도중 cycle 로 합쳐졌으면 대표 node 가 나머지 전파를 이어서 한다.
+                rep.delta |= delta
+                self._worklist.append(rep)
+                continue
+
+            for s in successors:
+                s = find(s)
+                if s is not n:
+                    self.propagate(n, s, delta)
+
+    def points_to(self, cell: Cell) -> set[Cell]:
+        v = self._vertices.get(cell)
+        if v is None:
+            return set()
+        return {c.cell for c in self.union_find.find(v).points_to}
+
+    def points_to_variable(self, name: str, function: str = 'main') -> set[Cell]:
+        return self.points_to(Cell('variable', name, function))
+
+    def may_alias(self, a: Cell, b: Cell) -> bool:
+        return bool(self.points_to(a) & self.points_to(b))
@@ -0,0 +1,67 @@
+"""
+Control flow analysis (closure analysis, spa 9 장)
+
+TIP 의 호출 E(E1, ..., En) 은 callee 가 임의의 expression 이므로 (함수 값을 담은 변수, *p, 괄호 ...)
+call graph 를 문법만으로 만들 수 없다. 각 expression 이 가질 수 있는 함수 값의 집합 [[E]] 를 구한다.
+    함수 이름 f:           {f} ⊆ [[f]]
+    X = E:                 [[E]] ⊆ [[X]]
+    E(E1, ..., En):        f ∈ [[E]] => [[Ei]] ⊆ [[fi]], [[return f]] ⊆ [[E(E1, ..., En)]]
+
+함수 값은 pointer 를 거쳐서도 흐르므로 (*p = f; g = *p; g()) PointerConstraintCollector 의 constraint 를
+그대로 쓰고 AndersenSolver 로 푼다. (함수 cell 은 points-to 집합의 원소)
+constraint 를 모두 반복해서 다시 보는 cubic algorithm (spa 9.2) 대신
+- worklist + difference propagation: 새로 들어온 함수 값만 successor 로 보낸다.
+- lazy cycle detection: 대입 cycle 을 찾으면 하나의 node 로 합친다.
+
+call graph 는 인자 수가 맞는 callee 만 남긴다. (맞지 않는 호출은 실행 시 오류)
+InterproceduralSignSolver 는 이 call graph 의 SCC 순서로 문맥을 풀고, 간접 호출도 여기서 찾은 callee 로 계산한다.
+"""
+from dataclasses import dataclass, field
+
+from ir import tip_ast as ast
+from pointer.tip_andersen import AndersenSolver
+from pointer.tip_pointer_constraint import CallSite
+
+@dataclass
+class ClosureAnalysis:
+    """
+    - call_graph[f]: f 안의 호출이 부를 수 있는 함수 (모든 함수가 key)
+    - unresolved: callee 를 하나도 찾지 못한 호출 위치 수
+    """
+    target_ast: ast.Program
+
+    solver: AndersenSolver = field(init=False, default=None)
+    call_graph: dict[str, set[str]] = field(init=False, default_factory=dict)
+    unresolved: int = field(init=False, default=0)
+
+    _callees: dict[int, set[str]] = field(init=False, default_factory=dict)
+
+    def __post_init__(self):
+        self.solver = AndersenSolver(self.target_ast)
+        functions = self.solver.collector.functions
+        self.call_graph = {name: set() for name in functions}
+
+        for site in self.call_sites:
+            callees = set()
+            if site.callee is not None:
+                arity = len(ast.as_list(site.node.expressions, []))
+                callees = {c.name for c in self.solver.points_to(site.callee)
+                           if c.kind == 'function' and len(functions[c.name].parameters) == arity}
+            # AST node 는 hash 할 수 없으므로 id 로 찾는다. (call_sites 가 node 를 붙잡고 있다.)
+            self._callees[id(site.node)] = callees
+            self.call_graph[site.function] |= callees
+            if not callees:
+                self.unresolved += 1
+
+    @property
+    def call_sites(self) -> list[CallSite]:
+        return self.solver.collector.call_sites
+
+    def callees(self, node: ast.FunctionCall) -> set[str]:
+        """
+        node 가 부를 수 있는 함수 이름 (target_ast 밖의 node 는 빈 집합)
+        """
+        return self._callees.get(id(node), set())
+
+    def edges(self) -> list[tuple[str, str]]:
+        return sorted((caller, callee) for caller, callees in self.call_graph.items() for callee in callees)
@@ -0,0 +1,315 @@
+"""
+Points-to constraint 수집
+
+spa 11 장의 pointer analysis 는 정규화된 (normalized) 문장만 다룬다.
+    X = alloc P, X1 = &X2, X1 = X2, X1 = *X2, *X1 = X2, X = null
+중첩된 expression 은 임시 cell (#n) 을 만들어 아래의 기본 constraint 로 펼친다.
+
+AddressOf   x = &c          c ∈ [[x]]
+Copy        x = y           [[y]] ⊆ [[x]]
+Load        x = *y          c ∈ [[y]] => [[c]] ⊆ [[x]]
+Store       *x = y          c ∈ [[x]] => [[y]] ⊆ [[c]]
+Call        r = f(a1, ...)  g ∈ [[f]] => [[ai]] ⊆ [[gi]], [[return g]] ⊆ [[r]]
+
+cell 종류
+- variable: 함수의 parameter / local 변수 (함수 이름으로 구분)
+- alloc: alloc expression (등장 위치마다 하나)
+- function: 함수 값 (TIP 에서는 함수 이름도 expression)
+- temp: 중첩 expression 의 중간 값
+"""
+from __future__ import annotations
+from dataclasses import dataclass, field
+from ir import tip_ast as ast
+
+@dataclass(frozen=True)
+class Cell:
+    kind: str
+    name: str
+    function: str = None
+
+    def __str__(self):
+        return self.name
+
+@dataclass(frozen=True)
+class AddressOf:
+    target: Cell
+    cell: Cell
+
+    def __str__(self):
+        return f"{self.target} = &{self.cell}"
+
+@dataclass(frozen=True)
+class Copy:
+    target: Cell
+    source: Cell
+
+    def __str__(self):
+        return f"{self.target} = {self.source}"
+
+@dataclass(frozen=True)
+class Load:
+    target: Cell
+    source: Cell
+
+    def __str__(self):
+        return f"{self.target} = *{self.source}"
+
+@dataclass(frozen=True)
+class Store:
+    target: Cell
+    source: Cell
+
+    def __str__(self):
+        return f"*{self.target} = {self.source}"
+
+@dataclass(frozen=True)
+class Call:
+    target: Cell
+    callee: Cell
+    arguments: tuple
+
+    def __str__(self):
+        args = ', '.join(str(a) for a in self.arguments)
+        return f"{self.target} = {self.callee}({args})"
+
+@dataclass(eq=False)
+class CallSite:
+    """
+    AST 의 FunctionCall 하나 (callee 가 pointer 값이 아니면 callee cell 은 None)
+    """
+    node: ast.FunctionCall
+    function: str
+    callee: Cell
+
+@dataclass
+class FunctionSignature:
+    cell: Cell
+    parameters: list[Cell]
+    result: Cell
+
+def function_locals(node: ast.Function) -> set[str]:
+    """
+    parameter, var 선언, 대입 대상 이름
+    """
+    names = {str(p.name) for p in node.parameters}
+    stack = list(node.statements)
+
+    while stack:
+        stmt = stack.pop()
+        if isinstance(stmt, ast.Declaration):
+            names.update(str(id.name) for id in stmt.ids)
+        elif isinstance(stmt, (ast.Assignment, ast.FieldAssignment)):
+            names.add(str(stmt.id.name))
+        elif isinstance(stmt, ast.If):
+            stack.extend(stmt.true_statements)
+            stack.extend(stmt.false_statements or [])
+        elif isinstance(stmt, ast.While):
+            stack.extend(stmt.statements)
+
+    return names
+
+@dataclass
+class PointerConstraintCollector:
+    target_ast: ast.Program
+
+    constraints: list = field(init=False, default_factory=list)
+    functions: dict[str, FunctionSignature] = field(init=False, default_factory=dict)
+    allocations: list[Cell] = field(init=False, default_factory=list)
+    call_sites: list[CallSite] = field(init=False, default_factory=list)
+
+    _function: str = field(init=False, default=None)
+    _locals: set[str] = field(init=False, default_factory=set)
+    _temps: int = field(init=False, default=0)
+
+    def __post_init__(self):
+        for fun in self.target_ast.functions:
+            name = str(fun.name.name)
+            self.functions[name] = FunctionSignature(
+                Cell('function', name),
+                [Cell('variable', str(p.name), name) for p in fun.parameters],
+                Cell('temp', f"{name}.return", name)
+            )
+
+        self.visit(self.target_ast)
+
+    def address_taken(self, function: str) -> set[str]:
+        """
+        function 안에서 &X 로 주소가 만들어지는 변수 이름
+        """
+        return {
+            c.cell.name for c in self.constraints
+            if isinstance(c, AddressOf) and c.cell.kind == 'variable' and c.cell.function == function
+        }
+
+    def variable(self, name: str) -> Cell:
+        return Cell('variable', name, self._function)
+
+    def temp(self) -> Cell:
+        self._temps += 1
+        return Cell('temp', f"#{self._temps}", self._function)
+
+    def visit(self, node):
+        # 노드 타입에 따라 적절한 visit 메서드 호출, expression 은 결과 cell (pointer 가 아니면 None) 을 반환
+        method_name = f'visit_{node.__class__.__name__}'
+        visitor = getattr(self, method_name)
+
+        return visitor(node)
+
+    def visit_list(self, node: list):
+        for item in node:
+            self.visit(item)
+
+    def visit_Program(self, node: ast.Program):
+        for fun in node.functions:
+            self.visit(fun)
+
+    def visit_Function(self, node: ast.Function):
+        self._function = str(node.name.name)
+        self._locals = function_locals(node)
+
+        self.visit(node.statements)
+        self.visit(node.return_statement)
+
+    # statements ==========
+    def visit_Declaration(self, node: ast.Declaration):
+        pass
+
+    def visit_Assignment(self, node: ast.Assignment):
+        """
+        X = E: [[E]] ⊆ [[X]]
+        """
+        source = self.visit(node.expression)
+        if source is not None:
+            self.constraints.append(Copy(self.variable(str(node.id.name)), source))
+
+    def visit_DereferenceAssignment(self, node: ast.DereferenceAssignment):
+        """
+        *E1 = E2: c ∈ [[E1]] => [[E2]] ⊆ [[c]]
+        """
+        target = self.visit(node.target.expression)
+        source = self.visit(node.expression)
+        if target is not None and source is not None:
+            self.constraints.append(Store(target, source))
+
+    def visit_FieldAssignment(self, node: ast.FieldAssignment):
+        """
+        X.Y = E: field 를 구분하지 않으므로 (field-insensitive) [[E]] ⊆ [[X]]
+        """
+        source = self.visit(node.expression)
+        if source is not None:
+            self.constraints.append(Copy(self.variable(str(node.id.name)), source))
+
+    def visit_DereferenceFieldAssignment(self, node: ast.DereferenceFieldAssignment):
+        target = self.visit(node.target.expression)
+        source = self.visit(node.expression)
+        if target is not None and source is not None:
+            self.constraints.append(Store(target, source))
+
+    def visit_Output(self, node: ast.Output):
+        self.visit(node.expression)
+
+    def visit_Return(self, node: ast.Return):
+        """
+        return E: [[E]] ⊆ [[f.return]]
+        """
+        source = self.visit(node.expression)
+        if source is not None:
+            self.constraints.append(Copy(self.functions[self._function].result, source))
+
+    def visit_If(self, node: ast.If):
+        self.visit(node.condition)
+        self.visit(node.true_statements)
+        if node.false_statements:
+            self.visit(node.false_statements)
+
+    def visit_While(self, node: ast.While):
+        self.visit(node.condition)
+        self.visit(node.statements)
+
+    # expressions ==========
+    def visit_Id(self, node: ast.Id):
+        name = str(node.name)
+        if name in self.functions and name not in self._locals:
+            # 함수 이름: 함수 cell 의 주소
+            t = self.temp()
+            self.constraints.append(AddressOf(t, self.functions[name].cell))
+            return t
+
+        return self.variable(name)
+
+    def visit_Reference(self, node: ast.Reference):
+        """
+        &X: X ∈ [[&X]]
+        """
+        t = self.temp()
+        self.constraints.append(AddressOf(t, self.variable(str(node.id.name))))
+        return t
+
+    def visit_Allocation(self, node: ast.Allocation):
+        """
+        alloc E: alloc-i ∈ [[alloc E]]
+        """
+        self.visit(node.expression)
+        cell = Cell('alloc', f"alloc-{len(self.allocations)}")
+        self.allocations.append(cell)
+
+        t = self.temp()
+        self.constraints.append(AddressOf(t, cell))
+        return t
+
+    def visit_Dereference(self, node: ast.Dereference):
+        """
+        *E: c ∈ [[E]] => [[c]] ⊆ [[*E]]
+        """
+        source = self.visit(node.expression)
+        if source is None:
+            return None
+
+        t = self.temp()
+        self.constraints.append(Load(t, source))
+        return t
+
+    def visit_FunctionCall(self, node: ast.FunctionCall):
+        callee = self.visit(node.callee)
+        arguments = tuple(self.visit(e) for e in node.expressions)
+        self.call_sites.append(CallSite(node, self._function, callee))
+        if callee is None:
+            return None
+
+        t = self.temp()
+        self.constraints.append(Call(t, callee, arguments))
+        return t
+
+    def visit_Record(self, node: ast.Record):
+        """
+        { X1: E1, ... }: field-insensitive, 모든 field 값을 record cell 하나로 합친다.
+        """
+        t = self.temp()
+        for f in node.fields:
+            source = self.visit(f.Value)
+            if source is not None:
+                self.constraints.append(Copy(t, source))
+        return t
+
+    def visit_FieldAccess(self, node: ast.FieldAccess):
+        return self.visit(node.expression)
+
+    def visit_Arithmetic(self, node: ast.Arithmetic):
+        self.visit(node.left_expression)
+        self.visit(node.right_expression)
+
+    def visit_Comparison(self, node: ast.Comparison):
+        self.visit(node.left_expression)
+        self.visit(node.right_expression)
+
+    def visit_Parenthesize(self, node: ast.Parenthesize):
+        return self.visit(node.expression)
+
+    def visit_Int(self, node: ast.Int):
+        pass
+
+    def visit_Input(self, node: ast.Input):
+        pass
+
+    def visit_Null(self, node: ast.Null):
+        pass
@@ -0,0 +1,94 @@
+"""
+Steensgaard-style points-to analysis (spa 11.3)
+
+X = alloc P:  [[X]] = ↑[[alloc-i]]
+X1 = &X2:     [[X1]] = ↑[[X2]]
+X1 = X2:      [[X1]] = [[X2]]
+X1 = *X2:     [[X2]] = ↑α ∧ [[X1]] = α   =>   [[X2]] = ↑[[X1]]
+*X1 = X2:     [[X1]] = ↑α ∧ [[X2]] = α   =>   [[X1]] = ↑[[X2]]
+f(X1, ...) { ... return E; }:  [[f]] = ([[X1]], ...) -> [[E]]
+r = E(E1, ...):                [[E]] = ↑(([[E1]], ...) -> [[r]])
+
+term 과 unification 은 type analysis 의 것 (tip_constraint, UnificationSolver) 을 그대로 쓴다.
+- cell c 의 term 은 Type(c)
+- pt(X) = { c | find([[X]]) = ↑t ∧ find([[c]]) = find(t) }
+union-find 연산만 사용하므로 거의 선형 시간에 풀린다.
+"""
+from dataclasses import dataclass, field
+
+from ir import tip_ast as ast
+from type import tip_constraint as constraint
+from type.tip_unification import UnificationSolver
+from pointer.tip_pointer_constraint import (
+    PointerConstraintCollector, Cell, AddressOf, Copy, Load, Store, Call
+)
+
+@dataclass
+class SteensgaardSolver:
+    target_ast: ast.Program
+
+    collector: PointerConstraintCollector = field(init=False, default=None)
+    equality_constraints: list[constraint.TypeEqualityConstraint] = field(init=False, default_factory=list)
+    unification_solver: UnificationSolver = field(init=False, default=None)
+
+    _members: dict = field(init=False, default_factory=dict)
+    _fresh: int = field(init=False, default=0)
+
+    def __post_init__(self):
+        self.collector = PointerConstraintCollector(self.target_ast)
+        self.make_equality_constraints()
+        self.unification_solver = UnificationSolver(self.equality_constraints, set())
+
+        # 주소가 만들어지는 cell 만 points-to 집합의 원소가 될 수 있다.
+        find = self.unification_solver.find
+        for c in self.collector.constraints:
+            if isinstance(c, AddressOf):
+                self._members.setdefault(find(constraint.Type(c.cell)), set()).add(c.cell)
+
+    def term(self, cell: Cell):
+        if cell is None:
+            # pointer 가 아닌 인자 자리: 새 type variable
+            self._fresh += 1
+            return constraint.Type(Cell('temp', f"α{self._fresh}"))
+        return constraint.Type(cell)
+
+    def make_equality_constraints(self):
+        equal = constraint.TypeEqualityConstraint
+        add = self.equality_constraints.append
+
+        for signature in self.collector.functions.values():
+            add(equal(
+                self.term(signature.cell),
+                constraint.FunctionType([self.term(p) for p in signature.parameters], self.term(signature.result))
+            ))
+
+        for c in self.collector.constraints:
+            if isinstance(c, AddressOf):
+                add(equal(self.term(c.target), constraint.PointerType(self.term(c.cell))))
+            elif isinstance(c, Copy):
+                add(equal(self.term(c.target), self.term(c.source)))
+            elif isinstance(c, Load):
+                add(equal(self.term(c.source), constraint.PointerType(self.term(c.target))))
+            elif isinstance(c, Store):
+                add(equal(self.term(c.target), constraint.PointerType(self.term(c.source))))
+            elif isinstance(c, Call):
+                function_type = constraint.FunctionType([self.term(a) for a in c.arguments], self.term(c.target))
+                add(equal(self.term(c.callee), constraint.PointerType(function_type)))
+
+    def points_to(self, cell: Cell) -> set[Cell]:
+        find = self.unification_solver.find
+        term = constraint.Type(cell)
+        if term not in self.unification_solver.type_parent_relation:
+            return set()
+
+        root = find(term)
+        if not isinstance(root, constraint.PointerType):
+            return set()
+
+        return set(self._members.get(find(root.base), ()))
+
+    def points_to_variable(self, name: str, function: str = 'main') -> set[Cell]:
+        return self.points_to(Cell('variable', name, function))
+
+    def may_alias(self, a: Cell, b: Cell) -> bool:
+        return bool(self.points_to(a) & self.points_to(b))
@@ -0,0 +1,21 @@
+"""
+tests 공통 fixture
+
+    python -m pytest -q tests
+"""
+import sys
+
+import pytest
+
+from ir.tip_ast import get_ast
+from main import load_parser
+
+sys.setrecursionlimit(max(sys.getrecursionlimit(), 10000))
+
+@pytest.fixture(scope='session')
+def parse():
+    """
+    TIP source -> ast.Program
+    """
+    parser = load_parser()
+    return lambda source: get_ast(parser.parse(source))
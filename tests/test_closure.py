@@ -0,0 +1,56 @@
+"""
+ClosureAnalysis: 간접 호출의 callee 는 함수 값의 흐름으로 찾고, 인자 수가 맞는 함수만 남긴다.
+"""
+from ir import tip_ast as ast
+from pointer.tip_closure import ClosureAnalysis
+
+PROGRAM = """
+one(a) { var r; r = a + 1; return r; }
+other(a) { var r; r = a - 1; return r; }
+two(a, b) { var r; r = a + b; return r; }
+apply(f, x) { var r; r = f(x); return r; }
+main() {
+    var f, g, p, x, y, z;
+    f = one;
+    if (x > 0) { f = two; } else { f = other; }
+    p = alloc 0;
+    *p = f;
+    g = *p;
+    x = g(1);
+    y = g(1, 2);
+    z = apply(one, 3) + f(1, 2, 3);
+    return x;
+}
+"""
+
+def calls(program, function: str) -> list[ast.FunctionCall]:
+    body = next(f for f in program.functions if str(f.name.name) == function)
+    return [n for n in ast.walk(body) if isinstance(n, ast.FunctionCall)]
+
+def test_indirect_calls_filtered_by_arity(parse):
+    program = parse(PROGRAM)
+    closure = ClosureAnalysis(program)
+    main_calls = {str(call): closure.callees(call) for call in calls(program, 'main')}
+
+    # g 는 pointer 를 거쳐 one / two / other 를 받는다.
+    assert main_calls['g(1)'] == {'one', 'other'}
+    assert main_calls['g(1, 2)'] == {'two'}
+    assert main_calls['apply(one, 3)'] == {'apply'}
+    # 인자 3 개인 함수는 없다.
+    assert main_calls['f(1, 2, 3)'] == set()
+    assert closure.unresolved == 1
+
+    # apply 의 f 는 parameter 로 one 만 받는다.
+    [inner] = calls(program, 'apply')
+    assert closure.callees(inner) == {'one'}
+    assert closure.call_graph == {
+        'one': set(), 'other': set(), 'two': set(),
+        'apply': {'one'},
+        'main': {'one', 'other', 'two', 'apply'},
+    }
+    assert ('main', 'two') in closure.edges()
+
+def test_unknown_node(parse):
+    closure = ClosureAnalysis(parse(PROGRAM))
+    [call] = calls(parse(PROGRAM), 'apply')
+    assert closure.callees(call) == set()
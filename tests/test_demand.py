@@ -0,0 +1,112 @@
+"""
+DemandSignSolver 의 답은 FixedPointSolver (같은 입력의 MonotoneSolver) 의 state 와 같아야 한다.
+"""
+import pytest
+
+from common.generator import GeneratorConfig, generate
+from ir import tip_ast as ast
+from ir import tip_cfg as cfg
+from ir.tip_cfg import GraphBuilder
+from lattice.tip_demand import DemandSignSolver
+from lattice.tip_lattice import FixedPointSolver, MapLattice, SignAnalysis, SignLattice
+from lattice.tip_monotone import MonotoneSolver
+from lattice.tip_sccp import SparseConditionalConstantSolver
+from pointer.tip_andersen import AndersenSolver
+from pointer.tip_steensgaard import SteensgaardSolver
+
+LOOP = """
+main(n) {
+    var v2, v5;
+    v2 = 7;
+    v5 = 3;
+    while (n > 0) {
+        v2 = v2 + v5 + 7;
+        n = n - 1;
+    }
+    output v2;
+    return v2;
+}
+"""
+
+SWAP = """
+swap(a, b) { var t; t = *a; *a = *b; *b = t; return 0; }
+main() { var y, z, q; y = 3; z = 0 - 4; q = swap(&y, &z); output y; return y; }
+"""
+
+def assert_same(program, function, executable_edges=None, points_to=None):
+    """
+    모든 (node, 변수) 질의를 fixed point 와 비교한다.
+    """
+    name = str(function.name.name)
+    parameters = ast.as_list(function.parameters, [])
+    entry = GraphBuilder(program, name).graph
+    graph = cfg.IndexedGraph(entry)
+    fixed_point = MonotoneSolver(SignAnalysis(parameters, points_to, name), entry, executable_edges, graph=graph).after
+    names = sorted({key for state in fixed_point if isinstance(state, MapLattice) for key, _ in state.lattice.items()})
+
+    solver = DemandSignSolver(entry, parameters, executable_edges, points_to, name, graph=graph)
+    mismatches = []
+    for v, state in enumerate(fixed_point):
+        for x in names:
+            expected = state.lattice.get(x) if isinstance(state, MapLattice) else None
+            answer = solver.query(v, x)
+            if answer != expected:
+                mismatches.append((v, x, expected, answer))
+    assert mismatches == []
+
+def test_loop_head(parse):
+    program = parse(LOOP)
+    function = program.functions[0]
+    entry = GraphBuilder(program, 'main').graph
+    graph = cfg.IndexedGraph(entry)
+    output = next(v for v, node in enumerate(graph.nodes)
+                  if isinstance(node, cfg.NormalNode) and isinstance(node.statement, ast.Output))
+
+    solver = DemandSignSolver(entry, ast.as_list(function.parameters, []), graph=graph)
+    assert solver.query_before(output, 'v2') is SignLattice.PLUS
+    assert_same(program, function)
+
+def test_fixed_point_solver(parse):
+    program = parse(LOOP)
+    function = program.functions[0]
+    entry = GraphBuilder(program, 'main').graph
+    fixed_point = FixedPointSolver(entry, ast.as_list(function.parameters, [])).fixed_point
+    solver = DemandSignSolver(entry, ast.as_list(function.parameters, []))
+    for v, state in enumerate(fixed_point):
+        assert solver.query(v, 'v2') == state.lattice.get('v2')
+
+@pytest.mark.parametrize('seed', range(8))
+def test_generated_loops(parse, seed):
+    config = GeneratorConfig(functions=2, statements=60, loop_density=0.3, branch_density=0.2,
+                             pointer_density=0.3, call_graph='none', seed=seed)
+    program = parse(generate(config))
+    points_to = AndersenSolver(program)
+    for function in program.functions:
+        entry = GraphBuilder(program, str(function.name.name)).graph
+        edges = SparseConditionalConstantSolver(entry, ast.as_list(function.parameters, [])).executable_edges
+        assert_same(program, function)
+        assert_same(program, function, edges)
+        assert_same(program, function, points_to=points_to)
+        assert_same(program, function, edges, points_to)
+
+@pytest.mark.parametrize('solver', [AndersenSolver, SteensgaardSolver])
+def test_call_clobbers_address_taken(parse, solver):
+    # swap 은 y 에 -4 를 쓴다.
+    program = parse(SWAP)
+    main = program.functions[1]
+    points_to = solver(program)
+    fixed_point = FixedPointSolver(GraphBuilder(program, 'main').graph, points_to=points_to).fixed_point
+    assert fixed_point[-1].lattice.get('y') is SignLattice.TOP
+    assert_same(program, main, points_to=points_to)
+
+@pytest.mark.parametrize('seed', range(4))
+def test_generated_calls(parse, seed):
+    config = GeneratorConfig(functions=4, statements=40, loop_density=0.2, branch_density=0.2,
+                             pointer_density=0.4, call_graph='dag', seed=seed)
+    program = parse(generate(config))
+    points_to = AndersenSolver(program)
+    for function in program.functions:
+        entry = GraphBuilder(program, str(function.name.name)).graph
+        edges = SparseConditionalConstantSolver(entry, ast.as_list(function.parameters, [])).executable_edges
+        assert_same(program, function, points_to=points_to)
+        assert_same(program, function, edges, points_to)
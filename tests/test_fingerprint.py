@@ -0,0 +1,19 @@
+"""
+fingerprint 는 변수 이름만 다른 함수에서만 같아야 한다.
+"""
+from ir.tip_fingerprint import FunctionFingerprint
+
+def function(parse, source):
+    return parse(source).functions[0]
+
+def test_renamed_variables(parse):
+    f = function(parse, "f(q) { var a, r; r = {a: q}; a = r.a; return a; }")
+    g = function(parse, "g(x) { var b, s; s = {a: x}; b = s.a; return b; }")
+    assert FunctionFingerprint(f).digest == FunctionFingerprint(g).digest
+    assert FunctionFingerprint(g).names == {'x': '#0', 'b': '#1', 's': '#2'}
+
+def test_field_access_name(parse):
+    # 지역 변수 a / b 와 이름이 같은 field 를 읽어도 field 이름은 바꾸지 않는다.
+    f = function(parse, "f(q) { var a, r; r = {a: q}; a = r.a; return a; }")
+    g = function(parse, "g(q) { var b, r; r = {a: q}; b = r.b; return b; }")
+    assert FunctionFingerprint(f).digest != FunctionFingerprint(g).digest
@@ -0,0 +1,81 @@
+"""
+IncrementalDocument.apply 후의 program 은 편집된 text 를 처음부터 parse 한 결과와 같다.
+"""
+import pytest
+
+from ir.tip_incremental import IncrementalDocument, TextEdit
+from main import load_parser
+
+TEXT = """f(a) { var x; x = a; return x; }
+g(b) { var y; if (b > 0) { y = b; } else { y = 0; } return y; }
+h(c) { var z; z = c; return z; }
+main() { var w; w = f(1) + g(2) + h(3); return w; }
+"""
+
+def replace(text: str, old: str, new: str) -> TextEdit:
+    start = text.index(old)
+    return TextEdit(start, start + len(old), new)
+
+@pytest.fixture
+def document():
+    return IncrementalDocument(load_parser(), TEXT)
+
+def assert_reparsed(document, parse):
+    assert document.program == parse(document.text)
+    assert [document.text[s:e] for s, e in document.spans] == [
+        document.text[s:e] for s, e in IncrementalDocument(load_parser(), document.text).spans
+    ]
+
+def test_edit_inside_function(document, parse):
+    h, main = document.program.functions[2:]
+    result = document.apply(replace(document.text, 'z = c;', 'z = c + 1;'))
+    assert result.changed == ['h'] and result.reparsed == 1
+    assert document.program.functions[3] is main
+    assert document.program.functions[2] is not h
+    assert_reparsed(document, parse)
+
+def test_merge_across_boundary(document, parse):
+    # f 의 끝과 g 의 앞부분을 지워 두 함수가 하나가 된다.
+    f, g, h, main = document.program.functions
+    result = document.apply(replace(document.text, 'return x; }\ng(b) { var y;', 'var b, y;'))
+    assert result.changed == ['f'] and result.removed == ['g'] and result.added == []
+    assert [str(fn.name.name) for fn in document.program.functions] == ['f', 'h', 'main']
+    assert document.program.functions[1] is h and document.program.functions[2] is main
+    assert_reparsed(document, parse)
+
+def test_split_across_boundary(document, parse):
+    # f 안에 '}' 와 새 함수 머리를 넣어 함수 하나가 둘이 된다. (앞쪽 f 는 글자가 그대로이므로 재사용)
+    f, g = document.program.functions[:2]
+    result = document.apply(replace(document.text, 'x = a;', 'x = a; return x; }\nm(e) { var x; x = e;'))
+    assert result.changed == [] and result.added == ['m'] and result.reparsed == 1
+    assert [str(fn.name.name) for fn in document.program.functions] == ['f', 'm', 'g', 'h', 'main']
+    assert document.program.functions[0] is f and document.program.functions[2] is g
+    assert_reparsed(document, parse)
+
+def test_brace_shift_resyncs_later(document, parse):
+    # g 의 else 블록을 없애면 중괄호 위치가 바뀌지만 h 부터는 다시 맞춰진다.
+    h = document.program.functions[2]
+    result = document.apply(replace(document.text, ' else { y = 0; }', ''))
+    assert result.changed == ['g'] and result.reparsed == 1
+    assert document.program.functions[2] is h
+    assert_reparsed(document, parse)
+
+def test_sequence_of_edits(document, parse):
+    edits = [
+        ('main() {', 'k(q) { var r; r = q; return r; }\nmain() {'),
+        ('h(c) { var z; z = c; return z; }\n', ''),
+        (' + h(3)', ' + k(3)'),
+        ('return y; }\nk(q)', 'return y; }\n\n\nk(q)'),
+    ]
+    for old, new in edits:
+        document.apply(replace(document.text, old, new))
+        assert_reparsed(document, parse)
+    assert [str(fn.name.name) for fn in document.program.functions] == ['f', 'g', 'k', 'main']
+
+def test_syntax_error_keeps_document(document, parse):
+    text, functions = document.text, list(document.program.functions)
+    with pytest.raises(Exception):
+        document.apply(replace(document.text, 'z = c;', 'z = ;'))
+    assert document.text == text
+    assert document.program.functions == functions
+    assert_reparsed(document, parse)
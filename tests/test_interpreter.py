@@ -0,0 +1,98 @@
+"""
+compile_program + Interpreter: 실행 결과 (반환값, output) 와 오류
+"""
+import pytest
+
+from ir.tip_bytecode import compile_program
+from ir.tip_interpreter import ExecutionError, Interpreter
+
+def run(parse, source, inputs=(), **options):
+    interpreter = Interpreter(compile_program(parse(source)), inputs, **options)
+    result = interpreter.run()
+    return result, interpreter.outputs
+
+def test_recursion(parse):
+    source = """
+    fact(n) { var r; if (n > 0) { r = n * fact(n - 1); } else { r = 1; } return r; }
+    main(n) { var x; x = fact(n); output x; return x; }
+    """
+    assert run(parse, source, [5]) == (120, [120])
+
+def test_deep_recursion(parse):
+    # 호출은 Python 재귀가 아니므로 recursion limit 보다 깊어도 된다.
+    source = """
+    count(n) { var r; if (n > 0) { r = 1 + count(n - 1); } else { r = 0; } return r; }
+    main() { var x; x = count(50000); return x; }
+    """
+    assert run(parse, source)[0] == 50000
+
+def test_swap_through_pointers(parse):
+    source = """
+    swap(a, b) { var t; t = *a; *a = *b; *b = t; return 0; }
+    main() { var y, z, q; y = 3; z = 0 - 4; q = swap(&y, &z); output y; output z; return q; }
+    """
+    assert run(parse, source) == (0, [-4, 3])
+
+def test_boxed_variable_per_frame(parse):
+    # 주소를 쓰는 변수의 Cell 은 호출마다 새로 만든다.
+    source = """
+    h(n) { var x, p, r; x = n; p = &x; if (n > 0) { r = h(n - 1); } else { r = 0; } return *p + r; }
+    main() { var s; s = h(3); return s; }
+    """
+    assert run(parse, source)[0] == 6
+
+def test_left_to_right_with_boxed_variable(parse):
+    # x 는 set 이 바꾸기 전에 읽는다.
+    source = """
+    set(p) { var r; *p = 5; r = 0; return r; }
+    main() { var x, y; x = 1; y = x + set(&x); output y; output x; return 0; }
+    """
+    assert run(parse, source)[1] == [1, 5]
+
+def test_record_copy_semantics(parse):
+    source = """
+    main() {
+        var r, s, p, q, t;
+        r = {a: 1, b: 2};
+        s = r;
+        s.a = 3;
+        output r.a;
+        output s.a;
+        p = alloc {a: 4};
+        q = p;
+        t = *p;
+        (*p).a = 5;
+        output (*q).a;
+        output t.a;
+        return 0;
+    }
+    """
+    assert run(parse, source)[1] == [1, 3, 5, 4]
+
+def test_frame_reuse(parse):
+    # 호출 결과를 다른 호출의 인자로 (callee 가 caller 의 register 를 건드리지 않는다.)
+    source = """
+    g(n) { var t; t = n + 1; return t; }
+    main() { var a, b; a = 10; b = g(1) + g(g(a)) + a; return b; }
+    """
+    assert run(parse, source)[0] == 2 + 12 + 10
+
+@pytest.mark.parametrize('expression, value', [('(0 - 7) / 2', -3), ('7 / (0 - 2)', -3), ('(0 - 7) / (0 - 2)', 3), ('7 / 2', 3)])
+def test_truncating_division(parse, expression, value):
+    assert run(parse, f"main() {{ var x; x = {expression}; return x; }}")[0] == value
+
+def test_division_by_zero(parse):
+    with pytest.raises(ExecutionError, match='0 으로 나눔'):
+        run(parse, "main(n) { var x; x = 1 / n; return x; }", [0])
+
+def test_null_dereference(parse):
+    with pytest.raises(ExecutionError, match='역참조'):
+        run(parse, "main() { var p, x; p = null; x = *p; return x; }")
+
+def test_max_steps(parse):
+    with pytest.raises(ExecutionError, match='1000'):
+        run(parse, "main() { var x; x = 1; while (x > 0) { x = x + 1; } return x; }", max_steps=1000)
+
+def test_missing_input(parse):
+    with pytest.raises(ExecutionError, match='input'):
+        run(parse, "main(a, b) { var x; x = a + b; return x; }", [1])
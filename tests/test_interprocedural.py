@@ -0,0 +1,40 @@
+"""
+InterproceduralSignSolver: 요약으로 호출 결과를 계산하고, pointer 인자로 바뀔 수 있는 변수는 ㅜ 로 둔다.
+"""
+from lattice.tip_interprocedural import InterproceduralSignSolver
+from lattice.tip_lattice import SignLattice
+
+SWAP = """
+swap(a, b) { var t; t = *a; *a = *b; *b = t; return 0; }
+main() { var y, z, q; y = 3; z = 0 - 4; q = swap(&y, &z); output y; return y; }
+"""
+
+IDENTITY = """
+id(x) { var r; r = x; return r; }
+main() { var p, n; p = id(5); n = id(0 - 2); return p; }
+"""
+
+LOCAL_STORE = """
+main() { var y, p; y = 3; p = &y; *p = 0 - 4; output y; return y; }
+"""
+
+def exit_state(solver, name='main'):
+    return solver.fixed_point(name)[-1].lattice
+
+def test_summary_by_context(parse):
+    solver = InterproceduralSignSolver(parse(IDENTITY))
+    state = exit_state(solver)
+    assert state.get('p') is SignLattice.PLUS
+    assert state.get('n') is SignLattice.MINUS
+    assert solver.contexts('id') == {(SignLattice.PLUS,): SignLattice.PLUS, (SignLattice.MINUS,): SignLattice.MINUS}
+
+def test_call_clobbers_pointer_arguments(parse):
+    # 실행하면 swap 이 y 에 -4 를 쓴다.
+    state = exit_state(InterproceduralSignSolver(parse(SWAP)))
+    assert state.get('y') is SignLattice.TOP
+    assert state.get('z') is SignLattice.TOP
+    assert state.get('q') is SignLattice.ZERO
+
+def test_store_clobbers_address_taken(parse):
+    state = exit_state(InterproceduralSignSolver(parse(LOCAL_STORE)))
+    assert state.get('y') is SignLattice.TOP
@@ -0,0 +1,93 @@
+"""
+정규화한 프로그램은 원래 프로그램과 같은 값을 출력해야 한다. (user-044 interpreter 로 실행)
+"""
+import pytest
+
+from ir.tip_bytecode import compile_program
+from ir.tip_interpreter import Interpreter
+from ir.tip_normalize import is_normalized, normalize
+
+WRITE = """
+g(p) {
+    *p = 10;
+    return 1;
+}
+"""
+
+PROGRAMS = {
+    # 앞의 피연산자 a 를 뒤의 호출이 바꾼다.
+    'operand': WRITE + """
+main() {
+    var a, p, x;
+    a = 1;
+    p = &a;
+    x = a + g(p);
+    output x;
+    return 0;
+}
+""",
+    'nested': WRITE + """
+main() {
+    var a, p, x;
+    a = 1;
+    p = &a;
+    x = (a * 3) + (a - g(p) + a);
+    output x;
+    output a;
+    return 0;
+}
+""",
+    'callee': """
+one(a) {
+    var r;
+    r = 1;
+    return r;
+}
+two(a) {
+    var r;
+    r = 2;
+    return r;
+}
+set(p) {
+    *p = two;
+    return 0;
+}
+main() {
+    var f, p, x;
+    f = one;
+    p = &f;
+    x = f(set(p));
+    output x;
+    return 0;
+}
+""",
+    'store': """
+move(p, q) {
+    *p = q;
+    return 0;
+}
+main() {
+    var a, b, p, q;
+    a = 0;
+    b = 0;
+    p = &a;
+    q = &p;
+    *p = move(q, &b) + 5;
+    output a;
+    output b;
+    return 0;
+}
+""",
+}
+
+def outputs(program) -> list:
+    interpreter = Interpreter(compile_program(program), inputs=[])
+    interpreter.run()
+    return interpreter.outputs
+
+@pytest.mark.parametrize('name', sorted(PROGRAMS))
+def test_same_outputs(parse, name):
+    program = parse(PROGRAMS[name])
+    normalized = normalize(program)
+    assert is_normalized(normalized)
+    assert outputs(normalized) == outputs(program)
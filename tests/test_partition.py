@@ -0,0 +1,45 @@
+"""
+PartitionedUnificationSolver 는 UnificationSolver 와 같은 동치류를 만든다. (bin 을 process pool 에서 풀어도)
+"""
+import pytest
+
+from common.exceptions import TypeAnalysisException
+from common.generator import GeneratorConfig, generate
+from type.tip_constraint import ConstraintCollector
+from type.tip_partition import PartitionedUnificationSolver
+from type.tip_unification import UnificationSolver, UnionFind
+
+# 서로 term 을 공유하지 않는 함수 (component 가 여럿), bad 만 type 이 맞지 않는다.
+ILL_TYPED = """
+ok(a) { var b; b = a + 1; return b; }
+pointer(p) { var q; q = *p; return q; }
+bad(x) { var y; y = &x; y = 3; return x; }
+main() { var r; r = 1; return r; }
+"""
+
+def classes(relation: dict) -> set[frozenset]:
+    union_find = UnionFind(dict(relation))
+    groups = {}
+    for t in relation:
+        groups.setdefault(union_find.find(t), set()).add(t)
+    return {frozenset(g) for g in groups.values()}
+
+@pytest.mark.parametrize('seed', range(3))
+def test_same_classes(parse, seed):
+    collector = ConstraintCollector(parse(generate(GeneratorConfig(functions=12, statements=12, seed=seed))))
+    serial = UnificationSolver(collector.constraints, collector.record_fields)
+    partitioned = PartitionedUnificationSolver(collector.constraints, collector.record_fields,
+                                               workers=2, parallel_threshold=0)
+    assert len(partitioned.bins) == 2
+    assert len(partitioned.components) > 2
+    assert classes(partitioned.type_parent_relation) == classes(serial.type_parent_relation)
+    assert partitioned.unique_constraints == set(collector.constraints)
+
+def test_failing_bin_keeps_message(parse):
+    collector = ConstraintCollector(parse(ILL_TYPED))
+    with pytest.raises(TypeAnalysisException) as serial:
+        UnificationSolver(collector.constraints, collector.record_fields)
+    with pytest.raises(TypeAnalysisException) as partitioned:
+        PartitionedUnificationSolver(collector.constraints, collector.record_fields, workers=2, parallel_threshold=0)
+    assert str(partitioned.value) == str(serial.value)
+    assert 'unification 실패' not in str(partitioned.value)
@@ -0,0 +1,122 @@
+"""
+PersistentMap (HAMT) 를 dict 와 비교한다.
+"""
+import random
+
+import pytest
+
+from lattice.tip_persistent import PersistentMap, _Node, _Collision, _iter_entries
+
+class Key:
+    """
+    hash 를 정할 수 있는 key (bits 가 작으면 hash 가 자주 충돌한다.)
+    """
+    def __init__(self, value, bits):
+        self.value = value
+        self.bits = bits
+
+    def __hash__(self):
+        return self.value & ((1 << self.bits) - 1)
+
+    def __eq__(self, other):
+        return isinstance(other, Key) and self.value == other.value
+
+    def __repr__(self):
+        return f"Key({self.value})"
+
+def walk(m: PersistentMap):
+    stack = [m._root]
+    while stack:
+        node = stack.pop()
+        yield node
+        if isinstance(node, _Node):
+            stack.extend(node.children)
+
+def nodes(m: PersistentMap) -> set[int]:
+    return {id(node) for node in walk(m)}
+
+def join(a, b):
+    return max(a, b)
+
+def assert_same(m: PersistentMap, expected: dict):
+    assert len(m) == len(expected)
+    assert dict(m.items()) == expected
+    assert m == expected
+    for key, value in expected.items():
+        assert key in m and m[key] == value
+
+# 2 bit: 64 bit 를 다 쓴 collision node, 12 bit: 같은 prefix 로 깊어지는 경로, 64 bit: 거의 충돌 없음
+@pytest.mark.parametrize('bits', [2, 12, 64])
+@pytest.mark.parametrize('seed', range(3))
+def test_random_against_dict(bits, seed):
+    rng = random.Random(seed)
+    keys = [Key(rng.getrandbits(64), bits) for _ in range(200)]
+    m, expected = PersistentMap(), {}
+    versions = []
+    for step in range(1000):
+        key = rng.choice(keys)
+        op = rng.random()
+        if op < 0.5:
+            value = rng.randrange(5)
+            m, expected = m.set(key, value), {**expected, key: value}
+        elif op < 0.9:
+            m, expected = m.remove(key), {k: v for k, v in expected.items() if k != key}
+        else:
+            other = {rng.choice(keys): rng.randrange(5) for _ in range(rng.randrange(20))}
+            m = m.merge(PersistentMap(other), join)
+            expected = {**other, **{k: join(v, other[k]) if k in other else v for k, v in expected.items()}}
+        versions.append((m, dict(expected)))
+        assert len(m) == len(expected) and m.get(key) == expected.get(key)
+        if step % 10 == 0:
+            assert_same(m, expected)
+    assert_same(m, expected)
+
+    # 이전 버전은 바뀌지 않는다.
+    for old, snapshot in versions[::50]:
+        assert_same(old, snapshot)
+    # 같은 내용이면 만든 순서와 관계없이 같은 구조 (== 가 구조를 비교한다.)
+    items = list(expected.items())
+    rng.shuffle(items)
+    assert PersistentMap(items) == m
+
+@pytest.mark.parametrize('bits', [2, 12, 64])
+def test_remove_to_empty(bits):
+    keys = [Key(i * 0x9E3779B97F4A7C15 & ((1 << 64) - 1), bits) for i in range(100)]
+    m = PersistentMap((key, i) for i, key in enumerate(keys))
+    assert len(m) == 100
+    if bits == 2:
+        assert any(isinstance(n, _Collision) for n in walk(m))
+    for i, key in enumerate(keys):
+        m = m.remove(key)
+        assert len(m) == 100 - i - 1
+        assert key not in m
+        assert m.remove(key) is m
+    assert m == PersistentMap()
+    assert list(m.items()) == []
+
+def test_merge():
+    a = PersistentMap({'x': 1, 'y': 5})
+    b = PersistentMap({'y': 2, 'z': 3})
+    merged = a.merge(b, join)
+    assert merged == {'x': 1, 'y': 5, 'z': 3}
+    assert a == {'x': 1, 'y': 5} and b == {'y': 2, 'z': 3}
+    # 결과가 한쪽과 같으면 그 map 자체
+    assert a.merge(PersistentMap({'x': 0}), join) is a
+    assert a.merge(a.set('x', 7), join) == {'x': 7, 'y': 5}
+    assert PersistentMap({'x': 0}).merge(a, join) is a
+
+def test_structural_sharing():
+    base = PersistentMap((f"v{i}", i) for i in range(5000))
+    changed = base.set('v17', 100)
+    assert changed.get('v17') == 100 and base.get('v17') == 17
+    # 바뀐 경로의 node 만 새로 만든다. (5000 개면 깊이 3 정도)
+    assert len(nodes(changed) - nodes(base)) <= 5
+    assert len(nodes(base.remove('v17')) - nodes(base)) <= 5
+    assert base.set('v17', 17) is base
+    assert base.remove('missing') is base
+
+    # 공유하는 subtree 는 merge 에서 그대로 쓴다.
+    merged = changed.merge(base, join)
+    assert merged is changed
+    assert len(nodes(base.merge(base.set('v3', 100), join)) - nodes(base)) <= 5
+    assert sum(1 for _ in _iter_entries(merged._root)) == 5000
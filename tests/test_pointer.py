@@ -0,0 +1,100 @@
+"""
+points-to analysis: SteensgaardSolver (unification) / AndersenSolver (inclusion)
+"""
+import pytest
+
+from common.generator import GeneratorConfig, generate
+from lattice.tip_lattice import SignLattice
+from main import TipAnalysis
+from pointer.tip_andersen import AndersenSolver
+from pointer.tip_pointer_constraint import Cell
+from pointer.tip_steensgaard import SteensgaardSolver
+
+SOLVERS = [AndersenSolver, SteensgaardSolver]
+
+def variables(*names, function='main'):
+    return {Cell('variable', name, function) for name in names}
+
+def names(cells):
+    return {c.name for c in cells}
+
+@pytest.mark.parametrize('solver', SOLVERS)
+def test_alloc_and_reference(parse, solver):
+    result = solver(parse("""
+    main() { var p, q, x; p = alloc 1; q = &x; x = 2; return x; }
+    """))
+    assert result.points_to_variable('p') == {Cell('alloc', 'alloc-0')}
+    assert result.points_to_variable('q') == variables('x')
+    assert result.points_to_variable('x') == set()
+
+@pytest.mark.parametrize('solver', SOLVERS)
+def test_load_store_chain(parse, solver):
+    result = solver(parse("""
+    main() {
+        var a, b, c, p, pp, r, x, y;
+        p = &x; pp = &p; r = *pp; *pp = &y;
+        a = &b; *a = &c;
+        return 0;
+    }
+    """))
+    assert result.points_to_variable('pp') == variables('p')
+    assert result.points_to_variable('p') == variables('x', 'y')
+    assert result.points_to_variable('r') == variables('x', 'y')
+    assert result.points_to_variable('a') == variables('b')
+    assert result.points_to_variable('b') == variables('c')
+
+def test_direction(parse):
+    # p = q 는 Andersen 에서 pt(q) ⊆ pt(p) 일 뿐이고, Steensgaard 에서는 둘을 합친다.
+    program = parse("main() { var p, q, x, y; p = &x; q = &y; p = q; return 0; }")
+    andersen = AndersenSolver(program)
+    steensgaard = SteensgaardSolver(program)
+    assert andersen.points_to_variable('p') == variables('x', 'y')
+    assert andersen.points_to_variable('q') == variables('y')
+    assert steensgaard.points_to_variable('q') == variables('x', 'y')
+
+def test_copy_cycle(parse):
+    # a -> b -> c -> a 는 lazy cycle detection 으로 한 node 가 된다.
+    result = AndersenSolver(parse("""
+    main() { var a, b, c, x, y; a = &x; b = a; c = b; a = c; b = &y; return 0; }
+    """))
+    for name in 'abc':
+        assert result.points_to_variable(name) == variables('x', 'y')
+    assert result.collapsed == 2
+
+@pytest.mark.parametrize('solver', SOLVERS)
+def test_function_pointers(parse, solver):
+    result = solver(parse("""
+    inc(n) { var r; r = n + 1; return r; }
+    dec(n) { var r; r = n - 1; return r; }
+    id(p) { var r; r = p; return r; }
+    main() { var f, g, x, q; f = inc; if (x) { f = dec; } g = f; x = g(3); q = id(&x); return x; }
+    """))
+    assert names(result.points_to_variable('g')) == {'inc', 'dec'}
+    assert result.points_to_variable('q') == variables('x')
+    assert result.points_to_variable('p', 'id') == variables('x')
+
+@pytest.mark.parametrize('seed', range(4))
+def test_andersen_within_steensgaard(parse, seed):
+    config = GeneratorConfig(functions=4, statements=40, pointer_density=0.5, call_graph='dag', seed=seed)
+    program = parse(generate(config))
+    andersen = AndersenSolver(program)
+    steensgaard = SteensgaardSolver(program)
+    cells = {c for constraint in andersen.collector.constraints for c in vars(constraint).values() if isinstance(c, Cell)}
+    assert any(andersen.points_to(c) for c in cells)
+    for cell in cells:
+        assert andersen.points_to(cell) <= steensgaard.points_to(cell), cell
+
+def test_sign_analysis_with_points_to():
+    # python main.py --points-to steensgaard 와 같은 단계
+    analyzer = TipAnalysis()
+    analyzer.program = """
+    swap(a, b) { var t; t = *a; *a = *b; *b = t; return 0; }
+    main() { var y, z, q; y = 3; z = 0 - 4; q = swap(&y, &z); output y; return y; }
+    """
+    analyzer.set_parser()
+    analyzer.parse_program()
+    analyzer.build_ast()
+    analyzer.analyse_pointers('steensgaard')
+    analyzer.build_cfg('main')
+    analyzer.solve_sign('main')
+    assert analyzer.fixed_point[-1].lattice.get('y') is SignLattice.TOP
@@ -0,0 +1,29 @@
+"""
+Profiler.report: 같은 이름의 단계는 합친다.
+"""
+from common.profiler import Profiler
+
+def test_repeated_phases():
+    profiler = Profiler(memory=False)
+    for nodes, path in ((10, 3), (5, 7)):
+        with profiler.phase('fixed_point'):
+            profiler.count('nodes', nodes)
+            profiler.maximum('find_path_max', path)
+    with profiler.phase('cfg'):
+        profiler.count('nodes', 1)
+
+    report = profiler.report()
+    assert list(report) == ['fixed_point', 'cfg']
+    assert report['fixed_point']['runs'] == 2
+    assert report['fixed_point']['counters'] == {'nodes': 15, 'find_path_max': 7}
+    assert report['fixed_point']['wall'] == sum(r.wall for r in profiler.phases[:2])
+    assert report['fixed_point']['peak_memory'] is None
+    assert report['cfg']['runs'] == 1
+
+def test_peak_memory():
+    profiler = Profiler(memory=True)
+    for size in (1000, 100000):
+        with profiler.phase('alloc'):
+            data = bytearray(size)
+            del data
+    assert profiler.report()['alloc']['peak_memory'] == max(r.peak_memory for r in profiler.phases)
@@ -0,0 +1,104 @@
+"""
+SparseConditionalConstantSolver: 주소가 노출된 변수는 *E = E 와 함수 호출이 덮어쓸 수 있다.
+"""
+import pytest
+
+from ir import tip_ast as ast
+from ir import tip_cfg as cfg
+from ir.tip_cfg import GraphBuilder
+from lattice.tip_sccp import TOP, SparseConditionalConstantSolver
+
+SET = """
+set(p) {
+    *p = 5;
+    return 0;
+}
+"""
+
+def solve(parse, source) -> SparseConditionalConstantSolver:
+    return SparseConditionalConstantSolver(GraphBuilder(parse(source), 'main').graph)
+
+def outputs(solver) -> list[str]:
+    return [str(n.statement) for n in solver.graph.nodes
+            if isinstance(n, cfg.NormalNode) and isinstance(n.statement, ast.Output) and solver.is_reachable(n)]
+
+def exit_state(solver) -> dict:
+    return solver.constants[solver.graph.exits()[0]]
+
+@pytest.mark.parametrize('statement', [
+    'x = set(&y);',
+    'x = 1 + set(&y);',
+    'output set(&y);',
+    '*(&x) = set(&y);',
+])
+def test_call_clobbers_address_taken(parse, statement):
+    solver = solve(parse, SET + f"""
+main() {{
+    var x, y;
+    y = 0;
+    {statement}
+    if (y) {{
+        output 1;
+    }} else {{
+        output 2;
+    }}
+    return y;
+}}
+""")
+    assert {'output 1;', 'output 2;'} <= set(outputs(solver))
+    assert exit_state(solver)['y'] is TOP
+
+def test_call_in_condition(parse):
+    solver = solve(parse, SET + """
+main() {
+    var y;
+    y = 0;
+    if (set(&y) == 0) {
+        output y;
+    }
+    return y;
+}
+""")
+    assert exit_state(solver)['y'] is TOP
+
+def test_other_variables_kept(parse):
+    # 주소가 노출되지 않은 변수는 호출 뒤에도 상수
+    solver = solve(parse, SET + """
+main() {
+    var x, y, z;
+    y = 0;
+    z = 3;
+    x = set(&y);
+    if (z == 3) {
+        output 1;
+    } else {
+        output 2;
+    }
+    return z;
+}
+""")
+    assert 'output 1;' in outputs(solver) and 'output 2;' not in outputs(solver)
+    assert exit_state(solver)['z'] == 3
+
+def test_sign_analysis_skips_dead_branches():
+    from lattice.tip_lattice import SignLattice
+    from main import TipAnalysis
+
+    # python main.py --constants 와 같은 단계
+    analyzer = TipAnalysis()
+    analyzer.program = "main() { var x, y; x = 1; if (x == 1) { y = 5; } else { y = 0 - 5; } output y; return y; }"
+    analyzer.set_parser()
+    analyzer.parse_program()
+    analyzer.build_ast()
+    analyzer.build_cfg('main')
+    analyzer.solve_sign('main')
+    assert analyzer.fixed_point[-1].lattice.get('y') is SignLattice.TOP
+
+    analyzer.propagate_constants('main')
+    analyzer.solve_sign('main')
+    assert analyzer.fixed_point[-1].lattice.get('y') is SignLattice.PLUS
+    assert analyzer.query_sign(['y']) == [('output y;', 'y', SignLattice.PLUS)]
+
+    # 다른 CFG 의 SCCP 결과는 쓰지 않는다.
+    analyzer.build_cfg('main')
+    assert analyzer.executable_edges() is None
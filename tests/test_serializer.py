@@ -0,0 +1,143 @@
+"""
+common.serializer round-trip: 복원한 객체가 원래 AST / CFG / 분석 결과와 같아야 한다.
+"""
+import struct
+
+import pytest
+
+from common.serializer import HEADER, VERSION, SerializationError, dumps, loads
+from ir import tip_ast as ast
+from ir import tip_cfg as cfg
+from ir.tip_cfg import GraphBuilder, IndexedGraph
+from lattice.tip_lattice import FixedPointSolver
+
+SOURCE = """
+inc(p) {
+    *p = *p + 1;
+    return *p;
+}
+record(n) {
+    var r;
+    r = {a: n, b: (n - 1)};
+    r.a = r.b * 2;
+    return r.a;
+}
+main(n) {
+    var i, x, p;
+    i = 0;
+    x = &i;
+    p = null;
+    while (n > i) {
+        if (i == 3) {
+            output inc(x);
+        } else {
+            i = i + 1;
+        }
+    }
+    output record(i);
+    return i;
+}
+"""
+
+@pytest.fixture(scope='module')
+def program(parse):
+    return parse(SOURCE)
+
+@pytest.fixture(scope='module')
+def entry(program):
+    return GraphBuilder(program, 'main').graph
+
+def edges(graph: IndexedGraph) -> tuple:
+    """
+    (node 종류, statement, pred index, succ index) 목록
+    """
+    return [
+        (type(node).__name__, getattr(node, 'statement', None),
+         [graph.index[p] for p in getattr(node, 'predecessors', ())], graph.successors[i])
+        for i, node in enumerate(graph.nodes)
+    ]
+
+def test_program(program):
+    snapshot = loads(dumps(program=program))
+    assert snapshot.program == program
+    assert snapshot.cfg is None and snapshot.fixed_point is None and snapshot.types is None
+
+def test_cfg(program, entry):
+    snapshot = loads(dumps(program=program, cfg=entry))
+    restored = snapshot.cfg
+    assert isinstance(restored, cfg.Entry)
+    assert edges(IndexedGraph(restored)) == edges(IndexedGraph(entry))
+
+def test_cyclic_predecessors(program, entry):
+    graph = IndexedGraph(loads(dumps(program=program, cfg=entry)).cfg)
+    # succ -> pred -> succ 로 객체가 서로 가리킨다. pred 는 복원된 같은 객체여야 한다.
+    linked = 0
+    for node in graph.nodes:
+        for p in getattr(node, 'predecessors', ()):
+            assert any(s is node for s in cfg.successors(p))
+            linked += 1
+    assert linked >= len(graph) - 1
+
+    # while 의 body 에서 조건 node 로 돌아오는 edge
+    head = next(node for node in graph.nodes
+                if isinstance(node, cfg.BranchNode) and node.category is cfg.BranchCategory.WHILE)
+    assert len(graph.predecessors[graph.index[head]]) > 1
+
+def test_shared_statements(program, entry):
+    snapshot = loads(dumps(program=program, cfg=entry))
+    main = snapshot.program.functions[-1]
+    statements = set()
+    stack = [*ast.as_list(main.statements, []), main.return_statement]
+    while stack:
+        stmt = stack.pop()
+        statements.add(id(stmt))
+        for name in ('true_statements', 'false_statements', 'statements'):
+            stack.extend(ast.as_list(getattr(stmt, name, None), []))
+    # CFG node 의 statement 는 program 의 statement 와 같은 객체로 복원된다.
+    nodes = [n for n in IndexedGraph(snapshot.cfg).nodes if isinstance(n, (cfg.NormalNode, cfg.BranchNode))]
+    assert all(id(n.statement) in statements for n in nodes)
+
+def test_lazy(program, entry):
+    data = dumps(program=program, cfg=entry)
+    snapshot = loads(data)
+    assert isinstance(snapshot.view, memoryview) and snapshot.view.obj is data
+    assert all(obj is None for obj in snapshot.cache)
+
+    assert snapshot.function_names() == ['inc', 'record', 'main']
+    assert all(obj is None for obj in snapshot.cache)
+
+    function = snapshot.function('record')
+    assert function == program.functions[1]
+    created = sum(obj is not None for obj in snapshot.cache)
+    assert 0 < created < len(snapshot)
+    # 한 번 만든 node 는 다시 만들지 않는다.
+    assert snapshot.function('record') is function
+
+def test_results(program, entry):
+    fixed_point = FixedPointSolver(entry, ast.as_list(program.functions[-1].parameters, [])).fixed_point
+    types = {'main': '(int) -> int', 'x': '↑int'}
+    snapshot = loads(dumps(program=program, cfg=entry, fixed_point=fixed_point, types=types))
+    assert snapshot.fixed_point == fixed_point
+    assert snapshot.types == types
+
+def test_stable_bytes(program, entry):
+    data = dumps(program=program, cfg=entry)
+    snapshot = loads(data)
+    assert dumps(program=snapshot.program, cfg=snapshot.cfg) == data
+
+def test_version(program):
+    data = bytearray(dumps(program=program))
+    _, version = struct.unpack_from('<4sH', data)
+    assert version == VERSION
+    struct.pack_into('<H', data, 4, VERSION + 1)
+    with pytest.raises(SerializationError, match='version'):
+        loads(bytes(data))
+
+def test_invalid(program):
+    data = dumps(program=program)
+    with pytest.raises(SerializationError):
+        loads(b'XXXX' + data[4:])
+    with pytest.raises(SerializationError):
+        loads(data[:HEADER.size - 1])
+    with pytest.raises(SerializationError):
+        loads(data[:-1])
@@ -0,0 +1,40 @@
+"""
+Unix socket 경로 정리: socket 이 아닌 파일은 지우지 않고, 종료 시에는 자기가 만든 socket 만 지운다.
+"""
+import os
+import socket
+
+import pytest
+
+from common.server import remove_own_socket, remove_stale_socket, socket_identity
+
+def bind(path):
+    sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    sock.bind(str(path))
+    return sock
+
+def test_regular_file_is_kept(tmp_path):
+    path = tmp_path / 'notasock.txt'
+    path.write_text('keep')
+    with pytest.raises(FileExistsError):
+        remove_stale_socket(str(path))
+    assert path.read_text() == 'keep'
+
+def test_stale_socket_is_removed(tmp_path):
+    path = tmp_path / 'stale.sock'
+    bind(path).close()
+    remove_stale_socket(str(path))
+    assert not path.exists()
+    remove_stale_socket(str(path))
+
+def test_only_own_socket_is_removed(tmp_path):
+    path = tmp_path / 'server.sock'
+    with bind(path):
+        owned = socket_identity(str(path))
+    # 다른 process 가 같은 경로에 새 socket 을 만든 경우 (옛 inode 는 살려 두어 번호가 재사용되지 않게 한다)
+    os.rename(path, tmp_path / 'old.sock')
+    with bind(path):
+        remove_own_socket(str(path), owned)
+        assert path.exists()
+        remove_own_socket(str(path), socket_identity(str(path)))
+        assert not path.exists()
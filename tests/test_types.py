@@ -0,0 +1,55 @@
+"""
+type analysis: ConstraintCollector -> UnificationSolver -> SolvedTypes
+"""
+from ir import tip_ast as ast
+from type.tip_constraint import ConstraintCollector, IntType, PointerType, RecordType, TypeFactory
+from type.tip_solution import SolvedTypes
+from type.tip_unification import UnificationSolver
+
+def solve(program) -> SolvedTypes:
+    collector = ConstraintCollector(program)
+    solver = UnificationSolver(collector.constraints, collector.record_fields)
+    return SolvedTypes(solver.type_parent_relation, collector.types)
+
+def test_null_per_occurrence(parse):
+    # null 마다 가리키는 타입이 다르다.
+    program = parse("""
+    main() { var p, q, x, r; x = 1; r = {a: 2}; p = null; q = null; p = &x; q = &r; return x; }
+    """)
+    types = solve(program)
+    variables = types.variables()
+    assert variables['p'] == PointerType(IntType())
+    assert isinstance(variables['q'], PointerType) and isinstance(variables['q'].base, RecordType)
+
+    nulls = [n for n in ast.walk(program) if isinstance(n, ast.Null)]
+    assert len(nulls) == 2
+    assert [types.type_of(n) for n in nulls] == [variables['p'], variables['q']]
+
+def test_interning(parse):
+    types = TypeFactory()
+    x, y = ast.Id('x'), ast.Id('x')
+    # 같은 node 는 id 로, 구조가 같은 다른 node 는 값으로 같은 term
+    assert types.type(x) is types.type(x)
+    assert types.type(y) is types.type(x)
+    assert types.pointer(types.type(x)) is types.pointer(types.type(y))
+    assert types.function([types.int, types.type(x)], types.int) is types.function([types.int, types.type(y)], types.int)
+    assert types.record({'a': types.int}) is types.record({'a': types.int})
+    assert types.intern(IntType()) is types.int
+
+    # constraint 의 모든 term 은 factory 가 가진 객체 하나
+    collector = ConstraintCollector(parse("main() { var x, p; x = 1; p = &x; x = *p; return x; }"))
+    terms = collector.types
+    for c in collector.constraints:
+        for term in (c.left, c.right):
+            assert terms.terms[term] is term
+
+def test_recursive_types(parse):
+    types = solve(parse("""
+    main() { var p, q, l; p = &p; l = {next: null}; q = &l; l = {next: q}; return 0; }
+    """))
+    variables = types.variables()
+    assert str(variables['p']) == 'µα0.↑α0'
+    assert str(variables['q']) == 'µα1.↑{next: α1}'
+    assert str(variables['l']) == '{next: µα1.↑{next: α1}}'
+    # by_node 에 없는 node (다른 AST 의 p) 는 Type(node) 의 값으로 찾는다.
+    assert types.type_of(parse("main() { var p; return p; }").functions[0].return_statement.expression) is variables['p']
@@ -0,0 +1,44 @@
+"""
+BatchSignSolver 의 fixed_point(i) / states(i) 는 CFG 마다 푼 FixedPointSolver 결과와 같아야 한다.
+"""
+import pytest
+
+from common.generator import GeneratorConfig, generate
+from ir import tip_ast as ast
+from ir.tip_cfg import GraphBuilder
+from lattice.tip_lattice import FixedPointSolver, MapLattice
+from lattice.tip_vectorized import BatchSignSolver
+
+def as_states(fixed_point: list) -> list:
+    return [dict(state.lattice.items()) if isinstance(state, MapLattice) else None for state in fixed_point]
+
+@pytest.mark.parametrize('config', [
+    GeneratorConfig(functions=12, statements=10, call_graph='dag', seed=0),
+    GeneratorConfig(functions=12, statements=10, call_graph='dag', seed=1),
+    GeneratorConfig(functions=4, statements=40, loop_density=0.3, branch_density=0.3, seed=2),
+    GeneratorConfig(functions=4, statements=30, pointer_density=0.4, record_density=0.2, seed=3),
+])
+def test_same_as_fixed_point_solver(parse, config):
+    program = parse(generate(config))
+    cfgs = [GraphBuilder(program, str(f.name.name)).graph for f in program.functions]
+    parameters = [ast.as_list(f.parameters, []) for f in program.functions]
+    solver = BatchSignSolver(cfgs, parameters)
+    assert len(solver) == len(cfgs)
+    for i, (entry, ps) in enumerate(zip(cfgs, parameters)):
+        expected = FixedPointSolver(entry, ps).fixed_point
+        assert solver.fixed_point(i) == expected, i
+        assert solver.states(i) == as_states(expected), i
+
+def test_unequal_sizes(parse):
+    # 길이가 다른 CFG (step 수가 모자란 프로그램) 와 loop
+    program = parse("""
+    f(n) { var x; x = n; return x; }
+    main(n) { var a, b; a = 1; b = 0 - 1; while (n > 0) { a = a + b; n = n - 1; } output a; return a; }
+    """)
+    cfgs = [GraphBuilder(program, name).graph for name in ('f', 'main')]
+    parameters = [ast.as_list(f.parameters, []) for f in program.functions]
+    solver = BatchSignSolver(cfgs, parameters)
+    for i in range(2):
+        expected = FixedPointSolver(cfgs[i], parameters[i]).fixed_point
+        assert solver.fixed_point(i) == expected
+        assert solver.states(i) == as_states(expected)
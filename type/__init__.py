@@ -1,3 +1,5 @@
-from . import tip_constraint, tip_unification
+from common.lazy import lazy_module
 
-__all__ = ["tip_constraint", "tip_unification"]
\ No newline at end of file
+__all__ = ["tip_constraint", "tip_unification", "tip_solution", "tip_partition"]
+
+__getattr__ = lazy_module(__name__, __all__)
@@ -17,6 +17,8 @@ null: [[null]] = ↑α
 *E1 = E2: [[E1]] = ↑[[E2]]
 { X1:E1,..., Xn:En }: [[{ X1:E1,..., Xn:En }]] = {X1:[[E1]], ...,Xn:[[En]]}
 E.X: [[E]] = {...,X:[[E.X]], ...}
+X.Y = E: [[X]] = {...,Y:[[E]], ...}
+(*E1).Y = E2: [[E1]] = ↑[[*E1]] ∧ [[*E1]] = {...,Y:[[E2]], ...}
 
 Type -> int
 	| ↑ Type
@@ -41,12 +43,31 @@ class Type(_Type):
         return f"[{self.value}]"
 
     def __eq__(self, other):
+        # TypeFactory 가 만든 term 은 대부분 같은 객체
+        if self is other:
+            return True
         if not isinstance(other, Type):
             return False
         return self.value == other.value
 
     def __hash__(self):
-        return hash(self.value)
+        # AST 의 hash 는 매번 하위 node 를 모두 돌기 때문에 한 번만 계산한다.
+        h = self.__dict__.get('_hash')
+        if h is None:
+            h = self.__dict__['_hash'] = hash(self.value)
+        return h
+
+@dataclass(eq=False)
+class FreshType(_Type):
+    """
+    식 하나의 occurrence 에만 속하는 타입 변수, 구조가 같은 다른 term 과도 같지 않다. (identity 로 비교)
+    null 은 나올 때마다 다른 타입의 pointer 일 수 있다.
+    """
+    value: ast._Expression
+    label: str
+
+    def __str__(self):
+        return self.label
 
 class IntType(_Type):
     def __str__(self):
@@ -66,6 +87,8 @@ class PointerType(_Type):
         return f"↑{self.base}"
 
     def __eq__(self, other):
+        if self is other:
+            return True
         if not isinstance(other, PointerType):
             return False
         return self.base == other.base
@@ -83,6 +106,8 @@ class FunctionType(_Type):
         return f"({params_str}) -> {self.result}"
 
     def __eq__(self, other):
+        if self is other:
+            return True
         if not isinstance(other, FunctionType):
             return False
         return self.params == other.params and self.result == other.result
@@ -92,20 +117,26 @@ class FunctionType(_Type):
 
 @dataclass
 class TypeVar(_Type):
+    # 이름 없는 TypeVar 는 모두 같다. 이름은 풀이 결과 (SolvedTypes) 의 α0, α1, ... 에만 붙는다.
+    name: str = None
+
     def __str__(self):
-        return "typevar"
+        return "typevar" if self.name is None else self.name
 
     def __eq__(self, other):
-        return isinstance(other, TypeVar)
+        return isinstance(other, TypeVar) and self.name == other.name
 
     def __hash__(self):
-        return hash("typevar")
+        return hash("typevar") if self.name is None else hash(("typevar", self.name))
 
 @dataclass
 class RecursiveType(_Type):
     var: TypeVar
     body: Type
 
+    def __str__(self):
+        return f"µ{self.var}.{self.body}"
+
     def __eq__(self, other):
         if not isinstance(other, RecursiveType):
             return False
@@ -119,6 +150,8 @@ class RecordType(_Type):
     field_map: dict
 
     def __eq__(self, other):
+        if self is other:
+            return True
         if not isinstance(other, RecordType):
             return False
         return self.field_map == other.field_map
@@ -141,6 +174,56 @@ class AbsenceType(_Type):
     def __hash__(self):
         return hash("absence")
 
+@dataclass
+class TypeFactory:
+    """
+    hash-consing: 구조가 같은 term 은 하나만 만든다.
+    - Type(E): 같은 AST node 객체는 id 로 바로 찾고, 처음 보는 node 만 값으로 hash 한다.
+    - ↑τ, (τ1, ..., τn) -> τ: 하위 term 이 이미 하나뿐이므로 구조 비교는 사실상 identity 비교
+    - int, typevar, absence: 하나씩
+    - [null] 과 null 이 가리키는 타입: occurrence 마다 새 FreshType
+    - record: set_record_field 가 field 를 모두 채운 다음 intern 한다. (채우기 전에 공유하면 안 된다.)
+    """
+    terms: dict[_Type, _Type] = field(default_factory=dict)
+    by_node: dict[int, Type] = field(default_factory=dict)
+
+    int: IntType = field(init=False, default=None)
+    type_var: TypeVar = field(init=False, default=None)
+    absence: AbsenceType = field(init=False, default=None)
+
+    def __post_init__(self):
+        self.int = self.intern(IntType())
+        self.type_var = self.intern(TypeVar())
+        self.absence = self.intern(AbsenceType())
+
+    def __len__(self):
+        return len(self.terms)
+
+    def intern(self, term: _Type) -> _Type:
+        return self.terms.setdefault(term, term)
+
+    def type(self, value: ast._Expression) -> Type:
+        term = self.by_node.get(id(value))
+        if term is None:
+            if isinstance(value, ast.Null):
+                term = self.fresh(value, f"[{value}]")
+            else:
+                term = self.intern(Type(value))
+            self.by_node[id(value)] = term
+        return term
+
+    def fresh(self, value: ast._Expression, label: str) -> FreshType:
+        return self.intern(FreshType(value, label))
+
+    def pointer(self, base: _Type) -> PointerType:
+        return self.intern(PointerType(base))
+
+    def function(self, params: list[_Type], result: _Type) -> FunctionType:
+        return self.intern(FunctionType(list(params), result))
+
+    def record(self, field_map: dict) -> RecordType:
+        return self.intern(RecordType(field_map))
+
 @dataclass(frozen=True)
 class TypeEqualityConstraint:
     """
@@ -158,6 +241,7 @@ class TypeEqualityConstraint:
 class ConstraintCollector:
     target_ast: ast._Ast
 
+    types: TypeFactory = field(init=False, default_factory=TypeFactory)
     record_fields: set[ast.Id] = field(init=False, default_factory=set)
     record_constraints: list[tuple[str, TypeEqualityConstraint]] = field(init=False,default_factory=list)
     constraints: list[TypeEqualityConstraint] = field(init=False, default_factory=list)
@@ -178,23 +262,28 @@ class ConstraintCollector:
         """
         AST 를 끝까지 순회하고 모든 field 를 수집하여 TypeVar 와 absence type 을 넣어주기 위해 분리
         """
+        # set 순서는 실행마다 다르므로 이름 순서로 채운다. (field 순서가 α0, α1, ... 의 순서를 정한다.)
+        fields = sorted(self.record_fields, key=str)
         for element in self.record_constraints:
             type = element[0]
             value = element[1]
             if type == 'field_access':
                 # [E] = { ..., X: [E.X] ,... } , 없는 field 는 TypeVar 로 추가
-                for f in self.record_fields:
+                for f in fields:
                     if f not in value.right.field_map:
-                        value.right.field_map[f] = TypeVar()
+                        value.right.field_map[f] = self.types.type_var
 
             elif type == 'record':
                 # [{ X1:E1, ... Xn:En }] = { X1:[E1], ... Xn:[En] } , 없는 field 는 absence 로 추가
-                for f in self.record_fields:
+                for f in fields:
                     if f not in value.right.field_map:
-                        value.right.field_map[f] = AbsenceType()
+                        value.right.field_map[f] = self.types.absence
             else:
                 print('[ERROR]')
 
+            # field 가 모두 채워진 record 만 공유한다.
+            value = TypeEqualityConstraint(value.left, self.types.record(value.right.field_map))
+
             # 원본 제약 배열에 넣어주기
             self.constraints.append(value)
 
@@ -220,26 +309,26 @@ class ConstraintCollector:
         if node.name.name == 'main':
             # main(X1, ..., Xn) { ...return E; }: [X1] = ... [Xn] = [E] = int
             self.constraints.extend(
-                TypeEqualityConstraint(Type(param), IntType())
+                TypeEqualityConstraint(self.types.type(param), self.types.int)
                 for param in params
             )
             self.constraints.append(
                 TypeEqualityConstraint(
-                    Type(node.return_statement.expression),
-                    IntType()
+                    self.types.type(node.return_statement.expression),
+                    self.types.int
                 )
             )
 
         # Function type constraint 추가
-        temp = [Type(p) for p in params]
+        temp = [self.types.type(p) for p in params]
 
         self.visit(node.return_statement.expression)
 
         constraint1 = TypeEqualityConstraint(
-            Type(node.name),
-            FunctionType(
+            self.types.type(node.name),
+            self.types.function(
                 temp,
-                Type(node.return_statement.expression)
+                self.types.type(node.return_statement.expression)
             )
         )
         self.constraints.append(constraint1)
@@ -252,8 +341,8 @@ class ConstraintCollector:
         """
         # Reference type constraint 추가
         constraint1 = TypeEqualityConstraint(
-            Type(node),
-            PointerType(Type(node.id))
+            self.types.type(node),
+            self.types.pointer(self.types.type(node.id))
         )
         self.constraints.append(constraint1)
 
@@ -265,8 +354,8 @@ class ConstraintCollector:
 
         # Dereference type constraint 추가
         constraint1 = TypeEqualityConstraint(
-            Type(node.expression),
-            PointerType(Type(node))
+            self.types.type(node.expression),
+            self.types.pointer(self.types.type(node))
         )
         self.constraints.append(constraint1)
 
@@ -282,10 +371,10 @@ class ConstraintCollector:
         self.visit(node.expressions)
 
         constraint1 = TypeEqualityConstraint(
-            Type(node.callee),
-            FunctionType(
-                [Type(expr) for expr in node.expressions],
-                Type(node)
+            self.types.type(node.callee),
+            self.types.function(
+                [self.types.type(expr) for expr in node.expressions],
+                self.types.type(node)
             )
         )
         self.constraints.append(constraint1)
@@ -298,8 +387,8 @@ class ConstraintCollector:
 
         # Allocation type constraint 추가
         constraint1 = TypeEqualityConstraint(
-            Type(node),
-            PointerType(Type(node.expression))
+            self.types.type(node),
+            self.types.pointer(self.types.type(node.expression))
         )
         self.constraints.append(constraint1)
 
@@ -309,22 +398,32 @@ class ConstraintCollector:
         """
         # Int type constraint 추가
         constraint1 = TypeEqualityConstraint(
-            Type(node),
-            IntType()
+            self.types.type(node),
+            self.types.int
         )
         self.constraints.append(constraint1)
 
     def visit_Id(self, node: ast.Id):
         pass
 
+    def visit_Null(self, node: ast.Null):
+        """
+        null: [null] = ↑α (null 마다 새 α)
+        """
+        constraint1 = TypeEqualityConstraint(
+            self.types.type(node),
+            self.types.pointer(self.types.fresh(node, f"[*{node}]"))
+        )
+        self.constraints.append(constraint1)
+
     def visit_Input(self, node: ast.Input):
         """
         input: [input] = int
         """
         # Input type constraint 추가
         constraint1 = TypeEqualityConstraint(
-            Type(node),
-            IntType()
+            self.types.type(node),
+            self.types.int
         )
         self.constraints.append(constraint1)
 
@@ -336,8 +435,8 @@ class ConstraintCollector:
         self.visit(node.expression)
 
         constraint1 = TypeEqualityConstraint(
-            Type(node.id),
-            Type(node.expression)
+            self.types.type(node.id),
+            self.types.type(node.expression)
         )
         self.constraints.append(constraint1)
 
@@ -353,11 +452,68 @@ class ConstraintCollector:
 
         # DereferenceAssignment type constraint 추가
         constraint1 = TypeEqualityConstraint(
-            Type(node.target.expression),
-            PointerType(Type(node.expression))
+            self.types.type(node.target.expression),
+            self.types.pointer(self.types.type(node.expression))
         )
         self.constraints.append(constraint1)
 
+    def visit_FieldAssignment(self, node: ast.FieldAssignment):
+        """
+        X.Y = E: [X] = { ..., Y: [E], ... }
+        """
+        self.visit(node.expression)
+
+        # field 목록 수집, E.X 와 같이 나머지 field 는 TypeVar 로 채운다.
+        self.record_fields.add(node.key)
+
+        constraint1 = TypeEqualityConstraint(
+            self.types.type(node.id),
+            RecordType({node.key: self.types.type(node.expression)})
+        )
+        self.record_constraints.append(("field_access", constraint1))
+
+    def visit_DereferenceFieldAssignment(self, node: ast.DereferenceFieldAssignment):
+        """
+        (*E1).Y = E2: [E1] = ↑[*E1], [*E1] = { ..., Y: [E2], ... }
+        """
+        self.visit(node.target)
+        self.visit(node.expression)
+
+        self.record_fields.add(node.key)
+
+        constraint1 = TypeEqualityConstraint(
+            self.types.type(node.target),
+            RecordType({node.key: self.types.type(node.expression)})
+        )
+        self.record_constraints.append(("field_access", constraint1))
+
+    def visit_Output(self, node: ast.Output):
+        """
+        output E: [E] = int
+        """
+        self.visit(node.expression)
+
+        constraint1 = TypeEqualityConstraint(
+            self.types.type(node.expression),
+            self.types.int
+        )
+        self.constraints.append(constraint1)
+
+    def visit_While(self, node: ast.While):
+        """
+        while (E) S: [E] = int
+        """
+        self.visit(node.condition)
+
+        constraint1 = TypeEqualityConstraint(
+            self.types.type(node.condition),
+            self.types.int
+        )
+        self.constraints.append(constraint1)
+
+        for stmt in node.statements:
+            self.visit(stmt)
+
     def visit_If(self, node: ast.If):
         """
         if(E) S: [E] = int
@@ -367,8 +523,8 @@ class ConstraintCollector:
         self.visit(node.condition)
 
         constraint1 = TypeEqualityConstraint(
-            Type(node.condition),
-            IntType()
+            self.types.type(node.condition),
+            self.types.int
         )
         self.constraints.append(constraint1)
 
@@ -387,12 +543,12 @@ class ConstraintCollector:
 
         # Comparison type constraint 추가 
         constraint1 = TypeEqualityConstraint(
-            Type(node.left_expression),
-            Type(node.right_expression)
+            self.types.type(node.left_expression),
+            self.types.type(node.right_expression)
         )
         constraint2 = TypeEqualityConstraint(
-            Type(node),
-            IntType()
+            self.types.type(node),
+            self.types.int
         )
         self.constraints += [constraint1, constraint2]
 
@@ -405,16 +561,16 @@ class ConstraintCollector:
 
         # Arithmetic type constraint 추가
         constraint1 = TypeEqualityConstraint(
-            Type(node),
-            IntType()
+            self.types.type(node),
+            self.types.int
         )
         constraint2 = TypeEqualityConstraint(
-            Type(node.left_expression),
-            IntType()
+            self.types.type(node.left_expression),
+            self.types.int
         )
         constraint3 = TypeEqualityConstraint(
-            Type(node.right_expression),
-            IntType()
+            self.types.type(node.right_expression),
+            self.types.int
         )
         self.constraints += [constraint1, constraint2, constraint3]
 
@@ -431,10 +587,10 @@ class ConstraintCollector:
 
             if f.key not in field_map:
                 self.visit(f.Value)
-                field_map[f.key] = Type(f.Value)
+                field_map[f.key] = self.types.type(f.Value)
 
         constraint1 = TypeEqualityConstraint(
-            Type(node),
+            self.types.type(node),
             RecordType(field_map)
         )
         # self.constraints.append(constraint1)
@@ -449,9 +605,9 @@ class ConstraintCollector:
         self.record_fields.add(node.id)
 
         field_map = dict()
-        field_map[node.id] = Type(node)
+        field_map[node.id] = self.types.type(node)
         constraint1 = TypeEqualityConstraint(
-            Type(node.expression),
+            self.types.type(node.expression),
             RecordType(field_map)
         )
         #self.constraints.append(constraint1)
@@ -0,0 +1,330 @@
+"""
+connected component 로 나눈 unification
+
+서로 term 을 공유하지 않는 constraint 들은 union-find 에서 서로 영향을 주지 않는다.
+    [x] = [y], [y] = int        (component 1)
+    [p] = ↑[q]                  (component 2)
+그래서 constraint 를 component 로 나누고 따로 풀어 결과 (term -> 대표) 를 합쳐도
+하나의 union-find 로 푼 것과 같은 동치류가 나온다.
+
+component 나누기 (pre-pass)
+- term 에 하위 term 이 먼저 오도록 번호를 붙이고 (TermTable) 번호 위의 union-find 로 묶는다.
+- term 과 하위 term (↑τ 의 τ, 함수의 param / result, record field) 을 같은 component 로 묶는다.
+- constraint 의 양변을 같은 component 로 묶는다.
+- int, absence 는 묶지 않는다. 항상 자기 자신이 대표이므로 여러 component 에 있어도 결과가 충돌하지 않는다.
+  (묶으면 int 를 쓰는 constraint 가 모두 한 component 가 된다.)
+
+component 를 크기 순으로 bin 에 나누어 담고 (LPT), bin 하나를 UnificationSolver 하나로 푼다.
+- workers > 1 이고 constraint 가 parallel_threshold 이상이면 bin 을 process pool 에서 푼다.
+- worker 에는 AST 대신 번호로 된 term (tuple) 을 보낸다. worker 는 [E] 를 Type(번호) 로 바꿔 풀고 대표 번호를 돌려준다.
+  결과 relation 의 term 은 원래 객체 그대로이므로 TypeFactory.by_node / SolvedTypes 를 그대로 쓸 수 있다.
+- worker 에서 unification 이 실패하면 그 bin 만 원래 term 으로 다시 풀어 같은 message 의 예외를 낸다.
+"""
+import os
+from concurrent.futures import Executor, ProcessPoolExecutor
+from dataclasses import dataclass, field
+
+from common.exceptions import TypeAnalysisException
+from . import tip_constraint as constraint
+from .tip_unification import UnificationSolver, UnionFind
+
+# record field 의 값 (term 번호 대신)
+ABSENT = -1
+VARIABLE = -2
+
+def subterms(t: constraint._Type) -> list[constraint._Type]:
+    """
+    UnificationSolver.makeSet 이 내려가는 하위 term
+    """
+    if isinstance(t, constraint.PointerType):
+        return [t.base]
+    if isinstance(t, constraint.FunctionType):
+        return [*t.params, t.result]
+    if isinstance(t, constraint.RecursiveType):
+        return [t.body]
+    if isinstance(t, constraint.RecordType):
+        return [f for f in t.field_map.values()
+                if not isinstance(f, (constraint.AbsenceType, constraint.TypeVar))]
+    return []
+
+@dataclass
+class TermTable:
+    """
+    constraint 에 나오는 term 과 하위 term 에 0 ... n-1 번호 (하위 term 이 먼저, 값이 같은 term 은 하나)
+    - nodes[i]: i 번째 term 의 구조 (하위 term 은 번호)
+        ('var',) ('int',) ('absence',) ('typevar', name)
+        ('pointer', base) ('function', (param, ...), result) ('record', ((field, value), ...)) ('recursive', name, body)
+    - pairs: constraint 의 (left 번호, right 번호)
+    """
+    constraints: list[constraint.TypeEqualityConstraint]
+
+    terms: list[constraint._Type] = field(init=False, default_factory=list)
+    index: dict[constraint._Type, int] = field(init=False, default_factory=dict)
+    nodes: list[tuple] = field(init=False, default_factory=list)
+    pairs: list[tuple[int, int]] = field(init=False, default_factory=list)
+
+    def __post_init__(self):
+        for c in self.constraints:
+            self.pairs.append((self.add(c.left), self.add(c.right)))
+
+    def __len__(self):
+        return len(self.terms)
+
+    def add(self, term: constraint._Type) -> int:
+        # 재귀 대신 stack 으로 postorder (깊은 term 에서 recursion limit 회피)
+        index = self.index
+        stack = [(term, False)]
+        while stack:
+            t, expanded = stack.pop()
+            if t in index:
+                continue
+            if expanded:
+                index[t] = len(self.terms)
+                self.terms.append(t)
+                self.nodes.append(self.encode(t))
+            else:
+                stack.append((t, True))
+                stack.extend((s, False) for s in reversed(subterms(t)) if s not in index)
+        return index[term]
+
+    def encode(self, t: constraint._Type) -> tuple:
+        index = self.index
+        if isinstance(t, constraint.IntType):
+            return ('int',)
+        if isinstance(t, constraint.AbsenceType):
+            return ('absence',)
+        if isinstance(t, constraint.TypeVar):
+            return ('typevar', t.name)
+        if isinstance(t, constraint.PointerType):
+            return ('pointer', index[t.base])
+        if isinstance(t, constraint.FunctionType):
+            return ('function', tuple(index[p] for p in t.params), index[t.result])
+        if isinstance(t, constraint.RecursiveType):
+            return ('recursive', t.var.name, index[t.body])
+        if isinstance(t, constraint.RecordType):
+            return ('record', tuple((str(k), self.field_value(v)) for k, v in t.field_map.items()))
+        return ('var',)
+
+    def field_value(self, value: constraint._Type) -> int:
+        if isinstance(value, constraint.AbsenceType):
+            return ABSENT
+        if isinstance(value, constraint.TypeVar):
+            return VARIABLE
+        return self.index[value]
+
+def children(node: tuple) -> list[int]:
+    kind = node[0]
+    if kind == 'pointer':
+        return [node[1]]
+    if kind == 'function':
+        return [*node[1], node[2]]
+    if kind == 'recursive':
+        return [node[2]]
+    if kind == 'record':
+        return [value for _, value in node[1] if value >= 0]
+    return []
+
+def components(table: TermTable) -> list[list[int]]:
+    """
+    term 을 공유하는 constraint 끼리 묶는다. -> component 마다 constraint 번호 (처음 나온 순서)
+    """
+    parent = list(range(len(table)))
+
+    def find(x):
+        root = x
+        while parent[root] != root:
+            root = parent[root]
+        while parent[x] != root:
+            parent[x], x = root, parent[x]
+        return root
+
+    def union(x, y):
+        xr, yr = find(x), find(y)
+        if xr != yr:
+            parent[xr] = yr
+
+    constant = [node[0] in ('int', 'absence') for node in table.nodes]
+    for i, node in enumerate(table.nodes):
+        if not constant[i]:
+            for s in children(node):
+                if not constant[s]:
+                    union(s, i)
+
+    keys = []
+    for left, right in table.pairs:
+        if constant[left]:
+            left, right = right, left
+        if not constant[right]:
+            union(right, left)
+        # 양변이 모두 상수 (int = int) 이면 left 자체가 key
+        keys.append(left)
+
+    # 모두 묶은 다음에 대표를 본다. (뒤의 constraint 가 앞의 component 들을 합칠 수 있다.)
+    groups = {}
+    for i, key in enumerate(keys):
+        groups.setdefault(find(key), []).append(i)
+    return list(groups.values())
+
+def pack(groups: list[list], bins: int) -> list[list]:
+    """
+    LPT: 큰 component 부터 지금 가장 가벼운 bin 에 넣는다. (빈 bin 은 버린다.)
+    """
+    loads = [[] for _ in range(max(1, bins))]
+    sizes = [0] * len(loads)
+    for group in sorted(groups, key=len, reverse=True):
+        i = sizes.index(min(sizes))
+        loads[i].extend(group)
+        sizes[i] += len(group)
+    return [b for b in loads if b]
+
+def payload(table: TermTable, constraint_ids: list[int]) -> tuple[list[int], list[tuple], list[tuple[int, int]]]:
+    """
+    bin 하나를 worker 로 보낼 형태로: (전체 term 번호, bin 안 번호로 바꾼 nodes, pairs)
+    - 하위 term 이 먼저 오는 순서를 유지한다.
+    """
+    used = set()
+    stack = [i for c in constraint_ids for i in table.pairs[c]]
+    while stack:
+        i = stack.pop()
+        if i not in used:
+            used.add(i)
+            stack.extend(children(table.nodes[i]))
+
+    terms = sorted(used)
+    local = {i: n for n, i in enumerate(terms)}
+
+    def renumber(node: tuple) -> tuple:
+        kind = node[0]
+        if kind == 'pointer':
+            return (kind, local[node[1]])
+        if kind == 'function':
+            return (kind, tuple(local[p] for p in node[1]), local[node[2]])
+        if kind == 'recursive':
+            return (kind, node[1], local[node[2]])
+        if kind == 'record':
+            return (kind, tuple((k, local[v] if v >= 0 else v) for k, v in node[1]))
+        return node
+
+    nodes = [renumber(table.nodes[i]) for i in terms]
+    pairs = [(local[table.pairs[c][0]], local[table.pairs[c][1]]) for c in constraint_ids]
+    return terms, nodes, pairs
+
+def decode(nodes: list[tuple]) -> list[constraint._Type]:
+    """
+    번호로 된 term 을 다시 term 으로, [E] 는 Type(번호) (AST 가 없어도 값이 다른 term 이 된다.)
+    """
+    types = constraint.TypeFactory()
+    terms = []
+
+    def field_value(value: int) -> constraint._Type:
+        if value == ABSENT:
+            return types.absence
+        if value == VARIABLE:
+            return types.type_var
+        return terms[value]
+
+    for i, node in enumerate(nodes):
+        kind = node[0]
+        if kind == 'int':
+            t = types.int
+        elif kind == 'absence':
+            t = types.absence
+        elif kind == 'typevar':
+            t = constraint.TypeVar(node[1])
+        elif kind == 'pointer':
+            t = types.pointer(terms[node[1]])
+        elif kind == 'function':
+            t = types.function([terms[p] for p in node[1]], terms[node[2]])
+        elif kind == 'recursive':
+            t = constraint.RecursiveType(constraint.TypeVar(node[1]), terms[node[2]])
+        elif kind == 'record':
+            t = types.record({k: field_value(v) for k, v in node[1]})
+        else:
+            t = constraint.Type(i)
+        terms.append(t)
+    return terms
+
+def _solve_bin(nodes: list[tuple], pairs: list[tuple[int, int]], record_fields: set[str]) -> list[int]:
+    """
+    process pool 에서 실행: i 번째 term 의 대표 번호, 실패하면 None
+    """
+    terms = decode(nodes)
+    constraints = [constraint.TypeEqualityConstraint(terms[left], terms[right]) for left, right in pairs]
+    try:
+        solver = UnificationSolver(constraints, record_fields)
+    except TypeAnalysisException:
+        return None
+
+    number = {id(t): i for i, t in enumerate(terms)}
+    find = solver.find
+    return [number[id(find(t))] for t in terms]
+
+@dataclass
+class PartitionedUnificationSolver:
+    """
+    UnificationSolver 와 같은 결과 (unique_constraints, type_parent_relation, union_find)
+    - type_parent_relation 은 모든 term 이 대표를 바로 가리키는 상태
+    - workers: None 이면 os.cpu_count(), 1 이하이면 process 를 쓰지 않는다.
+    - component 가 하나뿐이거나 constraint 가 parallel_threshold 보다 적으면 UnificationSolver 하나로 푼다.
+    - executor: 이미 있는 pool 을 쓸 때 (없으면 필요할 때 만들고 닫는다.)
+    """
+    target_constraints: list[constraint.TypeEqualityConstraint]
+    record_fields: set[str]
+    workers: int = None
+    parallel_threshold: int = 20000
+    executor: Executor = None
+
+    unique_constraints: set[constraint.TypeEqualityConstraint] = field(init=False, default_factory=set)
+    components: list[list[constraint.TypeEqualityConstraint]] = field(init=False, default_factory=list)
+    bins: list[list[constraint.TypeEqualityConstraint]] = field(init=False, default_factory=list)
+    type_parent_relation: dict = field(init=False, default_factory=dict)
+    union_find: UnionFind = field(init=False, default=None)
+
+    def __post_init__(self):
+        self.union_find = UnionFind(self.type_parent_relation)
+
+        # 중복 제거 (처음 나온 순서 유지)
+        unique = list(dict.fromkeys(self.target_constraints))
+        self.unique_constraints = set(unique)
+
+        workers = self.workers if self.workers is not None else os.cpu_count() or 1
+        if workers > 1 and len(unique) >= self.parallel_threshold:
+            # 작은 입력은 pre-pass 와 process 간 전송 비용이 더 크다.
+            table = TermTable(unique)
+            groups = components(table)
+            self.components = [[unique[c] for c in group] for group in groups]
+            bins = pack(groups, workers)
+            if len(bins) > 1:
+                self.bins = [[unique[c] for c in b] for b in bins]
+                self.solve_parallel(table, bins, workers)
+                return
+
+        self.bins = [unique]
+        self.solve_serial(unique)
+
+    def solve_serial(self, constraints: list[constraint.TypeEqualityConstraint]):
+        solver = UnificationSolver(constraints, self.record_fields)
+        find = solver.find
+        for t in list(solver.type_parent_relation):
+            self.type_parent_relation[t] = find(t)
+
+    def solve_parallel(self, table: TermTable, bins: list[list[int]], workers: int):
+        record_fields = {str(f) for f in self.record_fields}
+        executor = self.executor or ProcessPoolExecutor(max_workers=min(workers, len(bins)))
+        try:
+            payloads = [payload(table, b) for b in bins]
+            futures = [executor.submit(_solve_bin, nodes, pairs, record_fields) for _, nodes, pairs in payloads]
+            for constraint_ids, (terms, _, _), future in zip(bins, payloads, futures):
+                roots = future.result()
+                if roots is None:
+                    # 원래 term 으로 다시 풀어 실패 message 를 만든다.
+                    UnificationSolver([table.constraints[c] for c in constraint_ids], self.record_fields)
+                    raise TypeAnalysisException("unification 실패")
+                for i, root in zip(terms, roots):
+                    self.type_parent_relation[table.terms[i]] = table.terms[terms[root]]
+        finally:
+            if self.executor is None:
+                executor.shutdown(cancel_futures=True)
+
+    def find(self, x: constraint._Type):
+        return self.union_find.find(x)
@@ -0,0 +1,143 @@
+"""
+풀이 결과 (solved types)
+
+unification 이 끝나면 각 term 의 type 은 Find(term) 의 하위 term 을 다시 Find 로 바꿔 끝까지 펼친 것이다.
+    [p] → ↑[*p] → ↑int
+SolvedTypes 는 이 작업을 동치류 (대표) 마다 한 번만 하고 기억해 둔다.
+- 대표가 type variable 인 동치류: 새 type variable α0, α1, ... (같은 동치류는 같은 변수)
+- 펼치는 중에 같은 대표를 다시 만나면 (순환) 그 자리는 변수 α 로 두고 바깥을 µα.τ (RecursiveType) 로 감싼다.
+    [p] = ↑[p]  =>  µα0.↑α0
+- 순환 안쪽에서 만든 결과는 바깥의 α 가 묶이지 않은 채 들어 있으므로 기억하지 않는다.
+
+모든 대표를 미리 풀어 두므로 질의는 dict 조회 두 번이다.
+    solved = SolvedTypes(solver.type_parent_relation, collector.types)
+    solved.type_of(node)      # AST node 의 type
+    solved.variables()        # 변수 / 함수 이름 -> type
+"""
+from dataclasses import dataclass, field
+
+from ir import tip_ast as ast
+from . import tip_constraint as constraint
+from .tip_unification import UnionFind
+
+EMPTY = frozenset()
+
+def is_proper(t: constraint._Type) -> bool:
+    return isinstance(t, (constraint.IntType, constraint.PointerType, constraint.FunctionType, constraint.RecordType))
+
+@dataclass
+class SolvedTypes:
+    """
+    type_parent_relation: UnificationSolver.type_parent_relation (경로 압축으로 내용이 바뀔 수 있다.)
+    types: ConstraintCollector.types, 주면 AST node 를 id 로 찾는다. (없으면 Type(node) 를 값으로 hash)
+    """
+    type_parent_relation: dict
+    types: constraint.TypeFactory = None
+
+    canonical: dict = field(init=False, default_factory=dict)  # 대표 -> 펼친 type
+    terms: constraint.TypeFactory = field(init=False, default_factory=constraint.TypeFactory)
+    union_find: UnionFind = field(init=False, default=None)
+    _active: dict = field(init=False, default_factory=dict)  # 펼치는 중인 대표 -> µ 변수 (아직 없으면 None)
+    _variables: int = field(init=False, default=0)
+
+    def __post_init__(self):
+        self.union_find = UnionFind(self.type_parent_relation)
+
+        # 모든 term 의 parent 가 대표를 바로 가리키도록 압축
+        find = self.union_find.find
+        for term in list(self.type_parent_relation):
+            find(term)
+
+        # 변수 이름 α0, α1, ... 이 실행마다 같도록 동치류를 처음 나온 순서대로 푼다.
+        # type_parent_relation 의 삽입 순서는 unification 이 constraint set 을 도는 순서 (hash 순서) 이므로
+        # types 가 있으면 term 을 만든 순서 (constraint 를 모은 AST 순서) 를 먼저 따른다.
+        relation = self.type_parent_relation
+        order = relation
+        if self.types is not None:
+            order = [*(t for t in self.types.terms if t in relation), *relation]
+        for root in dict.fromkeys(relation[t] for t in order):
+            self.resolve(root)
+
+    def fresh(self) -> constraint.TypeVar:
+        var = constraint.TypeVar(f"α{self._variables}")
+        self._variables += 1
+        return var
+
+    def resolve(self, term: constraint._Type):
+        """
+        (펼친 type, 묶이지 않은 µ 대표 집합)
+        """
+        if isinstance(term, constraint.AbsenceType):
+            return term, EMPTY
+        if isinstance(term, constraint.TypeVar) and term not in self.type_parent_relation:
+            # 채워 넣은 record field (제약이 없는 field)
+            return self.fresh(), EMPTY
+
+        root = self.union_find.find(term) if term in self.type_parent_relation else term
+        result = self.canonical.get(root)
+        if result is not None:
+            return result, EMPTY
+
+        if root in self._active:
+            var = self._active[root]
+            if var is None:
+                var = self._active[root] = self.fresh()
+            return var, frozenset((root,))
+
+        if not is_proper(root):
+            result = self.canonical[root] = self.fresh()
+            return result, EMPTY
+        if isinstance(root, constraint.IntType):
+            result = self.canonical[root] = self.terms.int
+            return result, EMPTY
+
+        self._active[root] = None
+        free = set()
+
+        def sub(t):
+            resolved, unbound = self.resolve(t)
+            free.update(unbound)
+            return resolved
+
+        if isinstance(root, constraint.PointerType):
+            result = self.terms.pointer(sub(root.base))
+        elif isinstance(root, constraint.FunctionType):
+            result = self.terms.function([sub(p) for p in root.params], sub(root.result))
+        else:
+            result = self.terms.record({key: sub(value) for key, value in root.field_map.items()})
+
+        var = self._active.pop(root)
+        free.discard(root)
+        if var is not None:
+            result = self.terms.intern(constraint.RecursiveType(var, result))
+
+        if not free:
+            self.canonical[root] = result
+        return result, frozenset(free)
+
+    def term(self, term: constraint._Type) -> constraint._Type:
+        """
+        constraint 의 term 하나의 type, O(1)
+        """
+        return self.canonical[self.type_parent_relation[term]]
+
+    def type_of(self, node: ast._Expression) -> constraint._Type:
+        """
+        AST node 의 type [[E]], O(1) (types 가 있으면 node 를 hash 하지 않는다.)
+        """
+        term = self.types.by_node.get(id(node)) if self.types is not None else None
+        if term is None:
+            term = constraint.Type(node)
+        return self.term(term)
+
+    __getitem__ = type_of
+
+    def variables(self) -> dict[str, constraint._Type]:
+        """
+        변수 / 함수 이름 -> type
+        """
+        return {
+            str(t.value.name): self.term(t)
+            for t in self.type_parent_relation
+            if isinstance(t, constraint.Type) and isinstance(t.value, ast.Id)
+        }
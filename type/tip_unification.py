@@ -13,6 +13,61 @@ from dataclasses import dataclass, field
 from common.exceptions import TypeAnalysisException
 from . import tip_constraint as constraint
 
+@dataclass
+class UnionFind:
+    """
+    spa p26 union-find
+    - parent: x -> x.parent
+    - union(x, y) 는 항상 x 의 대표를 y 의 대표 아래에 붙인다. (rank 를 쓰지 않음)
+      unify 는 이 방향을 이용해 proper type 을 대표로 유지한다.
+    """
+    parent: dict = field(default_factory=dict)
+
+    def makeSet(self, x):
+        """
+        procedure MakeSet(x):
+            x.parent := x
+        end procedure
+        """
+        if x not in self.parent:
+            self.parent[x] = x
+
+    def find(self, x):
+        """
+        procedure Find(x):
+            if x.parent ≠ x then
+                x.parent := Find(x.parent)
+            end if
+            return x.parent
+        end procedure
+        - 재귀 대신 두 번의 반복으로 path compression (긴 chain 에서 recursion limit 회피)
+        """
+        parent = self.parent
+        root = x
+        while parent[root] is not root:
+            root = parent[root]
+
+        while x is not root:
+            parent[x], x = root, parent[x]
+
+        return root
+
+    def union(self, x, y):
+        """
+        procedure Union(x , y):
+            xr := Find(x)
+            yr := Find(y)
+            if xr ≠ yr then
+                xr.parent := yr
+            end if
+        end procedure
+        """
+        xr = self.find(x)
+        yr = self.find(y)
+
+        if xr is not yr:
+            self.parent[xr] = yr
+
 @dataclass
 class UnificationSolver:
     target_constraints: list[constraint.TypeEqualityConstraint]
@@ -20,13 +75,17 @@ class UnificationSolver:
 
     unique_constraints: set[constraint.TypeEqualityConstraint] = field(init=False, default_factory=set)
     type_parent_relation: dict = field(init=False, default_factory=dict)
+    union_find: UnionFind = field(init=False, default=None)
 
     def __post_init__(self):
-        # equality constraints 중 중복 제거
-        self.unique_constraints = set(self.target_constraints)
-        self.all_make_set(self.unique_constraints)
+        self.union_find = UnionFind(self.type_parent_relation)
 
-        for element in self.unique_constraints:
+        # equality constraints 중 중복 제거 (순서는 target_constraints 를 따른다.)
+        ordered = list(dict.fromkeys(self.target_constraints))
+        self.unique_constraints = set(ordered)
+        self.all_make_set(ordered)
+
+        for element in ordered:
             self.unify(element.left, element.right)
 
     def is_type_variable(self, t: constraint._Type):
@@ -81,9 +140,12 @@ class UnificationSolver:
         procedure MakeSet(x):
             x.parent := x
         end procedure
+        - 이미 집합이 있는 term 은 하위 term 도 이미 처리했으므로 다시 내려가지 않는다.
+          (TypeFactory 로 만든 term 은 하위 term 을 공유하므로 각 term 을 한 번만 방문)
         """
-        if x not in self.type_parent_relation:
-            self.type_parent_relation[x] = x
+        if x in self.union_find.parent:
+            return
+        self.union_find.makeSet(x)
 
         # spa p26 - "For each term τ we initially invoke MakeSet(τ)" τ 은 type 을 나타냄.
         if isinstance(x, constraint.PointerType):
@@ -100,36 +162,10 @@ class UnificationSolver:
                     self.makeSet(t)
 
     def find(self, x: constraint._Type):
-        """
-        procedure Find(x):
-            if x.parent ≠ x then
-                x.parent := Find(x.parent)
-            end if
-            return x.parent
-        end procedure
-        """
-        parent = self.type_parent_relation[x]
-
-        if parent is not x:
-            self.type_parent_relation[x] = self.find(parent)
-
-        return self.type_parent_relation[x]
+        return self.union_find.find(x)
 
     def union(self, x, y):
-        """
-        procedure Union(x , y):
-            xr := Find(x)
-            yr := Find(y)
-            if xr ≠ yr then
-                xr.parent := yr
-            end if
-        end procedure
-        """
-        xr = self.find(x)
-        yr = self.find(y)
-
-        if xr is not yr:
-            self.type_parent_relation[xr] = yr
+        self.union_find.union(x, y)
 
     def unify(self, x, y):
         """
@@ -177,6 +213,7 @@ class UnificationSolver:
                     elif proper_type is constraint.FunctionType:
                         for a, b in zip(xr.params, yr.params):
                             self.unify(a, b)
+                        self.unify(xr.result, yr.result)
                     elif proper_type is constraint.RecordType:
                         for k in self.record_fields:
                             xr_type = xr.field_map[k]